@@ -4,65 +4,40 @@ Curso: Física Moderna 2025
 Autor: Mauricio Santibañez
 Descripción: Este código procesa datos experimentales de radiación térmica,
 y genera gráficos comparativos con datos reales medidos en clase.
+Uso: python Experimento1.py [--no-plot] [--datos ARCHIVO] [--exportar TABLA.csv|.npz|.fmc] [--resumen RESUMEN.md|.tex]
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
-
-# Datos
-R = np.array([2041.7, 2157.6, 2281.0, 2412.6, 2553.0, 2702.7, 2862.5, 3033.3, 3215.8, 3411.0,
-              3619.8, 3843.4, 4082.9, 4339.7, 4615.1, 4910.7, 5228.1, 5569.3, 5936.1, 6330.8,
-              6755.9, 7214.0, 7707.7, 8240.6, 8816.0, 9437.7, 10100, 10837, 11625, 12479, 
-              13405, 14410, 15502, 16689, 17980, 19386, 20919, 22590, 24415, 26409, 28590,
-              30976, 33591, 36458, 39605, 43062, 46863, 51048, 55658, 60743, 66356, 72560, 79422])
-
-T_C = np.array([134 - 2*i for i in range(53)])  # °C
-T_K = T_C + 273.15  # Kelvin
-
-# --- Coeficientes dados Steinhart-Hart ---
-A = 8.467428050163e-4
-B = 2.058325204985e-4
-C = 9.050118014518e-8
-
-# --- Modelo Steinhart-Hart ---
-def steinhart(R):
-    return 1.0 / (A + B*np.log(R) + C*(np.log(R)**3))
-
-# Valores ajustados con tus coeficientes
-T_fit_SH = steinhart(R)
-
-# --- Interpolación spline cúbico ---
-spline = interp1d(R, T_K, kind="cubic")
+import argparse
+import time
 
-# --- Graficar ---
-plt.figure(figsize=(8,5))
-plt.scatter(R, T_K, label="Datos tabla", color="blue")
-plt.plot(R, spline(R), "--", label="Spline cúbico", color="green")
-plt.plot(R, T_fit_SH, label="Steinhart-Hart (coef. dados)", color="red")
-plt.xlabel("Resistencia [Ω]")
-plt.ylabel("Temperatura [K]")
-plt.title("Comparación spline vs Steinhart-Hart")
-plt.legend()
-plt.grid()
-plt.show()
+import numpy as np
 
+# Datos, coeficientes Steinhart-Hart y spline cúbico (tabla del fabricante)
+from termistor import (R, T_K, A, B, C, steinhart, spline, derivada_spline, convertir_resistencias,
+                       ajustar_steinhart_lotes, buscar_desviacion_maxima)
+from incertidumbre import AcumuladorTipoA, DDOF_TIPO_A
+from mediciones import MedicionesRadiacion
+from datos import cargar_datos
+from exportar import TablaResultados
+from cache import memoizar, reportar_cache
+from instrumentacion import etapa
+from graficos import Figura, mostrar, renderizar_pendientes
 
 
 #------------------------------------------------------------------------------------------
 
 #Datos Resoluciones y temperatura ambiente
-res_Voltimetro = 0.1 #mV 
+res_Voltimetro = 0.1 #mV
 res_Ohmetro = 0.01 #kOhms
 
-Temperatura_ambiente = 23 + 273.15 #K 
+Temperatura_ambiente = 23 + 273.15 #K
 
 
 #------------------------------------------------------------------------------------------
 
 #Mediciones para incertidumbre tipo A:
 
-#Potencia 9 
+#Potencia 9
 
 R9_repetibilidad = 2.28 #KOhms
 V9_repetibilidad = [28.6, 28.7, 28.6, 28.6, 28.6, 28.6, 28.7, 28.6] #mV
@@ -74,8 +49,8 @@ V7_repetibilidad = [25.7, 25.6 ,25.7, 25.6, 25.6, 25.6, 25.5, 25.6] #mV
 
 #Potencia 6
 
-R6_repetibilidad = 3.76 #KOhms 
-V6_repetibilidad = [21.3, 21.3, 21.3, 21.3, 21.3, 21.2, 21.3, 21.4] #mV 
+R6_repetibilidad = 3.76 #KOhms
+V6_repetibilidad = [21.3, 21.3, 21.3, 21.3, 21.3, 21.2, 21.3, 21.4] #mV
 
 #Potencia 5
 
@@ -84,204 +59,303 @@ V5_repetibilidad = [15.5, 15.5, 15.5, 15.5, 15.4, 15.5, 15.5, 15.5] #mV
 
 #------------------------------------------------------------------------------------------
 
-#Cálculo de incertidumbres 
-
-# -- Por resolución --
-
-u_res_V = res_Voltimetro / np.sqrt(12)
-u_res_Ohm = res_Ohmetro / np.sqrt(12)
-
-# -- Tipo A -- 
-
-n_V = 8
-
-std_V9 = np.std(V9_repetibilidad)
-std_V7 = np.std(V7_repetibilidad)
-std_V6 = np.std(V6_repetibilidad)
-std_V5 = np.std(V5_repetibilidad)
-
-u_A_V9 = std_V9/np.sqrt(n_V)
-u_A_V7 = std_V7/np.sqrt(n_V)
-u_A_V6 = std_V6/np.sqrt(n_V)
-u_A_V5 = std_V5/np.sqrt(n_V)
-
-#Mostrar Resultados 
-print("Incertidumbre por resolución Voltímetro:", u_res_V, "mV")
-print("Incertidumbre por resolución Ohmetro:", u_res_Ohm, "kOhms")
-
-print("Incertidumbre tipo A Potencia 9:", u_A_V9, "mV")
-print("Incertidumbre tipo A Potencia 7:", u_A_V7, "mV")
-print("Incertidumbre tipo A Potencia 6:", u_A_V6, "mV")
-print("Incertidumbre tipo A Potencia 5:", u_A_V5, "mV")
-
-print("Incertidumbre combinada Potencia 9:", np.sqrt(u_res_V**2 + u_A_V9**2), "mV")
-print("Incertidumbre combinada Potencia 7:", np.sqrt(u_res_V**2 + u_A_V7**2), "mV")
-print("Incertidumbre combinada Potencia 6:", np.sqrt(u_res_V**2 + u_A_V6**2), "mV")
-print("Incertidumbre combinada Potencia 5:", np.sqrt(u_res_V**2 + u_A_V5**2), "mV")
-#------------------------------------------------------------------------------------------
-
-#Mediciones Realizadas 
-
-#Potencia 9
-
-R9_negra = 2.18 #kOhms 
-V9_negra = 28.6 #mV
-
-R9_blanca = 2.18 #kOhms
-V9_blanca = 27.9 #mV     
-
-R9_bruñido = 2.18 #kOhms 
-V9_bruñido = 8.9 #mV
-
-R9_pulido = 2.18 #kOhms 
-V9_pulido = 1.4 #mV
-
-#Potencia 7
-
-R7_negra = 2.75 #kOhms 
-V7_negra = 25.1 #mV
-
-R7_blanca = 2.75 #kOhms
-V7_blanca = 24.5 #mV     
-
-R7_bruñido = 2.75 #kOhms 
-V7_bruñido = 7.8 #mV
-
-R7_pulido = 2.75 #kOhms 
-V7_pulido = 1.3 #mV
-
-#Potencia 6
-
-R6_negra = 3.87 #kOhms 
-V6_negra = 20.8 #mV
-
-R6_blanca = 3.87 #kOhms
-V6_blanca = 20.5 #mV     
-
-R6_bruñido = 3.87 #kOhms 
-V6_bruñido = 6.5 #mV
-
-R6_pulido = 3.87 #kOhms 
-V6_pulido = 1.2 #mV
-
-#Potencia 5
-
-R5_negra = 6.60 #kOhms 
-V5_negra = 15.3 #mV
-
-R5_blanca = 6.60 #kOhms
-V5_blanca = 15.1 #mV     
-
-R5_bruñido = 6.60 #kOhms 
-V5_bruñido = 4.7 #mV
-
-R5_pulido = 6.60 #kOhms 
-V5_pulido = 0.9 #mV
-
-#------------------------------------------------------------------------------------------
-
-#Conversión Resistencia a Temperatura con resolución considerada
-
-#Diccionario con las resistencias medidas en Ohms
-resistencias = {
-    "R9": {"negra": R9_negra*1000, "blanca": R9_blanca*1000, "bruñido": R9_bruñido*1000, "pulido": R9_pulido*1000},
-    "R7": {"negra": R7_negra*1000, "blanca": R7_blanca*1000, "bruñido": R7_bruñido*1000, "pulido": R7_pulido*1000},
-    "R6": {"negra": R6_negra*1000, "blanca": R6_blanca*1000, "bruñido": R6_bruñido*1000, "pulido": R6_pulido*1000},
-    "R5": {"negra": R5_negra*1000, "blanca": R5_blanca*1000, "bruñido": R5_bruñido*1000, "pulido": R5_pulido*1000},
-}
-
-#Calcular temperaturas usando spline y redondear según resolución del Ohmetro (0.01 kΩ)
-temperaturas = {}
-for potencia, caras in resistencias.items():
-    temperaturas[potencia] = {}
-    for cara, R_val in caras.items():
-        T_K = float(spline(R_val))  # Temperatura en Kelvin
-        T_K_redondeada = round(T_K, 1)  # redondear 0.1 K, ejemplo de resolución práctica
-        temperaturas[potencia][cara] = T_K_redondeada
-
-#Resultados
-for potencia, caras in temperaturas.items():
-    print(f"\nTemperaturas para {potencia}:")
-    for cara, T_K in caras.items():
-        print(f"{cara}: {T_K} K")
-
-
-#Resistencias repetibilidad convertidas a Ohms
-repetibilidad = {
-    "R9": R9_repetibilidad*1000,
-    "R7": R7_repetibilidad*1000,
-    "R6": R6_repetibilidad*1000,
-    "R5": R5_repetibilidad*1000,
-}
-
-# Calcular temperaturas de repetibilidad
-temp_repetibilidad = {}
-for potencia, R_val in repetibilidad.items():
-    T_K = float(spline(R_val))
-    temp_repetibilidad[potencia] = round(T_K, 1)
-
-#Resultados
-print("\nTemperaturas de repetibilidad:")
-for potencia, T_K in temp_repetibilidad.items():
-    print(f"{potencia}: {T_K} K")
-
-
-
-#Comparación máxima diferencia spline vs Steinhart-Hart
-diferencias = np.abs(spline(R) - T_fit_SH)
-max_diferencia = np.max(diferencias)
-indice_max = np.argmax(diferencias)
-
-print(f"\nMáxima diferencia entre spline y Steinhart-Hart: {max_diferencia:.3f} K")
-print(f"Se produce en R = {R[indice_max]} Ω, T_spline = {spline(R[indice_max]):.3f} K, T_SH = {T_fit_SH[indice_max]:.3f} K")
-
-#------------------------------------------------------------------------------------------
-
-#------------------------------------------------------------------------------------------
-
-#------------------------------------------------------------------------------------------
+#Mediciones Realizadas
 
-#Organizar mediciones en arrays
+#Etiquetas de los ejes: filas = potencia, columnas = cara del cubo
 potencias = ["R9", "R7", "R6", "R5"]
 caras = ["negra", "blanca", "bruñido", "pulido"]
 
-# Tensiones medidas
-V_medidas = {
-    "R9": [V9_negra, V9_blanca, V9_bruñido, V9_pulido],
-    "R7": [V7_negra, V7_blanca, V7_bruñido, V7_pulido],
-    "R6": [V6_negra, V6_blanca, V6_bruñido, V6_pulido],
-    "R5": [V5_negra, V5_blanca, V5_bruñido, V5_pulido],
-}
-
-# Temperaturas correspondientes (ya calculadas con spline)
-T_medidas = {pot: [temperaturas[pot][c] for c in caras] for pot in potencias}
-
-#V vs T para cada superficie ---
-plt.figure(figsize=(8,6))
-for i, cara in enumerate(caras):
-    T_vals = [T_medidas[pot][i] for pot in potencias]
-    V_vals = [V_medidas[pot][i] for pot in potencias]
-    plt.plot(T_vals, V_vals, "o-", label=f"Cara {cara}")
-plt.xlabel("Temperatura [K]")
-plt.ylabel("Voltaje termopila [mV]")
-plt.title("Señal de radiación vs Temperatura")
-plt.legend()
-plt.grid()
-plt.show()
-
-# Emisividades relativas normalizadas a la cara negra
-plt.figure(figsize=(8,6))
-for pot in potencias:
-    V_vals = np.array(V_medidas[pot])
-    V_norm = V_vals / V_vals[0]  # normalizar respecto a la cara negra
-    # Cambiar R- por P- en etiquetas
-    plt.bar([f"P{pot[-1]}-{c}" for c in caras], V_norm, label=f"P{pot[-1]}")
-plt.axhline(1.0, color="k", linestyle="--", linewidth=0.8)
-plt.xlabel("Potencia asociada")  # nueva etiqueta del eje X
-plt.ylabel("Emisividad relativa (ε/ε_negra)")
-plt.title("Comparación de emisividades relativas")
-plt.xticks(rotation=45)
-plt.ylim(0, 1.1)
-plt.grid(axis="y", linestyle=":")
-plt.legend(title="Nivel de potencia")
-plt.show()
+R_caras = np.array([
+    [2.18, 2.18, 2.18, 2.18],  # Potencia 9
+    [2.75, 2.75, 2.75, 2.75],  # Potencia 7
+    [3.87, 3.87, 3.87, 3.87],  # Potencia 6
+    [6.60, 6.60, 6.60, 6.60],  # Potencia 5
+]) #kOhms
+
+V_caras = np.array([
+    [28.6, 27.9, 8.9, 1.4],    # Potencia 9
+    [25.1, 24.5, 7.8, 1.3],    # Potencia 7
+    [20.8, 20.5, 6.5, 1.2],    # Potencia 6
+    [15.3, 15.1, 4.7, 0.9],    # Potencia 5
+]) #mV
+
+
+def tabla_resultados(mediciones, T_caras, V_prom, emisividades, u_V):
+    """
+    Tabla con una fila por (potencia, cara): R, T, V y emisividad relativa, con
+    sus incertidumbres. u_V es la incertidumbre del voltaje de cada potencia; la
+    de T se propaga desde la resolución del óhmetro con la derivada del spline,
+    el mismo modelo con que se calcularon las temperaturas.
+    """
+    n_potencias, n_caras = T_caras.shape
+    R_kOhm = np.nanmean(mediciones.R_kohm, axis=2)
+    dT_dR = derivada_spline(R_kOhm * 1000)
+
+    tabla = TablaResultados("Experimento 1 - Radiación por cara del cubo")
+    tabla.agregar("potencia", np.repeat(mediciones.potencias, n_caras))
+    tabla.agregar("cara", np.tile(mediciones.caras, n_potencias))
+    tabla.agregar("R", R_kOhm, res_Ohmetro/np.sqrt(12), "kOhms")
+    tabla.agregar("T", T_caras, np.abs(dT_dR) * res_Ohmetro/np.sqrt(12) * 1000, "K")
+    tabla.agregar("V", V_prom, np.repeat(np.broadcast_to(u_V, n_potencias), n_caras), "mV")
+    tabla.agregar("emisividad", emisividades)
+    return tabla
+
+
+def _exportar(tabla, exportar, resumen):
+    with etapa("exportar"):
+        if exportar is not None:
+            tabla.guardar(exportar)
+            print(f"\nTabla de resultados ({tabla.n_filas} filas) guardada en {exportar}")
+            print(tabla.markdown())
+        if resumen is not None:
+            tabla.guardar_resumen(resumen)
+
+
+def ejecutar(graficar=True, exportar=None, resumen=None):
+    """
+    Ejecuta el análisis del Experimento 1 y retorna los resultados principales.
+
+    exportar: archivo .csv, .npz o .fmc donde se escribe la tabla por potencia y
+    cara en lugar de imprimir las temperaturas una a una; resumen: archivo .md o
+    .tex con los valores agregados de la tabla.
+    """
+
+    # Valores ajustados con tus coeficientes
+    with etapa("steinhart"):
+        T_fit_SH = steinhart(R)
+
+    # --- Graficar ---
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp1_spline_vs_steinhart", figsize=(8,5))
+            fig.scatter(R, T_K, label="Datos tabla", color="blue")
+            fig.plot(R, spline(R), "--", label="Spline cúbico", color="green")
+            fig.plot(R, T_fit_SH, label="Steinhart-Hart (coef. dados)", color="red")
+            fig.xlabel("Resistencia [Ω]")
+            fig.ylabel("Temperatura [K]")
+            fig.title("Comparación spline vs Steinhart-Hart")
+            fig.legend()
+            fig.grid()
+            mostrar(fig)
+
+    #------------------------------------------------------------------------------------------
+
+    #Cálculo de incertidumbres
+
+    # -- Por resolución --
+
+    u_res_V = res_Voltimetro / np.sqrt(12)
+    u_res_Ohm = res_Ohmetro / np.sqrt(12)
+
+    # -- Tipo A --
+
+    # Acumuladores en línea: desviación estándar experimental (ddof=1), igual que en el Experimento 2
+    with etapa("u_A"):
+        acum_V9 = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V).agregar_bloque(V9_repetibilidad)
+        acum_V7 = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V).agregar_bloque(V7_repetibilidad)
+        acum_V6 = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V).agregar_bloque(V6_repetibilidad)
+        acum_V5 = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V).agregar_bloque(V5_repetibilidad)
+
+        u_A_V9 = acum_V9.u_A
+        u_A_V7 = acum_V7.u_A
+        u_A_V6 = acum_V6.u_A
+        u_A_V5 = acum_V5.u_A
+
+    #Mostrar Resultados
+    print("Incertidumbre por resolución Voltímetro:", u_res_V, "mV")
+    print("Incertidumbre por resolución Ohmetro:", u_res_Ohm, "kOhms")
+
+    print("Incertidumbre tipo A Potencia 9:", u_A_V9, "mV")
+    print("Incertidumbre tipo A Potencia 7:", u_A_V7, "mV")
+    print("Incertidumbre tipo A Potencia 6:", u_A_V6, "mV")
+    print("Incertidumbre tipo A Potencia 5:", u_A_V5, "mV")
+
+    print("Incertidumbre combinada Potencia 9:", acum_V9.u_combinada, "mV")
+    print("Incertidumbre combinada Potencia 7:", acum_V7.u_combinada, "mV")
+    print("Incertidumbre combinada Potencia 6:", acum_V6.u_combinada, "mV")
+    print("Incertidumbre combinada Potencia 5:", acum_V5.u_combinada, "mV")
+
+    #------------------------------------------------------------------------------------------
+
+    #Conversión Resistencia a Temperatura con resolución considerada
+
+    with etapa("temperaturas"):
+        mediciones = MedicionesRadiacion(potencias, caras, R_caras, V_caras)
+
+        #Calcular temperaturas usando spline sobre todo el array y redondear a 0.1 K (ejemplo de resolución práctica)
+        T_caras, V_prom = mediciones.V_vs_T(modelo="spline", resolucion=0.1)
+        temperaturas = mediciones.como_diccionario(T_caras)
+
+    #Resultados
+    if exportar is None:
+        for potencia, T_pot in temperaturas.items():
+            print(f"\nTemperaturas para {potencia}:")
+            for cara, T_val in T_pot.items():
+                print(f"{cara}: {T_val} K")
+
+
+    #Resistencias repetibilidad convertidas a Ohms
+    repetibilidad = {
+        "R9": R9_repetibilidad*1000,
+        "R7": R7_repetibilidad*1000,
+        "R6": R6_repetibilidad*1000,
+        "R5": R5_repetibilidad*1000,
+    }
+
+    # Calcular temperaturas de repetibilidad
+    with etapa("temperaturas"):
+        T_repetibilidad = convertir_resistencias(list(repetibilidad.values()), modelo="spline", resolucion=0.1)
+        temp_repetibilidad = dict(zip(repetibilidad, T_repetibilidad.tolist()))
+
+    #Resultados
+    print("\nTemperaturas de repetibilidad:")
+    for potencia, T_val in temp_repetibilidad.items():
+        print(f"{potencia}: {T_val} K")
+
+
+
+    #Comparación máxima diferencia spline vs Steinhart-Hart
+    with etapa("desviacion_maxima"):
+        diferencias = np.abs(spline(R) - T_fit_SH)
+        max_diferencia = np.max(diferencias)
+        indice_max = np.argmax(diferencias)
+
+    print(f"\nMáxima diferencia entre spline y Steinhart-Hart: {max_diferencia:.3f} K")
+    print(f"Se produce en R = {R[indice_max]} Ω, T_spline = {spline(R[indice_max]):.3f} K, T_SH = {T_fit_SH[indice_max]:.3f} K")
+
+    #En los nodos el spline es exacto: la búsqueda en grilla densa cubre también los tramos entre nodos
+    with etapa("desviacion_maxima"):
+        t0 = time.perf_counter()
+        busqueda = memoizar("termistor_desviacion_maxima", lambda: buscar_desviacion_maxima(n_puntos=10**6),
+                        R=R, T_K=T_K, coeficientes=(A, B, C), kind="cubic", n_puntos=10**6,
+                        tiempos=("t_grilla", "t_refinamiento"))
+        t_busqueda = time.perf_counter() - t0  # medido en esta ejecución (con caché, solo la lectura)
+    print(f"Máxima diferencia en grilla densa ({busqueda['n_puntos']} puntos): {busqueda['max_desviacion']:.3f} K "
+          f"en R = {busqueda['R_max']:.1f} Ω ({t_busqueda:.2f} s)")
+
+    #Ajuste propio de los coeficientes Steinhart-Hart a partir de la tabla
+    with etapa("ajuste_SH"):
+        ajuste_SH = memoizar("termistor_ajuste_SH", lambda: ajustar_steinhart_lotes(R, T_K), R=R, T_K=T_K)
+    A_fit, B_fit, C_fit = ajuste_SH["coeficientes"][0]
+    print(f"\nCoeficientes ajustados: A = {A_fit:.6e}, B = {B_fit:.6e}, C = {C_fit:.6e}")
+    print(f"Máximo residuo del ajuste en la tabla: {ajuste_SH['max_residuo'][0]:.3f} K")
+
+    #------------------------------------------------------------------------------------------
+
+    reportar_cache()
+
+    emisividades = mediciones.emisividad_relativa(referencia="negra")  # normalizar respecto a la cara negra
+
+    if exportar is not None or resumen is not None:
+        u_V = [acum_V9.u_combinada, acum_V7.u_combinada, acum_V6.u_combinada, acum_V5.u_combinada]
+        _exportar(tabla_resultados(mediciones, T_caras, V_prom, emisividades, u_V), exportar, resumen)
+
+    if graficar:
+        with etapa("graficos"):
+            #V vs T para cada superficie ---
+            fig = Figura("exp1_voltaje_vs_temperatura", figsize=(8,6))
+            for j, cara in enumerate(caras):
+                fig.plot(T_caras[:, j], V_prom[:, j], "o-", label=f"Cara {cara}")
+            fig.xlabel("Temperatura [K]")
+            fig.ylabel("Voltaje termopila [mV]")
+            fig.title("Señal de radiación vs Temperatura")
+            fig.legend()
+            fig.grid()
+            mostrar(fig)
+
+            # Emisividades relativas normalizadas a la cara negra
+            fig = Figura("exp1_emisividades", figsize=(8,6))
+            for pot, V_norm in zip(potencias, emisividades):
+                # Cambiar R- por P- en etiquetas
+                fig.bar([f"P{pot[-1]}-{c}" for c in caras], V_norm, label=f"P{pot[-1]}")
+            fig.axhline(1.0, color="k", linestyle="--", linewidth=0.8)
+            fig.xlabel("Potencia asociada")  # nueva etiqueta del eje X
+            fig.ylabel("Emisividad relativa (ε/ε_negra)")
+            fig.title("Comparación de emisividades relativas")
+            fig.xticks(rotation=45)
+            fig.ylim(0, 1.1)
+            fig.grid(axis="y", linestyle=":")
+            fig.legend(title="Nivel de potencia")
+            mostrar(fig)
+
+        # Guardar las figuras pendientes si se ejecuta sin pantalla (FISMOD_FIGURAS)
+        with etapa("render"):
+            renderizar_pendientes()
+
+    return {
+        "u_A_V": {"R9": u_A_V9, "R7": u_A_V7, "R6": u_A_V6, "R5": u_A_V5},
+        "temperaturas": temperaturas,
+        "temperaturas_repetibilidad": temp_repetibilidad,
+        "emisividades": mediciones.como_diccionario(emisividades),
+        "max_desviacion_spline_SH": busqueda["max_desviacion"],
+        "coeficientes_SH": (A_fit, B_fit, C_fit),
+    }
+
+
+def ejecutar_datos(datos, graficar=True, exportar=None, resumen=None):
+    """
+    Temperaturas y emisividades relativas de otra sesión, a partir de una tabla
+    con una fila por potencia y columnas R_<cara> [kOhms] y V_<cara> [mV] para
+    cada cara del cubo; la columna opcional `potencia` da el nivel de cada fila.
+    exportar y resumen como en ejecutar (sin repeticiones, u(V) es solo la de resolución).
+    """
+    with etapa("temperaturas"):
+        R_tabla = np.column_stack([datos[f"R_{cara}"] for cara in caras])
+        V_tabla = np.column_stack([datos[f"V_{cara}"] for cara in caras])
+        if "potencia" in datos:
+            nombres = [f"R{p:g}" for p in datos["potencia"]]
+        else:
+            nombres = [f"P{i + 1}" for i in range(datos.n_filas)]
+        mediciones = MedicionesRadiacion(nombres, caras, R_tabla, V_tabla)
+
+        T_caras, V_prom = mediciones.V_vs_T(modelo="spline", resolucion=0.1)
+        emisividades = mediciones.emisividad_relativa(referencia="negra")
+        emisividad_media = dict(zip(caras, np.nanmean(emisividades, axis=0).tolist()))
+
+    print(f"Sesión {datos.ruta}: {datos.n_filas} potencias")
+    if exportar is None:
+        for potencia, T_pot in mediciones.como_diccionario(T_caras).items():
+            print(f"{potencia}: " + ", ".join(f"{cara} {T_val} K" for cara, T_val in T_pot.items()))
+    print("Emisividad relativa media: " + ", ".join(f"{cara} {e:.3f}" for cara, e in emisividad_media.items()))
+
+    if exportar is not None or resumen is not None:
+        _exportar(tabla_resultados(mediciones, T_caras, V_prom, emisividades, res_Voltimetro/np.sqrt(12)),
+                  exportar, resumen)
+
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp1_voltaje_vs_temperatura_datos", figsize=(8,6))
+            for j, cara in enumerate(caras):
+                fig.plot(T_caras[:, j], V_prom[:, j], "o-", label=f"Cara {cara}")
+            fig.xlabel("Temperatura [K]")
+            fig.ylabel("Voltaje termopila [mV]")
+            fig.title("Señal de radiación vs Temperatura")
+            fig.legend()
+            fig.grid()
+            mostrar(fig)
+            renderizar_pendientes()
+
+    return {
+        "temperaturas": mediciones.como_diccionario(T_caras),
+        "emisividades": mediciones.como_diccionario(emisividades),
+        "emisividad_media": emisividad_media,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Experimento 1 - Radiación infrarroja y ley de Stefan-Boltzmann")
+    parser.add_argument("--no-plot", action="store_true", help="solo calcula e imprime, sin importar matplotlib")
+    parser.add_argument("--datos", help="archivo .csv/.npy/.npz/.fmc con columnas R_<cara> y V_<cara> por potencia")
+    parser.add_argument("--exportar", help="archivo .csv/.npz/.fmc para la tabla de resultados por potencia y cara")
+    parser.add_argument("--resumen", help="archivo .md/.tex con el resumen agregado de la tabla")
+    args = parser.parse_args(argv)
+    with etapa("Experimento1"):
+        if args.datos:
+            ejecutar_datos(cargar_datos(args.datos), graficar=not args.no_plot, exportar=args.exportar,
+                           resumen=args.resumen)
+        else:
+            ejecutar(graficar=not args.no_plot, exportar=args.exportar, resumen=args.resumen)
+
+
+if __name__ == "__main__":
+    main()
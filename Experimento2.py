@@ -5,92 +5,400 @@ Autor: Mauricio Santibañez
 Descripción: Este código procesa datos experimentales de voltaje medido por un sensor
 de radiación infrarroja frente a una fuente puntual. Genera gráficos de repetibilidad,
 voltaje vs distancia y voltaje vs 1/r², y calcula las incertidumbres asociadas
-a las mediciones y la propagación para 1/r².
+a las mediciones y la propagación para 1/r². Ajusta V = a/r² + b y V = a·r⁻ⁿ + b
+con pesos robustos de Huber (ver ajuste_robusto.py), que restan peso al punto de
+campo cercano a 3 cm. Con --vivo el barrido se grafica a medida que llegan las
+lecturas (simuladas, o las de --datos reproducidas por lotes).
+Uso: python Experimento2.py [--no-plot] [--datos ARCHIVO] [--repetibilidad ARCHIVO]
+     [--vivo [--puntos N] [--tasa HZ]]
 """
 
 
+import argparse
+import time
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+
+from incertidumbre import AcumuladorTipoA, DDOF_TIPO_A
+from datos import cargar_datos, TAM_BLOQUE
+from cache import memoizar, reportar_cache
+from regresion import RegresionIncremental
+from ajuste_robusto import ajustar_inverso_cuadrado, ajustar_potencia
+from instrumentacion import etapa
+from graficos import Figura, GraficoVivo, mostrar, renderizar_pendientes, MAX_PUNTOS, TASA_REDIBUJO
 
 # -----------------------------
 # Datos
 distancias = np.array([3, 3.5, 4, 4.5, 5, 6, 7, 8, 9, 10, 15, 20, 25, 30, 40, 50])
 voltaje = np.array([92.0, 37.2, 29.7, 23.4, 21.0, 15.5, 11.9, 9.0, 7.4, 6.2, 2.8, 1.4, 0.8, 0.4, 0.1, 0])
 
-# 1/r^2
-distancias_inverso = 1 / (distancias**2)
-
 # Repetibilidad (mV)
-repetibilidad = np.array([6.2, 6.5, 6.4, 6.4, 6.4, 6.4, 6.4, 6.6]) 
-
-# -----------------------------
-# Gráfico 1: Repetibilidad 
-plt.figure(figsize=(7,5))
-plt.bar(range(1, len(repetibilidad)+1), repetibilidad, color="skyblue", edgecolor="black", alpha=0.7, label="Mediciones")
-plt.axhline(np.mean(repetibilidad), color="red", linestyle="--", label=f"Media = {np.mean(repetibilidad):.2f} mV")
-plt.title("Repetibilidad de mediciones de voltaje")
-plt.xlabel("Número de medición")
-plt.ylabel("Voltaje [mV]")
-plt.legend()
-plt.grid(True, alpha=0.4)
-plt.show()
-
-# -----------------------------
-# Gráfico 2: Voltaje vs Distancia
-plt.figure(figsize=(7,5))
-plt.plot(distancias, voltaje, "o", label="Datos medidos")
-
-# Interpolación 
-interp = interp1d(distancias, voltaje, kind="cubic")
-x_smooth = np.linspace(min(distancias), max(distancias), 300)
-plt.plot(x_smooth, interp(x_smooth), "-", alpha=0.7)
-
-plt.title("Voltaje medido vs Distancia")
-plt.xlabel("Distancia [cm]")
-plt.ylabel("Voltaje [mV]")
-plt.legend()
-plt.grid(True, alpha=0.4)
-plt.show()
+repetibilidad = np.array([6.2, 6.5, 6.4, 6.4, 6.4, 6.4, 6.4, 6.6])
 
-# -----------------------------
-# Gráfico 3: Voltaje vs 1/r^2 
-plt.figure(figsize=(7,5))
-plt.plot(distancias_inverso, voltaje, "o", label="Datos medidos")
-plt.plot(distancias_inverso, voltaje, "-", color="red", alpha=0.7, label="Conexión de puntos")
-
-plt.title("Voltaje medido vs 1/r²")
-plt.xlabel("1 / Distancia² [1/cm²]")
-plt.ylabel("Voltaje [mV]")
-plt.legend()
-plt.grid(True, alpha=0.4)
-plt.show()
-
-# -----------------------------
-# Cálculo de incertidumbres
 # Definir resolución de voltímetro y huincha
 res_Voltimetro = 0.1  #mV
 res_huincha = 0.1     #cm
 
-# -- Por resolución --
-u_res_V = res_Voltimetro / np.sqrt(12)
-u_res_huincha = res_huincha / np.sqrt(12)
 
-# -- Tipo A --
-n_V = len(repetibilidad)
-std_V = np.std(repetibilidad, ddof=1)
-u_A_V = std_V / np.sqrt(n_V)
+def _interpolar(x):
+    from scipy.interpolate import interp1d
 
-# Mostrar resultados
-print(f"Incertidumbre por resolución Voltímetro: {u_res_V: .2f} mV")
-print(f"Incertidumbre por resolución huincha: {u_res_huincha: .2f} cm")
-print(f"Incertidumbre tipo A Voltaje: {u_A_V: .2f} mV")
-print(f"Incertidumbre combinada: {np.sqrt(u_res_V**2 + u_A_V**2): .2f} mV")
+    return interp1d(distancias, voltaje, kind="cubic")(x)
+
+
+def ejecutar(graficar=True):
+    """Ejecuta el análisis del Experimento 2 y retorna los resultados principales."""
+
+    # 1/r^2
+    with etapa("inverso_cuadrado"):
+        distancias_inverso = 1 / (distancias**2)
+
+    if graficar:
+        with etapa("graficos"):
+            # -----------------------------
+            # Gráfico 1: Repetibilidad
+            fig = Figura("exp2_repetibilidad", figsize=(7,5))
+            fig.bar(range(1, len(repetibilidad)+1), repetibilidad, color="skyblue", edgecolor="black", alpha=0.7, label="Mediciones")
+            fig.axhline(np.mean(repetibilidad), color="red", linestyle="--", label=f"Media = {np.mean(repetibilidad):.2f} mV")
+            fig.title("Repetibilidad de mediciones de voltaje")
+            fig.xlabel("Número de medición")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+            # -----------------------------
+            # Gráfico 2: Voltaje vs Distancia
+            fig = Figura("exp2_voltaje_vs_distancia", figsize=(7,5))
+            fig.plot(distancias, voltaje, "o", label="Datos medidos")
+
+            # Interpolación
+            x_smooth = np.linspace(min(distancias), max(distancias), 300)
+            y_smooth = memoizar("exp2_interpolacion", lambda: _interpolar(x_smooth),
+                                distancias=distancias, voltaje=voltaje, kind="cubic", x=x_smooth)
+            fig.plot(x_smooth, y_smooth, "-", alpha=0.7)
+
+            fig.title("Voltaje medido vs Distancia")
+            fig.xlabel("Distancia [cm]")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+            # -----------------------------
+            # Gráfico 3: Voltaje vs 1/r^2
+            fig = Figura("exp2_voltaje_vs_inverso_cuadrado", figsize=(7,5))
+            fig.plot(distancias_inverso, voltaje, "o", label="Datos medidos")
+            fig.plot(distancias_inverso, voltaje, "-", color="red", alpha=0.7, label="Conexión de puntos")
+
+            fig.title("Voltaje medido vs 1/r²")
+            fig.xlabel("1 / Distancia² [1/cm²]")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+    # -----------------------------
+    # Cálculo de incertidumbres
+
+    # -- Por resolución --
+    u_res_V = res_Voltimetro / np.sqrt(12)
+    u_res_huincha = res_huincha / np.sqrt(12)
+
+    # -- Tipo A --
+    with etapa("u_A"):
+        acum_V = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V).agregar_bloque(repetibilidad)
+        u_A_V = acum_V.u_A
+
+    # Mostrar resultados
+    print(f"Incertidumbre por resolución Voltímetro: {u_res_V: .2f} mV")
+    print(f"Incertidumbre por resolución huincha: {u_res_huincha: .2f} cm")
+    print(f"Incertidumbre tipo A Voltaje: {u_A_V: .2f} mV")
+    print(f"Incertidumbre combinada: {acum_V.u_combinada: .2f} mV")
+
+    # -----------------------------
+    # Incertidumbre representativa para 1/r^2 usando r_media
+    with etapa("u_inverso_cuadrado"):
+        r_media = np.mean(distancias)
+        u_propagacion = np.sqrt(((2 / r_media**3)**2 * u_res_huincha**2))
+
+    print(f"r_media = {r_media:.1f} cm")
+    print(f"Incertidumbre representativa u(1/r^2) = {u_propagacion:.5f} cm^-2")
+
+    # -----------------------------
+    # Ajustes robustos V = a/r² + b y V = a·r⁻ⁿ + b
+    with etapa("ajuste_robusto"):
+        u_V = acum_V.u_combinada
+        inverso = memoizar("exp2_inverso_cuadrado", lambda: ajustar_inverso_cuadrado(distancias, voltaje, u_V),
+                           distancias=distancias, voltaje=voltaje, u_V=u_V)
+        potencia = memoizar("exp2_potencia", lambda: ajustar_potencia(distancias, voltaje, u_V),
+                            distancias=distancias, voltaje=voltaje, u_V=u_V)
+
+    print(f"Ajuste robusto V = a/r² + b: a = {inverso['a'][0]:.1f} ± {inverso['u_a'][0]:.1f} mV·cm², "
+          f"b = {inverso['b'][0]:.2f} ± {inverso['u_b'][0]:.2f} mV")
+    print(f"Ajuste robusto V = a·r⁻ⁿ + b: n = {potencia['n'][0]:.3f} ± {potencia['u_n'][0]:.3f}, "
+          f"a = {potencia['a'][0]:.1f} ± {potencia['u_a'][0]:.1f} mV·cm^n, "
+          f"b = {potencia['b'][0]:.2f} ± {potencia['u_b'][0]:.2f} mV")
+    print(f"Peso de Huber del punto a {distancias[0]:g} cm: {potencia['pesos'][0, 0]:.2f}")
+
+    if graficar:
+        with etapa("graficos"):
+            # -----------------------------
+            # Gráfico 4: Ajustes robustos
+            fig = Figura("exp2_ajuste_robusto", figsize=(7,5))
+            fig.scatter(distancias, voltaje, c=potencia["pesos"][0], cmap="viridis", vmin=0, vmax=1,
+                        edgecolors="black", label="Datos medidos (color = peso de Huber)")
+            r_fino = np.linspace(min(distancias), max(distancias), 300)
+            fig.plot(r_fino, inverso["a"][0] / r_fino**2 + inverso["b"][0], "-", color="red",
+                     label="V = a/r² + b")
+            fig.plot(r_fino, potencia["a"][0] * r_fino**-potencia["n"][0] + potencia["b"][0], "--", color="black",
+                     label=f"V = a·r⁻ⁿ + b, n = {potencia['n'][0]:.2f} ± {potencia['u_n'][0]:.2f}")
+            fig.title("Ajustes robustos del inverso del cuadrado")
+            fig.xlabel("Distancia [cm]")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+    reportar_cache()
+
+    if graficar:
+        # Guardar las figuras pendientes si se ejecuta sin pantalla (FISMOD_FIGURAS)
+        with etapa("render"):
+            renderizar_pendientes()
+
+    return {
+        "u_A_V": u_A_V,
+        "u_combinada_V": acum_V.u_combinada,
+        "r_media": r_media,
+        "u_inverso_cuadrado": u_propagacion,
+        "a_inverso_cuadrado": inverso["a"][0],
+        "u_a_inverso_cuadrado": inverso["u_a"][0],
+        "b_inverso_cuadrado": inverso["b"][0],
+        "exponente": potencia["n"][0],
+        "u_exponente": potencia["u_n"][0],
+    }
+
+
+def ejecutar_datos(datos, repetibilidad_datos=None, graficar=True, tam_bloque=TAM_BLOQUE):
+    """
+    Mismo análisis sobre un barrido en disco con columnas distancias y voltaje
+    (ver datos.cargar_datos) y, opcionalmente, un registro de repetibilidad con
+    una columna de voltajes. Ambos se recorren por bloques de vistas del archivo.
+    El ajuste robusto V = a/r² + b de ejecutar se hace sobre la misma muestra del
+    gráfico (todas las filas si son a lo más MAX_PUNTOS).
+    """
+    u_res_V = res_Voltimetro / np.sqrt(12)
+    u_res_huincha = res_huincha / np.sqrt(12)
+
+    # Muestra para el gráfico y el ajuste robusto: un punto de cada `paso`
+    paso = max(1, -(-datos.n_filas // MAX_PUNTOS))
+    muestra_distancias, muestra_voltaje = [], []
+
+    acum_r = AcumuladorTipoA(ddof=DDOF_TIPO_A)
+    ajuste = RegresionIncremental()  # V = a + b/r²
+    for bloque in datos.bloques(tam_bloque, ("distancias", "voltaje")):
+        with etapa("inverso_cuadrado"):
+            acum_r.agregar_bloque(bloque["distancias"])
+            ajuste.agregar_bloque(1 / bloque["distancias"]**2, bloque["voltaje"])
+        muestra_distancias.append(np.array(bloque["distancias"][::paso]))
+        muestra_voltaje.append(np.array(bloque["voltaje"][::paso]))
+    distancias_muestra = np.concatenate(muestra_distancias)
+    voltaje_muestra = np.concatenate(muestra_voltaje)
+
+    acum_V = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=u_res_V)
+    with etapa("u_A"):
+        if repetibilidad_datos is None:
+            acum_V.agregar_bloque(repetibilidad)
+        else:
+            columna = repetibilidad_datos.nombres[0]
+            for bloque in repetibilidad_datos.bloques(tam_bloque, (columna,)):
+                acum_V.agregar_bloque(bloque[columna])
+
+    print(f"Mediciones del barrido: {datos.n_filas} ({datos.ruta})")
+    print(f"Incertidumbre por resolución Voltímetro: {u_res_V: .2f} mV")
+    print(f"Incertidumbre por resolución huincha: {u_res_huincha: .2f} cm")
+    print(f"Incertidumbre tipo A Voltaje: {acum_V.u_A: .2f} mV ({acum_V.n} lecturas)")
+    print(f"Incertidumbre combinada: {acum_V.u_combinada: .2f} mV")
+
+    r_media = acum_r.media
+    u_propagacion = np.sqrt(((2 / r_media**3)**2 * u_res_huincha**2))
+
+    print(f"r_media = {r_media:.1f} cm")
+    print(f"Incertidumbre representativa u(1/r^2) = {u_propagacion:.5f} cm^-2")
+    print(f"Ajuste V = a + b/r²: b = {ajuste.pendiente:.1f} ± {ajuste.u_pendiente:.1f} mV·cm², "
+          f"a = {ajuste.intercepto:.2f} ± {ajuste.u_intercepto:.2f} mV, R² = {ajuste.r2:.4f}")
+
+    # Ajuste robusto V = a/r² + b, como en ejecutar (necesita al menos 3 puntos)
+    inverso = {"a": [np.nan], "u_a": [np.nan], "b": [np.nan], "u_b": [np.nan]}
+    if distancias_muestra.size > 2:
+        with etapa("ajuste_robusto"):
+            inverso = ajustar_inverso_cuadrado(distancias_muestra, voltaje_muestra, acum_V.u_combinada)
+        print(f"Ajuste robusto V = a/r² + b: a = {inverso['a'][0]:.1f} ± {inverso['u_a'][0]:.1f} mV·cm², "
+              f"b = {inverso['b'][0]:.2f} ± {inverso['u_b'][0]:.2f} mV")
+
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp2_voltaje_vs_distancia_datos", figsize=(7,5))
+            fig.plot(distancias_muestra, voltaje_muestra, ".", markersize=2, label=f"Datos medidos (1 de cada {paso})")
+            fig.title("Voltaje medido vs Distancia")
+            fig.xlabel("Distancia [cm]")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+            fig = Figura("exp2_voltaje_vs_inverso_cuadrado_datos", figsize=(7,5))
+            fig.plot(1 / distancias_muestra**2, voltaje_muestra, ".", markersize=2, label="Datos medidos")
+            fig.title("Voltaje medido vs 1/r²")
+            fig.xlabel("1 / Distancia² [1/cm²]")
+            fig.ylabel("Voltaje [mV]")
+            fig.legend()
+            fig.grid(True, alpha=0.4)
+            mostrar(fig)
+
+            renderizar_pendientes()
+
+    return {
+        "u_A_V": acum_V.u_A,
+        "u_combinada_V": acum_V.u_combinada,
+        "r_media": r_media,
+        "u_inverso_cuadrado": u_propagacion,
+        "pendiente_inverso_cuadrado": ajuste.pendiente,
+        "u_pendiente_inverso_cuadrado": ajuste.u_pendiente,
+        "intercepto_inverso_cuadrado": ajuste.intercepto,
+        "r2_inverso_cuadrado": ajuste.r2,
+        "a_inverso_cuadrado": inverso["a"][0],
+        "u_a_inverso_cuadrado": inverso["u_a"][0],
+        "b_inverso_cuadrado": inverso["b"][0],
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Barrido en vivo
+
+# Lecturas por lote en el modo en vivo (como las entrega la adquisición); --tam-bloque lo cambia
+TAM_LOTE_VIVO = 16
+
+
+def barrido_simulado(n_puntos, tasa=None, tam_lote=TAM_LOTE_VIVO, semilla=0):
+    """
+    Lotes (distancias [cm], voltaje [mV]) de un barrido simulado de 3 a 50 cm con
+    V = a/r² + b (a y b del ajuste robusto de clase), el ruido de la repetibilidad
+    y la resolución del voltímetro. Con tasa [lecturas/s] los lotes se entregan a
+    ese ritmo, como los daría la adquisición.
+    """
+    rng = np.random.default_rng(semilla)
+    ajuste = ajustar_inverso_cuadrado(distancias, voltaje, np.std(repetibilidad, ddof=DDOF_TIPO_A))
+    a, b = ajuste["a"][0], ajuste["b"][0]
+    r = np.linspace(distancias.min(), distancias.max(), n_puntos)
+    t0 = time.perf_counter()
+    for inicio in range(0, n_puntos, tam_lote):
+        r_lote = r[inicio:inicio + tam_lote]
+        V = a / r_lote**2 + b + rng.normal(0, np.std(repetibilidad, ddof=DDOF_TIPO_A), r_lote.size)
+        if tasa:
+            espera = t0 + inicio / tasa - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+        yield r_lote, np.round(V / res_Voltimetro) * res_Voltimetro
+
+
+def ejecutar_vivo(lecturas, graficar=True, tasa_redibujo=TASA_REDIBUJO):
+    """
+    Barrido en curso: `lecturas` entrega lotes (distancias, voltaje) a medida que
+    se miden. El ajuste V = a + b/r² se actualiza solo con cada lote nuevo
+    (RegresionIncremental) y el gráfico agrega los puntos nuevos con blitting, a lo
+    más `tasa_redibujo` veces por segundo (ver graficos.GraficoVivo); las curvas
+    del ajuste se evalúan solo al redibujar.
+    """
+    ajuste = RegresionIncremental()
+    r_min, r_max = np.inf, -np.inf
+
+    if graficar:
+        # Ejes iniciales con el rango del montaje (el de clase): un barrido normal no obliga a redibujar todo
+        limites_V = (-0.05*voltaje.max(), 1.05*voltaje.max())
+        grafico = GraficoVivo("exp2_barrido_vivo", [
+            {"xlabel": "Distancia [cm]", "ylabel": "Voltaje [mV]", "title": "Voltaje vs Distancia (en vivo)",
+             "xlim": (0, 1.05*distancias.max()), "ylim": limites_V},
+            {"xlabel": "1 / Distancia² [1/cm²]", "ylabel": "Voltaje [mV]", "title": "Voltaje vs 1/r² (en vivo)",
+             "xlim": (0, 1.05 / distancias.min()**2), "ylim": limites_V},
+        ], tasa=tasa_redibujo, figsize=(12,5))
+        puntos_r = grafico.serie(0, "o", markersize=3, label="Datos medidos")
+        puntos_inverso = grafico.serie(1, "o", markersize=3, label="Datos medidos")
+        curva_r = grafico.curva(0, "-", color="red", label="Ajuste V = a + b/r²")
+        curva_inverso = grafico.curva(1, "-", color="red", label="Ajuste V = a + b/r²")
+        for eje in grafico.ejes:
+            eje.legend(loc="upper right")
+
+        def actualizar_curvas():
+            if ajuste.n >= 2 and r_max > r_min:
+                r_fino = np.linspace(r_min, r_max, 200)
+                grafico.actualizar_curva(curva_r, r_fino, ajuste.intercepto + ajuste.pendiente / r_fino**2)
+                x = np.array([1 / r_max**2, 1 / r_min**2])
+                grafico.actualizar_curva(curva_inverso, x, ajuste.intercepto + ajuste.pendiente * x)
+
+    t0 = time.perf_counter()
+    for r, V in lecturas:
+        r = np.asarray(r, dtype=float)
+        V = np.asarray(V, dtype=float)
+        with etapa("inverso_cuadrado"):
+            ajuste.agregar_bloque(1 / r**2, V)
+            r_min, r_max = min(r_min, r.min()), max(r_max, r.max())
+        if graficar:
+            with etapa("graficos"):
+                grafico.agregar(puntos_r, r, V)
+                grafico.agregar(puntos_inverso, 1 / r**2, V)
+                if grafico.listo():
+                    actualizar_curvas()
+                    grafico.refrescar()
+    t_total = time.perf_counter() - t0
+
+    print(f"Barrido en vivo: {ajuste.n} lecturas en {t_total:.2f} s ({ajuste.n / t_total:.0f} lecturas/s)")
+    print(f"Ajuste V = a + b/r²: b = {ajuste.pendiente:.1f} ± {ajuste.u_pendiente:.1f} mV·cm², "
+          f"a = {ajuste.intercepto:.2f} ± {ajuste.u_intercepto:.2f} mV, R² = {ajuste.r2:.4f}")
+
+    resultado = {"n": ajuste.n, "lecturas_s": ajuste.n / t_total, "pendiente_inverso_cuadrado": ajuste.pendiente,
+                 "u_pendiente_inverso_cuadrado": ajuste.u_pendiente, "intercepto_inverso_cuadrado": ajuste.intercepto}
+    if graficar:
+        with etapa("graficos"):
+            actualizar_curvas()
+            grafico.cerrar()
+        t = np.array(grafico.t_refrescos)
+        decil = max(1, t.size // 10)
+        print(f"Refrescos: {grafico.redibujos} ({grafico.completos} completos), "
+              f"{t[:decil].mean()*1e3:.2f} ms en promedio el primer 10% y {t[-decil:].mean()*1e3:.2f} ms el último")
+        resultado.update({"refrescos": grafico.redibujos, "completos": grafico.completos, "t_refrescos": t})
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Experimento 2 - Ley del inverso del cuadrado")
+    parser.add_argument("--no-plot", action="store_true", help="solo calcula e imprime, sin importar matplotlib")
+    parser.add_argument("--datos", help="archivo .csv/.npy/.npz/.fmc con columnas distancias y voltaje")
+    parser.add_argument("--repetibilidad", help="archivo con una columna de voltajes de repetibilidad")
+    parser.add_argument("--tam-bloque", type=int,
+                        help=f"filas por bloque al recorrer los archivos (por defecto {TAM_BLOQUE}; "
+                             f"con --vivo, lecturas por lote, por defecto {TAM_LOTE_VIVO})")
+    parser.add_argument("--vivo", action="store_true", help="grafica el barrido a medida que llegan las lecturas")
+    parser.add_argument("--puntos", type=int, default=2000, help="lecturas del barrido simulado (--vivo)")
+    parser.add_argument("--tasa", type=float, default=1000, help="lecturas por segundo en --vivo (0, sin esperar)")
+    args = parser.parse_args(argv)
+    with etapa("Experimento2"):
+        if args.vivo:
+            tam_lote = args.tam_bloque or TAM_LOTE_VIVO
+            if args.datos:
+                lecturas = ((b["distancias"], b["voltaje"]) for b in cargar_datos(args.datos).bloques(tam_lote))
+            else:
+                lecturas = barrido_simulado(args.puntos, args.tasa or None, tam_lote)
+            ejecutar_vivo(lecturas, graficar=not args.no_plot)
+        elif args.datos:
+            repetibilidad_datos = cargar_datos(args.repetibilidad) if args.repetibilidad else None
+            ejecutar_datos(cargar_datos(args.datos), repetibilidad_datos, graficar=not args.no_plot,
+                           tam_bloque=args.tam_bloque or TAM_BLOQUE)
+        else:
+            ejecutar(graficar=not args.no_plot)
 
-# -----------------------------
-# Incertidumbre representativa para 1/r^2 usando r_media
-r_media = np.mean(distancias)
-u_propagacion = np.sqrt(((2 / r_media**3)**2 * u_res_huincha**2))
 
-print(f"r_media = {r_media:.1f} cm")
-print(f"Incertidumbre representativa u(1/r^2) = {u_propagacion:.5f} cm^-2")
+if __name__ == "__main__":
+    main()
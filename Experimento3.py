@@ -9,15 +9,29 @@ Se calcula la radiancia detectada por un sensor de radiación y se compara con l
 cuarta potencia de la temperatura para verificar la ley de Stefan-Boltzmann.
 Se generan gráficos de radiancia vs T^4, se realiza regresión lineal y se
 propagan las incertidumbres asociadas a todas las magnitudes medidas y calculadas.
+Además se ajusta Radiancia = a·(Tⁿ - T_ambⁿ) + b con el exponente libre en una
+grilla (n, T_amb) alrededor de la temperatura ambiente (ver verosimilitud.py).
+Uso: python Experimento3.py [--no-plot] [--datos ARCHIVO] [--exportar TABLA.csv|.npz|.fmc] [--resumen RESUMEN.md|.tex]
+     [--celdas N] [--u-intercepto MV]
 """
 
 
-
+import argparse
+import os
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
-from scipy.stats import linregress
+
+# Tabla del fabricante del filamento de tungsteno
+from tungsteno import R_rel_tabla, Temp_tabla, CalibracionTungsteno
+from montecarlo import propagar_montecarlo
+from verosimilitud import ajustar_exponente, grilla, CELDAS, N_PARAMETROS
+from regresion import ajustar_york, regresion_lineal, RegresionIncremental
+from cache import memoizar, reportar_cache
+from datos import cargar_datos, TAM_BLOQUE
+from exportar import (TablaResultados, EscritorTabla, resumen_markdown, guardar_resumen, EXTENSIONES_TABLA,
+                      EXTENSIONES_BLOQUES, EXTENSIONES_RESUMEN)
+from instrumentacion import etapa
+from graficos import Figura, mostrar, renderizar_pendientes, MAX_PUNTOS
 
 # -----------------------------
 # Datos
@@ -28,160 +42,418 @@ Voltajes = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0])
 Corrientes = np.array([1.18, 1.41, 1.58, 1.75, 1.91, 2.04, 2.17, 2.30, 2.44, 2.55, 2.68])  # A
 Radiancia = np.array([1.8, 3.6, 5.9, 8.6, 11.6, 14.9, 16.8, 20.5, 25.5, 29.0, 32.5])  # mV
 
-# Tabla de conversión manual de usuario
-# Cada fila: [R/R300K, Temp_K, Resistivity_μΩcm]
-data = np.array([
-    [1.00,  300,  5.65],
-    [1.43,  400,  8.06],
-    [1.87,  500, 10.56],
-    [2.34,  600, 13.23],
-    [2.85,  700, 16.09],
-    [3.36,  800, 19.00],
-    [3.88,  900, 21.94],
-    [4.41, 1000, 24.93],
-    [4.95, 1100, 27.94],
-    [5.48, 1200, 30.98],
-    [6.03, 1300, 34.08],
-    [6.58, 1400, 37.19],
-    [7.14, 1500, 40.36],
-    [7.71, 1600, 43.55],
-    [8.28, 1700, 46.78],
-    [8.86, 1800, 50.05],
-    [9.44, 1900, 53.35],
-    [10.03, 2000, 56.67],
-    [10.63, 2100, 60.06],
-    [11.24, 2200, 63.48],
-    [11.84, 2300, 66.91],
-    [12.46, 2400, 70.39],
-    [13.08, 2500, 73.91],
-    [13.72, 2600, 77.49],
-    [14.34, 2700, 81.04],
-    [14.99, 2800, 84.70],
-    [15.63, 2900, 88.33],
-    [16.29, 3000, 92.04],
-    [16.95, 3100, 95.76],
-    [17.62, 3200, 99.54],
-    [18.28, 3300, 103.3],
-    [18.97, 3400, 107.2],
-    [19.66, 3500, 111.1]
-])
+# Resoluciones de los instrumentos
+res_Voltaje = 0.5  # V
+res_Corriente = 0.01  # A
+res_Radiancia = 0.1  # mV
 
-# -----------------------------
-# Cálculo de Resistencias experimentales
-Resistencias = Voltajes / Corrientes  # Ω
 
-print("\n--- Resistencias calculadas ---")
-for V, I, R in zip(Voltajes, Corrientes, Resistencias):
-    print(f"V = {V:2.0f} V, I = {I:4.2f} A  -->  R = {R:5.2f} Ω")
+def tabla_resultados(Voltajes, Corrientes, Resistencias, u_Resistencias, R_rel, Temperaturas, u_T, T_cuarta,
+                     u_T_cuarta, Radiancia):
+    """Tabla con cada magnitud calculada y su incertidumbre, una fila por medición."""
+    tabla = TablaResultados("Experimento 3 - Radiancia vs T^4")
+    tabla.agregar("Voltaje", Voltajes, res_Voltaje/np.sqrt(12), "V")
+    tabla.agregar("Corriente", Corrientes, res_Corriente/np.sqrt(12), "A")
+    tabla.agregar("R", Resistencias, u_Resistencias, "Ω")
+    tabla.agregar("R_rel", R_rel, u_Resistencias / R_ref)
+    tabla.agregar("T", Temperaturas, u_T, "K")
+    tabla.agregar("T4", T_cuarta, u_T_cuarta, "K^4")
+    tabla.agregar("Radiancia", Radiancia, res_Radiancia/np.sqrt(12), "mV")
+    return tabla
 
-# -----------------------------
-# Cálculo de Temperaturas a partir de la resistencia
-R_rel = Resistencias / R_ref
-R_rel_tabla = data[:, 0]
-Temp_tabla = data[:, 1]
 
-interpolador_temp = interp1d(R_rel_tabla, Temp_tabla, kind='cubic', fill_value="extrapolate")
-Temperaturas = interpolador_temp(R_rel)
+def _exponente(Temperaturas, Radiancia, u_T, u_Radiancia, celdas, u_intercepto, graficar):
+    """Ajuste con exponente libre (ver verosimilitud.py): imprime n y, si se pide, grafica su marginal."""
+    if Temperaturas.size <= N_PARAMETROS:
+        print(f"\nExponente libre omitido: {Temperaturas.size} mediciones (se necesitan al menos {N_PARAMETROS + 1})")
+        return None
+    with etapa("exponente"):
+        n_grilla, T_amb_grilla = grilla(celdas, limites_T_amb=(Temperatura_Ambiente - 50, Temperatura_Ambiente + 50),
+                                        b_libre=u_intercepto is None)
+        exponente = memoizar("exp3_exponente",
+                             lambda: ajustar_exponente(Temperaturas, Radiancia, u_T, u_Radiancia, n_grilla,
+                                                       T_amb_grilla, u_intercepto),
+                             Temperaturas=Temperaturas, Radiancia=Radiancia, u_T=u_T,
+                             u_Radiancia=u_Radiancia, exponentes=n_grilla, T_ambientes=T_amb_grilla,
+                             u_intercepto=u_intercepto, tiempos=("t_total",))
+    n = exponente["exponente"]
+    mejor = exponente["mejor"]
+    # Con b libre solo se recorre una T_amb (ver verosimilitud.grilla): se informan las celdas evaluadas
+    print(f"\nExponente libre ({exponente['celdas']} celdas n × T_amb evaluadas de {celdas} pedidas): "
+          f"n = {n['media']:.3f} ± {n['desviacion']:.3f}")
+    print(f"Intervalo 95% de n: [{n['intervalo_95'][0]:.3f}, {n['intervalo_95'][1]:.3f}]")
+    print(f"Mejor celda: a = {mejor['a']:.2e} mV/K^n, b = {mejor['b']:.2f} mV, "
+          f"chi² reducido = {mejor['chi2_reducido']:.2f}")
+    if u_intercepto is not None:
+        T_amb = exponente["T_amb"]
+        print(f"T_amb = {T_amb['media']:.1f} ± {T_amb['desviacion']:.1f} K")
 
-print("\n--- Temperaturas calculadas ---")
-for Rr, T in zip(R_rel, Temperaturas):
-    print(f"R_rel = {Rr:4.2f}  -->  T = {T:6.1f} K")
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp3_exponente", figsize=(8,5))
+            fig.plot(n["valores"], n["densidad"], 'b-', label='Marginal de n')
+            fig.axvspan(*n["intervalo_95"], color='blue', alpha=0.15, label='Intervalo 95%')
+            fig.axvline(4, color='r', linestyle='--', label='Stefan-Boltzmann (n = 4)')
+            fig.xlabel('Exponente n')
+            fig.ylabel('Densidad')
+            fig.title('Radiancia = a(T$^n$ - T$_{amb}^n$) + b: marginal del exponente')
+            fig.grid(True)
+            fig.legend()
+            fig.tight_layout()
+            mostrar(fig)
+    return exponente
 
-# -----------------------------
-# Cálculo de T^4 
-T_cuarta = Temperaturas**4
-print("\n--- Temperaturas a la cuarta potencia ---")
-for T, T4 in zip(Temperaturas, T_cuarta):
-    print(f"T = {T:6.1f} K  -->  T^4 = {T4:10.2e} K^4")
 
-# -----------------------------
-# Gráfico de la tabla de conversión
-plt.figure(figsize=(8,5))
-plt.plot(Temp_tabla, R_rel_tabla, 'b-', label='Tabla de conversión (fabricante)')
-plt.plot(Temperaturas, R_rel, 'ro', label='Mediciones experimentales')
-plt.xlabel('Temperatura (K)')
-plt.ylabel('Resistencia relativa $R/R_{300K}$')
-plt.title('Conversión de Resistencia a Temperatura del Filamento de Tungsteno')
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.xlim(0, 3600)
-plt.show()
+def ejecutar(graficar=True, exportar=None, resumen=None, celdas=CELDAS, u_intercepto=None):
+    """
+    Ejecuta el análisis del Experimento 3 y retorna los resultados principales.
 
-# -----------------------------
-# Cálculo de incertidumbres
-res_Voltaje = 0.5  # V
-res_Corriente = 0.01  # A
-res_Radiancia = 0.1  # mV
+    exportar: archivo .csv, .npz o .fmc donde se escribe la tabla de resultados
+    con sus incertidumbres en lugar de imprimirla fila a fila; resumen: archivo
+    .md o .tex con los valores agregados de la tabla.
+    celdas: tamaño de la grilla (n, T_amb) del ajuste con exponente libre (0 lo omite);
+    u_intercepto: prior gaussiano del intercepto b [mV] (None, libre; ver verosimilitud.py).
+    """
+    imprimir_filas = exportar is None
 
-u_res_Voltaje = res_Voltaje/np.sqrt(12)
-u_res_Corriente = res_Corriente/np.sqrt(12)
-u_res_Radiancia = res_Radiancia/np.sqrt(12)
+    # -----------------------------
+    # Cálculo de Resistencias experimentales
+    with etapa("resistencias"):
+        Resistencias = Voltajes / Corrientes  # Ω
 
-print(f"\nIncertidumbre por resolución Voltímetro Analógico: {u_res_Voltaje: .2f} V")
-print(f"Incertidumbre por resolución Amperímetro: {u_res_Corriente: .3f} A")
-print(f"Incertidumbre por resolución Radiancia: {u_res_Radiancia: .2f} mV")
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Resistencias calculadas ---")
+            for V, I, R in zip(Voltajes, Corrientes, Resistencias):
+                print(f"V = {V:2.0f} V, I = {I:4.2f} A  -->  R = {R:5.2f} Ω")
 
-# -----------------------------
-# Cálculo de incertidumbre de la resistencia
-u_Resistencias = np.sqrt((1/Corrientes * u_res_Voltaje)**2 + ((-Voltajes/(Corrientes**2)) * u_res_Corriente)**2)
+    # -----------------------------
+    # Cálculo de Temperaturas a partir de la resistencia
+    with etapa("temperaturas"):
+        R_rel = Resistencias / R_ref
 
-print("\n--- Incertidumbre de las resistencias ---")
-for R, uR in zip(Resistencias, u_Resistencias):
-    print(f"R = {R:5.2f} Ω  -->  u(R) = {uR:5.3f} Ω")
+        calibracion = CalibracionTungsteno.desde_arrays(**memoizar(
+            "calibracion_tungsteno", lambda: CalibracionTungsteno().como_arrays(), R_rel=R_rel_tabla, T=Temp_tabla, k=3))
+        Temperaturas = calibracion.temperatura(R_rel)
 
-# -----------------------------
-# Incertidumbre de R_rel 
-u_R_rel = u_Resistencias / R_ref
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Temperaturas calculadas ---")
+            for Rr, T in zip(R_rel, Temperaturas):
+                print(f"R_rel = {Rr:4.2f}  -->  T = {T:6.1f} K")
 
-# Derivada de T respecto a R_rel
-dT_dR_rel_tabla = np.gradient(Temp_tabla, R_rel_tabla)
-interpolador_deriv = interp1d(R_rel_tabla, dT_dR_rel_tabla, kind='cubic', fill_value="extrapolate")
-dT_dR_rel = interpolador_deriv(R_rel)
+    # -----------------------------
+    # Cálculo de T^4
+    with etapa("T4"):
+        T_cuarta = Temperaturas**4
 
-# Incertidumbre propagada de la temperatura
-u_T = dT_dR_rel * u_R_rel
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Temperaturas a la cuarta potencia ---")
+            for T, T4 in zip(Temperaturas, T_cuarta):
+                print(f"T = {T:6.1f} K  -->  T^4 = {T4:10.2e} K^4")
 
-print("\n--- Incertidumbre propagada de las temperaturas ---")
-for T, uT in zip(Temperaturas, u_T):
-    print(f"T = {T:6.1f} K  -->  u(T) = {uT:5.2f} K")
+    # -----------------------------
+    # Gráfico de la tabla de conversión
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp3_conversion_tungsteno", figsize=(8,5))
+            fig.plot(Temp_tabla, R_rel_tabla, 'b-', label='Tabla de conversión (fabricante)')
+            fig.plot(Temperaturas, R_rel, 'ro', label='Mediciones experimentales')
+            fig.xlabel('Temperatura (K)')
+            fig.ylabel('Resistencia relativa $R/R_{300K}$')
+            fig.title('Conversión de Resistencia a Temperatura del Filamento de Tungsteno')
+            fig.grid(True)
+            fig.legend()
+            fig.tight_layout()
+            fig.xlim(0, 3600)
+            mostrar(fig)
 
-# Incertidumbre propagada de T^4
-u_T_cuarta = 4 * Temperaturas**3 * u_T
+    # -----------------------------
+    # Cálculo de incertidumbres
+    u_res_Voltaje = res_Voltaje/np.sqrt(12)
+    u_res_Corriente = res_Corriente/np.sqrt(12)
+    u_res_Radiancia = res_Radiancia/np.sqrt(12)
 
-print("\n--- Incertidumbre propagada de T^4 ---")
-for T4_val, uT4 in zip(T_cuarta, u_T_cuarta):
-    print(f"T^4 = {T4_val:10.2e} K^4  -->  u(T^4) = {uT4:10.2e} K^4")
+    print(f"\nIncertidumbre por resolución Voltímetro Analógico: {u_res_Voltaje: .2f} V")
+    print(f"Incertidumbre por resolución Amperímetro: {u_res_Corriente: .3f} A")
+    print(f"Incertidumbre por resolución Radiancia: {u_res_Radiancia: .2f} mV")
 
-# -----------------------------
-# Regresión lineal Rad vs T^4
-slope, intercept, r_value, p_value, std_err = linregress(T_cuarta, Radiancia)
+    # -----------------------------
+    # Cálculo de incertidumbre de la resistencia
+    with etapa("u_R"):
+        u_Resistencias = np.sqrt((1/Corrientes * u_res_Voltaje)**2 + ((-Voltajes/(Corrientes**2)) * u_res_Corriente)**2)
 
-# Factor de cobertura k=2 (98% confianza)
-k = 2
-u_T_cuarta_98 = k * u_T_cuarta
-u_res_Radiancia_98 = k * u_res_Radiancia
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Incertidumbre de las resistencias ---")
+            for R, uR in zip(Resistencias, u_Resistencias):
+                print(f"R = {R:5.2f} Ω  -->  u(R) = {uR:5.3f} Ω")
 
-# -----------------------------
-# Gráfico con línea de ajuste
-plt.figure(figsize=(8,5))
-plt.errorbar(T_cuarta, Radiancia, xerr=u_T_cuarta_98, yerr=u_res_Radiancia_98, fmt='o',
-             color='purple', ecolor='gray', elinewidth=1.5, capsize=3,
-             label='Datos experimentales (98% conf.)')
-
-# Línea de regresión
-T_cuarta_fit = np.linspace(min(T_cuarta), max(T_cuarta), 200)
-Radiancia_fit = slope * T_cuarta_fit + intercept
-plt.plot(T_cuarta_fit, Radiancia_fit, 'r--', label='Ajuste por regresión lineal')
-
-plt.xlabel('$T^4$ (K$^4$)')
-plt.ylabel('Radiancia (mV)')
-plt.title('Radiancia vs $T^4$ del filamento de Tungsteno')
-plt.grid(True)
-plt.legend()
-plt.tight_layout()
-plt.show()
-
-print(f"\nPendiente: {slope:.2e} mV/K^4")
-print(f"Intercepto: {intercept:.2f} mV")
-print(f"R^2: {r_value**2:.4f}")
+    with etapa("u_T"):
+        # -----------------------------
+        # Incertidumbre de R_rel
+        u_R_rel = u_Resistencias / R_ref
+
+        # Derivada de T respecto a R_rel, analítica del mismo spline usado para la temperatura
+        dT_dR_rel = calibracion.derivada(R_rel)
+
+        # Incertidumbre propagada de la temperatura
+        u_T = dT_dR_rel * u_R_rel
+
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Incertidumbre propagada de las temperaturas ---")
+            for T, uT in zip(Temperaturas, u_T):
+                print(f"T = {T:6.1f} K  -->  u(T) = {uT:5.2f} K")
+
+    # Incertidumbre propagada de T^4
+    with etapa("u_T4"):
+        u_T_cuarta = 4 * Temperaturas**3 * u_T
+
+    if imprimir_filas:
+        with etapa("impresion"):
+            print("\n--- Incertidumbre propagada de T^4 ---")
+            for T4_val, uT4 in zip(T_cuarta, u_T_cuarta):
+                print(f"T^4 = {T4_val:10.2e} K^4  -->  u(T^4) = {uT4:10.2e} K^4")
+
+    # -----------------------------
+    # Exportación de la tabla de resultados y del resumen agregado
+    if exportar is not None or resumen is not None:
+        with etapa("exportar"):
+            tabla = tabla_resultados(Voltajes, Corrientes, Resistencias, u_Resistencias, R_rel, Temperaturas, u_T,
+                                     T_cuarta, u_T_cuarta, Radiancia)
+            if exportar is not None:
+                tabla.guardar(exportar)
+                print(f"\nTabla de resultados ({tabla.n_filas} filas) guardada en {exportar}")
+                print(tabla.markdown())
+            if resumen is not None:
+                tabla.guardar_resumen(resumen)
+
+    # -----------------------------
+    # Regresión lineal Rad vs T^4
+    with etapa("ajuste"):
+        slope, intercept, r_value, p_value, std_err = regresion_lineal(T_cuarta, Radiancia)
+
+    # Factor de cobertura k=2 (98% confianza)
+    k = 2
+    u_T_cuarta_98 = k * u_T_cuarta
+    u_res_Radiancia_98 = k * u_res_Radiancia
+
+    # -----------------------------
+    # Gráfico con línea de ajuste
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp3_radiancia_vs_T4", figsize=(8,5))
+            fig.errorbar(T_cuarta, Radiancia, xerr=u_T_cuarta_98, yerr=u_res_Radiancia_98, fmt='o',
+                         color='purple', ecolor='gray', elinewidth=1.5, capsize=3,
+                         label='Datos experimentales (98% conf.)')
+
+            # Línea de regresión
+            T_cuarta_fit = np.linspace(min(T_cuarta), max(T_cuarta), 200)
+            Radiancia_fit = slope * T_cuarta_fit + intercept
+            fig.plot(T_cuarta_fit, Radiancia_fit, 'r--', label='Ajuste por regresión lineal')
+
+            fig.xlabel('$T^4$ (K$^4$)')
+            fig.ylabel('Radiancia (mV)')
+            fig.title('Radiancia vs $T^4$ del filamento de Tungsteno')
+            fig.grid(True)
+            fig.legend()
+            fig.tight_layout()
+            mostrar(fig)
+
+    print(f"\nPendiente: {slope:.2e} mV/K^4")
+    print(f"Intercepto: {intercept:.2f} mV")
+    print(f"R^2: {r_value**2:.4f}")
+
+    # -----------------------------
+    # Ajuste de York: considera u(T^4) y u(Radiancia) a la vez (errores en ambas variables)
+    with etapa("york"):
+        york = memoizar("exp3_york", lambda: ajustar_york(T_cuarta, Radiancia, u_T_cuarta, u_res_Radiancia),
+                        T_cuarta=T_cuarta, Radiancia=Radiancia, u_T_cuarta=u_T_cuarta, u_Radiancia=u_res_Radiancia)
+
+    print(f"\nPendiente York: {york['pendiente'][0]:.2e} ± {york['u_pendiente'][0]:.1e} mV/K^4")
+    print(f"Intercepto York: {york['intercepto'][0]:.2f} ± {york['u_intercepto'][0]:.2f} mV")
+    print(f"Chi² reducido: {york['chi2_reducido'][0]:.2f}")
+
+    # -----------------------------
+    # Propagación por Monte Carlo (GUM Suplemento 1) de la pendiente
+    with etapa("montecarlo"):
+        mc = memoizar("exp3_montecarlo",
+                      lambda: propagar_montecarlo(Voltajes, Corrientes, Radiancia, res_Voltaje, res_Corriente,
+                                                  res_Radiancia, R_ref, n_muestras=10**5, tam_bloque=10**5,
+                                                  semilla=0, calibracion=calibracion),
+                      Voltajes=Voltajes, Corrientes=Corrientes, Radiancia=Radiancia, R_ref=R_ref,
+                      resoluciones=(res_Voltaje, res_Corriente, res_Radiancia), n_muestras=10**5, semilla=0,
+                      calibracion=calibracion.como_arrays(), tam_bloque=10**5, tiempos=("t_total",))
+
+    print(f"\nPendiente Monte Carlo ({mc['n_muestras']} muestras): {mc['pendiente_media']:.2e} ± {mc['u_pendiente']:.1e} mV/K^4")
+    print(f"Intervalo de cobertura 95%: [{mc['intervalo_95'][0]:.2e}, {mc['intervalo_95'][1]:.2e}] mV/K^4")
+
+    # -----------------------------
+    # Exponente libre: Radiancia = a·(T^n - T_amb^n) + b en una grilla (n, T_amb)
+    exponente = None
+    if celdas:
+        exponente = _exponente(Temperaturas, Radiancia, u_T, u_res_Radiancia, celdas, u_intercepto, graficar)
+
+    reportar_cache()
+
+    if graficar:
+        # Guardar las figuras pendientes si se ejecuta sin pantalla (FISMOD_FIGURAS)
+        with etapa("render"):
+            renderizar_pendientes()
+
+    return {
+        "pendiente": slope,
+        "intercepto": intercept,
+        "r2": r_value**2,
+        "std_err": std_err,
+        "pendiente_york": york["pendiente"][0],
+        "u_pendiente_york": york["u_pendiente"][0],
+        "pendiente_montecarlo": mc["pendiente_media"],
+        "u_pendiente_montecarlo": mc["u_pendiente"],
+        "exponente": exponente["exponente"]["media"] if exponente else None,
+        "u_exponente": exponente["exponente"]["desviacion"] if exponente else None,
+        "intervalo_exponente": exponente["exponente"]["intervalo_95"] if exponente else None,
+    }
+
+
+def ejecutar_datos(datos, graficar=True, tam_bloque=TAM_BLOQUE, exportar=None, resumen=None, celdas=CELDAS,
+                   u_intercepto=None):
+    """
+    Regresión Radiancia vs T^4 sobre un registro en disco con columnas Voltajes,
+    Corrientes y Radiancia (ver datos.cargar_datos). El archivo se recorre por
+    bloques de vistas, sin copiarlo completo a memoria.
+
+    exportar: archivo .csv o .fmc donde se escribe, bloque a bloque, la tabla de
+    resultados con sus incertidumbres; resumen: archivo .md o .tex con sus agregados
+    (requiere exportar, el resumen se acumula en la misma pasada).
+    celdas, u_intercepto: ajuste con exponente libre como en ejecutar; con más de
+    MAX_PUNTOS filas se ajusta sobre la misma muestra que se grafica.
+    """
+    calibracion = CalibracionTungsteno()
+    regresion = RegresionIncremental()
+    escritor = None
+    u_res_Voltaje = res_Voltaje/np.sqrt(12)
+    u_res_Corriente = res_Corriente/np.sqrt(12)
+
+    # Para el gráfico y el exponente libre basta una muestra: un punto de cada `paso`
+    paso = max(1, -(-datos.n_filas // MAX_PUNTOS))
+    muestra_T_cuarta, muestra_Radiancia = [], []
+    muestra_T, muestra_u_T = [], []
+    con_incertidumbre = exportar is not None or bool(celdas)
+
+    for bloque in datos.bloques(tam_bloque, ("Voltajes", "Corrientes", "Radiancia")):
+        with etapa("temperaturas"):
+            R_rel = bloque["Voltajes"] / bloque["Corrientes"] / R_ref
+            if not con_incertidumbre:
+                T_cuarta = calibracion.temperatura(R_rel)**4
+            else:
+                Temperaturas, dT_dR_rel = calibracion.evaluar(R_rel)
+                T_cuarta = Temperaturas**4
+                V, I = bloque["Voltajes"], bloque["Corrientes"]
+                u_R = np.sqrt((u_res_Voltaje / I)**2 + (V / I**2 * u_res_Corriente)**2)
+                u_T = dT_dR_rel * u_R / R_ref
+        with etapa("ajuste"):
+            regresion.agregar_bloque(T_cuarta, bloque["Radiancia"])
+        if celdas:
+            muestra_T.append(Temperaturas[::paso])
+            muestra_u_T.append(u_T[::paso])
+        if graficar or celdas:
+            muestra_Radiancia.append(np.array(bloque["Radiancia"][::paso]))
+        if exportar is not None:
+            with etapa("exportar"):
+                tabla = tabla_resultados(V, I, R_rel*R_ref, u_R, R_rel, Temperaturas, u_T, T_cuarta,
+                                         4 * Temperaturas**3 * u_T, bloque["Radiancia"])
+                if escritor is None:
+                    escritor = EscritorTabla(exportar, tabla.columnas, datos.n_filas, tabla.incertidumbres,
+                                             tabla.unidades, tabla.titulo)
+                escritor.escribir(tabla.columnas)
+        if graficar:
+            muestra_T_cuarta.append(T_cuarta[::paso])
+
+    print(f"\n--- Regresión Radiancia vs T^4 ({regresion.n} mediciones de {datos.ruta}) ---")
+    print(f"Pendiente: {regresion.pendiente:.2e} ± {regresion.u_pendiente:.1e} mV/K^4")
+    print(f"Intercepto: {regresion.intercepto:.2f} ± {regresion.u_intercepto:.2f} mV")
+    print(f"R^2: {regresion.r2:.4f}")
+
+    exponente = None
+    if celdas:
+        u_res_Radiancia = res_Radiancia/np.sqrt(12)
+        exponente = _exponente(np.concatenate(muestra_T), np.concatenate(muestra_Radiancia),
+                               np.concatenate(muestra_u_T), u_res_Radiancia, celdas, u_intercepto, graficar)
+
+    if escritor is not None:
+        escritor.cerrar()
+        print(f"\nTabla de resultados ({escritor.escritas} filas) guardada en {exportar}")
+        print(resumen_markdown(escritor.resumen(), escritor.titulo))
+        if resumen is not None:
+            guardar_resumen(escritor.resumen(), resumen, escritor.titulo)
+
+    if graficar:
+        with etapa("graficos"):
+            T_cuarta = np.concatenate(muestra_T_cuarta)
+            fig = Figura("exp3_radiancia_vs_T4_datos", figsize=(8,5))
+            fig.plot(T_cuarta, np.concatenate(muestra_Radiancia), '.', color='purple', markersize=2,
+                     label=f'Mediciones (1 de cada {paso})')
+            T_cuarta_fit = np.linspace(np.nanmin(T_cuarta), np.nanmax(T_cuarta), 200)
+            fig.plot(T_cuarta_fit, regresion.pendiente*T_cuarta_fit + regresion.intercepto, 'r--',
+                     label='Ajuste por regresión lineal')
+            fig.xlabel('$T^4$ (K$^4$)')
+            fig.ylabel('Radiancia (mV)')
+            fig.title('Radiancia vs $T^4$ del filamento de Tungsteno')
+            fig.grid(True)
+            fig.legend()
+            fig.tight_layout()
+            mostrar(fig)
+            renderizar_pendientes()
+
+    return {
+        "pendiente": regresion.pendiente,
+        "intercepto": regresion.intercepto,
+        "r2": regresion.r2,
+        "std_err": regresion.u_pendiente,
+        "u_intercepto": regresion.u_intercepto,
+        "n": regresion.n,
+        "exponente": exponente["exponente"]["media"] if exponente else None,
+        "u_exponente": exponente["exponente"]["desviacion"] if exponente else None,
+        "intervalo_exponente": exponente["exponente"]["intervalo_95"] if exponente else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Experimento 3 - Ley de Stefan-Boltzmann")
+    parser.add_argument("--no-plot", action="store_true", help="solo calcula e imprime, sin importar matplotlib")
+    parser.add_argument("--datos", help="archivo .csv/.npy/.npz/.fmc con columnas Voltajes, Corrientes y Radiancia")
+    parser.add_argument("--tam-bloque", type=int, default=TAM_BLOQUE, help="filas por bloque al recorrer --datos")
+    parser.add_argument("--exportar", help="archivo .csv/.npz/.fmc para la tabla de resultados (con --datos, .csv/.fmc)")
+    parser.add_argument("--resumen", help="archivo .md/.tex con el resumen agregado de la tabla")
+    parser.add_argument("--celdas", type=int, default=CELDAS,
+                        help="celdas de la grilla (n, T_amb) del ajuste con exponente libre (0 lo omite); "
+                             "con b libre se evalúa una sola columna de T_amb (~√(2·celdas) celdas)")
+    parser.add_argument("--u-intercepto", type=float, default=None,
+                        help="prior gaussiano del intercepto b [mV]; sin él, T_amb no queda determinada")
+    args = parser.parse_args(argv)
+
+    # Errores de argumentos antes de recorrer los datos, no al final de la pasada
+    extensiones = EXTENSIONES_BLOQUES if args.datos else EXTENSIONES_TABLA
+    if args.exportar and os.path.splitext(args.exportar)[1].lower() not in extensiones:
+        parser.error(f"--exportar {args.exportar}: use {', '.join(extensiones)}"
+                     + (" (con --datos la tabla se escribe por bloques)" if args.datos else ""))
+    if args.resumen and os.path.splitext(args.resumen)[1].lower() not in EXTENSIONES_RESUMEN:
+        parser.error(f"--resumen {args.resumen}: use {', '.join(EXTENSIONES_RESUMEN)}")
+    if args.datos and args.resumen and not args.exportar:
+        parser.error("con --datos, --resumen requiere --exportar (el resumen se acumula al escribir la tabla)")
+
+    with etapa("Experimento3"):
+        if args.datos:
+            ejecutar_datos(cargar_datos(args.datos), graficar=not args.no_plot, tam_bloque=args.tam_bloque,
+                           exportar=args.exportar, resumen=args.resumen, celdas=args.celdas,
+                           u_intercepto=args.u_intercepto)
+        else:
+            ejecutar(graficar=not args.no_plot, exportar=args.exportar, resumen=args.resumen, celdas=args.celdas,
+                     u_intercepto=args.u_intercepto)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,26 @@ Curso: Física Moderna 2025
 Autor: Mauricio Santibañez
 Descripción: Este código procesa los datos experimentales de desfase temporal (Δt) y distancia recorrida (Δd)
 medidos con un láser, un espejo y un fotoreceptor conectado a un osciloscopio. Realiza un ajuste lineal
-de Δd vs Δt para determinar la velocidad de la luz en el aire, calcula la incertidumbre asociada al 
-valor de c mediante propagación de errores, y genera gráficos que muestran los datos experimentales
+de Δd vs Δt para determinar la velocidad de la luz en el aire, calcula la incertidumbre asociada al
+valor de c mediante propagación de errores y por remuestreo (bootstrap y jackknife), y genera gráficos que muestran los datos experimentales
 y la recta de ajuste correspondiente.
+Los Δt también se pueden obtener de las capturas del osciloscopio (ver retardo.py).
+Con --datos o --capturas el bootstrap se omite salvo que se pida con --remuestreos N.
+Uso: python Experimento4.py [--no-plot] [--datos ARCHIVO] [--remuestreos N] [--procesos P]
+     python Experimento4.py --capturas ARCHIVO --distancias ARCHIVO --muestras L --frecuencia FS [--corte HZ]
 """
 
+import argparse
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import linregress
+
+from regresion import regresion_lineal
+from cache import memoizar, reportar_cache
+from datos import cargar_datos
+from remuestreo import bootstrap_pendiente, jackknife_pendiente
+from retardo import estimar_retardos
+from instrumentacion import etapa
+from graficos import Figura, mostrar, renderizar_pendientes
 
 
 # Datos experimentales
@@ -23,44 +35,145 @@ distancias = np.array([16.82, 17.82, 18.82, 19.82, 20.82, 21.82])
 res_fase = 0.1e-9   # s
 res_huincha = 0.05  # m
 
-# ===============================
-# Incertidumbres 
-u_dt = res_fase / np.sqrt(12)  # s
-u_dd = res_huincha / np.sqrt(12)  # m
+# Remuestreos bootstrap de la pendiente con los datos de clase (con archivos, 0 salvo que se pidan)
+N_REMUESTREOS = 10**5
 
-# ===============================
-# Ajuste lineal 
-slope, intercept, r_value, p_value, std_err = linregress(fases, distancias)
 
-print(f"Pendiente (c) = {slope:.2e} m/s")
-print(f"Intercepto = {intercept:.2f} m")
-print(f"R² = {r_value**2:.4f}")
+def ejecutar(graficar=True, fases=fases, distancias=distancias, n_remuestreos=N_REMUESTREOS, n_procesos=1):
+    """
+    Ejecuta el análisis del Experimento 4 y retorna los resultados principales.
+    Por defecto usa las mediciones de clase; fases [s] y distancias [m] permiten otra sesión.
+    """
 
-# ===============================
-# Propagación de incertidumbre
-d_prom = np.mean(distancias)
-t_prom = np.mean(fases)
+    # ===============================
+    # Incertidumbres
+    u_dt = res_fase / np.sqrt(12)  # s
+    u_dd = res_huincha / np.sqrt(12)  # m
 
-u_c = np.sqrt((u_dd / t_prom) ** 2 + (d_prom * u_dt / t_prom**2) ** 2)
+    # ===============================
+    # Ajuste lineal
+    with etapa("ajuste"):
+        slope, intercept, r_value, p_value, std_err = regresion_lineal(fases, distancias)
 
-print(f"Incertidumbre de c = {u_c:.2e} m/s")
+    print(f"Pendiente (c) = {slope:.2e} m/s")
+    print(f"Intercepto = {intercept:.2f} m")
+    print(f"R² = {r_value**2:.4f}")
 
-# ===============================
-# Gráfico
-plt.figure(figsize=(8, 5))
-plt.scatter(fases * 1e9, distancias, color='blue', label='Datos experimentales')
-plt.plot(
-    fases * 1e9,
-    slope * fases + intercept,
-    color='red',
-    label=(f"Ajuste lineal:\n"
-           f"Δd = {slope:.2e}Δt + {intercept:.2f}\n"
-           f"c = ({slope:.2e} ± {u_c:.2e}) m/s")
-)
-
-plt.xlabel("Δt (ns)")
-plt.ylabel("Δd (m)")
-plt.title("Medición de la velocidad de la luz")
-plt.legend()
-plt.grid(True)
-plt.show()
+    # ===============================
+    # Propagación de incertidumbre
+    with etapa("u_c"):
+        d_prom = np.mean(distancias)
+        t_prom = np.mean(fases)
+
+        u_c = np.sqrt((u_dd / t_prom) ** 2 + (d_prom * u_dt / t_prom**2) ** 2)
+
+    print(f"Incertidumbre de c = {u_c:.2e} m/s")
+    print(f"Error estándar del ajuste = {std_err:.2e} m/s")
+
+    # ===============================
+    # Remuestreo: incertidumbre de c por la dispersión de los puntos
+    # (n_remuestreos = 0 omite el bootstrap)
+    boot = {"u_pendiente": np.nan, "intervalo_bca": (np.nan, np.nan)}
+    if n_remuestreos > 0:
+        with etapa("bootstrap"):
+            boot = memoizar("exp4_bootstrap",
+                            lambda: bootstrap_pendiente(fases, distancias, n_remuestreos, n_procesos=n_procesos,
+                                                        semilla=0),
+                            fases=fases, distancias=distancias, n_remuestreos=n_remuestreos, tiempos=("t_total",))
+        print(f"Bootstrap ({n_remuestreos} remuestreos): u_c = {boot['u_pendiente']:.2e} m/s, "
+              f"IC 95% BCa = [{boot['intervalo_bca'][0]:.3e}, {boot['intervalo_bca'][1]:.3e}] m/s")
+    with etapa("jackknife"):
+        jack = jackknife_pendiente(fases, distancias)
+    print(f"Jackknife: u_c = {jack['u_pendiente']:.2e} m/s, "
+          f"IC 95% = [{jack['intervalo'][0]:.3e}, {jack['intervalo'][1]:.3e}] m/s")
+
+    # ===============================
+    # Gráfico
+    if graficar:
+        with etapa("graficos"):
+            fig = Figura("exp4_velocidad_luz", figsize=(8, 5))
+            fig.scatter(fases * 1e9, distancias, color='blue', label='Datos experimentales')
+            fig.plot(
+                fases * 1e9,
+                slope * fases + intercept,
+                color='red',
+                label=(f"Ajuste lineal:\n"
+                       f"Δd = {slope:.2e}Δt + {intercept:.2f}\n"
+                       f"c = ({slope:.2e} ± {u_c:.2e}) m/s")
+            )
+
+            fig.xlabel("Δt (ns)")
+            fig.ylabel("Δd (m)")
+            fig.title("Medición de la velocidad de la luz")
+            fig.legend()
+            fig.grid(True)
+            mostrar(fig)
+
+        # Guardar las figuras pendientes si se ejecuta sin pantalla (FISMOD_FIGURAS)
+        with etapa("render"):
+            renderizar_pendientes()
+
+    reportar_cache()
+
+    return {"c": slope, "u_c": u_c, "intercepto": intercept, "r2": r_value**2, "std_err": std_err,
+            "u_c_bootstrap": boot["u_pendiente"], "intervalo_c_bootstrap": boot["intervalo_bca"],
+            "u_c_jackknife": jack["u_pendiente"], "intervalo_c_jackknife": jack["intervalo"]}
+
+
+def ejecutar_datos(datos, graficar=True, n_remuestreos=0, n_procesos=1):
+    """
+    Mismo análisis con las columnas fases [s] y distancias [m] de un archivo (ver
+    datos.cargar_datos). El bootstrap se omite salvo que se pidan n_remuestreos.
+    """
+    return ejecutar(graficar, np.asarray(datos["fases"], dtype=float), np.asarray(datos["distancias"], dtype=float),
+                    n_remuestreos, n_procesos)
+
+
+def ejecutar_capturas(capturas, distancias, muestras_por_captura, frecuencia_muestreo, frecuencia_corte=None,
+                      graficar=True, n_remuestreos=0, n_procesos=1):
+    """
+    Mismo análisis con los Δt estimados por correlación cruzada de las capturas del
+    osciloscopio (ConjuntoDatos con columnas referencia y senal, una captura por
+    posición del espejo) y las distancias [m] de cada captura.
+    """
+    with etapa("retardos"):
+        fases = estimar_retardos(capturas, muestras_por_captura, frecuencia_muestreo,
+                                 frecuencia_corte=frecuencia_corte)
+    distancias = np.asarray(distancias, dtype=float)
+    if distancias.size != fases.size:
+        raise ValueError(f"{fases.size} capturas y {distancias.size} distancias")
+    print(f"Δt de {fases.size} capturas por correlación cruzada")
+    return ejecutar(graficar, fases, distancias, n_remuestreos, n_procesos)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Experimento 4 - Velocidad de la luz en el aire")
+    parser.add_argument("--no-plot", action="store_true", help="solo calcula e imprime, sin importar matplotlib")
+    parser.add_argument("--datos", help="archivo .csv/.npy/.npz/.fmc con columnas fases y distancias")
+    parser.add_argument("--remuestreos", type=int,
+                        help=f"remuestreos bootstrap de c (0 lo omite; por defecto {N_REMUESTREOS} con los datos "
+                             "de clase y 0 con --datos o --capturas)")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos para el bootstrap")
+    parser.add_argument("--capturas", help="archivo de capturas del osciloscopio (columnas referencia y senal)")
+    parser.add_argument("--distancias", help="archivo con la columna distancias [m], una por captura")
+    parser.add_argument("--muestras", type=int, help="muestras por captura")
+    parser.add_argument("--frecuencia", type=float, help="frecuencia de muestreo del osciloscopio [Hz]")
+    parser.add_argument("--corte", type=float, help="frecuencia de corte del pasa bajos [Hz] para los retardos")
+    args = parser.parse_args(argv)
+    if args.capturas and not (args.distancias and args.muestras and args.frecuencia):
+        parser.error("--capturas requiere --distancias, --muestras y --frecuencia")
+    if args.remuestreos is None:
+        args.remuestreos = 0 if args.capturas or args.datos else N_REMUESTREOS
+    with etapa("Experimento4"):
+        if args.capturas:
+            ejecutar_capturas(cargar_datos(args.capturas), cargar_datos(args.distancias)["distancias"],
+                              args.muestras, args.frecuencia, args.corte, not args.no_plot,
+                              args.remuestreos, args.procesos)
+        elif args.datos:
+            ejecutar_datos(cargar_datos(args.datos), not args.no_plot, args.remuestreos, args.procesos)
+        else:
+            ejecutar(not args.no_plot, n_remuestreos=args.remuestreos, n_procesos=args.procesos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""
+Adquisición - Lectura concurrente de los instrumentos del laboratorio con asyncio
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo consulta a la vez el voltímetro, el ohmímetro, el
+amperímetro, la termopila y el osciloscopio, y deja sus lecturas en buffers
+circulares de NumPy de tamaño fijo. Cada cierto tiempo los consumidores toman
+las lecturas nuevas de cada buffer como un lote y las pasan al código de
+conversión y ajuste de los experimentos (R → T del termistor, cadena V/I → T⁴ del
+tungsteno, regresión incremental de Radiancia vs T⁴ y de Δd vs Δt).
+
+Los instrumentos se comunican por sockets TCP locales con un protocolo al estilo
+SCPI: "*IDN?" responde el nombre y "LEER?" las lecturas acumuladas desde la
+consulta anterior como un bloque binario de largo definido ("#8" + largo en 8
+dígitos + pares float64 (tiempo, valor)). Se incluyen instrumentos simulados
+que generan lecturas coherentes con los datos de clase, en el mismo proceso o
+en uno aparte. Se mide la tasa sostenida de lecturas y la latencia de extremo a
+extremo (desde que el instrumento genera la lectura hasta que su lote fue
+procesado); los tiempos usan time.perf_counter, que en Linux es el reloj
+monotónico del sistema y sirve entre procesos.
+Uso: python adquisicion.py [--duracion S] [--tasa HZ] [--sondeo S] [--simulador-aparte]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import numpy as np
+
+# Columnas de los buffers: tiempo de generación, valor y tiempo de recepción
+COLUMNAS = ("t", "valor", "t_recepcion")
+
+
+class BufferCircular:
+    """
+    Últimas `capacidad` lecturas en un array (capacidad, 3) de tamaño fijo.
+
+    escribir() agrega un lote (sobrescribiendo lo más antiguo) y leer() entrega
+    como copia todo lo escrito desde la lectura anterior. Si el lector se atrasa
+    más que la capacidad, las lecturas sobrescritas se cuentan en `perdidos`.
+    """
+
+    def __init__(self, capacidad=2**16, n_columnas=len(COLUMNAS)):
+        self.capacidad = capacidad
+        self.datos = np.empty((capacidad, n_columnas))
+        self.escritos = 0
+        self.leidos = 0
+        self.perdidos = 0
+
+    def __len__(self):
+        return min(self.escritos, self.capacidad)
+
+    def _copiar_en(self, inicio, bloque):
+        i = inicio % self.capacidad
+        primero = min(len(bloque), self.capacidad - i)
+        self.datos[i:i + primero] = bloque[:primero]
+        self.datos[:len(bloque) - primero] = bloque[primero:]
+
+    def _copiar_desde(self, inicio, n):
+        i = inicio % self.capacidad
+        primero = min(n, self.capacidad - i)
+        return np.concatenate([self.datos[i:i + primero], self.datos[:n - primero]])
+
+    def escribir(self, bloque):
+        bloque = np.asarray(bloque, dtype=float).reshape(-1, self.datos.shape[1])
+        if len(bloque) > self.capacidad:
+            self.escritos += len(bloque) - self.capacidad
+            bloque = bloque[-self.capacidad:]
+        self._copiar_en(self.escritos, bloque)
+        self.escritos += len(bloque)
+
+    def leer(self):
+        """Lecturas nuevas desde la última llamada, de forma (n, n_columnas)."""
+        if self.escritos - self.leidos > self.capacidad:
+            self.perdidos += self.escritos - self.leidos - self.capacidad
+            self.leidos = self.escritos - self.capacidad
+        n = self.escritos - self.leidos
+        lote = self._copiar_desde(self.leidos, n)
+        self.leidos = self.escritos
+        return lote
+
+    def ultimos(self, n):
+        """Las últimas n lecturas (sin marcarlas como leídas)."""
+        n = min(n, len(self))
+        return self._copiar_desde(self.escritos - n, n)
+
+
+#------------------------------------------------------------------------------------------
+
+#Escenario simulado: un barrido de cada experimento que se repite en el tiempo
+
+PASO_TUNGSTENO = 0.2  # s por voltaje de la fuente (Experimento 3)
+PASO_ESPEJO = 0.2     # s por posición del espejo (Experimento 4)
+PERIODO_CUBO = 2.0    # s por ciclo de calentamiento del cubo (Experimento 1)
+
+
+def _datos_clase():
+    from Experimento1 import R_caras
+    from Experimento3 import Voltajes, Corrientes, Radiancia
+    from Experimento4 import distancias
+    return R_caras[:, 0], Voltajes, Corrientes, Radiancia, distancias
+
+
+def posicion_espejo(t, distancias):
+    """Distancia [m] del espejo en el instante t: recorre las posiciones comandadas `distancias`."""
+    return distancias[(np.asarray(t) // PASO_ESPEJO).astype(int) % distancias.size]
+
+
+def _cuantizar(x, resolucion):
+    return np.round(x / resolucion) * resolucion
+
+
+def _generadores():
+    # nombre: función (t, rng) -> lecturas, con ruido y la resolución de cada instrumento
+    R_cubo, Voltajes, Corrientes, Radiancia, distancias = _datos_clase()
+
+    def paso(t):
+        return (t // PASO_TUNGSTENO).astype(int) % Voltajes.size
+
+    def voltimetro(t, rng):
+        return _cuantizar(Voltajes[paso(t)] + rng.normal(0, 0.05, t.size), 0.5)
+
+    def amperimetro(t, rng):
+        return _cuantizar(Corrientes[paso(t)] + rng.normal(0, 0.003, t.size), 0.01)
+
+    def termopila(t, rng):
+        return _cuantizar(Radiancia[paso(t)] + rng.normal(0, 0.05, t.size), 0.1)
+
+    def ohmimetro(t, rng):
+        # El cubo se calienta y enfría entre las resistencias medidas con la potencia 9 y la 5
+        fase = 0.5 - 0.5*np.cos(2*np.pi*t / PERIODO_CUBO)
+        R = np.exp(np.log(R_cubo.max()) + fase*(np.log(R_cubo.min()) - np.log(R_cubo.max())))
+        return _cuantizar(R + rng.normal(0, 0.005, t.size), 0.01)
+
+    def osciloscopio(t, rng):
+        d = distancias[(t // PASO_ESPEJO).astype(int) % distancias.size]
+        return _cuantizar((d + 28.6) / 2.19e8 + rng.normal(0, 0.3e-9, t.size), 0.1e-9)
+
+    return {"voltimetro": voltimetro, "amperimetro": amperimetro, "termopila": termopila,
+            "ohmimetro": ohmimetro, "osciloscopio": osciloscopio}
+
+
+INSTRUMENTOS = ("voltimetro", "amperimetro", "termopila", "ohmimetro", "osciloscopio")
+
+
+class InstrumentoSimulado:
+    """
+    Servidor TCP local que simula un instrumento que mide a `tasa` lecturas por segundo.
+    Cada "LEER?" entrega las lecturas generadas desde la consulta anterior (a lo más `max_lote`).
+    """
+
+    def __init__(self, nombre, tasa=4000, semilla=None, max_lote=2**16):
+        self.nombre = nombre
+        self.tasa = tasa
+        self.max_lote = max_lote
+        self.generar = _generadores()[nombre]
+        self.rng = np.random.default_rng(semilla)
+        self.servidor = None
+        self.puerto = None
+
+    async def iniciar(self, host="127.0.0.1", puerto=0):
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    async def cerrar(self):
+        self.servidor.close()
+        await self.servidor.wait_closed()
+
+    async def _atender(self, lector, escritor):
+        t_inicio = time.perf_counter()
+        enviados = 0
+        try:
+            while True:
+                comando = (await lector.readline()).strip()
+                if not comando:
+                    break
+                if comando == b"*IDN?":
+                    escritor.write(f"FISMOD,{self.nombre},SIM\n".encode())
+                elif comando == b"LEER?":
+                    disponibles = int((time.perf_counter() - t_inicio) * self.tasa) - enviados
+                    n = max(0, min(disponibles, self.max_lote))
+                    t = t_inicio + (enviados + np.arange(n)) / self.tasa
+                    enviados += n
+                    carga = np.column_stack([t, self.generar(t, self.rng)]).tobytes()
+                    escritor.write(b"#8" + f"{len(carga):08d}".encode() + carga)
+                else:
+                    escritor.write(b"ERROR\n")
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+
+async def iniciar_simuladores(tasa=4000, semilla=0, nombres=INSTRUMENTOS):
+    """Inicia un instrumento simulado por nombre; retorna la lista de instrumentos y {nombre: (host, puerto)}."""
+    semillas = np.random.SeedSequence(semilla).spawn(len(nombres))
+    instrumentos = [InstrumentoSimulado(nombre, tasa, s) for nombre, s in zip(nombres, semillas)]
+    direcciones = {}
+    for instrumento in instrumentos:
+        direcciones[instrumento.nombre] = ("127.0.0.1", await instrumento.iniciar())
+    return instrumentos, direcciones
+
+
+def _proceso_simulador(conexion, tasa, semilla):
+    # Simuladores en otro proceso: envía las direcciones y atiende hasta recibir algo por la tubería
+    async def servir():
+        instrumentos, direcciones = await iniciar_simuladores(tasa, semilla)
+        conexion.send(direcciones)
+        await asyncio.get_running_loop().run_in_executor(None, conexion.recv)
+        for instrumento in instrumentos:
+            await instrumento.cerrar()
+
+    asyncio.run(servir())
+
+
+#------------------------------------------------------------------------------------------
+
+#Consumidores: conversión y ajustes de los experimentos sobre cada lote
+
+class ConsumidorTungsteno:
+    """
+    Experimento 3 en vivo: empareja las lecturas de voltímetro y amperímetro con las
+    de la termopila (interpolando en el tiempo), convierte V/I → T → T⁴ y actualiza
+    la regresión incremental de Radiancia vs T⁴.
+    """
+
+    nombres = ("voltimetro", "amperimetro", "termopila")
+
+    def __init__(self):
+        from Experimento3 import R_ref
+        from regresion import RegresionIncremental
+        from tungsteno import CalibracionTungsteno
+
+        self.R_ref = R_ref
+        self.calibracion = CalibracionTungsteno()
+        self.ajuste = RegresionIncremental()
+        self.V = np.empty((0, 2))
+        self.I = np.empty((0, 2))
+        self.pendientes = np.empty((0, 2))  # radiancias que aún no tienen V e I posteriores
+
+    @staticmethod
+    def _desde(lecturas, t):
+        # Lecturas desde la última anterior o igual a t (la última de todas si t = inf)
+        return lecturas[max(np.searchsorted(lecturas[:, 0], t, side="right") - 1, 0):]
+
+    def procesar(self, lotes):
+        # Se conservan las lecturas de V e I que aún pueden emparejarse con radiancias pendientes
+        self.V = np.concatenate([self.V, lotes["voltimetro"][:, :2]])
+        self.I = np.concatenate([self.I, lotes["amperimetro"][:, :2]])
+        Rad = np.concatenate([self.pendientes, lotes["termopila"][:, :2]])
+        if len(self.V) < 2 or len(self.I) < 2:
+            self.pendientes = Rad
+            return
+        t_min = max(self.V[0, 0], self.I[0, 0])
+        t_max = min(self.V[-1, 0], self.I[-1, 0])
+        listos = (Rad[:, 0] >= t_min) & (Rad[:, 0] <= t_max)
+        self.pendientes = Rad[Rad[:, 0] > t_max]
+        t = Rad[listos, 0]
+        # Lectura anterior más cercana: los valores de la fuente cambian por escalones
+        V = self.V[np.searchsorted(self.V[:, 0], t, side="right") - 1, 1]
+        I = self.I[np.searchsorted(self.I[:, 0], t, side="right") - 1, 1]
+        T = self.calibracion.temperatura(V / I / self.R_ref)
+        self.ajuste.agregar_bloque(T**4, Rad[listos, 1])
+        t_pendiente = self.pendientes[0, 0] if len(self.pendientes) else np.inf
+        self.V = self._desde(self.V, t_pendiente)
+        self.I = self._desde(self.I, t_pendiente)
+
+    def resumen(self):
+        return (f"Radiancia vs T⁴: pendiente = {self.ajuste.pendiente:.3e} ± {self.ajuste.u_pendiente:.1e} "
+                f"mV/K⁴ ({self.ajuste.n} puntos)")
+
+
+class ConsumidorTermistor:
+    """Experimento 1 en vivo: R del ohmímetro → T con el spline del termistor, con la T actual y su rango."""
+
+    nombres = ("ohmimetro",)
+
+    def __init__(self):
+        from incertidumbre import AcumuladorTipoA, DDOF_TIPO_A
+
+        self.temperaturas = AcumuladorTipoA(ddof=DDOF_TIPO_A)
+        self.T_actual = np.nan
+        self.T_min, self.T_max = np.inf, -np.inf
+
+    def procesar(self, lotes):
+        from termistor import convertir_resistencias
+
+        R = lotes["ohmimetro"][:, 1]
+        if R.size == 0:
+            return
+        T = convertir_resistencias(R, unidad="kohm")
+        T = T[np.isfinite(T)]
+        if T.size:
+            self.temperaturas.agregar_bloque(T)
+            self.T_actual = T[-1]
+            self.T_min, self.T_max = min(self.T_min, T.min()), max(self.T_max, T.max())
+
+    def resumen(self):
+        return (f"Termistor: T actual = {self.T_actual:.1f} K, rango {self.T_min:.1f}-{self.T_max:.1f} K "
+                f"({self.temperaturas.n} lecturas)")
+
+
+class ConsumidorLuz:
+    """Experimento 4 en vivo: Δt del osciloscopio contra la posición comandada del espejo → c."""
+
+    nombres = ("osciloscopio",)
+
+    def __init__(self):
+        from regresion import RegresionIncremental
+
+        self.ajuste = RegresionIncremental()
+        self.distancias = _datos_clase()[4]  # posiciones comandadas, las de clase
+
+    def procesar(self, lotes):
+        lote = lotes["osciloscopio"]
+        self.ajuste.agregar_bloque(lote[:, 1], posicion_espejo(lote[:, 0], self.distancias))
+
+    def resumen(self):
+        return f"Δd vs Δt: c = {self.ajuste.pendiente:.4e} ± {self.ajuste.u_pendiente:.1e} m/s ({self.ajuste.n} puntos)"
+
+
+#------------------------------------------------------------------------------------------
+
+#Adquisición
+
+class Adquisicion:
+    """
+    Consulta concurrentemente los instrumentos en `direcciones` ({nombre: (host, puerto)})
+    cada `periodo_sondeo` segundos y entrega lotes a los consumidores cada `periodo_consumo`.
+    """
+
+    def __init__(self, direcciones, capacidad=2**16, periodo_sondeo=0.005, periodo_consumo=0.02,
+                 capacidad_latencias=2**20):
+        self.direcciones = dict(direcciones)
+        self.buffers = {nombre: BufferCircular(capacidad) for nombre in self.direcciones}
+        self.periodo_sondeo = periodo_sondeo
+        self.periodo_consumo = periodo_consumo
+        self.latencias = BufferCircular(capacidad_latencias, 1)
+        self.consumidos = {nombre: 0 for nombre in self.direcciones}
+        self.identificaciones = {}
+        self._activo = False
+
+    async def _consultar(self, lector, escritor):
+        escritor.write(b"LEER?\n")
+        await escritor.drain()
+        encabezado = await lector.readexactly(2)
+        if encabezado != b"#8":
+            raise ValueError(f"Respuesta inesperada del instrumento: {encabezado!r}")
+        largo = int(await lector.readexactly(8))
+        return np.frombuffer(await lector.readexactly(largo), dtype=float).reshape(-1, 2)
+
+    async def _sondear(self, nombre):
+        lector, escritor = await asyncio.open_connection(*self.direcciones[nombre])
+        escritor.write(b"*IDN?\n")
+        self.identificaciones[nombre] = (await lector.readline()).decode().strip()
+        buffer = self.buffers[nombre]
+        try:
+            while self._activo:
+                lecturas = await self._consultar(lector, escritor)
+                if len(lecturas):
+                    lote = np.empty((len(lecturas), 3))
+                    lote[:, :2] = lecturas
+                    lote[:, 2] = time.perf_counter()
+                    buffer.escribir(lote)
+                await asyncio.sleep(self.periodo_sondeo)
+        finally:
+            escritor.close()
+
+    def consumir(self, consumidores):
+        """Entrega las lecturas nuevas a los consumidores y registra la latencia de cada lectura."""
+        lotes = {nombre: buffer.leer() for nombre, buffer in self.buffers.items()}
+        for consumidor in consumidores:
+            consumidor.procesar({nombre: lotes[nombre] for nombre in consumidor.nombres})
+        t_fin = time.perf_counter()
+        for nombre, lote in lotes.items():
+            self.consumidos[nombre] += len(lote)
+            if len(lote):
+                self.latencias.escribir(t_fin - lote[:, 0])
+
+    async def _consumir(self, consumidores):
+        while self._activo:
+            await asyncio.sleep(self.periodo_consumo)
+            self.consumir(consumidores)
+
+    async def ejecutar(self, duracion, consumidores=()):
+        """Adquiere durante `duracion` segundos y retorna las estadísticas de tasa y latencia."""
+        self._activo = True
+        t0 = time.perf_counter()
+        tareas = [asyncio.create_task(self._sondear(nombre)) for nombre in self.direcciones]
+        tareas.append(asyncio.create_task(self._consumir(consumidores)))
+        await asyncio.sleep(duracion)
+        self._activo = False
+        await asyncio.gather(*tareas)
+        self.consumir(consumidores)
+        return self.estadisticas(time.perf_counter() - t0)
+
+    def estadisticas(self, t_total):
+        latencias = self.latencias.ultimos(self.latencias.capacidad)[:, 0]
+        return {
+            "t_total_s": t_total,
+            "tasa_por_instrumento": {nombre: n / t_total for nombre, n in self.consumidos.items()},
+            "tasa_total": sum(self.consumidos.values()) / t_total,
+            "perdidos": {nombre: buffer.perdidos for nombre, buffer in self.buffers.items()},
+            "latencia_p50_s": float(np.percentile(latencias, 50)) if latencias.size else np.nan,
+            "latencia_p99_s": float(np.percentile(latencias, 99)) if latencias.size else np.nan,
+            "latencia_max_s": float(latencias.max()) if latencias.size else np.nan,
+        }
+
+
+async def adquirir_simulado(duracion=5.0, tasa=4000, periodo_sondeo=0.005, periodo_consumo=0.02,
+                            simulador_aparte=False, semilla=0):
+    """Adquisición con los cinco instrumentos simulados y los consumidores de los Experimentos 1, 3 y 4."""
+    consumidores = [ConsumidorTungsteno(), ConsumidorTermistor(), ConsumidorLuz()]
+    if simulador_aparte:
+        conexion, conexion_hijo = multiprocessing.Pipe()
+        proceso = multiprocessing.Process(target=_proceso_simulador, args=(conexion_hijo, tasa, semilla))
+        proceso.start()
+        direcciones = await asyncio.get_running_loop().run_in_executor(None, conexion.recv)
+        instrumentos = []
+    else:
+        instrumentos, direcciones = await iniciar_simuladores(tasa, semilla)
+
+    adquisicion = Adquisicion(direcciones, periodo_sondeo=periodo_sondeo, periodo_consumo=periodo_consumo)
+    try:
+        estadisticas = await adquisicion.ejecutar(duracion, consumidores)
+    finally:
+        for instrumento in instrumentos:
+            await instrumento.cerrar()
+        if simulador_aparte:
+            conexion.send("fin")
+            proceso.join()
+    return estadisticas, consumidores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Adquisición concurrente con instrumentos simulados")
+    parser.add_argument("--duracion", type=float, default=5.0, help="segundos de adquisición")
+    parser.add_argument("--tasa", type=float, default=4000, help="lecturas por segundo de cada instrumento")
+    parser.add_argument("--sondeo", type=float, default=0.005, help="segundos entre consultas a cada instrumento")
+    parser.add_argument("--consumo", type=float, default=0.02, help="segundos entre lotes entregados al análisis")
+    parser.add_argument("--simulador-aparte", action="store_true", help="simular los instrumentos en otro proceso")
+    args = parser.parse_args(argv)
+
+    estadisticas, consumidores = asyncio.run(adquirir_simulado(args.duracion, args.tasa, args.sondeo, args.consumo,
+                                                               args.simulador_aparte))
+    print(f"Adquisición de {estadisticas['t_total_s']:.1f} s, {len(INSTRUMENTOS)} instrumentos a {args.tasa:g} Hz:")
+    for nombre, tasa in estadisticas["tasa_por_instrumento"].items():
+        print(f"  {nombre:<13} {tasa:9.0f} lecturas/s, {estadisticas['perdidos'][nombre]} perdidas")
+    print(f"Tasa total sostenida: {estadisticas['tasa_total']:.0f} lecturas/s")
+    print(f"Latencia de extremo a extremo: p50 = {estadisticas['latencia_p50_s']*1e3:.1f} ms, "
+          f"p99 = {estadisticas['latencia_p99_s']*1e3:.1f} ms, máx = {estadisticas['latencia_max_s']*1e3:.1f} ms")
+    for consumidor in consumidores:
+        print(consumidor.resumen())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Ajuste robusto - Ley del inverso del cuadrado para muchos barridos a la vez
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo ajusta V = a/r² + b y la variante de exponente libre
+V = a·r⁻ⁿ + b a barridos de distancia del Experimento 2, apilados en arrays de
+forma (n_barridos, n_puntos) (los barridos más cortos se completan con NaN).
+Los ajustes son robustos: cada iteración repondera los residuos con la función
+de Huber (escala estimada con la MAD), de modo que puntos como el de 3 cm (campo
+cercano) pierden peso sin descartarlos a mano. Todas las iteraciones son
+vectorizadas sobre los barridos: la forma cerrada de mínimos cuadrados ponderados
+para V = a/r² + b y pasos de Levenberg-Marquardt en lote para el exponente libre.
+"""
+
+import time
+
+import numpy as np
+
+# Constante de Huber: 95 % de eficiencia con residuos normales
+K_HUBER = 1.345
+
+# Iteraciones en que se reestima la escala de los residuos; después queda fija y
+# la reponderación converge rápido (si se reestima siempre, oscila lentamente)
+ITERACIONES_ESCALA = 5
+
+
+def apilar(barridos):
+    """Apila una lista de (distancias, voltajes) de distinto largo en dos arrays completados con NaN."""
+    n_puntos = max(len(r) for r, V in barridos)
+    r = np.full((len(barridos), n_puntos), np.nan)
+    V = np.full((len(barridos), n_puntos), np.nan)
+    for i, (r_i, V_i) in enumerate(barridos):
+        r[i, :len(r_i)] = r_i
+        V[i, :len(V_i)] = V_i
+    return r, V
+
+
+def _preparar(r, V, u_V):
+    r = np.atleast_2d(np.asarray(r, dtype=float))
+    V = np.atleast_2d(np.asarray(V, dtype=float))
+    validos = np.isfinite(r) & np.isfinite(V) & (r > 0)
+    var_V = np.broadcast_to(np.asarray(u_V, dtype=float)**2, V.shape)
+    peso_base = np.where(validos, 1.0 / var_V, 0.0)
+    # Valores neutros en los puntos inválidos: sus pesos son 0
+    return np.where(validos, r, 1.0), np.where(validos, V, 0.0), validos, peso_base
+
+
+def _validar_puntos(validos, n_parametros):
+    # Con n_parametros puntos o menos no quedan grados de libertad para el chi² reducido
+    cortos = np.flatnonzero(validos.sum(axis=1) <= n_parametros)
+    if cortos.size:
+        raise ValueError(f"{cortos.size} barrido(s) con {n_parametros} puntos válidos o menos "
+                         f"(se necesitan al menos {n_parametros + 1}): índices {cortos[:10].tolist()}")
+
+
+def _mediana(valores, validos):
+    # Mediana de cada fila considerando solo los puntos válidos (np.nanmedian es mucho más lento)
+    n = validos.sum(axis=1)
+    ordenados = np.sort(np.where(validos, valores, np.inf), axis=1)
+    filas = np.arange(valores.shape[0])
+    return 0.5 * (ordenados[filas, (n - 1) // 2] + ordenados[filas, n // 2])
+
+
+def escala_robusta(residuos, u_V, validos):
+    """Escala de los residuos normalizados por u_V de cada barrido: 1.4826·MAD, al menos 1."""
+    z = residuos / u_V
+    return np.maximum(1.4826 * _mediana(np.abs(z - _mediana(z, validos)[:, None]), validos), 1.0)
+
+
+def pesos_huber(residuos, u_V, validos, escala, k=K_HUBER):
+    """Pesos de Huber de cada punto: 1 si |z| <= k y k/|z| si no, con z = residuo / (u_V·escala)."""
+    z = np.abs(residuos / u_V) / escala[:, None]
+    return np.where(validos, np.minimum(1.0, k / np.maximum(z, 1e-300)), 0.0)
+
+
+def varianza_residuos(residuos, u_V, validos, escala, n_parametros, robusto, k=K_HUBER):
+    """
+    Factor de varianza de los residuos normalizados z = residuo/u_V de cada barrido,
+    que multiplica la covarianza (JᵀJ)⁻¹ con los pesos 1/u_V². Sin robustez es el
+    chi² reducido. Con Huber es la estimación H1 de Huber, escala²·K²·Σψ(z')²/(n - p)
+    / media(ψ'(z'))² con z' = z/escala: ψ acota el aporte de un punto atípico, que
+    en Σ(peso·z²) crece con su residuo e infla las incertidumbres.
+    """
+    z = np.where(validos, residuos / u_V, 0.0)
+    n = validos.sum(axis=1)
+    if not robusto:
+        return (z*z).sum(axis=1) / (n - n_parametros)
+    z = z / escala[:, None]
+    psi = np.clip(z, -k, k)
+    m = np.where(validos, np.abs(z) <= k, False).sum(axis=1) / n  # media de ψ' en los puntos válidos
+    with np.errstate(divide="ignore", invalid="ignore"):
+        K = 1 + n_parametros/n * (1 - m)/m
+        return (escala*K)**2 * (psi*psi).sum(axis=1) / (n - n_parametros) / m**2
+
+
+def _minimos_cuadrados(x, y, W):
+    # Recta y = a·x + b por mínimos cuadrados ponderados en cada fila
+    suma_W = W.sum(axis=1)
+    x_m = (W*x).sum(axis=1) / suma_W
+    y_m = (W*y).sum(axis=1) / suma_W
+    dx = x - x_m[:, None]
+    Sxx = (W*dx*dx).sum(axis=1)
+    a = (W*dx*(y - y_m[:, None])).sum(axis=1) / Sxx
+    return a, y_m - a*x_m, suma_W, x_m, Sxx
+
+
+def ajustar_inverso_cuadrado(r, V, u_V=1.0, robusto=True, tolerancia=1e-10, max_iteraciones=50):
+    """
+    Ajuste de V = a/r² + b a un lote de barridos.
+
+    r, V: arrays (n_barridos, n_puntos) o (n_puntos,); u_V se amplía por broadcasting.
+    Con robusto=True los pesos 1/u_V² se multiplican por los de Huber, recalculados
+    hasta que a y b cambien menos que `tolerancia` (relativa); los barridos que
+    convergen dejan de iterarse. Las incertidumbres se escalan con el factor de
+    varianza de los residuos (ver varianza_residuos), que se retorna como
+    chi2_reducido. Cada barrido necesita al menos 3 puntos válidos (ValueError).
+    """
+    r, V, validos, peso_base = _preparar(r, V, u_V)
+    _validar_puntos(validos, 2)
+    x = np.where(validos, 1.0 / r**2, 0.0)
+    u = np.sqrt(1.0 / np.where(validos, peso_base, 1.0))
+    W = peso_base
+    huber = np.where(validos, 1.0, 0.0)
+    a, b, *_ = _minimos_cuadrados(x, V, W)
+    escala = np.ones(V.shape[0])
+    iteracion = 0
+    if robusto:
+        activos = np.arange(V.shape[0])
+        for iteracion in range(1, max_iteraciones + 1):
+            x_a, V_a, validos_a, u_a = x[activos], V[activos], validos[activos], u[activos]
+            residuos = V_a - a[activos, None]*x_a - b[activos, None]
+            if iteracion <= ITERACIONES_ESCALA:
+                escala[activos] = escala_robusta(residuos, u_a, validos_a)
+            huber_a = pesos_huber(residuos, u_a, validos_a, escala[activos])
+            a_nueva, b_nueva, *_ = _minimos_cuadrados(x_a, V_a, peso_base[activos]*huber_a)
+            convergido = (np.abs(a_nueva - a[activos]) <= tolerancia*np.abs(a_nueva)) & \
+                (np.abs(b_nueva - b[activos]) <= tolerancia*np.maximum(np.abs(b_nueva), np.abs(a_nueva)))
+            a[activos], b[activos], huber[activos] = a_nueva, b_nueva, huber_a
+            if iteracion >= ITERACIONES_ESCALA:
+                activos = activos[~convergido]
+            if activos.size == 0:
+                break
+        W = peso_base*huber
+
+    a, b, *_ = _minimos_cuadrados(x, V, W)
+    # Covarianza con los pesos 1/u_V², escalada con la varianza de los residuos
+    _, _, suma_W, x_m, Sxx = _minimos_cuadrados(x, V, peso_base)
+    chi2_reducido = varianza_residuos(V - a[:, None]*x - b[:, None], u, validos, escala, 2, robusto)
+    return {
+        "a": a,
+        "b": b,
+        "u_a": np.sqrt(chi2_reducido / Sxx),
+        "u_b": np.sqrt(chi2_reducido * (1.0/suma_W + x_m**2/Sxx)),
+        "chi2_reducido": chi2_reducido,
+        "pesos": huber,
+        "iteraciones": iteracion,
+    }
+
+
+def _modelo_potencia(r, p):
+    # V = a·r⁻ⁿ + b y su jacobiano respecto de (a, n, b)
+    ln_r = np.log(r)
+    potencia = np.exp(-p[:, 1:2]*ln_r)
+    J = np.stack([potencia, -p[:, 0:1]*ln_r*potencia, np.ones_like(r)], axis=-1)
+    return p[:, 0:1]*potencia + p[:, 2:3], J
+
+
+def _perdida(residuos, u_V, validos, escala, robusto, k=K_HUBER):
+    # Función objetivo de cada barrido: Σρ(z) de Huber, o Σz²/2 sin robustez
+    z = np.abs(residuos / u_V) / escala[:, None]
+    rho = 0.5*z*z if not robusto else np.where(z <= k, 0.5*z*z, k*z - 0.5*k*k)
+    return np.where(validos, rho, 0.0).sum(axis=1)
+
+
+def _sistema_normal(J, W, residuos):
+    # JᵀWJ y JᵀW·residuos de cada barrido
+    JW = J * W[..., None]
+    return np.matmul(JW.transpose(0, 2, 1), J), np.einsum("smi,sm->si", JW, residuos)
+
+
+def ajustar_potencia(r, V, u_V=1.0, robusto=True, tolerancia=1e-7, max_iteraciones=100):
+    """
+    Ajuste de V = a·r⁻ⁿ + b (exponente n libre) a un lote de barridos.
+
+    Parte del ajuste de V = a/r² + b (n = 2) y minimiza la pérdida de Huber con
+    pasos de Levenberg-Marquardt resueltos en lote (sistemas 3×3 apilados). El
+    hessiano usa solo los puntos dentro de la zona cuadrática de Huber (paso de
+    Newton, que converge mucho más rápido que reponderar); cada barrido ajusta su
+    propio amortiguamiento y los que convergen dejan de iterarse. Retorna a, n, b
+    con sus incertidumbres (escaladas como en ajustar_inverso_cuadrado). Cada
+    barrido necesita al menos 4 puntos válidos (ValueError).
+    """
+    _validar_puntos(_preparar(r, V, u_V)[2], 3)
+    inicial = ajustar_inverso_cuadrado(r, V, u_V, robusto)
+    r, V, validos, peso_base = _preparar(r, V, u_V)
+    u = np.sqrt(1.0 / np.where(validos, peso_base, 1.0))
+    p = np.stack([inicial["a"], np.full(r.shape[0], 2.0), inicial["b"]], axis=1)
+    amortiguamiento = np.full(r.shape[0], 1e-3)
+    escala = np.ones(r.shape[0])
+    identidad = np.eye(3)
+
+    # Índices de los barridos que aún no convergen
+    activos = np.arange(r.shape[0])
+    for iteracion in range(1, max_iteraciones + 1):
+        r_a, V_a, validos_a, base_a, u_a = r[activos], V[activos], validos[activos], peso_base[activos], u[activos]
+        p_a, amort_a = p[activos], amortiguamiento[activos]
+        modelo, J = _modelo_potencia(r_a, p_a)
+        residuos = V_a - modelo
+        if robusto and iteracion <= ITERACIONES_ESCALA:
+            escala[activos] = escala_robusta(residuos, u_a, validos_a)
+        escala_a = escala[activos]
+        W = base_a * pesos_huber(residuos, u_a, validos_a, escala_a) if robusto else base_a
+        A, g = _sistema_normal(J, W, residuos)
+        # Amortiguamiento con la diagonal de JᵀWJ, que no se anula aunque haya pocos puntos cuadráticos
+        diagonal = A[:, [0, 1, 2], [0, 1, 2]]
+        if robusto:
+            A = _sistema_normal(J, base_a * (W == base_a), residuos)[0]
+        paso = np.linalg.solve(A + amort_a[:, None, None]*identidad*diagonal[:, None, :], g[..., None])[..., 0]
+
+        candidato = p_a + paso
+        modelo_c, _ = _modelo_potencia(r_a, candidato)
+        mejora = (_perdida(V_a - modelo_c, u_a, validos_a, escala_a, robusto) <
+                  _perdida(residuos, u_a, validos_a, escala_a, robusto))
+        p[activos] = np.where(mejora[:, None], candidato, p_a)
+        amortiguamiento[activos] = np.where(mejora, amort_a / 10, amort_a * 10)
+
+        relativo = (np.abs(paso) / np.maximum(np.abs(candidato), 1e-12)).max(axis=1)
+        convergido = (mejora & (relativo < tolerancia)) | (amort_a >= 1e12)
+        if iteracion >= ITERACIONES_ESCALA:
+            activos = activos[~convergido]
+        if activos.size == 0:
+            break
+
+    modelo, J = _modelo_potencia(r, p)
+    residuos = V - modelo
+    W = peso_base * pesos_huber(residuos, u, validos, escala) if robusto else peso_base
+    chi2_reducido = varianza_residuos(residuos, u, validos, escala, 3, robusto)
+    covarianza = np.linalg.inv(_sistema_normal(J, peso_base, residuos)[0]) * chi2_reducido[:, None, None]
+    u_p = np.sqrt(np.diagonal(covarianza, axis1=1, axis2=2))
+    return {
+        "a": p[:, 0],
+        "n": p[:, 1],
+        "b": p[:, 2],
+        "u_a": u_p[:, 0],
+        "u_n": u_p[:, 1],
+        "u_b": u_p[:, 2],
+        "covarianza": covarianza,  # orden (a, n, b)
+        "chi2_reducido": chi2_reducido,
+        "pesos": W / np.where(validos, peso_base, 1.0),
+        "iteraciones": iteracion,
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def barridos_sinteticos(n_barridos, semilla=0):
+    """Barridos con las distancias de clase, V = 650/r² + 0.05 mV, ruido de 0.1 mV y un punto de campo cercano."""
+    from Experimento2 import distancias
+
+    rng = np.random.default_rng(semilla)
+    r = np.broadcast_to(distancias, (n_barridos, distancias.size)).copy()
+    V = 650 / r**2 + 0.05 + rng.normal(0, 0.1, r.shape)
+    V[:, 0] += rng.uniform(10, 30, n_barridos)  # el detector satura distinto a 3 cm
+    return r, V
+
+
+def benchmark_ajuste_robusto(n_barridos=10**4, semilla=0):
+    """Barridos por segundo de ambos ajustes en lote y de curve_fit en bucle (estimado con 200 barridos)."""
+    from scipy.optimize import curve_fit
+
+    r, V = barridos_sinteticos(n_barridos, semilla)
+
+    t0 = time.perf_counter()
+    inverso = ajustar_inverso_cuadrado(r, V, 0.1)
+    t_inverso = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    potencia = ajustar_potencia(r, V, 0.1)
+    t_potencia = time.perf_counter() - t0
+
+    n_bucle = min(200, n_barridos)
+    t0 = time.perf_counter()
+    for i in range(n_bucle):
+        curve_fit(lambda r, a, n, b: a*r**-n + b, r[i], V[i], p0=(600, 2, 0))
+    t_curve_fit = (time.perf_counter() - t0) / n_bucle
+
+    return {
+        "n_barridos": n_barridos,
+        "barridos_s_inverso_cuadrado": n_barridos / t_inverso,
+        "barridos_s_potencia": n_barridos / t_potencia,
+        "barridos_s_curve_fit": 1 / t_curve_fit,
+        "inverso_cuadrado": inverso,
+        "potencia": potencia,
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_ajuste_robusto()
+    print(f"{resultado['n_barridos']} barridos: V = a/r² + b {resultado['barridos_s_inverso_cuadrado']:.2e} barridos/s, "
+          f"V = a·r⁻ⁿ + b {resultado['barridos_s_potencia']:.2e} barridos/s, "
+          f"curve_fit en bucle {resultado['barridos_s_curve_fit']:.2e} barridos/s")
+    n = resultado["potencia"]["n"]
+    print(f"Exponente: media {n.mean():.4f}, dispersión {n.std():.4f}, "
+          f"u(n) típica {np.median(resultado['potencia']['u_n']):.4f} (simulado 2)")
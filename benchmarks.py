@@ -0,0 +1,305 @@
+"""
+Benchmarks - Tiempo y memoria de cada etapa de los experimentos
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo mide cada etapa de los Experimentos 1 a 4 sobre datos
+sintéticos físicamente plausibles de 10² a 10⁷ puntos: conversión R → T del
+termistor (Steinhart-Hart y spline), procesamiento del inverso del cuadrado,
+cadena R → T → T⁴ del tungsteno con propagación de incertidumbre, linregress,
+exportación de la tabla de resultados del tungsteno (CSV y .fmc), ajuste del
+exponente libre en la grilla (n, T_amb) (ahí el tamaño es el número de celdas),
+ajuste de c y bootstrap de c (ahí, el número de remuestreos). Para
+cada etapa y tamaño guarda el tiempo (mediana y mínimo de varias repeticiones)
+y el pico de memoria en un JSON (por defecto en resultados_benchmark/), que se
+puede comparar con el de otro commit para detectar regresiones.
+Uso: python benchmarks.py [--puntos 100 10000 ...] [--etapas ...] [--salida archivo.json]
+     [--comparar anterior.json]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+TAMAÑOS = [10**2, 10**3, 10**4, 10**5, 10**6, 10**7]
+
+# Carpeta de los JSON de resultados cuando no se indica --salida (ignorada por git)
+DIRECTORIO_RESULTADOS = "resultados_benchmark"
+
+# Tiempo mínimo acumulado por medición y máximo de repeticiones
+T_MINIMO = 0.2
+MAX_REPETICIONES = 7
+
+
+#------------------------------------------------------------------------------------------
+
+#Generadores de datos sintéticos
+
+def sintetico_termistor(n, semilla=0):
+    """Resistencias del termistor [Ω] repartidas en ln(R) dentro del rango de la tabla."""
+    from termistor import R
+    rng = np.random.default_rng(semilla)
+    return {"R": np.exp(rng.uniform(np.log(R[0]), np.log(R[-1]), n))}
+
+
+def sintetico_inverso_cuadrado(n, semilla=0):
+    """Barrido de distancias [cm] y voltaje [mV] ~ 1/r² con ruido del voltímetro."""
+    rng = np.random.default_rng(semilla)
+    distancias = rng.uniform(3, 50, n)
+    voltaje = 0.05 + 650 / distancias**2 + rng.normal(0, 0.1, n)
+    return {"distancias": distancias, "voltaje": voltaje}
+
+
+def sintetico_tungsteno(n, semilla=0):
+    """
+    Voltajes [V], corrientes [A] y radiancia [mV] del filamento: la corriente sigue
+    la curva I(V) medida en clase y la radiancia es proporcional a T⁴ más ruido.
+    """
+    from Experimento3 import Voltajes, Corrientes, R_ref
+    from tungsteno import CalibracionTungsteno
+    rng = np.random.default_rng(semilla)
+    V = rng.uniform(Voltajes[0], Voltajes[-1], n)
+    I = np.interp(V, Voltajes, Corrientes) + rng.normal(0, 0.005, n)
+    T = CalibracionTungsteno().temperatura(V / I / R_ref)
+    Radiancia = 6.8e-12*T**4 + 3.6 + rng.normal(0, 0.05, n)
+    return {"Voltajes": V, "Corrientes": I, "Radiancia": Radiancia}
+
+
+def sintetico_luz(n, semilla=0):
+    """Desfases [s] y distancias [m] de un haz a c ≈ 2.2e8 m/s (el valor medido en clase) con ruido."""
+    rng = np.random.default_rng(semilla)
+    distancias = rng.uniform(16, 22, n)
+    fases = (distancias + 28.6) / 2.19e8 + rng.normal(0, 0.5e-9, n)
+    return {"fases": fases, "distancias": distancias}
+
+
+#------------------------------------------------------------------------------------------
+
+#Etapas
+
+def _e1_steinhart(datos):
+    from termistor import convertir_resistencias
+    return convertir_resistencias(datos["R"], modelo="steinhart")
+
+
+def _e1_spline(datos):
+    from termistor import convertir_resistencias
+    return convertir_resistencias(datos["R"], modelo="spline")
+
+
+def _e2_inverso_cuadrado(datos):
+    from datos import ConjuntoDatos
+    import Experimento2
+    with redirect_stdout(io.StringIO()):
+        return Experimento2.ejecutar_datos(ConjuntoDatos(datos), graficar=False)
+
+
+def _e3_cadena(datos):
+    # R → R_rel → T → T⁴ y u(R) → u(T) → u(T⁴), como en Experimento3.ejecutar
+    from Experimento3 import R_ref, res_Voltaje, res_Corriente
+    from tungsteno import CalibracionTungsteno
+    V, I = datos["Voltajes"], datos["Corrientes"]
+    u_V, u_I = res_Voltaje/np.sqrt(12), res_Corriente/np.sqrt(12)
+    R_rel = V / I / R_ref
+    T, dT_dR_rel = CalibracionTungsteno().evaluar(R_rel)
+    u_R_rel = np.sqrt((u_V / I)**2 + (V / I**2 * u_I)**2) / R_ref
+    u_T = dT_dR_rel * u_R_rel
+    return T**4, 4 * T**3 * u_T
+
+
+def _e3_linregress(datos):
+    from regresion import regresion_lineal
+    return regresion_lineal(datos["T_cuarta"], datos["Radiancia"])
+
+
+def _e4_ajuste_c(datos):
+    import Experimento4
+    with redirect_stdout(io.StringIO()):
+        return Experimento4.ejecutar(False, datos["fases"], datos["distancias"], n_remuestreos=0)
+
+
+def _e4_bootstrap(datos):
+    from remuestreo import bootstrap_pendiente
+    return bootstrap_pendiente(datos["fases"], datos["distancias"], datos["n_remuestreos"], semilla=0)
+
+
+def _datos_bootstrap(n, semilla=0):
+    # Aquí n es el número de remuestreos de las 6 mediciones de clase
+    from Experimento4 import fases, distancias
+    return {"fases": fases, "distancias": distancias, "n_remuestreos": n}
+
+
+def _e3_exportar(extension):
+    def exportar(datos):
+        with tempfile.TemporaryDirectory() as directorio:
+            return datos["tabla"].guardar(os.path.join(directorio, "tabla" + extension))
+    return exportar
+
+
+def _datos_tabla(n, semilla=0):
+    from exportar import tabla_tungsteno
+    return {"tabla": tabla_tungsteno(n, semilla)}
+
+
+def _e3_exponente(datos):
+    from verosimilitud import ajustar_exponente
+    return ajustar_exponente(datos["T"], datos["Radiancia"], datos["u_T"], datos["u_Radiancia"],
+                             datos["exponentes"], datos["T_ambientes"])
+
+
+def _datos_exponente(n, semilla=0):
+    # Aquí n es el número de celdas (n, T_amb) sobre las mediciones de clase
+    from verosimilitud import grilla
+    from Experimento3 import Voltajes, Corrientes, Radiancia, res_Radiancia
+    T_cuarta, u_T_cuarta = _e3_cadena({"Voltajes": Voltajes, "Corrientes": Corrientes})
+    T = T_cuarta**0.25
+    exponentes, T_ambientes = grilla(n)
+    return {"T": T, "Radiancia": Radiancia, "u_T": u_T_cuarta / (4 * T**3),
+            "u_Radiancia": res_Radiancia / np.sqrt(12),
+            "exponentes": exponentes, "T_ambientes": T_ambientes}
+
+
+def _datos_linregress(n, semilla=0):
+    datos = sintetico_tungsteno(n, semilla)
+    datos["T_cuarta"] = _e3_cadena(datos)[0]
+    return datos
+
+
+# nombre: (generador, etapa)
+ETAPAS = {
+    "e1_steinhart": (sintetico_termistor, _e1_steinhart),
+    "e1_spline": (sintetico_termistor, _e1_spline),
+    "e2_inverso_cuadrado": (sintetico_inverso_cuadrado, _e2_inverso_cuadrado),
+    "e3_cadena_incertidumbre": (sintetico_tungsteno, _e3_cadena),
+    "e3_linregress": (_datos_linregress, _e3_linregress),
+    "e3_exportar_csv": (_datos_tabla, _e3_exportar(".csv")),
+    "e3_exportar_fmc": (_datos_tabla, _e3_exportar(".fmc")),
+    "e3_exponente": (_datos_exponente, _e3_exponente),
+    "e4_ajuste_c": (sintetico_luz, _e4_ajuste_c),
+    "e4_bootstrap": (_datos_bootstrap, _e4_bootstrap),
+}
+
+
+#------------------------------------------------------------------------------------------
+
+#Medición
+
+def medir(etapa, datos):
+    """
+    Tiempo de `etapa(datos)`: se repite hasta acumular T_MINIMO segundos (a lo más
+    MAX_REPETICIONES veces). El pico de memoria se mide aparte con tracemalloc,
+    que registra también los arrays de numpy, descontando los datos de entrada.
+    """
+    etapa(datos)  # calentamiento: imports y cachés de la primera llamada
+    tiempos = []
+    while len(tiempos) < MAX_REPETICIONES and sum(tiempos) < T_MINIMO:
+        t0 = time.perf_counter()
+        etapa(datos)
+        tiempos.append(time.perf_counter() - t0)
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        etapa(datos)
+        pico = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "t_mediana_s": float(np.median(tiempos)),
+        "t_min_s": float(np.min(tiempos)),
+        "repeticiones": len(tiempos),
+        "pico_memoria_bytes": int(pico),
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def ejecutar_benchmarks(tamaños=TAMAÑOS, etapas=None, semilla=0, mostrar=True):
+    """Mide cada etapa en cada tamaño y retorna el informe (diccionario serializable a JSON)."""
+    etapas = list(ETAPAS) if etapas is None else list(etapas)
+    informe = {
+        "commit": _commit(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.platform(),
+        "resultados": [],
+    }
+    for nombre in etapas:
+        generador, etapa = ETAPAS[nombre]
+        for n in tamaños:
+            datos = generador(n, semilla)
+            resultado = {"etapa": nombre, "n": n, **medir(etapa, datos)}
+            resultado["puntos_por_s"] = n / resultado["t_mediana_s"]
+            informe["resultados"].append(resultado)
+            if mostrar:
+                print(f"{nombre:<24} n = {n:>9}: {resultado['t_mediana_s']*1e3:10.3f} ms "
+                      f"({resultado['puntos_por_s']:.2e} puntos/s), pico {resultado['pico_memoria_bytes']/2**20:8.1f} MB")
+            del datos
+    return informe
+
+
+def comparar(anterior, actual, tolerancia=0.2):
+    """
+    Lista de (etapa, n, magnitud, valor anterior, valor actual) que empeoraron más
+    de `tolerancia` (fracción) en tiempo mediano o pico de memoria.
+    """
+    previos = {(r["etapa"], r["n"]): r for r in anterior["resultados"]}
+    regresiones = []
+    for r in actual["resultados"]:
+        previo = previos.get((r["etapa"], r["n"]))
+        if previo is None:
+            continue
+        for magnitud in ("t_mediana_s", "pico_memoria_bytes"):
+            if previo[magnitud] > 0 and r[magnitud] > previo[magnitud] * (1 + tolerancia):
+                regresiones.append((r["etapa"], r["n"], magnitud, previo[magnitud], r[magnitud]))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa de los Experimentos 1-4")
+    parser.add_argument("--puntos", dest="tamaños", type=int, nargs="+", default=TAMAÑOS,
+                        help="número de puntos de cada medición")
+    parser.add_argument("--etapas", nargs="+", choices=list(ETAPAS), help="etapas a medir (por defecto todas)")
+    parser.add_argument("--salida", help=f"archivo JSON de resultados (por defecto "
+                                         f"{DIRECTORIO_RESULTADOS}/benchmark_<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de un commit anterior para reportar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="empeoramiento relativo tolerado al comparar")
+    args = parser.parse_args(argv)
+
+    informe = ejecutar_benchmarks(args.tamaños, args.etapas)
+    salida = args.salida
+    if salida is None:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS, f"benchmark_{informe['commit']}.json")
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        regresiones = comparar(anterior, informe, args.tolerancia)
+        print(f"Comparación con {anterior['commit']}: {len(regresiones)} regresiones "
+              f"(tolerancia {args.tolerancia:.0%})")
+        for etapa, n, magnitud, previo, actual in regresiones:
+            print(f"  {etapa} n = {n}: {magnitud} {previo:.4g} -> {actual:.4g} ({actual/previo - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    main()
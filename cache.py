@@ -0,0 +1,180 @@
+"""
+Caché - Resultados guardados en disco según el contenido de sus entradas
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo guarda en disco los resultados de las etapas costosas
+(calibraciones, ajustes, tablas de incertidumbre, Monte Carlo) con una clave que
+es el hash de los arrays de entrada y de los parámetros. Si se vuelve a ejecutar
+con las mismas entradas, el resultado se lee del disco en lugar de recalcularse.
+El directorio tiene un tamaño máximo; al superarlo se borran las entradas usadas
+hace más tiempo (LRU). Se activa con la variable de entorno FISMOD_CACHE (directorio).
+Se guardan arrays y diccionarios de resultados, no instancias de clases, y nunca
+los tiempos medidos (las claves que se indican en `tiempos`), que no valen para
+otra ejecución.
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+# Tamaño máximo por defecto del directorio de caché (FISMOD_CACHE_MB para cambiarlo)
+MAX_MB = 512
+
+# Versión del formato de los resultados guardados: se incluye en cada clave, así que
+# al cambiarla (por un cambio de algoritmo o de estructura) las entradas antiguas dejan de usarse
+VERSION = 5
+
+_caches = {}
+
+
+def _actualizar_hash(h, valor):
+    # Arrays: tipo, forma y bytes (por bloques, sin copiar arrays mapeados completos)
+    if isinstance(valor, np.ndarray):
+        h.update(f"array:{valor.dtype.str}:{valor.shape}".encode())
+        plano = valor.reshape(-1)
+        for inicio in range(0, plano.size, 2**20):
+            h.update(np.ascontiguousarray(plano[inicio:inicio + 2**20]).data)
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"{type(valor).__name__}:{len(valor)}".encode())
+        for elemento in valor:
+            _actualizar_hash(h, elemento)
+    elif isinstance(valor, dict):
+        h.update(f"dict:{len(valor)}".encode())
+        for nombre in sorted(valor):
+            h.update(repr(nombre).encode())
+            _actualizar_hash(h, valor[nombre])
+    else:
+        h.update(repr(valor).encode())
+
+
+def _sin_tiempos(resultado, tiempos):
+    # Los tiempos son de la ejecución que calculó el resultado: no se guardan ni se devuelven
+    if tiempos:
+        return {nombre: valor for nombre, valor in resultado.items() if nombre not in tiempos}
+    return resultado
+
+
+class CacheResultados:
+    """
+    Caché en disco con desalojo LRU por tamaño total.
+
+    directorio: carpeta donde se guarda un archivo .pkl por resultado.
+    max_bytes: tamaño máximo del directorio; al superarlo se borran las entradas
+    menos usadas recientemente (la fecha de modificación se renueva en cada acierto).
+    """
+
+    def __init__(self, directorio, max_bytes=MAX_MB * 2**20):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, nombre, entradas):
+        h = hashlib.sha256(f"{nombre}:v{VERSION}".encode())
+        _actualizar_hash(h, entradas)
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f"{clave}.pkl")
+
+    def obtener(self, nombre, calcular, tiempos=(), **entradas):
+        """
+        Resultado de calcular() para estas entradas, leído del disco si ya existe.
+
+        nombre identifica la etapa (debe cambiar si cambia el cálculo, o bien VERSION);
+        entradas son los arrays y parámetros de los que depende el resultado;
+        tiempos son las claves del diccionario resultado con tiempos medidos, que
+        se descartan.
+        """
+        ruta = self._ruta(self.clave(nombre, entradas))
+        try:
+            with open(ruta, "rb") as f:
+                resultado = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        else:
+            self.aciertos += 1
+            try:
+                os.utime(ruta)
+            except FileNotFoundError:
+                pass  # otro proceso la desalojó después de leerla
+            return resultado
+
+        self.fallos += 1
+        resultado = _sin_tiempos(calcular(), tiempos)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            pickle.dump(resultado, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+        self._desalojar()
+        return resultado
+
+    def _entradas(self):
+        # Con varios procesos compartiendo el directorio, un archivo listado puede
+        # desaparecer antes de leerlo o borrarlo: se ignora
+        entradas = []
+        for archivo in os.listdir(self.directorio):
+            if archivo.endswith(".pkl"):
+                try:
+                    estado = os.stat(os.path.join(self.directorio, archivo))
+                except FileNotFoundError:
+                    continue
+                entradas.append((estado.st_mtime, estado.st_size, archivo))
+        return sorted(entradas)
+
+    def _borrar(self, archivo):
+        try:
+            os.remove(os.path.join(self.directorio, archivo))
+        except FileNotFoundError:
+            pass
+
+    def tamaño(self):
+        return sum(tamaño for _, tamaño, _ in self._entradas())
+
+    def _desalojar(self):
+        entradas = self._entradas()
+        total = sum(tamaño for _, tamaño, _ in entradas)
+        for _, tamaño, archivo in entradas:
+            if total <= self.max_bytes:
+                break
+            self._borrar(archivo)
+            total -= tamaño
+
+    def limpiar(self):
+        for _, _, archivo in self._entradas():
+            self._borrar(archivo)
+
+    def resumen(self):
+        return f"Caché ({self.directorio}): {self.aciertos} aciertos, {self.fallos} fallos"
+
+
+def cache_activo():
+    """Caché del directorio FISMOD_CACHE, o None si la variable no está definida."""
+    directorio = os.environ.get("FISMOD_CACHE")
+    if not directorio:
+        return None
+    if directorio not in _caches:
+        max_bytes = int(float(os.environ.get("FISMOD_CACHE_MB", MAX_MB)) * 2**20)
+        _caches[directorio] = CacheResultados(directorio, max_bytes)
+    return _caches[directorio]
+
+
+def memoizar(nombre, calcular, tiempos=(), **entradas):
+    """
+    calcular() a través de la caché activa; sin FISMOD_CACHE simplemente lo ejecuta.
+    Las claves `tiempos` (tiempos medidos) no se devuelven en ningún caso.
+    """
+    cache = cache_activo()
+    if cache is None:
+        return _sin_tiempos(calcular(), tiempos)
+    return cache.obtener(nombre, calcular, tiempos=tiempos, **entradas)
+
+
+def reportar_cache():
+    """Imprime aciertos y fallos de la caché activa (nada si está desactivada)."""
+    cache = cache_activo()
+    if cache is not None:
+        print(f"\n{cache.resumen()}")
@@ -0,0 +1,309 @@
+"""
+Datos - Carga de mediciones desde CSV, NPY/NPZ o formato binario columnar
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo carga las mismas magnitudes que los experimentos tienen
+escritas como arrays (tablas de calibración, voltajes, corrientes, radiancia,
+distancias) desde archivos en disco. Los archivos grandes se abren con memoria
+mapeada, de modo que el análisis lee directamente del archivo sin copiarlo a RAM,
+y los datos se entregan a cada experimento como vistas por bloques.
+
+Formato binario columnar (.fmc): 8 bytes mágicos b"FMCOL001", la longitud del
+encabezado (uint64 little-endian), el encabezado en JSON con n_filas y, para cada
+columna, su nombre, dtype y posición; luego cada columna contigua, alineada a 64 bytes.
+"""
+
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+MAGICO = b"FMCOL001"
+ALINEACION = 64
+
+# Filas por bloque al recorrer los datos (8 MB por columna float64)
+TAM_BLOQUE = 2**20
+
+# Bajo este tamaño un CSV se lee completo a memoria; sobre él se convierte una vez a .fmc
+UMBRAL_CSV = 64 * 2**20
+
+
+class ConjuntoDatos:
+    """
+    Columnas 1-D del mismo largo, normalmente vistas de un archivo mapeado en memoria.
+
+    columnas: diccionario {nombre: array}; los arrays no se copian.
+    ruta: archivo de origen, solo informativo.
+    """
+
+    def __init__(self, columnas, ruta=None):
+        self.columnas = dict(columnas)
+        self.ruta = ruta
+        largos = {len(c) for c in self.columnas.values()}
+        if len(largos) > 1:
+            raise ValueError(f"Las columnas tienen distinto largo: {sorted(largos)}")
+        self.n_filas = largos.pop() if largos else 0
+
+    @property
+    def nombres(self):
+        return list(self.columnas)
+
+    def __getitem__(self, nombre):
+        return self.columnas[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self.columnas
+
+    def __len__(self):
+        return self.n_filas
+
+    def renombrar(self, **nombres):
+        """Nuevo conjunto con columnas renombradas (nombre_nuevo="nombre_en_archivo"), sin copiar datos."""
+        columnas = {nuevo: self.columnas[viejo] for nuevo, viejo in nombres.items()}
+        for nombre, columna in self.columnas.items():
+            if nombre not in nombres.values():
+                columnas.setdefault(nombre, columna)
+        return ConjuntoDatos(columnas, self.ruta)
+
+    def bloques(self, tam_bloque=TAM_BLOQUE, columnas=None):
+        """Recorre los datos en bloques de `tam_bloque` filas, como diccionarios de vistas."""
+        nombres = self.nombres if columnas is None else list(columnas)
+        for inicio in range(0, self.n_filas, tam_bloque):
+            yield {nombre: self.columnas[nombre][inicio:inicio + tam_bloque] for nombre in nombres}
+
+
+#------------------------------------------------------------------------------------------
+
+#Formato binario columnar
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+def _escribir_encabezado(f, n_filas, esquema, largo_encabezado):
+    encabezado = json.dumps({"n_filas": n_filas, "columnas": esquema}).encode().ljust(largo_encabezado)
+    f.seek(0)
+    f.write(MAGICO + struct.pack("<Q", len(encabezado)) + encabezado)
+
+
+def _acortar_columnar(ruta, n_filas):
+    # Corrige n_filas en el encabezado (las columnas no se mueven, solo se leen menos filas)
+    with open(ruta, "r+b") as f:
+        f.seek(len(MAGICO))
+        (largo,) = struct.unpack("<Q", f.read(8))
+        esquema = json.loads(f.read(largo))["columnas"]
+        _escribir_encabezado(f, n_filas, esquema, largo)
+
+
+def crear_columnar(ruta, nombres, n_filas, dtype=np.float64):
+    """
+    Crea un archivo .fmc vacío de `n_filas` filas y retorna sus columnas como
+    memmaps escribibles, para llenarlas por bloques. `dtype` es uno para todas
+    las columnas o una lista con el de cada una (por ejemplo, etiquetas "<U8").
+    """
+    if isinstance(dtype, (list, tuple)):
+        dtypes = [np.dtype(d) for d in dtype]
+    else:
+        dtypes = [np.dtype(dtype)] * len(nombres)
+    # Encabezado con posiciones de ancho fijo para saber su largo antes de calcularlas
+    esquema = [{"nombre": nombre, "dtype": d.str, "offset": 0} for nombre, d in zip(nombres, dtypes)]
+    largo_encabezado = len(json.dumps({"n_filas": n_filas, "columnas": esquema}).encode()) + 20*len(nombres)
+    posicion = _alinear(len(MAGICO) + 8 + largo_encabezado)
+    for columna, d in zip(esquema, dtypes):
+        columna["offset"] = posicion
+        posicion = _alinear(posicion + n_filas*d.itemsize)
+
+    with open(ruta, "wb") as f:
+        _escribir_encabezado(f, n_filas, esquema, largo_encabezado)
+        f.truncate(posicion)
+    return {c["nombre"]: np.memmap(ruta, dtype=np.dtype(c["dtype"]), mode="r+", offset=c["offset"], shape=(n_filas,))
+            for c in esquema}
+
+
+def guardar_columnar(ruta, columnas, tam_bloque=TAM_BLOQUE):
+    """
+    Guarda {nombre: array} en formato .fmc, copiando por bloques (sirve con memmaps
+    de entrada). Las columnas numéricas se guardan con un tipo común (al menos
+    float64) y las de texto conservan el suyo.
+    """
+    n_filas = len(ConjuntoDatos(columnas))
+    dtypes = [np.asarray(c[:0]).dtype for c in columnas.values()]
+    numerico = np.result_type(*[d for d in dtypes if d.kind not in "SU"], np.float64)
+    destino = crear_columnar(ruta, list(columnas), n_filas, [d if d.kind in "SU" else numerico for d in dtypes])
+    for nombre, columna in columnas.items():
+        for inicio in range(0, n_filas, tam_bloque):
+            destino[nombre][inicio:inicio + tam_bloque] = columna[inicio:inicio + tam_bloque]
+        destino[nombre].flush()
+    return ruta
+
+
+def cargar_columnar(ruta):
+    with open(ruta, "rb") as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{ruta} no es un archivo columnar .fmc")
+        (largo,) = struct.unpack("<Q", f.read(8))
+        encabezado = json.loads(f.read(largo))
+    n_filas = encabezado["n_filas"]
+    columnas = {c["nombre"]: np.memmap(ruta, dtype=np.dtype(c["dtype"]), mode="r", offset=c["offset"],
+                                       shape=(n_filas,))
+                for c in encabezado["columnas"]}
+    return ConjuntoDatos(columnas, ruta)
+
+
+#------------------------------------------------------------------------------------------
+
+#NPY / NPZ
+
+def _columnas_de_array(arreglo, nombres, nombre_archivo):
+    # Array estructurado: un campo por columna; 2-D: una columna por índice; 1-D: una sola columna
+    if arreglo.dtype.names:
+        return {nombre: arreglo[nombre] for nombre in arreglo.dtype.names}
+    if arreglo.ndim == 1:
+        return {nombres[0] if nombres else nombre_archivo: arreglo}
+    if arreglo.ndim != 2:
+        raise ValueError(f"Se esperaba un array 1-D o 2-D, no de forma {arreglo.shape}")
+    if nombres is None:
+        nombres = [f"c{j}" for j in range(arreglo.shape[1])]
+    if len(nombres) != arreglo.shape[1]:
+        raise ValueError(f"{len(nombres)} nombres para {arreglo.shape[1]} columnas")
+    return {nombre: arreglo[:, j] for j, nombre in enumerate(nombres)}
+
+
+def cargar_npy(ruta, columnas=None):
+    arreglo = np.load(ruta, mmap_mode="r")
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return ConjuntoDatos(_columnas_de_array(arreglo, columnas, nombre), ruta)
+
+
+def _memmap_miembro_npz(ruta, info):
+    # Un miembro sin comprimir es un .npy dentro del zip: se mapea desde su posición en el archivo
+    with open(ruta, "rb") as f:
+        f.seek(info.header_offset)
+        cabecera_local = f.read(30)
+        largo_nombre, largo_extra = struct.unpack("<HH", cabecera_local[26:30])
+        f.seek(info.header_offset + 30 + largo_nombre + largo_extra)
+        if np.lib.format.read_magic(f) == (1, 0):
+            forma, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            forma, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        inicio_datos = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{info.filename} contiene objetos de Python y no se puede mapear")
+    return np.memmap(ruta, dtype=dtype, mode="r", offset=inicio_datos, shape=forma,
+                     order="F" if fortran else "C")
+
+
+def cargar_npz(ruta, columnas=None):
+    """
+    Cada miembro del .npz es una columna (o varias, si es 2-D o estructurado).
+    Los miembros guardados sin comprimir (np.savez) se mapean en memoria; los
+    comprimidos (np.savez_compressed) se descomprimen a RAM.
+    """
+    resultado = {}
+    with zipfile.ZipFile(ruta) as zf, np.load(ruta) as npz:
+        for info in zf.infolist():
+            nombre = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type == zipfile.ZIP_STORED:
+                arreglo = _memmap_miembro_npz(ruta, info)
+            else:
+                arreglo = npz[nombre]
+            resultado.update(_columnas_de_array(arreglo, None, nombre))
+    conjunto = ConjuntoDatos(resultado, ruta)
+    if columnas is not None:
+        conjunto = ConjuntoDatos({nombre: conjunto[nombre] for nombre in columnas}, ruta)
+    return conjunto
+
+
+#------------------------------------------------------------------------------------------
+
+#CSV
+
+def _leer_encabezado_csv(ruta, delimitador):
+    with open(ruta, encoding="utf-8") as f:
+        primera = f.readline().strip()
+    campos = [c.strip() for c in primera.split(delimitador)]
+    try:
+        [float(c) for c in campos]
+        return None, len(campos)
+    except ValueError:
+        return campos, len(campos)
+
+
+def csv_a_columnar(ruta_csv, ruta_salida=None, delimitador=",", columnas=None, tam_bloque=TAM_BLOQUE):
+    """
+    Convierte un CSV numérico a .fmc en una pasada por bloques de filas, sin leerlo
+    completo a memoria. Si el CSV tiene encabezado de nombres se usa; si no, `columnas`.
+    """
+    ruta_salida = ruta_salida or ruta_csv + ".fmc"
+    nombres, n_columnas = _leer_encabezado_csv(ruta_csv, delimitador)
+    saltar = 1 if nombres is not None else 0
+    nombres = columnas or nombres or [f"c{j}" for j in range(n_columnas)]
+
+    # Primera pasada: contar filas contando saltos de línea en bloques binarios
+    with open(ruta_csv, "rb") as f:
+        n_lineas = sum(trozo.count(b"\n") for trozo in iter(lambda: f.read(2**24), b""))
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            n_lineas += 1
+    n_filas = n_lineas - saltar
+
+    destino = crear_columnar(ruta_salida, nombres, n_filas)
+    with open(ruta_csv, encoding="utf-8") as f:
+        for _ in range(saltar):
+            f.readline()
+        inicio = 0
+        while inicio < n_filas:
+            lineas = [f.readline() for _ in range(min(tam_bloque, n_filas - inicio))]
+            if not any(linea.strip() for linea in lineas):
+                break
+            bloque = np.loadtxt(lineas, delimiter=delimitador, ndmin=2)
+            for j, nombre in enumerate(nombres):
+                destino[nombre][inicio:inicio + len(bloque)] = bloque[:, j]
+            inicio += len(bloque)
+    for columna in destino.values():
+        columna.flush()
+    del destino
+    if inicio < n_filas:
+        # Líneas vacías contadas en la primera pasada
+        _acortar_columnar(ruta_salida, inicio)
+    return ruta_salida
+
+
+def cargar_csv(ruta, delimitador=",", columnas=None):
+    """
+    CSV pequeños: se leen completos. CSV grandes: se convierten una vez a un .fmc
+    al lado del original (se reutiliza mientras sea más nuevo que el CSV) y se mapea.
+    """
+    if os.path.getsize(ruta) >= UMBRAL_CSV:
+        ruta_fmc = ruta + ".fmc"
+        if not os.path.exists(ruta_fmc) or os.path.getmtime(ruta_fmc) < os.path.getmtime(ruta):
+            csv_a_columnar(ruta, ruta_fmc, delimitador, columnas)
+        return cargar_columnar(ruta_fmc)
+
+    nombres, n_columnas = _leer_encabezado_csv(ruta, delimitador)
+    tabla = np.loadtxt(ruta, delimiter=delimitador, skiprows=1 if nombres is not None else 0, ndmin=2)
+    nombres = columnas or nombres or [f"c{j}" for j in range(n_columnas)]
+    return ConjuntoDatos({nombre: tabla[:, j] for j, nombre in enumerate(nombres)}, ruta)
+
+
+#------------------------------------------------------------------------------------------
+
+def cargar_datos(ruta, columnas=None, **opciones):
+    """
+    Carga un archivo de datos según su extensión (.csv, .npy, .npz, .fmc).
+
+    columnas: nombres para archivos sin nombres propios (CSV sin encabezado,
+    NPY 2-D), o columnas a conservar de un NPZ.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".csv", ".txt"):
+        return cargar_csv(ruta, columnas=columnas, **opciones)
+    if extension == ".npy":
+        return cargar_npy(ruta, columnas)
+    if extension == ".npz":
+        return cargar_npz(ruta, columnas)
+    if extension == ".fmc":
+        return cargar_columnar(ruta)
+    raise ValueError(f"Formato de datos no reconocido: {extension}")
@@ -0,0 +1,336 @@
+"""
+Exportar - Tablas de resultados con sus incertidumbres en CSV, NPZ o formato columnar
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo reemplaza los bucles que imprimen cada resultado fila a
+fila (resistencias, temperaturas, T⁴, u(R), u(T), u(T⁴), ...) por una tabla que
+se escribe de una vez: cada magnitud calculada va en una columna junto a la de su
+incertidumbre ("u_<magnitud>"). La tabla se guarda en CSV, NPZ o el formato
+columnar .fmc de datos.py, y aparte se puede generar un resumen en Markdown o
+LaTeX que muestra solo valores agregados (n, media, desviación, mínimo, máximo y
+la incertidumbre media de cada magnitud), nunca las filas.
+Los registros demasiado grandes para memoria se escriben por bloques con
+EscritorTabla (CSV o .fmc).
+Uso: python exportar.py [--filas N]   (benchmark de exportación)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from datos import crear_columnar, guardar_columnar
+from incertidumbre import AcumuladorTipoA
+
+# Formato de los números en CSV: 10 cifras significativas bastan para cualquier instrumento del curso
+FORMATO_CSV = "%.10g"
+FILAS_BLOQUE_CSV = 10**5
+
+EXTENSIONES_TABLA = (".csv", ".npz", ".fmc")
+EXTENSIONES_BLOQUES = (".csv", ".fmc")  # las que EscritorTabla puede escribir por bloques
+EXTENSIONES_RESUMEN = (".md", ".tex")
+
+
+def _extension(ruta, validas):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in validas:
+        raise ValueError(f"Formato no reconocido: {extension!r} (use {', '.join(validas)})")
+    return extension
+
+
+def _escribir_csv(f, columnas, formato=FORMATO_CSV):
+    # Un bloque de filas se formatea con una sola operación % sobre todos sus valores
+    nombres = list(columnas)
+    fila = ",".join("%s" if columnas[n].dtype.kind in "SU" else formato for n in nombres) + "\n"
+    n_filas = len(columnas[nombres[0]])
+    for inicio in range(0, n_filas, FILAS_BLOQUE_CSV):
+        bloque = [columnas[n][inicio:inicio + FILAS_BLOQUE_CSV].tolist() for n in nombres]
+        f.write((fila * len(bloque[0])) % tuple(v for valores in zip(*bloque) for v in valores))
+
+
+#------------------------------------------------------------------------------------------
+
+#Resúmenes agregados
+
+class _Agregado:
+    # n, media, desviación, mínimo y máximo de una columna, acumulados por bloques
+    def __init__(self):
+        self.acumulador = AcumuladorTipoA(ddof=1)
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        valores = valores[np.isfinite(valores)]
+        if valores.size:
+            self.acumulador.agregar_bloque(valores)
+            self.minimo = min(self.minimo, valores.min())
+            self.maximo = max(self.maximo, valores.max())
+
+    def como_diccionario(self):
+        a = self.acumulador
+        return {"n": a.n, "media": a.media if a.n else np.nan, "desviacion": a.desviacion if a.n > 1 else np.nan,
+                "minimo": self.minimo if a.n else np.nan, "maximo": self.maximo if a.n else np.nan}
+
+
+def _resumen(agregados, incertidumbres, unidades):
+    resumen = {}
+    for nombre, agregado in agregados.items():
+        if nombre in incertidumbres.values():
+            continue
+        fila = {"unidad": unidades.get(nombre, ""), **agregado.como_diccionario(), "u_media": np.nan}
+        if nombre in incertidumbres:
+            fila["u_media"] = agregados[incertidumbres[nombre]].como_diccionario()["media"]
+        resumen[nombre] = fila
+    return resumen
+
+
+ENCABEZADOS = ["Magnitud", "Unidad", "n", "Media", "Desv. estándar", "Mínimo", "Máximo", "u media"]
+
+
+def _filas_resumen(resumen):
+    for nombre, r in resumen.items():
+        yield nombre, r["unidad"], [f"{r['n']:d}"] + [
+            "" if not np.isfinite(r[c]) else f"{r[c]:.4g}"
+            for c in ("media", "desviacion", "minimo", "maximo", "u_media")]
+
+
+def resumen_markdown(resumen, titulo=""):
+    """Tabla Markdown con una fila de agregados por magnitud."""
+    lineas = [f"### {titulo}", ""] if titulo else []
+    lineas.append("| " + " | ".join(ENCABEZADOS) + " |")
+    lineas.append("|" + "|".join(["---"]*2 + ["---:"]*(len(ENCABEZADOS) - 2)) + "|")
+    for nombre, unidad, valores in _filas_resumen(resumen):
+        lineas.append("| " + " | ".join([nombre, unidad] + valores) + " |")
+    return "\n".join(lineas) + "\n"
+
+
+def _latex(texto):
+    for original, reemplazo in (("\\", r"\textbackslash{}"), ("_", r"\_"), ("%", r"\%"), ("&", r"\&"),
+                                ("#", r"\#"), ("Ω", r"$\Omega$"), ("²", r"$^2$"), ("^4", r"$^4$"),
+                                ("⁴", r"$^4$"), ("·", r"$\cdot$")):
+        texto = texto.replace(original, reemplazo)
+    return texto
+
+
+def resumen_latex(resumen, titulo=""):
+    """Entorno tabular de LaTeX (dentro de un table con caption si hay título) con los agregados."""
+    lineas = [r"\begin{tabular}{ll" + "r"*(len(ENCABEZADOS) - 2) + "}", r"\hline",
+              " & ".join(_latex(e) for e in ENCABEZADOS) + r" \\", r"\hline"]
+    for nombre, unidad, valores in _filas_resumen(resumen):
+        lineas.append(" & ".join([_latex(nombre), _latex(unidad)] + valores) + r" \\")
+    lineas += [r"\hline", r"\end{tabular}"]
+    if titulo:
+        lineas = [r"\begin{table}[h]", r"\centering", rf"\caption{{{_latex(titulo)}}}"] + lineas + [r"\end{table}"]
+    return "\n".join(lineas) + "\n"
+
+
+def guardar_resumen(resumen, ruta, titulo=""):
+    """Guarda el resumen en Markdown (.md) o LaTeX (.tex) según la extensión."""
+    extension = _extension(ruta, EXTENSIONES_RESUMEN)
+    texto = resumen_markdown(resumen, titulo) if extension == ".md" else resumen_latex(resumen, titulo)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(texto)
+    return ruta
+
+
+#------------------------------------------------------------------------------------------
+
+#Tablas
+
+class TablaResultados:
+    """
+    Columnas de resultados del mismo largo, cada una con su incertidumbre opcional.
+
+    agregar("T", Temperaturas, u_T, "K") agrega las columnas "T" y "u_T". Las
+    columnas de texto (etiquetas como la potencia o la cara) se guardan tal cual
+    y no entran en el resumen.
+    """
+
+    def __init__(self, titulo=""):
+        self.titulo = titulo
+        self.columnas = {}
+        self.unidades = {}
+        self.incertidumbres = {}  # magnitud: columna de su incertidumbre
+
+    @property
+    def n_filas(self):
+        return len(next(iter(self.columnas.values()))) if self.columnas else 0
+
+    def _agregar_columna(self, nombre, valores):
+        if self.columnas and len(valores) != self.n_filas:
+            raise ValueError(f"La columna {nombre} tiene {len(valores)} filas y la tabla {self.n_filas}")
+        self.columnas[nombre] = valores
+
+    def agregar(self, nombre, valores, incertidumbre=None, unidad=""):
+        valores = np.asarray(valores).ravel()
+        self._agregar_columna(nombre, valores)
+        self.unidades[nombre] = unidad
+        if incertidumbre is not None:
+            u = np.broadcast_to(np.asarray(incertidumbre, dtype=float).ravel(), valores.shape)
+            self._agregar_columna(f"u_{nombre}", u)
+            self.unidades[f"u_{nombre}"] = unidad
+            self.incertidumbres[nombre] = f"u_{nombre}"
+        return self
+
+    def guardar(self, ruta):
+        """Escribe la tabla completa en .csv, .npz (sin comprimir: se puede mapear) o .fmc."""
+        extension = _extension(ruta, EXTENSIONES_TABLA)
+        if extension == ".npz":
+            np.savez(ruta, **{nombre: np.ascontiguousarray(c) for nombre, c in self.columnas.items()})
+        elif extension == ".fmc":
+            guardar_columnar(ruta, self.columnas)
+        else:
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(",".join(self.columnas) + "\n")
+                _escribir_csv(f, self.columnas)
+        return ruta
+
+    def resumen(self):
+        """{magnitud: {unidad, n, media, desviacion, minimo, maximo, u_media}} de las columnas numéricas."""
+        agregados = {}
+        for nombre, columna in self.columnas.items():
+            if columna.dtype.kind not in "SU":
+                agregados[nombre] = _Agregado()
+                agregados[nombre].agregar(columna)
+        return _resumen(agregados, self.incertidumbres, self.unidades)
+
+    def guardar_resumen(self, ruta):
+        return guardar_resumen(self.resumen(), ruta, self.titulo)
+
+    def markdown(self):
+        return resumen_markdown(self.resumen(), self.titulo)
+
+
+class EscritorTabla:
+    """
+    Tabla escrita por bloques de filas en .csv o .fmc (NPZ necesita la tabla completa),
+    con el resumen agregado acumulado en la misma pasada.
+
+    nombres: columnas en orden; incertidumbres: {magnitud: columna de su incertidumbre};
+    n_filas: total de filas, necesario para reservar el archivo .fmc.
+    """
+
+    def __init__(self, ruta, nombres, n_filas=None, incertidumbres=None, unidades=None, titulo=""):
+        self.ruta = ruta
+        self.nombres = list(nombres)
+        self.incertidumbres = dict(incertidumbres or {})
+        self.unidades = dict(unidades or {})
+        self.titulo = titulo
+        self.escritas = 0
+        self.agregados = {nombre: _Agregado() for nombre in self.nombres}
+        self._extension = _extension(ruta, EXTENSIONES_BLOQUES)
+        if self._extension == ".fmc":
+            if n_filas is None:
+                raise ValueError("Para escribir .fmc por bloques se necesita n_filas")
+            self._destino = crear_columnar(ruta, self.nombres, n_filas)
+        else:
+            self._archivo = open(ruta, "w", encoding="utf-8")
+            self._archivo.write(",".join(self.nombres) + "\n")
+
+    def escribir(self, bloque):
+        """Agrega un bloque {columna: array} con todas las columnas."""
+        columnas = {nombre: np.asarray(bloque[nombre], dtype=float).ravel() for nombre in self.nombres}
+        n = len(columnas[self.nombres[0]])
+        if self._extension == ".fmc":
+            for nombre, columna in columnas.items():
+                self._destino[nombre][self.escritas:self.escritas + n] = columna
+        else:
+            _escribir_csv(self._archivo, columnas)
+        for nombre, columna in columnas.items():
+            self.agregados[nombre].agregar(columna)
+        self.escritas += n
+
+    def cerrar(self):
+        if self._extension == ".fmc":
+            for columna in self._destino.values():
+                columna.flush()
+            self._destino = None
+        else:
+            self._archivo.close()
+        return self.ruta
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+        return False
+
+    def resumen(self):
+        return _resumen(self.agregados, self.incertidumbres, self.unidades)
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def tabla_tungsteno(n_filas, semilla=0):
+    """Tabla del Experimento 3 (V, I, R, R_rel, T, T⁴ y Radiancia con incertidumbres) para n_filas mediciones sintéticas."""
+    from benchmarks import sintetico_tungsteno
+    from Experimento3 import R_ref, res_Voltaje, res_Corriente, tabla_resultados
+    from tungsteno import CalibracionTungsteno
+
+    datos = sintetico_tungsteno(n_filas, semilla)
+    V, I = datos["Voltajes"], datos["Corrientes"]
+    R = V / I
+    u_R = np.sqrt((res_Voltaje/np.sqrt(12) / I)**2 + (V / I**2 * res_Corriente/np.sqrt(12))**2)
+    T, dT_dR_rel = CalibracionTungsteno().evaluar(R / R_ref)
+    u_T = dT_dR_rel * u_R / R_ref
+    return tabla_resultados(V, I, R, u_R, R / R_ref, T, u_T, T**4, 4*T**3*u_T, datos["Radiancia"])
+
+
+def benchmark_exportar(n_filas=10**6, semilla=0):
+    """Tiempo de escribir la tabla en cada formato y del bucle de impresión equivalente (estimado con 10⁴ filas)."""
+    import io
+    from contextlib import redirect_stdout
+
+    tabla = tabla_tungsteno(n_filas, semilla)
+    resultados = {"n_filas": n_filas, "n_columnas": len(tabla.columnas)}
+    with tempfile.TemporaryDirectory() as directorio:
+        for extension in EXTENSIONES_TABLA:
+            ruta = os.path.join(directorio, "tabla" + extension)
+            t0 = time.perf_counter()
+            tabla.guardar(ruta)
+            resultados[extension] = {"t_s": time.perf_counter() - t0, "bytes": os.path.getsize(ruta)}
+        t0 = time.perf_counter()
+        tabla.guardar_resumen(os.path.join(directorio, "resumen.md"))
+        resultados["resumen_s"] = time.perf_counter() - t0
+
+    # Los bucles de Experimento3.ejecutar, una línea por fila y magnitud
+    n_bucle = min(10**4, n_filas)
+    c = {nombre: columna[:n_bucle] for nombre, columna in tabla.columnas.items()}
+    t0 = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for V, I, R in zip(c["Voltaje"], c["Corriente"], c["R"]):
+            print(f"V = {V:2.0f} V, I = {I:4.2f} A  -->  R = {R:5.2f} Ω")
+        for T, T4 in zip(c["T"], c["T4"]):
+            print(f"T = {T:6.1f} K  -->  T^4 = {T4:10.2e} K^4")
+        for R, uR in zip(c["R"], c["u_R"]):
+            print(f"R = {R:5.2f} Ω  -->  u(R) = {uR:5.3f} Ω")
+        for T, uT in zip(c["T"], c["u_T"]):
+            print(f"T = {T:6.1f} K  -->  u(T) = {uT:5.2f} K")
+        for T4, uT4 in zip(c["T4"], c["u_T4"]):
+            print(f"T^4 = {T4:10.2e} K^4  -->  u(T^4) = {uT4:10.2e} K^4")
+    resultados["impresion_s"] = (time.perf_counter() - t0) * n_filas / n_bucle
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de exportación de tablas de resultados")
+    parser.add_argument("--filas", type=int, default=10**6, help="filas de la tabla")
+    args = parser.parse_args(argv)
+
+    resultados = benchmark_exportar(args.filas)
+    print(f"Tabla de {resultados['n_filas']} filas y {resultados['n_columnas']} columnas:")
+    for extension in EXTENSIONES_TABLA:
+        r = resultados[extension]
+        print(f"  {extension:<5} {r['t_s']:7.3f} s  {r['bytes']/2**20:7.1f} MB  ({r['bytes']/2**20/r['t_s']:7.1f} MB/s)")
+    print(f"  resumen Markdown {resultados['resumen_s']:.3f} s")
+    print(f"Bucle de impresión fila a fila (estimado): {resultados['impresion_s']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Gráficos - Figuras interactivas o guardadas en disco sin pantalla
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo registra las llamadas de pyplot de cada figura en un
+objeto Figura, sin dibujar nada al momento de crearla. En modo interactivo cada
+figura se dibuja y se muestra con plt.show() como antes; en modo sin pantalla
+(variable de entorno FISMOD_FIGURAS con el directorio de salida) las figuras se
+guardan como PNG con un backend no interactivo, repartidas en un pool de
+procesos. Las series muy densas se reducen antes de dibujar.
+GraficoVivo es la alternativa para mediciones en curso: agrega puntos a líneas
+ya creadas y redibuja con blitting solo lo nuevo, a una tasa máxima fija.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Máximo de puntos que se dibujan por serie de una línea
+MAX_PUNTOS = 4000
+
+# Redibujos por segundo, como máximo, de un GraficoVivo
+TASA_REDIBUJO = 30
+
+_pendientes = []
+
+
+class Figura:
+    """
+    Registro de una figura como lista de llamadas a pyplot.
+
+    Se usa igual que pyplot: fig.plot(...), fig.xlabel(...), etc. Las llamadas
+    se guardan como (nombre, args, kwargs) y se reproducen al dibujar, por lo
+    que la figura se puede enviar a otro proceso.
+    """
+
+    def __init__(self, nombre, **opciones_figura):
+        self.nombre = nombre
+        self.opciones_figura = opciones_figura
+        self.llamadas = []
+
+    def __getattr__(self, metodo):
+        if metodo.startswith("_"):
+            raise AttributeError(metodo)
+
+        def registrar(*args, **kwargs):
+            self.llamadas.append((metodo, args, kwargs))
+        return registrar
+
+
+def reducir_serie(x, y, max_puntos=MAX_PUNTOS):
+    """
+    Reduce una serie a lo más ~`max_puntos` puntos conservando el mínimo y el
+    máximo de cada tramo, de modo que la forma de la curva no cambia al dibujarla.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    n = len(y)
+    if n <= max_puntos:
+        return x, y
+    k = -(-n // (max_puntos // 2))  # puntos por tramo
+    n_completo = (n // k) * k
+    tramos = y[:n_completo].reshape(-1, k)
+    inicio = np.arange(0, n_completo, k)
+    indices = [[0, n - 1], inicio + tramos.argmin(axis=1), inicio + tramos.argmax(axis=1)]
+    if n_completo < n:
+        resto = y[n_completo:]
+        indices.append(n_completo + np.array([resto.argmin(), resto.argmax()]))
+    indices = np.unique(np.concatenate(indices))
+    return x[indices], y[indices]
+
+
+def _reducir_argumentos(args, max_puntos):
+    # plot(x, y, ...) con series largas: se reducen x e y antes de dibujar
+    if len(args) >= 2 and np.ndim(args[0]) == 1 and np.ndim(args[1]) == 1 and len(args[0]) == len(args[1]):
+        return reducir_serie(args[0], args[1], max_puntos) + tuple(args[2:])
+    return args
+
+
+def _dibujar(plt, figura, max_puntos):
+    plt.figure(**figura.opciones_figura)
+    for metodo, args, kwargs in figura.llamadas:
+        if metodo == "plot":
+            args = _reducir_argumentos(args, max_puntos)
+        getattr(plt, metodo)(*args, **kwargs)
+
+
+def _guardar(figura, directorio, max_puntos=MAX_PUNTOS, dpi=150):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    _dibujar(plt, figura, max_puntos)
+    ruta = os.path.join(directorio, f"{figura.nombre}.png")
+    plt.savefig(ruta, dpi=dpi)
+    plt.close("all")
+    return ruta
+
+
+def directorio_salida():
+    """Directorio del modo sin pantalla (FISMOD_FIGURAS), o None en modo interactivo."""
+    return os.environ.get("FISMOD_FIGURAS") or None
+
+
+def mostrar(figura):
+    """Muestra la figura (modo interactivo) o la deja pendiente para guardarla en disco."""
+    if directorio_salida() is None:
+        import matplotlib.pyplot as plt
+        _dibujar(plt, figura, MAX_PUNTOS)
+        plt.show()
+    else:
+        _pendientes.append(figura)
+
+
+def renderizar_pendientes(n_procesos=None):
+    """
+    Guarda en disco todas las figuras pendientes del modo sin pantalla, en un pool
+    de `n_procesos` procesos (por defecto FISMOD_PROCESOS o el número de CPUs).
+    Retorna las rutas de los archivos generados.
+    """
+    directorio = directorio_salida()
+    if directorio is None or not _pendientes:
+        return []
+    os.makedirs(directorio, exist_ok=True)
+    if n_procesos is None:
+        n_procesos = int(os.environ.get("FISMOD_PROCESOS", os.cpu_count() or 1))
+    figuras = list(_pendientes)
+    _pendientes.clear()
+
+    if n_procesos <= 1 or len(figuras) == 1:
+        return [_guardar(figura, directorio) for figura in figuras]
+    with ProcessPoolExecutor(max_workers=min(n_procesos, len(figuras))) as pool:
+        return list(pool.map(_guardar, figuras, [directorio]*len(figuras)))
+
+
+#------------------------------------------------------------------------------------------
+
+#Gráficos en vivo
+
+class GraficoVivo:
+    """
+    Figura que se actualiza mientras llegan las mediciones, con blitting.
+
+    Cada serie guarda sus puntos en un array preasignado (que se duplica al
+    llenarse) y en cada refresco solo se dibujan los puntos llegados desde el
+    anterior sobre el fondo guardado, que luego se vuelve a copiar con ellos; así
+    el costo de un refresco no crece con el número de puntos. Las curvas (por
+    ejemplo, un ajuste) son artistas animados que se redibujan completos en cada
+    refresco con un número fijo de puntos. Solo cuando un punto cae fuera de los
+    ejes se redibuja toda la figura (las series con línea reducidas a MAX_PUNTOS)
+    y los ejes se amplían con margen, para que eso ocurra pocas veces.
+
+    paneles: lista de {"xlabel", "ylabel", "title"} y, opcionalmente, "xlim" e "ylim"
+    iniciales (un eje por panel, en una fila).
+    En modo sin pantalla (FISMOD_FIGURAS) se dibuja con Agg y al cerrar se guarda el PNG.
+    """
+
+    def __init__(self, nombre, paneles, tasa=TASA_REDIBUJO, capacidad=1024, margen=0.5, **opciones_figura):
+        import matplotlib
+        if directorio_salida() is not None:
+            matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        self.nombre = nombre
+        self.intervalo = 1.0 / tasa if tasa else 0.0
+        self.capacidad = capacidad
+        self.margen = margen
+        self.figura, ejes = plt.subplots(1, len(paneles), squeeze=False, **opciones_figura)
+        self.ejes = list(ejes[0])
+        for eje, panel in zip(self.ejes, paneles):
+            eje.set_xlabel(panel.get("xlabel", ""))
+            eje.set_ylabel(panel.get("ylabel", ""))
+            eje.set_title(panel.get("title", ""))
+            eje.grid(True, alpha=0.4)
+            if "xlim" in panel:
+                eje.set_xlim(*panel["xlim"])
+            if "ylim" in panel:
+                eje.set_ylim(*panel["ylim"])
+        self.figura.tight_layout()
+        self.series = []
+        self.curvas = []
+        self.fondo = None
+        self.ultimo = -np.inf
+        self.redibujos = 0
+        self.completos = 0
+        self.t_refrescos = []
+        self._dibujando = False
+        self.figura.canvas.mpl_connect("draw_event", self._al_dibujar)
+        if directorio_salida() is None:
+            plt.show(block=False)
+
+    def serie(self, panel, *formato, **opciones):
+        """Crea una serie de puntos en el panel y retorna su índice (para agregar)."""
+        eje = self.ejes[panel]
+        base, = eje.plot([], [], *formato, **opciones)
+        # Los puntos nuevos se dibujan con un artista animado del mismo estilo
+        nuevos, = eje.plot([], [], *formato, **dict(opciones, label="_nuevos", animated=True))
+        nuevos.set_color(base.get_color())
+        conectada = base.get_linestyle() not in ("None", "", " ")
+        self.series.append({"eje": eje, "base": base, "nuevos": nuevos, "conectada": conectada,
+                            "x": np.empty(self.capacidad), "y": np.empty(self.capacidad), "n": 0, "dibujados": 0})
+        return len(self.series) - 1
+
+    def curva(self, panel, *formato, **opciones):
+        """Crea una curva animada (se reemplaza completa en cada refresco) y retorna su índice."""
+        linea, = self.ejes[panel].plot([], [], *formato, animated=True, **opciones)
+        self.curvas.append(linea)
+        return len(self.curvas) - 1
+
+    def agregar(self, serie, x, y):
+        """Agrega puntos a una serie; no dibuja nada hasta el próximo refresco."""
+        s = self.series[serie]
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        n = s["n"] + x.size
+        if n > s["x"].size:
+            capacidad = max(n, 2*s["x"].size)
+            for clave in ("x", "y"):
+                ampliado = np.empty(capacidad)
+                ampliado[:s["n"]] = s[clave][:s["n"]]
+                s[clave] = ampliado
+        s["x"][s["n"]:n] = x
+        s["y"][s["n"]:n] = y
+        s["n"] = n
+
+    def actualizar_curva(self, curva, x, y):
+        self.curvas[curva].set_data(x, y)
+
+    def listo(self):
+        """True si ya pasó el intervalo mínimo desde el último refresco."""
+        return time.perf_counter() - self.ultimo >= self.intervalo
+
+    def _fuera_de_ejes(self):
+        ejes = set()
+        for s in self.series:
+            if s["n"] > s["dibujados"]:
+                x = s["x"][s["dibujados"]:s["n"]]
+                y = s["y"][s["dibujados"]:s["n"]]
+                (x0, x1), (y0, y1) = s["eje"].get_xlim(), s["eje"].get_ylim()
+                if x.min() < x0 or x.max() > x1 or y.min() < y0 or y.max() > y1:
+                    ejes.add(s["eje"])
+        return ejes
+
+    def _ampliar(self, eje):
+        # Rango de todos los datos del eje más un margen: los próximos puntos caben sin redibujar
+        x = np.concatenate([s["x"][:s["n"]] for s in self.series if s["eje"] is eje])
+        y = np.concatenate([s["y"][:s["n"]] for s in self.series if s["eje"] is eje])
+        for valores, fijar in ((x, eje.set_xlim), (y, eje.set_ylim)):
+            minimo, maximo = np.nanmin(valores), np.nanmax(valores)
+            extra = self.margen * (maximo - minimo) or 0.5 * (abs(maximo) or 1.0)
+            fijar(minimo - extra, maximo + extra)
+
+    @staticmethod
+    def _datos_base(s):
+        # Solo las líneas se reducen: en una nube de puntos sin ordenar, los extremos por tramo la deforman
+        x, y = s["x"][:s["n"]], s["y"][:s["n"]]
+        return reducir_serie(x, y) if s["conectada"] else (x, y)
+
+    def _al_dibujar(self, evento):
+        # Un dibujo completo que no hizo _redibujar_todo (por ejemplo, al cambiar el tamaño de
+        # la ventana) deja el fondo guardado inservible: el próximo refresco lo vuelve a capturar
+        if not self._dibujando:
+            self.fondo = None
+
+    def _redibujar_todo(self, ejes):
+        for eje in ejes:
+            self._ampliar(eje)
+        for s in self.series:
+            s["base"].set_data(*self._datos_base(s))
+            s["dibujados"] = s["n"]
+        self._dibujando = True
+        try:
+            self.figura.canvas.draw()
+        finally:
+            self._dibujando = False
+        self.fondo = self.figura.canvas.copy_from_bbox(self.figura.bbox)
+        self.completos += 1
+
+    def refrescar(self, forzar=False):
+        """
+        Dibuja los puntos nuevos y las curvas si pasó el intervalo mínimo (o si
+        forzar=True). Retorna True si se dibujó.
+        """
+        if not forzar and not self.listo():
+            return False
+        t0 = time.perf_counter()
+        canvas = self.figura.canvas
+        ejes = self._fuera_de_ejes()
+        if ejes or self.fondo is None:
+            self._redibujar_todo(ejes)
+        else:
+            canvas.restore_region(self.fondo)
+            for s in self.series:
+                if s["n"] > s["dibujados"]:
+                    # Una serie conectada repite el último punto dibujado para unir el tramo nuevo
+                    inicio = s["dibujados"] - 1 if s["conectada"] and s["dibujados"] else s["dibujados"]
+                    s["nuevos"].set_data(s["x"][inicio:s["n"]], s["y"][inicio:s["n"]])
+                    s["eje"].draw_artist(s["nuevos"])
+                    s["dibujados"] = s["n"]
+            self.fondo = canvas.copy_from_bbox(self.figura.bbox)
+        for curva in self.curvas:
+            curva.axes.draw_artist(curva)
+        canvas.blit(self.figura.bbox)
+        canvas.flush_events()
+        self.redibujos += 1
+        self.ultimo = time.perf_counter()
+        self.t_refrescos.append(self.ultimo - t0)
+        return True
+
+    def cerrar(self):
+        """Último refresco; en modo sin pantalla guarda la figura (con todas las series) y retorna la ruta."""
+        import matplotlib.pyplot as plt
+
+        self.refrescar(forzar=True)
+        ruta = None
+        directorio = directorio_salida()
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+            for s in self.series:
+                s["base"].set_data(*self._datos_base(s))
+            for curva in self.curvas:
+                curva.set_animated(False)
+            ruta = os.path.join(directorio, f"{self.nombre}.png")
+            self.figura.savefig(ruta, dpi=150)
+        plt.close(self.figura)
+        return ruta
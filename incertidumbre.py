@@ -0,0 +1,88 @@
+"""
+Incertidumbre - Acumulador en línea de incertidumbre tipo A
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo calcula la media, la varianza y la incertidumbre tipo A
+de lecturas que llegan de forma continua (por ejemplo, el voltímetro de la
+termopila) sin guardarlas en memoria, usando el algoritmo de Welford. Los
+acumuladores se pueden actualizar con bloques completos de lecturas y combinar
+entre sí, de modo que cada bloque o proceso puede llevar su propio acumulador.
+"""
+
+import numpy as np
+
+# Política común para la desviación estándar experimental (GUM): n - 1 grados de libertad
+DDOF_TIPO_A = 1
+
+
+class AcumuladorTipoA:
+    """
+    Media, varianza e incertidumbre tipo A en línea, con memoria O(1).
+
+    ddof: grados de libertad descontados en la varianza (1 = desviación estándar
+    experimental, 0 = desviación poblacional); se pide explícitamente.
+    u_res: incertidumbre por resolución del instrumento, en las mismas unidades
+    que las lecturas, usada en la incertidumbre combinada.
+    """
+
+    def __init__(self, *, ddof, u_res=0.0):
+        self.ddof = ddof
+        self.u_res = u_res
+        self.n = 0
+        self.media = 0.0
+        self.M2 = 0.0  # suma de cuadrados de las desviaciones respecto a la media
+
+    def agregar(self, x):
+        """Agrega una lectura individual."""
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self.M2 += delta * (x - self.media)
+        return self
+
+    def agregar_bloque(self, bloque):
+        """Agrega un bloque de lecturas con una sola pasada vectorizada sobre el array."""
+        bloque = np.asarray(bloque, dtype=float).ravel()
+        if bloque.size == 0:
+            return self
+        media_bloque = bloque.mean()
+        M2_bloque = np.dot(bloque - media_bloque, bloque - media_bloque)
+        return self._combinar_estadisticos(bloque.size, media_bloque, M2_bloque)
+
+    def combinar(self, otro):
+        """Incorpora los estadísticos de otro acumulador (de otro bloque o proceso)."""
+        if otro.ddof != self.ddof:
+            raise ValueError("No se pueden combinar acumuladores con distinto ddof")
+        if otro.u_res != self.u_res:
+            raise ValueError(f"No se pueden combinar acumuladores con distinta u_res ({self.u_res} y {otro.u_res})")
+        return self._combinar_estadisticos(otro.n, otro.media, otro.M2)
+
+    def _combinar_estadisticos(self, n_b, media_b, M2_b):
+        # Fórmula de combinación de Chan et al. para dos conjuntos de datos
+        n = self.n + n_b
+        if n == 0:
+            return self
+        delta = media_b - self.media
+        self.media += delta * n_b / n
+        self.M2 += M2_b + delta**2 * self.n * n_b / n
+        self.n = n
+        return self
+
+    @property
+    def varianza(self):
+        if self.n <= self.ddof:
+            return np.nan
+        return self.M2 / (self.n - self.ddof)
+
+    @property
+    def desviacion(self):
+        return np.sqrt(self.varianza)
+
+    @property
+    def u_A(self):
+        return self.desviacion / np.sqrt(self.n)
+
+    @property
+    def u_combinada(self):
+        return np.sqrt(self.u_res**2 + self.u_A**2)
+
@@ -0,0 +1,155 @@
+"""
+Instrumentación - Tiempo, CPU y memoria de cada etapa de un análisis
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo mide las etapas con nombre de los experimentos
+("resistencias", "temperaturas", "u_T", "ajuste", "graficos", ...): tiempo real,
+tiempo de CPU y pico de memoria asignada (tracemalloc, incluye arrays de numpy).
+Las etapas se pueden anidar. Se activa con la variable de entorno FISMOD_TRAZA
+(archivo de salida); desactivada, `etapa()` retorna un objeto vacío compartido y
+no mide nada. tracemalloc hace más lentas las asignaciones de Python (por ejemplo
+los imports); con FISMOD_TRAZA_MEMORIA=0 se miden solo los tiempos. Al terminar
+el proceso se escribe la traza: en formato de eventos de Chrome (.json, se abre
+en chrome://tracing o Perfetto) o en pilas colapsadas (.folded, para
+flamegraph.pl o speedscope).
+"""
+
+import atexit
+import json
+import os
+import time
+import tracemalloc
+
+
+class _EtapaInactiva:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_INACTIVA = _EtapaInactiva()
+
+
+class Traza:
+    """Registro de etapas de una ejecución: una lista de eventos con inicio, duración, CPU y memoria."""
+
+    def __init__(self, memoria=True):
+        self.eventos = []
+        self.memoria = memoria
+        self._pila = []
+        self._t0 = time.perf_counter()
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def etapa(self, nombre):
+        return _Etapa(self, nombre)
+
+    def a_chrome(self):
+        """Eventos completos ("ph": "X") del formato de trazas de Chrome, en microsegundos."""
+        return {"traceEvents": [
+            {"name": e["nombre"], "ph": "X", "pid": os.getpid(), "tid": 0,
+             "ts": e["inicio_s"]*1e6, "dur": e["t_real_s"]*1e6,
+             "args": {"t_cpu_s": e["t_cpu_s"], "pico_memoria_bytes": e["pico_memoria_bytes"], "pila": e["pila"]}}
+            for e in self.eventos
+        ], "displayTimeUnit": "ms"}
+
+    def a_pilas_colapsadas(self):
+        """Líneas "padre;hijo microsegundos" con el tiempo propio de cada pila (sin el de sus hijas)."""
+        propio = {}
+        for e in self.eventos:
+            propio[e["pila"]] = propio.get(e["pila"], 0.0) + e["t_real_s"]
+            padre = e["pila"].rpartition(";")[0]
+            if padre:
+                propio[padre] = propio.get(padre, 0.0) - e["t_real_s"]
+        return [f"{pila} {max(round(t*1e6), 0)}" for pila, t in propio.items()]
+
+    def guardar(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            if ruta.endswith(".folded"):
+                f.write("\n".join(self.a_pilas_colapsadas()) + "\n")
+            else:
+                json.dump(self.a_chrome(), f, indent=1)
+        return ruta
+
+    def resumen(self):
+        """Tiempo real, CPU y pico de memoria acumulados por pila de etapas."""
+        totales = {}
+        for e in self.eventos:
+            t = totales.setdefault(e["pila"], {"t_real_s": 0.0, "t_cpu_s": 0.0, "pico_memoria_bytes": 0, "n": 0})
+            t["t_real_s"] += e["t_real_s"]
+            t["t_cpu_s"] += e["t_cpu_s"]
+            t["pico_memoria_bytes"] = max(t["pico_memoria_bytes"], e["pico_memoria_bytes"])
+            t["n"] += 1
+        return totales
+
+
+class _Etapa:
+    def __init__(self, traza, nombre):
+        self.traza = traza
+        self.nombre = nombre
+
+    def __enter__(self):
+        pila = self.traza._pila
+        self.ruta = ";".join([e.nombre for e in pila] + [self.nombre])
+        self.memoria_inicial = self.pico = 0
+        if self.traza.memoria:
+            if pila:
+                # El pico de la etapa padre hasta aquí se guarda antes de reiniciarlo para esta
+                pila[-1].pico = max(pila[-1].pico, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.memoria_inicial = self.pico = tracemalloc.get_traced_memory()[0]
+        pila.append(self)
+        self.cpu_inicial = time.process_time()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        t_real = time.perf_counter() - self.inicio
+        t_cpu = time.process_time() - self.cpu_inicial
+        if self.traza.memoria:
+            self.pico = max(self.pico, tracemalloc.get_traced_memory()[1])
+        pila = self.traza._pila
+        pila.pop()
+        if pila:
+            pila[-1].pico = max(pila[-1].pico, self.pico)
+        self.traza.eventos.append({
+            "nombre": self.nombre,
+            "pila": self.ruta,
+            "inicio_s": self.inicio - self.traza._t0,
+            "t_real_s": t_real,
+            "t_cpu_s": t_cpu,
+            "pico_memoria_bytes": self.pico - self.memoria_inicial,
+        })
+        return False
+
+
+_traza = None
+
+
+def activar(ruta=None, memoria=True):
+    """Comienza a registrar etapas; si se da `ruta`, la traza se guarda ahí al terminar el proceso."""
+    global _traza
+    if _traza is None:
+        _traza = Traza(memoria)
+        if ruta:
+            atexit.register(_traza.guardar, ruta)
+    return _traza
+
+
+def desactivar():
+    global _traza
+    traza, _traza = _traza, None
+    return traza
+
+
+def etapa(nombre):
+    """Contexto que mide la etapa `nombre` (with etapa("ajuste"): ...); sin traza activa no hace nada."""
+    if _traza is None:
+        return _INACTIVA
+    return _traza.etapa(nombre)
+
+
+if os.environ.get("FISMOD_TRAZA"):
+    activar(os.environ["FISMOD_TRAZA"], memoria=os.environ.get("FISMOD_TRAZA_MEMORIA", "1") != "0")
@@ -0,0 +1,265 @@
+"""
+Lote - Procesamiento de muchas sesiones de laboratorio en paralelo
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo busca archivos de datos de los Experimentos 1 a 4 en un
+directorio (de todos los grupos y sesiones), ejecuta el análisis de cada uno en
+un pool de procesos y reúne los resultados principales en una tabla resumen:
+emisividades relativas (E1), ajuste robusto V = a/r² + b (E2), pendiente de
+Stefan-Boltzmann y exponente libre n (E3), y c ± u_c (E4). El error de un archivo
+queda registrado en su fila sin detener el resto del lote. También mide cuántos
+archivos por segundo se procesan según el número de procesos, sin contar el
+arranque del pool ni la primera llamada de cada proceso.
+Uso: python lote.py DIRECTORIO [--procesos 1 2 4] [--resumen resumen.csv] [--sintetico N]
+"""
+
+import argparse
+import csv
+import importlib
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from datos import cargar_datos
+
+# Experimento de cada archivo: "exp1", "exp_2", "Experimento3", ... en el nombre o en una carpeta
+PATRON_EXPERIMENTO = re.compile(r"exp(?:erimento)?[_-]?([1-4])", re.IGNORECASE)
+EXTENSIONES = (".csv", ".npy", ".npz", ".fmc")
+
+COLUMNAS_RESUMEN = ["experimento", "archivo", "estado", "magnitud", "valor", "incertidumbre", "t_s", "detalle"]
+
+
+def descubrir(directorio):
+    """Lista ordenada de (número de experimento, ruta) de los archivos de datos bajo `directorio`."""
+    encontrados = []
+    for raiz, carpetas, archivos in os.walk(directorio):
+        carpetas.sort()
+        for archivo in sorted(archivos):
+            # Los .csv.fmc son conversiones de un CSV grande que ya está en la lista
+            if not archivo.lower().endswith(EXTENSIONES) or archivo.lower().endswith(".csv.fmc"):
+                continue
+            ruta = os.path.join(raiz, archivo)
+            coincidencias = PATRON_EXPERIMENTO.findall(os.path.relpath(ruta, directorio))
+            if coincidencias:
+                encontrados.append((int(coincidencias[-1]), ruta))
+    return encontrados
+
+
+def _filas_resumen(experimento, resultado):
+    # (magnitud, valor, incertidumbre) de cada experimento para la tabla resumen
+    if experimento == 1:
+        return [(f"emisividad_{cara}", e, np.nan) for cara, e in resultado["emisividad_media"].items()
+                if cara != "negra"]
+    if experimento == 2:
+        return [("a_robusto_V=a/r2+b", resultado["a_inverso_cuadrado"], resultado["u_a_inverso_cuadrado"])]
+    if experimento == 3:
+        filas = [("pendiente_Rad_vs_T4", resultado["pendiente"], resultado["std_err"])]
+        if resultado["exponente"] is not None:
+            filas.append(("exponente_n", resultado["exponente"], resultado["u_exponente"]))
+        return filas
+    return [("c", resultado["c"], resultado["u_c"])]
+
+
+def procesar(experimento, ruta):
+    """
+    Analiza un archivo sin gráficos. Nunca lanza excepciones: un error queda en el
+    resultado junto con lo que el análisis alcanzó a imprimir.
+    """
+    salida = io.StringIO()
+    t0 = time.perf_counter()
+    try:
+        modulo = importlib.import_module(f"Experimento{experimento}")
+        with redirect_stdout(salida):
+            resultado = modulo.ejecutar_datos(cargar_datos(ruta), graficar=False)
+        filas = _filas_resumen(experimento, resultado)
+        estado, detalle = "ok", ""
+    except Exception as error:
+        filas = []
+        estado, detalle = "error", f"{type(error).__name__}: {error}"
+    return {
+        "experimento": experimento,
+        "archivo": ruta,
+        "estado": estado,
+        "filas": filas,
+        "t_s": time.perf_counter() - t0,
+        "detalle": detalle,
+        "salida": salida.getvalue(),
+    }
+
+
+def calentar(archivos):
+    """
+    Procesa sin medir un archivo de cada experimento presente en `archivos`: los
+    imports (SciPy) y las cachés de la primera llamada no se cuentan como rendimiento.
+    """
+    for experimento, ruta in dict(archivos[::-1]).items():
+        procesar(experimento, ruta)
+
+
+# Si este proceso (del pool) ya se calentó
+_caliente = False
+
+
+def _calentar_proceso(archivos):
+    # Tarea de calentamiento del pool: solo la primera que toca a cada proceso procesa `archivos`
+    global _caliente
+    if not _caliente:
+        calentar(archivos)
+        _caliente = True
+    return os.getpid()
+
+
+def ejecutar_lote(archivos, n_procesos=1, calentamiento=True):
+    """
+    Procesa la lista de (experimento, ruta) con `n_procesos` procesos y retorna los
+    resultados en el mismo orden, más el tiempo total. Si un proceso del pool muere,
+    solo los archivos afectados quedan como error. Con `calentamiento`, cada proceso
+    se calienta antes (ver calentar) y el tiempo no incluye el arranque del pool.
+    """
+    muestra = archivos if calentamiento else []
+    if n_procesos <= 1:
+        calentar(muestra)
+        t0 = time.perf_counter()
+        resultados = [procesar(experimento, ruta) for experimento, ruta in archivos]
+        t_total = time.perf_counter() - t0
+    else:
+        resultados = [None] * len(archivos)
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            # Con spawn/forkserver el pool arranca los procesos a medida que llegan tareas, y un
+            # proceso ya caliente puede tomar varias: se repite hasta que respondieron todos
+            procesos = set()
+            while len(procesos) < n_procesos:
+                procesos.update(pool.map(_calentar_proceso, [muestra] * n_procesos))
+            t0 = time.perf_counter()
+            futuros = {pool.submit(procesar, experimento, ruta): i for i, (experimento, ruta) in enumerate(archivos)}
+            for futuro in as_completed(futuros):
+                i = futuros[futuro]
+                try:
+                    resultados[i] = futuro.result()
+                except Exception as error:
+                    experimento, ruta = archivos[i]
+                    resultados[i] = {"experimento": experimento, "archivo": ruta, "estado": "error", "filas": [],
+                                     "t_s": np.nan, "detalle": f"{type(error).__name__}: {error}", "salida": ""}
+            # Antes de cerrar el pool: esperar a que terminen sus procesos no es parte del lote
+            t_total = time.perf_counter() - t0
+    return resultados, t_total
+
+
+def tabla_resumen(resultados):
+    """Una fila por magnitud de cada archivo (o una fila de error), con las columnas de COLUMNAS_RESUMEN."""
+    tabla = []
+    for r in resultados:
+        base = {"experimento": r["experimento"], "archivo": r["archivo"], "estado": r["estado"],
+                "t_s": r["t_s"], "detalle": r["detalle"]}
+        if not r["filas"]:
+            tabla.append({**base, "magnitud": "", "valor": np.nan, "incertidumbre": np.nan})
+        for magnitud, valor, incertidumbre in r["filas"]:
+            tabla.append({**base, "magnitud": magnitud, "valor": valor, "incertidumbre": incertidumbre})
+    return tabla
+
+
+def guardar_resumen(tabla, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUMNAS_RESUMEN)
+        escritor.writeheader()
+        escritor.writerows(tabla)
+    return ruta
+
+
+def imprimir_resumen(tabla, directorio="."):
+    print(f"{'Exp':>3}  {'Archivo':<40} {'Magnitud':<22} {'Valor':>12} {'Incert.':>10}  Estado")
+    for fila in tabla:
+        archivo = os.path.relpath(fila["archivo"], directorio)
+        if fila["estado"] == "ok":
+            print(f"{fila['experimento']:>3}  {archivo:<40} {fila['magnitud']:<22} "
+                  f"{fila['valor']:>12.4g} {fila['incertidumbre']:>10.2g}  ok")
+        else:
+            print(f"{fila['experimento']:>3}  {archivo:<40} {'':<22} {'':>12} {'':>10}  {fila['detalle']}")
+
+
+#------------------------------------------------------------------------------------------
+
+#Lote sintético para pruebas y mediciones de rendimiento
+
+def crear_lote_sintetico(directorio, n_sesiones=10, semilla=0):
+    """
+    Escribe `n_sesiones` archivos CSV por experimento en `directorio`, con los datos
+    de clase más ruido del orden de la resolución de cada instrumento.
+    """
+    import Experimento1
+    import Experimento2
+    import Experimento3
+    import Experimento4
+
+    rng = np.random.default_rng(semilla)
+    os.makedirs(directorio, exist_ok=True)
+
+    def escribir(nombre, columnas):
+        with open(os.path.join(directorio, nombre), "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(list(columnas))
+            escritor.writerows(zip(*[c.tolist() for c in columnas.values()]))
+
+    for s in range(n_sesiones):
+        columnas = {"potencia": np.array([9, 7, 6, 5])}
+        for j, cara in enumerate(Experimento1.caras):
+            columnas[f"R_{cara}"] = Experimento1.R_caras[:, j] + rng.normal(0, 0.01, 4)
+        for j, cara in enumerate(Experimento1.caras):
+            columnas[f"V_{cara}"] = Experimento1.V_caras[:, j] + rng.normal(0, 0.1, 4)
+        escribir(f"exp1_sesion{s:03d}.csv", columnas)
+
+        distancias = Experimento2.distancias + rng.normal(0, 0.05, Experimento2.distancias.size)
+        voltaje = Experimento2.voltaje + rng.normal(0, 0.1, Experimento2.voltaje.size)
+        escribir(f"exp2_sesion{s:03d}.csv", {"distancias": distancias, "voltaje": voltaje})
+
+        escribir(f"exp3_sesion{s:03d}.csv", {
+            "Voltajes": Experimento3.Voltajes,
+            "Corrientes": Experimento3.Corrientes + rng.normal(0, 0.005, Experimento3.Corrientes.size),
+            "Radiancia": Experimento3.Radiancia + rng.normal(0, 0.05, Experimento3.Radiancia.size),
+        })
+
+        escribir(f"exp4_sesion{s:03d}.csv", {
+            "fases": Experimento4.fases + rng.normal(0, 0.5e-9, Experimento4.fases.size),
+            "distancias": Experimento4.distancias,
+        })
+    return directorio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa en lote archivos de datos de los Experimentos 1-4")
+    parser.add_argument("directorio", help="carpeta con los archivos (se busca en subcarpetas)")
+    parser.add_argument("--procesos", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="número de procesos; con varios valores se compara el rendimiento")
+    parser.add_argument("--resumen", help="guardar la tabla resumen en este CSV")
+    parser.add_argument("--sintetico", type=int, metavar="N",
+                        help="crear antes N sesiones sintéticas por experimento en el directorio")
+    args = parser.parse_args(argv)
+
+    if args.sintetico:
+        crear_lote_sintetico(args.directorio, args.sintetico)
+    archivos = descubrir(args.directorio)
+    if not archivos:
+        print(f"No se encontraron archivos de datos en {args.directorio}")
+        return
+
+    for n_procesos in args.procesos:
+        resultados, t_total = ejecutar_lote(archivos, n_procesos)
+        print(f"{len(archivos)} archivos con {n_procesos} proceso(s): {t_total:.2f} s, "
+              f"{len(archivos) / t_total:.1f} archivos/s")
+
+    tabla = tabla_resumen(resultados)
+    print()
+    imprimir_resumen(tabla, args.directorio)
+    errores = sum(r["estado"] != "ok" for r in resultados)
+    print(f"\n{len(resultados) - errores} correctos, {errores} con error")
+    if args.resumen:
+        guardar_resumen(tabla, args.resumen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Mediciones - Modelo en arrays de las mediciones del Experimento 1
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo guarda las resistencias del termistor y los voltajes de la
+termopila en arrays 3-D indexados por [potencia, cara, repetición], con etiquetas
+para cada eje. La conversión a temperatura, la normalización de emisividades
+respecto a la cara negra y la agregación V vs T se hacen sobre el array completo.
+"""
+
+import time
+
+import numpy as np
+
+from termistor import R, spline, convertir_resistencias
+
+
+class MedicionesRadiacion:
+    """
+    Mediciones del cubo de Leslie indexadas por [potencia, cara, repetición].
+
+    potencias, caras: etiquetas de los dos primeros ejes.
+    R_kohm, V_mV: arrays de forma (n_potencias, n_caras) o
+    (n_potencias, n_caras, n_repeticiones); los valores faltantes van como NaN.
+    """
+
+    def __init__(self, potencias, caras, R_kohm, V_mV):
+        self.potencias = list(potencias)
+        self.caras = list(caras)
+        R_kohm = np.asarray(R_kohm, dtype=float)
+        V_mV = np.asarray(V_mV, dtype=float)
+        if R_kohm.ndim == 2:
+            R_kohm = R_kohm[..., None]
+        if V_mV.ndim == 2:
+            V_mV = V_mV[..., None]
+        if R_kohm.shape != V_mV.shape or R_kohm.shape[:2] != (len(self.potencias), len(self.caras)):
+            raise ValueError("R_kohm y V_mV deben tener forma (n_potencias, n_caras[, n_repeticiones])")
+        self.R_kohm = R_kohm
+        self.V_mV = V_mV
+
+    @property
+    def forma(self):
+        return self.V_mV.shape
+
+    def indice_cara(self, cara):
+        return self.caras.index(cara)
+
+    def temperaturas(self, modelo="spline", resolucion=0.1):
+        """Temperatura [K] de cada medición, con la misma forma que R_kohm."""
+        return convertir_resistencias(self.R_kohm, unidad="kohm", modelo=modelo, resolucion=resolucion)
+
+    def emisividad_relativa(self, referencia="negra"):
+        """Voltaje de cada cara normalizado al de la cara de referencia, promediado en repeticiones."""
+        V = np.nanmean(self.V_mV, axis=2)
+        j = self.indice_cara(referencia)
+        return V / V[:, j:j+1]
+
+    def V_vs_T(self, modelo="spline", resolucion=0.1):
+        """Temperatura y voltaje promedio de cada (potencia, cara), de forma (n_potencias, n_caras)."""
+        T = self.temperaturas(modelo=modelo, resolucion=resolucion)
+        return np.nanmean(T, axis=2), np.nanmean(self.V_mV, axis=2)
+
+    def como_diccionario(self, valores):
+        """Convierte un array (n_potencias, n_caras) a {potencia: {cara: valor}} para mostrar resultados."""
+        return {pot: dict(zip(self.caras, fila.tolist())) for pot, fila in zip(self.potencias, valores)}
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def mediciones_sinteticas(n_potencias=10**4, n_repeticiones=8, semilla=0):
+    """Genera una grilla potencia × cara × repetición físicamente plausible para el cubo de Leslie."""
+    rng = np.random.default_rng(semilla)
+    caras = ["negra", "blanca", "bruñido", "pulido"]
+    emisividad = np.array([1.0, 0.97, 0.31, 0.06])
+    R_pot = np.exp(rng.uniform(np.log(R[0]*1.05), np.log(R[-1]*0.95), n_potencias)) / 1000  # kOhms
+    T_pot = spline(R_pot*1000)
+    V_negra = 28.6 * (T_pot**4 - 296.15**4) / (405**4 - 296.15**4)
+    forma = (n_potencias, len(caras), n_repeticiones)
+    R_kohm = np.round(np.broadcast_to(R_pot[:, None, None], forma), 2)
+    V_mV = np.round(V_negra[:, None, None] * emisividad[None, :, None] + rng.normal(0, 0.05, forma), 1)
+    potencias = [f"P{i}" for i in range(n_potencias)]
+    return MedicionesRadiacion(potencias, caras, R_kohm, V_mV)
+
+
+def benchmark_mediciones(n_potencias=10**4, semilla=0):
+    """Compara el procesamiento en arrays con el procesamiento por diccionarios y listas."""
+    mediciones = mediciones_sinteticas(n_potencias, n_repeticiones=1, semilla=semilla)
+
+    t0 = time.perf_counter()
+    temperaturas = {
+        pot: {cara: round(float(spline(mediciones.R_kohm[i, j, 0]*1000)), 1)
+              for j, cara in enumerate(mediciones.caras)}
+        for i, pot in enumerate(mediciones.potencias)
+    }
+    V_medidas = {pot: list(mediciones.V_mV[i, :, 0]) for i, pot in enumerate(mediciones.potencias)}
+    T_medidas = {pot: [temperaturas[pot][c] for c in mediciones.caras] for pot in mediciones.potencias}
+    for i in range(len(mediciones.caras)):
+        [T_medidas[pot][i] for pot in mediciones.potencias]
+        [V_medidas[pot][i] for pot in mediciones.potencias]
+    for pot in mediciones.potencias:
+        V_vals = np.array(V_medidas[pot])
+        V_vals / V_vals[0]
+    t_diccionarios = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    mediciones.V_vs_T()
+    mediciones.emisividad_relativa()
+    t_arrays = time.perf_counter() - t0
+
+    return {
+        "n_potencias": n_potencias,
+        "t_diccionarios": t_diccionarios,
+        "t_arrays": t_arrays,
+        "aceleracion": t_diccionarios / t_arrays,
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_mediciones()
+    print(f"Grilla sintética de {resultado['n_potencias']} potencias × 4 caras")
+    print(f"Diccionarios y listas: {resultado['t_diccionarios']*1e3:9.2f} ms")
+    print(f"Arrays:                {resultado['t_arrays']*1e3:9.2f} ms")
+    print(f"Aceleración:           {resultado['aceleracion']:9.1f} x")
@@ -0,0 +1,146 @@
+"""
+Monte Carlo - Propagación de incertidumbre del Experimento 3
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo propaga las incertidumbres por resolución de Voltajes,
+Corrientes y Radiancia a la pendiente de Radiancia vs T^4 por el método de
+Monte Carlo (GUM Suplemento 1). Cada muestra recorre la cadena completa
+V/I → R/R_ref → T (tabla del tungsteno) → T^4 → regresión lineal, evaluada por
+bloques vectorizados y, opcionalmente, repartida en varios procesos. De cada
+bloque solo se guardan estadísticos acumulables (media, varianza e histograma),
+así que la memoria no crece con el número de muestras.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from incertidumbre import AcumuladorTipoA
+from tungsteno import CalibracionTungsteno
+
+# Histograma de la pendiente para el intervalo de cobertura: intervalos y ancho (desviaciones a cada lado)
+INTERVALOS_HISTOGRAMA = 2**16
+ANCHO_HISTOGRAMA = 10
+
+
+def _pendientes(x, y):
+    """Pendiente e intercepto de mínimos cuadrados de cada fila de x, y (forma (n, m))."""
+    x_media = x.mean(axis=1, keepdims=True)
+    y_media = y.mean(axis=1, keepdims=True)
+    dx = x - x_media
+    pendiente = np.einsum("ij,ij->i", dx, y - y_media) / np.einsum("ij,ij->i", dx, dx)
+    return pendiente, y_media[:, 0] - pendiente*x_media[:, 0]
+
+
+def _bloque_montecarlo(semilla, n, Voltajes, Corrientes, Radiancia, resoluciones, R_ref, calibracion):
+    # Distribuciones rectangulares de ancho igual a la resolución, centradas en cada lectura
+    rng = np.random.default_rng(semilla)
+    res_V, res_I, res_Rad = resoluciones
+    V = Voltajes + res_V*(rng.random((n, Voltajes.size)) - 0.5)
+    I = Corrientes + res_I*(rng.random((n, Corrientes.size)) - 0.5)
+    Rad = Radiancia + res_Rad*(rng.random((n, Radiancia.size)) - 0.5)
+
+    R_rel = V / I / R_ref
+    T = CalibracionTungsteno.desde_arrays(**calibracion).temperatura(R_rel)
+    T *= T
+    T *= T  # T^4 en el mismo array
+    return _pendientes(T, Rad)
+
+
+def _resumir(pendientes, interceptos, bordes, muestras):
+    # Estadísticos combinables del bloque: acumuladores de media/varianza e histograma de la pendiente
+    # (los valores fuera de `bordes` se cuentan en el primer o último intervalo)
+    acumuladores = (AcumuladorTipoA(ddof=1).agregar_bloque(pendientes),
+                    AcumuladorTipoA(ddof=1).agregar_bloque(interceptos))
+    histograma = np.histogram(np.clip(pendientes, *bordes), bins=INTERVALOS_HISTOGRAMA, range=bordes)[0]
+    return acumuladores, histograma, (pendientes, interceptos) if muestras else None
+
+
+def _bloque_resumido(bordes, muestras, *argumentos):
+    return _resumir(*_bloque_montecarlo(*argumentos), bordes, muestras)
+
+
+def _cuantiles(histograma, bordes, probabilidades):
+    # Cuantiles interpolando linealmente la distribución acumulada del histograma
+    acumulada = np.concatenate([[0.0], np.cumsum(histograma)]) / histograma.sum()
+    return tuple(float(v) for v in np.interp(probabilidades, acumulada, np.linspace(*bordes, histograma.size + 1)))
+
+
+def propagar_montecarlo(Voltajes, Corrientes, Radiancia, res_Voltaje, res_Corriente, res_Radiancia,
+                        R_ref, n_muestras=10**6, tam_bloque=10**5, n_procesos=1, semilla=None, calibracion=None,
+                        muestras=False):
+    """
+    Distribución de la pendiente e intercepto de Radiancia vs T^4 por Monte Carlo.
+
+    Las muestras se procesan en bloques de `tam_bloque` para acotar la memoria;
+    con n_procesos > 1 los bloques se reparten en un pool de procesos, cada uno
+    con su propio generador aleatorio independiente derivado de `semilla`.
+    calibracion: CalibracionTungsteno ya construida (por defecto, la de la tabla);
+    se construye una sola vez y a los bloques solo llegan sus arrays.
+
+    Cada bloque se reduce a medias y varianzas (AcumuladorTipoA) y a un histograma
+    de la pendiente, de INTERVALOS_HISTOGRAMA intervalos en ±ANCHO_HISTOGRAMA
+    desviaciones alrededor de la media del primer bloque; el intervalo de cobertura
+    95 % sale de ese histograma (error menor que un intervalo, ~3e-4 desviaciones).
+    Con muestras=True también se devuelven todas las pendientes e interceptos
+    (8 bytes por muestra cada uno).
+    """
+    if calibracion is None:
+        calibracion = CalibracionTungsteno()
+    arrays = calibracion.como_arrays()
+    Voltajes, Corrientes, Radiancia = (np.asarray(a, dtype=float) for a in (Voltajes, Corrientes, Radiancia))
+    tamaños = [min(tam_bloque, n_muestras - inicio) for inicio in range(0, n_muestras, tam_bloque)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamaños))
+    argumentos = [(s, n, Voltajes, Corrientes, Radiancia, (res_Voltaje, res_Corriente, res_Radiancia), R_ref,
+                   arrays)
+                  for s, n in zip(semillas, tamaños)]
+
+    t0 = time.perf_counter()
+    # El primer bloque fija los bordes del histograma común a todos
+    primero = _bloque_montecarlo(*argumentos[0])
+    media, desviacion = primero[0].mean(), primero[0].std()
+    ancho = max(ANCHO_HISTOGRAMA*desviacion, 1e-12*abs(media), np.finfo(float).tiny)
+    bordes = (media - ancho, media + ancho)
+    resultados = [_resumir(*primero, bordes, muestras)]
+    del primero
+    resto = [(bordes, muestras) + args for args in argumentos[1:]]
+    if n_procesos > 1 and resto:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            resultados += pool.map(_bloque_resumido, *zip(*resto))
+    else:
+        resultados += [_bloque_resumido(*args) for args in resto]
+    t_total = time.perf_counter() - t0
+
+    acumulador_pendiente, acumulador_intercepto = resultados[0][0]
+    for (pendiente, intercepto), _, _ in resultados[1:]:
+        acumulador_pendiente.combinar(pendiente)
+        acumulador_intercepto.combinar(intercepto)
+    histograma = np.sum([r[1] for r in resultados], axis=0)
+    resultado = {
+        "pendiente_media": acumulador_pendiente.media,
+        "u_pendiente": acumulador_pendiente.desviacion,
+        "intervalo_95": _cuantiles(histograma, bordes, [0.025, 0.975]),
+        "intercepto_medio": acumulador_intercepto.media,
+        "u_intercepto": acumulador_intercepto.desviacion,
+        "n_muestras": n_muestras,
+        "t_total": t_total,
+    }
+    if muestras:
+        resultado["pendientes"] = np.concatenate([r[2][0] for r in resultados])
+        resultado["interceptos"] = np.concatenate([r[2][1] for r in resultados])
+    return resultado
+
+
+if __name__ == "__main__":
+    # Datos del Experimento 3
+    Voltajes = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0])  # V
+    Corrientes = np.array([1.18, 1.41, 1.58, 1.75, 1.91, 2.04, 2.17, 2.30, 2.44, 2.55, 2.68])  # A
+    Radiancia = np.array([1.8, 3.6, 5.9, 8.6, 11.6, 14.9, 16.8, 20.5, 25.5, 29.0, 32.5])  # mV
+
+    for n_procesos in (1, 2):
+        resultado = propagar_montecarlo(Voltajes, Corrientes, Radiancia, 0.5, 0.01, 0.1, R_ref=0.6,
+                                        n_muestras=10**7, n_procesos=n_procesos, semilla=0)
+        print(f"{resultado['n_muestras']} muestras, {n_procesos} proceso(s): {resultado['t_total']:.1f} s")
+        print(f"  Pendiente = {resultado['pendiente_media']:.3e} ± {resultado['u_pendiente']:.1e} mV/K^4, "
+              f"95%: [{resultado['intervalo_95'][0]:.3e}, {resultado['intervalo_95'][1]:.3e}]")
@@ -0,0 +1,287 @@
+"""
+Regresión - Ajustes lineales en lote con errores en ambas variables
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo ajusta rectas y = a + b·x considerando las incertidumbres
+de x e y (método de York, equivalente a la regresión ortogonal ponderada) para
+muchas series a la vez, a partir de arrays apilados de forma (n_series, n_puntos).
+Entrega pendiente, intercepto, sus incertidumbres y covarianza, y el chi².
+También incluye un acumulador de mínimos cuadrados que se actualiza punto a
+punto durante la adquisición.
+"""
+
+import time
+
+import numpy as np
+
+
+def regresion_lineal(x, y):
+    """linregress como tupla de floats (pendiente, intercepto, r, p, error estándar), fácil de guardar en caché."""
+    from scipy.stats import linregress
+
+    return tuple(float(v) for v in linregress(x, y))
+
+
+def ajustar_york(x, y, u_x, u_y, tolerancia=1e-12, max_iteraciones=100):
+    """
+    Ajuste de York de y = a + b·x para un lote de series.
+
+    x, y, u_x, u_y: arrays de forma (n_series, n_puntos) o (n_puntos,); las
+    incertidumbres se amplían por broadcasting. Los puntos con NaN en x o y se
+    ignoran, lo que permite apilar series de distinto largo. Todas las series se
+    iteran juntas hasta que el cambio relativo de todas las pendientes sea menor
+    que `tolerancia`; "convergido" indica, serie a serie, si la suya lo cumplió
+    en la última iteración (False si agotó max_iteraciones o su pendiente es NaN).
+    Cada serie necesita al menos 3 puntos válidos (chi² reducido con n - 2).
+    """
+    x, y = np.atleast_2d(np.asarray(x, dtype=float)), np.atleast_2d(np.asarray(y, dtype=float))
+    var_x = np.broadcast_to(np.asarray(u_x, dtype=float)**2, x.shape)
+    var_y = np.broadcast_to(np.asarray(u_y, dtype=float)**2, y.shape)
+    validos = np.isfinite(x) & np.isfinite(y)
+    x, y = np.where(validos, x, 0.0), np.where(validos, y, 0.0)
+    n = validos.sum(axis=1)
+    cortas = np.flatnonzero(n < 3)
+    if cortas.size:
+        raise ValueError(f"{cortas.size} serie(s) con menos de 3 puntos válidos: índices {cortas[:10].tolist()}")
+
+    def pesos(b):
+        return np.where(validos, 1.0 / np.where(validos, var_y + b[:, None]**2 * var_x, 1.0), 0.0)
+
+    def centroides(W):
+        suma_W = W.sum(axis=1)
+        return suma_W, (W*x).sum(axis=1) / suma_W, (W*y).sum(axis=1) / suma_W
+
+    # Estimación inicial: mínimos cuadrados ordinarios
+    x_m = x.sum(axis=1) / n
+    y_m = y.sum(axis=1) / n
+    U0 = np.where(validos, x - x_m[:, None], 0.0)
+    b = (U0*(y - y_m[:, None])).sum(axis=1) / (U0*U0).sum(axis=1)
+
+    iteracion = 0
+    convergido = np.zeros(x.shape[0], dtype=bool)
+    for iteracion in range(1, max_iteraciones + 1):
+        W = pesos(b)
+        suma_W, X_barra, Y_barra = centroides(W)
+        U = np.where(validos, x - X_barra[:, None], 0.0)
+        V = np.where(validos, y - Y_barra[:, None], 0.0)
+        beta = W * (U*var_y + b[:, None]*V*var_x)
+        b_nueva = (W*beta*V).sum(axis=1) / (W*beta*U).sum(axis=1)
+        convergido = np.abs(b_nueva - b) <= tolerancia*np.abs(b_nueva)
+        b = b_nueva
+        if convergido.all():
+            break
+
+    W = pesos(b)
+    suma_W, X_barra, Y_barra = centroides(W)
+    a = Y_barra - b*X_barra
+    U = np.where(validos, x - X_barra[:, None], 0.0)
+    V = np.where(validos, y - Y_barra[:, None], 0.0)
+    beta = W * (U*var_y + b[:, None]*V*var_x)
+    x_ajustado = X_barra[:, None] + beta  # abscisas ajustadas
+    x_medio = (W*x_ajustado).sum(axis=1) / suma_W
+    u_ajustado = np.where(validos, x_ajustado - x_medio[:, None], 0.0)
+
+    var_b = 1.0 / (W*u_ajustado**2).sum(axis=1)
+    var_a = 1.0 / suma_W + x_medio**2 * var_b
+    cov_ab = -x_medio * var_b
+    chi2 = (W*(y - b[:, None]*x - a[:, None])**2).sum(axis=1)
+
+    return {
+        "pendiente": b,
+        "intercepto": a,
+        "u_pendiente": np.sqrt(var_b),
+        "u_intercepto": np.sqrt(var_a),
+        "covarianza": np.stack([np.stack([var_a, cov_ab], axis=-1),
+                                np.stack([cov_ab, var_b], axis=-1)], axis=-2),  # orden (a, b)
+        "chi2": chi2,
+        "chi2_reducido": chi2 / (n - 2),
+        "iteraciones": iteracion,
+        "convergido": convergido,
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Regresión incremental para adquisición en vivo
+
+class RegresionIncremental:
+    """
+    Mínimos cuadrados ordinarios actualizados en O(1) por punto.
+
+    En lugar de las sumas Σx, Σxx, Σxy (que con x ~ T^4 ~ 1e13 pierden toda la
+    precisión al restar (Σx)²/n), guarda las medias y los co-momentos centrados
+    Cxx, Cxy, Cyy, actualizados al estilo Welford. Con ellos se obtienen los
+    mismos resultados que linregress, se pueden quitar puntos y combinar
+    acumuladores de distintos procesos.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.Cxx = 0.0
+        self.Cxy = 0.0
+        self.Cyy = 0.0
+
+    def agregar(self, x, y):
+        self.n += 1
+        dx = x - self.media_x
+        dy = y - self.media_y
+        self.media_x += dx / self.n
+        self.media_y += dy / self.n
+        self.Cxx += dx * (x - self.media_x)
+        self.Cxy += dx * (y - self.media_y)
+        self.Cyy += dy * (y - self.media_y)
+        return self
+
+    def agregar_bloque(self, x, y):
+        """Agrega un bloque de puntos con una pasada vectorizada (por ejemplo, una vista de un archivo)."""
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        if x.size == 0:
+            return self
+        bloque = RegresionIncremental()
+        bloque.n = x.size
+        bloque.media_x = x.mean()
+        bloque.media_y = y.mean()
+        dx = x - bloque.media_x
+        dy = y - bloque.media_y
+        bloque.Cxx = float(np.dot(dx, dx))
+        bloque.Cxy = float(np.dot(dx, dy))
+        bloque.Cyy = float(np.dot(dy, dy))
+        return self.combinar(bloque)
+
+    def quitar(self, x, y):
+        """Quita un punto agregado antes (por ejemplo, una lectura descartada)."""
+        if self.n <= 1:
+            self.__init__()
+            return self
+        n = self.n - 1
+        media_x = (self.n*self.media_x - x) / n
+        media_y = (self.n*self.media_y - y) / n
+        self.Cxx -= (x - media_x) * (x - self.media_x)
+        self.Cxy -= (x - media_x) * (y - self.media_y)
+        self.Cyy -= (y - media_y) * (y - self.media_y)
+        self.n, self.media_x, self.media_y = n, media_x, media_y
+        return self
+
+    def combinar(self, otro):
+        """Incorpora los puntos de otro acumulador (fórmula de Chan)."""
+        n = self.n + otro.n
+        if n == 0:
+            return self
+        dx = otro.media_x - self.media_x
+        dy = otro.media_y - self.media_y
+        factor = self.n * otro.n / n
+        self.Cxx += otro.Cxx + dx*dx*factor
+        self.Cxy += otro.Cxy + dx*dy*factor
+        self.Cyy += otro.Cyy + dy*dy*factor
+        self.media_x += dx * otro.n / n
+        self.media_y += dy * otro.n / n
+        self.n = n
+        return self
+
+    @property
+    def pendiente(self):
+        if self.n < 2 or self.Cxx == 0:
+            return np.nan
+        return self.Cxy / self.Cxx
+
+    @property
+    def intercepto(self):
+        return self.media_y - self.pendiente*self.media_x
+
+    @property
+    def r2(self):
+        if self.n < 2 or self.Cxx*self.Cyy == 0:
+            return np.nan
+        return self.Cxy**2 / (self.Cxx*self.Cyy)
+
+    @property
+    def _varianza_residual(self):
+        return max(self.Cyy - self.pendiente*self.Cxy, 0.0) / (self.n - 2)
+
+    @property
+    def u_pendiente(self):
+        if self.n < 3:
+            return np.nan
+        return np.sqrt(self._varianza_residual / self.Cxx)
+
+    @property
+    def u_intercepto(self):
+        if self.n < 3:
+            return np.nan
+        return np.sqrt(self._varianza_residual * (1.0/self.n + self.media_x**2/self.Cxx))
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def benchmark_york(n_series=1000, n_puntos=11, semilla=0):
+    """Compara el ajuste de York en lote con un bucle de linregress sobre las mismas series."""
+    from scipy.stats import linregress
+
+    rng = np.random.default_rng(semilla)
+    T = np.linspace(400, 1450, n_puntos) * rng.normal(1, 0.02, (n_series, 1))
+    u_T4 = 4*T**3 * 20.0
+    T4 = T**4 + rng.normal(0, 1, T.shape)*u_T4
+    Radiancia = 6.8e-12*T**4 + 3.6 + rng.normal(0, 0.03, T.shape)
+
+    t0 = time.perf_counter()
+    for i in range(n_series):
+        linregress(T4[i], Radiancia[i])
+    t_linregress = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    ajuste = ajustar_york(T4, Radiancia, u_T4, 0.1/np.sqrt(12))
+    t_york = time.perf_counter() - t0
+
+    return {
+        "n_series": n_series,
+        "series_s_linregress": n_series / t_linregress,
+        "series_s_york": n_series / t_york,
+        "iteraciones_york": ajuste["iteraciones"],
+    }
+
+
+def benchmark_incremental(n_puntos=2000, semilla=0):
+    """Tiempo por punto nuevo: acumulador incremental vs repetir linregress con todos los puntos."""
+    from scipy.stats import linregress
+
+    rng = np.random.default_rng(semilla)
+    T4 = np.linspace(400, 1450, n_puntos)**4
+    Radiancia = 6.8e-12*T4 + 3.6 + rng.normal(0, 0.3, n_puntos)
+
+    t0 = time.perf_counter()
+    for i in range(3, n_puntos + 1):
+        linregress(T4[:i], Radiancia[:i])
+    t_linregress = (time.perf_counter() - t0) / (n_puntos - 2)
+
+    acumulador = RegresionIncremental()
+    t0 = time.perf_counter()
+    for x, y in zip(T4.tolist(), Radiancia.tolist()):
+        acumulador.agregar(x, y)
+        acumulador.pendiente, acumulador.u_pendiente
+    t_incremental = (time.perf_counter() - t0) / n_puntos
+
+    referencia = linregress(T4, Radiancia)
+    return {
+        "n_puntos": n_puntos,
+        "t_punto_linregress": t_linregress,
+        "t_punto_incremental": t_incremental,
+        "error_relativo_pendiente": abs(acumulador.pendiente/referencia.slope - 1),
+        "error_relativo_u_pendiente": abs(acumulador.u_pendiente/referencia.stderr - 1),
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_york()
+    print(f"{resultado['n_series']} series: linregress en bucle {resultado['series_s_linregress']:.3e} series/s, "
+          f"York en lote {resultado['series_s_york']:.3e} series/s ({resultado['iteraciones_york']} iteraciones)")
+
+    resultado = benchmark_incremental()
+    print(f"Por punto nuevo ({resultado['n_puntos']} puntos): linregress {resultado['t_punto_linregress']*1e6:.1f} µs, "
+          f"incremental {resultado['t_punto_incremental']*1e6:.2f} µs")
+    print(f"Error relativo frente a linregress: pendiente {resultado['error_relativo_pendiente']:.1e}, "
+          f"u(pendiente) {resultado['error_relativo_u_pendiente']:.1e}")
@@ -0,0 +1,175 @@
+"""
+Remuestreo - Intervalos bootstrap y jackknife para la pendiente de un ajuste lineal
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo estima la incertidumbre de la pendiente de y = a + b·x
+(por ejemplo, c en Δd vs Δt del Experimento 4) a partir de la dispersión de los
+propios datos. El bootstrap genera los remuestreos como una matriz de índices y
+ajusta todas las filas a la vez en forma cerrada, sin un bucle de linregress;
+los remuestreos se procesan en bloques de memoria acotada y, opcionalmente,
+repartidos en un pool de procesos. El jackknife (dejar uno fuera) se obtiene
+descontando cada punto de las sumas del ajuste completo. Entrega el error
+estándar y los intervalos percentil y BCa (bootstrap) y t de Student (jackknife).
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+
+# Elementos de la matriz de índices por bloque (remuestreos × puntos): ~32 MB con int64
+ELEMENTOS_BLOQUE = 2**22
+
+
+def _centrar(x, y):
+    # La pendiente no cambia al centrar, y las sumas de cuadrados no pierden precisión
+    x = np.asarray(x, dtype=float).ravel()
+    y = np.asarray(y, dtype=float).ravel()
+    return x - x.mean(), y - y.mean()
+
+
+def _pendientes_indices(x, y, indices):
+    """Pendiente de mínimos cuadrados de cada fila de `indices` (forma (n_remuestreos, n))."""
+    n = indices.shape[1]
+    # Con x relativo al primer punto de cada fila, una fila con todos los x iguales
+    # da sxx = 0 exacto y no un residuo de redondeo con una pendiente arbitraria
+    xi = x[indices]
+    xi -= xi[:, :1]
+    yi = y[indices]
+    sx = xi.sum(axis=1)
+    sy = yi.sum(axis=1)
+    sxx = np.einsum("ij,ij->i", xi, xi) - sx*sx/n
+    sxy = np.einsum("ij,ij->i", xi, yi) - sx*sy/n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Un remuestreo con todos los x iguales no define la pendiente: queda NaN
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def _bloque_bootstrap(semilla, n_remuestreos, x, y):
+    rng = np.random.default_rng(semilla)
+    tipo = np.int32 if x.size < 2**31 else np.int64
+    indices = rng.integers(0, x.size, size=(n_remuestreos, x.size), dtype=tipo)
+    return _pendientes_indices(x, y, indices)
+
+
+def jackknife_pendiente(x, y, confianza=0.95):
+    """
+    Pendientes dejando fuera cada punto, en O(n): las sumas de cada submuestra son
+    las del ajuste completo menos la contribución del punto omitido.
+    """
+    from scipy.stats import t as t_student
+
+    x, y = _centrar(x, y)
+    n = x.size
+    # Sumas sin el punto i (Σx = Σy = 0 por el centrado)
+    sx, sy = -x, -y
+    sxx = np.dot(x, x) - x*x - sx*sx/(n - 1)
+    sxy = np.dot(x, y) - x*y - sx*sy/(n - 1)
+    pendientes = sxy / sxx
+
+    b = np.dot(x, y) / np.dot(x, x)
+    media = pendientes.mean()
+    sesgo = (n - 1) * (media - b)
+    u = np.sqrt((n - 1) / n * np.sum((pendientes - media)**2))
+    k = t_student.ppf(0.5 + confianza/2, n - 1)
+    corregida = b - sesgo
+    return {
+        "pendiente": b,
+        "pendientes": pendientes,
+        "sesgo": sesgo,
+        "u_pendiente": u,
+        "intervalo": (float(corregida - k*u), float(corregida + k*u)),
+    }
+
+
+def bootstrap_pendiente(x, y, n_remuestreos=10**5, confianza=0.95, tam_bloque=None, n_procesos=1,
+                        semilla=None):
+    """
+    Distribución bootstrap de la pendiente con `n_remuestreos` remuestreos de pares (x, y).
+
+    Los remuestreos se generan en bloques de a lo más `tam_bloque` filas (por
+    defecto ELEMENTOS_BLOQUE / n), cada uno con su propio generador derivado de
+    `semilla`, de modo que el resultado no depende de n_procesos. El intervalo BCa
+    usa la aceleración del jackknife.
+    """
+    x, y = _centrar(x, y)
+    if tam_bloque is None:
+        tam_bloque = max(1, ELEMENTOS_BLOQUE // x.size)
+    tamaños = [min(tam_bloque, n_remuestreos - inicio) for inicio in range(0, n_remuestreos, tam_bloque)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamaños))
+
+    t0 = time.perf_counter()
+    if n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            bloques = list(pool.map(_bloque_bootstrap, semillas, tamaños, [x]*len(tamaños), [y]*len(tamaños)))
+    else:
+        bloques = [_bloque_bootstrap(s, n, x, y) for s, n in zip(semillas, tamaños)]
+    t_total = time.perf_counter() - t0
+
+    pendientes = np.concatenate(bloques)
+    degenerados = int(np.isnan(pendientes).sum())
+    pendientes = pendientes[~np.isnan(pendientes)]
+
+    b = np.dot(x, y) / np.dot(x, x)
+    alfa = (1 - confianza) / 2
+    percentil = tuple(float(v) for v in np.quantile(pendientes, [alfa, 1 - alfa]))
+
+    # BCa: corrección de sesgo z0 y aceleración a a partir del jackknife
+    normal = NormalDist()
+    fraccion = np.clip(np.mean(pendientes < b), 1/pendientes.size, 1 - 1/pendientes.size)
+    z0 = normal.inv_cdf(fraccion)
+    jack = jackknife_pendiente(x, y)["pendientes"]
+    d = jack.mean() - jack
+    denominador = 6 * np.sum(d*d)**1.5
+    a = np.sum(d**3) / denominador if denominador > 0 else 0.0
+    niveles = []
+    for z in (normal.inv_cdf(alfa), normal.inv_cdf(1 - alfa)):
+        niveles.append(normal.cdf(z0 + (z0 + z) / (1 - a*(z0 + z))))
+    bca = tuple(float(v) for v in np.quantile(pendientes, niveles))
+
+    return {
+        "pendiente": b,
+        "pendientes": pendientes,
+        "u_pendiente": pendientes.std(ddof=1),
+        "intervalo_percentil": percentil,
+        "intervalo_bca": bca,
+        "n_remuestreos": n_remuestreos,
+        "degenerados": degenerados,
+        "t_total": t_total,
+    }
+
+
+def benchmark_bootstrap(n_remuestreos=10**6, semilla=0):
+    """Remuestreos por segundo en forma cerrada frente a un bucle de linregress (estimado con 2000)."""
+    from scipy.stats import linregress
+    from Experimento4 import fases, distancias
+
+    rng = np.random.default_rng(semilla)
+    n_bucle = 2000
+    t0 = time.perf_counter()
+    for _ in range(n_bucle):
+        i = rng.integers(0, fases.size, fases.size)
+        if np.ptp(fases[i]) > 0:
+            linregress(fases[i], distancias[i])
+    t_linregress = (time.perf_counter() - t0) / n_bucle
+
+    resultado = bootstrap_pendiente(fases, distancias, n_remuestreos, semilla=semilla)
+    return {
+        "n_remuestreos": n_remuestreos,
+        "remuestreos_s_linregress": 1 / t_linregress,
+        "remuestreos_s_cerrada": n_remuestreos / resultado["t_total"],
+        "resultado": resultado,
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_bootstrap()
+    b = resultado["resultado"]
+    print(f"{resultado['n_remuestreos']} remuestreos en {b['t_total']:.2f} s: "
+          f"{resultado['remuestreos_s_cerrada']:.2e} remuestreos/s en forma cerrada, "
+          f"{resultado['remuestreos_s_linregress']:.2e} con linregress en bucle")
+    print(f"c = {b['pendiente']:.3e} ± {b['u_pendiente']:.1e} m/s, "
+          f"BCa 95%: [{b['intervalo_bca'][0]:.3e}, {b['intervalo_bca'][1]:.3e}] "
+          f"({b['degenerados']} remuestreos degenerados)")
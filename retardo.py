@@ -0,0 +1,186 @@
+"""
+Retardo - Desfase temporal entre canales del osciloscopio por correlación cruzada
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo obtiene el Δt del Experimento 4 directamente de las
+capturas del osciloscopio en lugar de leerlo a mano en la pantalla. Cada captura
+tiene el canal de referencia y el del fotoreceptor; las capturas de todas las
+posiciones del espejo van una tras otra en las columnas "referencia" y "senal"
+de un archivo (.fmc, .npy, .npz o .csv, ver datos.cargar_datos), que se lee
+mapeado en memoria y por bloques de capturas. El retardo de cada captura es el
+máximo de la correlación cruzada, calculada con FFT para todo el bloque a la vez,
+refinado entre muestras con una parábola por los tres puntos del máximo. Un
+filtro pasa bajos opcional sobre el espectro cruzado quita el ruido fuera de la
+banda del pulso, que de otro modo domina el error del refinamiento.
+Uso: python retardo.py [--capturas N] [--muestras L] [--corte HZ] [--archivo RUTA]   (benchmark con capturas sintéticas)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from datos import cargar_datos, crear_columnar
+
+# Muestras (de ambos canales) por bloque de capturas: acota la memoria de las FFT
+ELEMENTOS_BLOQUE = 2**22
+
+
+def _interpolar_maximo(correlacion):
+    """Posición del máximo de cada fila con resolución menor que una muestra (parábola por 3 puntos)."""
+    filas = np.arange(correlacion.shape[0])
+    k = np.argmax(correlacion, axis=1)
+    k = np.clip(k, 1, correlacion.shape[1] - 2)
+    y0 = correlacion[filas, k - 1]
+    y1 = correlacion[filas, k]
+    y2 = correlacion[filas, k + 1]
+    curvatura = y0 - 2*y1 + y2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        desplazamiento = np.where(curvatura < 0, 0.5 * (y0 - y2) / curvatura, 0.0)
+    return k + desplazamiento
+
+
+def retardos_bloque(referencia, senal, retardo_max=None, corte=None):
+    """
+    Retardo en muestras de `senal` respecto a `referencia` para cada fila (forma
+    (n_capturas, n_muestras)); positivo si la señal llega después. Solo se buscan
+    retardos con |Δ| <= retardo_max muestras (por defecto, la mitad de la captura).
+    corte: frecuencia de corte del pasa bajos en ciclos por muestra (None, sin filtro).
+    """
+    from scipy import fft
+
+    referencia = np.asarray(referencia, dtype=float)
+    senal = np.asarray(senal, dtype=float)
+    n = referencia.shape[1]
+    m = n // 2 if retardo_max is None else int(min(retardo_max, n - 1))
+
+    # Relleno con ceros hasta n + m: los retardos buscados no se mezclan con la correlación circular
+    n_fft = fft.next_fast_len(n + m + 1, real=True)
+    referencia = referencia - referencia.mean(axis=1, keepdims=True)
+    senal = senal - senal.mean(axis=1, keepdims=True)
+    espectro = np.conj(fft.rfft(referencia, n_fft, axis=1, workers=-1))
+    espectro *= fft.rfft(senal, n_fft, axis=1, workers=-1)
+    if corte is not None:
+        espectro[:, int(corte*n_fft) + 1:] = 0
+    correlacion = fft.irfft(espectro, n_fft, axis=1, workers=-1)
+
+    # Retardos -m..m contiguos: los negativos están al final del resultado de la FFT
+    ventana = np.concatenate([correlacion[:, n_fft - m:], correlacion[:, :m + 1]], axis=1)
+    return _interpolar_maximo(ventana) - m
+
+
+def estimar_retardos(datos, muestras_por_captura, frecuencia_muestreo, retardo_max=None, frecuencia_corte=None,
+                     tam_bloque=None):
+    """
+    Δt [s] de cada captura de `datos` (ConjuntoDatos con columnas "referencia" y
+    "senal", capturas de `muestras_por_captura` muestras una tras otra). Las
+    capturas se leen de a `tam_bloque` (por defecto ELEMENTOS_BLOQUE / muestras)
+    como vistas del archivo; retardo_max [s] y frecuencia_corte [Hz] como en
+    retardos_bloque.
+    """
+    n = int(muestras_por_captura)
+    n_capturas = len(datos) // n
+    if n_capturas * n != len(datos):
+        raise ValueError(f"{len(datos)} muestras no son un número entero de capturas de {n}")
+    if tam_bloque is None:
+        tam_bloque = max(1, ELEMENTOS_BLOQUE // n)
+    if retardo_max is not None:
+        retardo_max = retardo_max * frecuencia_muestreo
+    corte = None if frecuencia_corte is None else frecuencia_corte / frecuencia_muestreo
+
+    referencia = datos["referencia"]
+    senal = datos["senal"]
+    retardos = np.empty(n_capturas)
+    for inicio in range(0, n_capturas, tam_bloque):
+        fin = min(inicio + tam_bloque, n_capturas)
+        retardos[inicio:fin] = retardos_bloque(referencia[inicio*n:fin*n].reshape(-1, n),
+                                               senal[inicio*n:fin*n].reshape(-1, n), retardo_max, corte)
+    return retardos / frecuencia_muestreo
+
+
+def cargar_retardos(ruta, muestras_por_captura, frecuencia_muestreo, retardo_max=None, frecuencia_corte=None):
+    """Δt [s] de cada captura de un archivo de capturas (ver estimar_retardos)."""
+    return estimar_retardos(cargar_datos(ruta), muestras_por_captura, frecuencia_muestreo, retardo_max,
+                            frecuencia_corte)
+
+
+#------------------------------------------------------------------------------------------
+
+#Capturas sintéticas para pruebas y mediciones de rendimiento
+
+def crear_capturas_sinteticas(ruta, retardos, muestras_por_captura=2**14, frecuencia_muestreo=2.5e9,
+                              ancho_pulso=2e-9, ruido=0.02, semilla=0):
+    """
+    Escribe un .fmc con una captura por retardo [s]: un pulso gaussiano del láser
+    en el canal de referencia y el mismo pulso atenuado y retrasado en el del
+    fotoreceptor, ambos con ruido. Las columnas se guardan en float32.
+    """
+    rng = np.random.default_rng(semilla)
+    n = int(muestras_por_captura)
+    retardos = np.asarray(retardos, dtype=float)
+    destino = crear_columnar(ruta, ["referencia", "senal"], retardos.size * n, np.float32)
+    t = np.arange(n) / frecuencia_muestreo
+    t_pulso = 0.1 * n / frecuencia_muestreo
+    por_bloque = max(1, ELEMENTOS_BLOQUE // n)
+    for inicio in range(0, retardos.size, por_bloque):
+        dt = retardos[inicio:inicio + por_bloque, None]
+        forma = (dt.shape[0], n)
+        referencia = np.exp(-0.5*((t - t_pulso) / ancho_pulso)**2) + rng.normal(0, ruido, forma)
+        senal = 0.3*np.exp(-0.5*((t - t_pulso - dt) / ancho_pulso)**2) + rng.normal(0, ruido, forma)
+        destino["referencia"][inicio*n:(inicio + dt.shape[0])*n] = referencia.ravel()
+        destino["senal"][inicio*n:(inicio + dt.shape[0])*n] = senal.ravel()
+    for columna in destino.values():
+        columna.flush()
+    return ruta
+
+
+def benchmark_retardos(ruta, n_capturas=2000, muestras_por_captura=2**14, frecuencia_muestreo=2.5e9,
+                       frecuencia_corte=200e6, semilla=0):
+    """Capturas por minuto y error de los Δt frente a los retardos simulados (c ≈ 2.2e8 m/s, como en clase)."""
+    rng = np.random.default_rng(semilla)
+    distancias = rng.uniform(16, 22, n_capturas)
+    retardos = (distancias + 28.6) / 2.19e8
+    crear_capturas_sinteticas(ruta, retardos, muestras_por_captura, frecuencia_muestreo, semilla=semilla)
+
+    t0 = time.perf_counter()
+    estimados = cargar_retardos(ruta, muestras_por_captura, frecuencia_muestreo, 500e-9, frecuencia_corte)
+    t_total = time.perf_counter() - t0
+    return {
+        "n_capturas": n_capturas,
+        "capturas_por_minuto": 60 * n_capturas / t_total,
+        "error_rms_s": float(np.sqrt(np.mean((estimados - retardos)**2))),
+        "retardos": estimados,
+        "distancias": distancias,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de la estimación de retardos por correlación cruzada")
+    parser.add_argument("--capturas", type=int, default=2000, help="número de capturas sintéticas")
+    parser.add_argument("--muestras", type=int, default=2**14, help="muestras por captura y canal")
+    parser.add_argument("--archivo", help="archivo de capturas a crear y conservar (por defecto, uno temporal)")
+    parser.add_argument("--corte", type=float, default=200e6,
+                        help="frecuencia de corte del pasa bajos [Hz] (0, sin filtro)")
+    args = parser.parse_args(argv)
+
+    if args.archivo:
+        resultado = benchmark_retardos(args.archivo, args.capturas, args.muestras,
+                                       frecuencia_corte=args.corte or None)
+    else:
+        # Las capturas sintéticas ocupan cientos de MB: sin --archivo se borran al terminar
+        with tempfile.TemporaryDirectory() as directorio:
+            resultado = benchmark_retardos(os.path.join(directorio, "capturas_sinteticas.fmc"), args.capturas,
+                                           args.muestras, frecuencia_corte=args.corte or None)
+    print(f"{resultado['n_capturas']} capturas de {args.muestras} muestras: "
+          f"{resultado['capturas_por_minuto']:.0f} capturas/min, "
+          f"error RMS de Δt = {resultado['error_rms_s']*1e12:.1f} ps")
+
+    from regresion import regresion_lineal
+    pendiente, intercepto, r, p, error = regresion_lineal(resultado["retardos"], resultado["distancias"])
+    print(f"Ajuste Δd vs Δt: c = {pendiente:.4e} ± {error:.1e} m/s (simulado 2.19e8 m/s)")
+
+
+if __name__ == "__main__":
+    main()
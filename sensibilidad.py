@@ -0,0 +1,241 @@
+"""
+Sensibilidad - Barrido de resoluciones instrumentales y factor de cobertura
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo responde qué instrumento limita la incertidumbre de cada
+resultado (la pendiente de Radiancia vs T⁴ del Experimento 3, u_c del
+Experimento 4 y la constante a de V = a/r² + b del Experimento 2) y cuánto se
+gana al cambiarlo. La propagación es la de primer orden que usan los scripts: con
+fuentes independientes, u² = Σ (c_s·u_s)², donde u_s = res_s/√12 y el coeficiente
+de sensibilidad c_s se calcula una sola vez a partir de las mediciones (para una
+pendiente de mínimos cuadrados, c_s² = Σ_i (∂b/∂m_i)², con m_i la magnitud que
+mide el instrumento s en el punto i). Así toda la grilla cartesiana de
+resoluciones y k se evalúa por broadcasting, sin repetir los análisis: 10⁶
+combinaciones en milisegundos. Se entregan la superficie de U = k·u, la fracción
+de la varianza que aporta cada fuente y la fuente dominante en cada punto.
+Uso: python sensibilidad.py [--experimento 2|3|4] [--puntos N] [--factor F]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+# Factores de cobertura del barrido por defecto
+K_BARRIDO = (1.0, 2.0, 3.0)
+
+
+def derivadas_pendiente(x, y, pesos=None):
+    """
+    Derivadas de la pendiente de mínimos cuadrados (ponderados si se dan pesos)
+    de y = a + b·x respecto de cada x_i y de cada y_i, con los pesos fijos.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    w = np.ones_like(x) if pesos is None else np.asarray(pesos, dtype=float)
+    x_m = np.sum(w*x) / np.sum(w)
+    y_m = np.sum(w*y) / np.sum(w)
+    Sxx = np.sum(w*(x - x_m)**2)
+    b = np.sum(w*(x - x_m)*(y - y_m)) / Sxx
+    db_dy = w*(x - x_m) / Sxx
+    db_dx = w*(y - y_m - 2*b*(x - x_m)) / Sxx
+    return b, db_dx, db_dy
+
+
+def _sensibilidad(*derivadas):
+    # c_s = √Σ_i (∂b/∂m_i)²: los errores de resolución de cada punto son independientes
+    return float(np.sqrt(sum(np.sum(np.asarray(d)**2) for d in derivadas)))
+
+
+def barrido(coeficientes, resoluciones, k=K_BARRIDO, fijas=None):
+    """
+    Incertidumbre sobre la grilla cartesiana de resoluciones y factores de cobertura.
+
+    coeficientes: {fuente: c_s}, sensibilidad del resultado a la incertidumbre
+    estándar de cada instrumento; resoluciones: {fuente: valores de la resolución}
+    (uno o más por fuente, cada fuente es un eje de la grilla en ese orden);
+    k: valores del factor de cobertura (último eje); fijas: {fuente: u} para
+    contribuciones que no dependen de las resoluciones (tipo A, dispersión del ajuste).
+
+    Retorna "U" (k·u, con la forma de la grilla), "u" (incertidumbre estándar),
+    "fraccion" ({fuente: u_s²/u²}) y "dominante" (índice en "fuentes" de la
+    mayor contribución); estos tres tienen largo 1 en el eje de k.
+    """
+    fijas = dict(fijas or {})
+    nombres = list(resoluciones)
+    ejes = [np.atleast_1d(np.asarray(resoluciones[n], dtype=float)) for n in nombres]
+    ejes.append(np.atleast_1d(np.asarray(k, dtype=float)))
+    n_ejes = len(ejes)
+
+    def eje(i, valores):
+        forma = [1] * n_ejes
+        forma[i] = valores.size
+        return valores.reshape(forma)
+
+    varianzas = [(coeficientes[n] * eje(i, ejes[i]) / np.sqrt(12))**2 for i, n in enumerate(nombres)]
+    varianzas += [np.full([1]*n_ejes, float(u)**2) for u in fijas.values()]
+    varianza = sum(varianzas)
+    u = np.sqrt(varianza)
+
+    forma = np.broadcast_shapes(*[v.shape for v in varianzas])
+    dominante = np.zeros(forma, dtype=np.intp)
+    maxima = np.broadcast_to(varianzas[0], forma).copy()
+    for i, v in enumerate(varianzas[1:], start=1):
+        mayor = v > maxima
+        dominante[mayor] = i
+        np.maximum(maxima, v, out=maxima)
+
+    fuentes = nombres + list(fijas)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraccion = {f: np.broadcast_to(v / varianza, forma) for f, v in zip(fuentes, varianzas)}
+    return {
+        "fuentes": fuentes,
+        "ejes": dict(zip(nombres + ["k"], ejes)),
+        "U": u * eje(n_ejes - 1, ejes[-1]),
+        "u": np.broadcast_to(u, forma),
+        "fraccion": fraccion,
+        "dominante": dominante,
+    }
+
+
+def grilla_resoluciones(nominales, n_puntos=32, factor=10.0):
+    """Para cada resolución nominal, n_puntos en escala logarítmica entre nominal/factor y nominal·factor."""
+    return {nombre: np.geomspace(res / factor, res * factor, n_puntos) for nombre, res in nominales.items()}
+
+
+#------------------------------------------------------------------------------------------
+
+#Coeficientes de sensibilidad de cada experimento
+
+def sensibilidad_experimento2():
+    """
+    c_s de la constante a de V = a/r² + b (Experimento 2), con los pesos de
+    Huber del ajuste robusto fijos. La huincha mueve x = 1/r² (∂x/∂r = -2/r³) y el
+    voltímetro mueve V; la repetibilidad (tipo A) entra como contribución fija.
+    """
+    from Experimento2 import distancias, voltaje, repetibilidad, res_Voltimetro, res_huincha
+    from ajuste_robusto import ajustar_inverso_cuadrado
+    from incertidumbre import AcumuladorTipoA, DDOF_TIPO_A
+
+    acum_V = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=res_Voltimetro/np.sqrt(12)).agregar_bloque(repetibilidad)
+    pesos = ajustar_inverso_cuadrado(distancias, voltaje, acum_V.u_combinada)["pesos"][0]
+    a, da_dx, da_dV = derivadas_pendiente(1 / distancias**2, voltaje, pesos)
+    return {
+        "resultado": "a",
+        "valor": a,
+        "unidad": "mV·cm²",
+        "coeficientes": {
+            "res_huincha": _sensibilidad(da_dx * -2 / distancias**3),
+            "res_Voltimetro": _sensibilidad(da_dV),
+        },
+        "nominales": {"res_huincha": res_huincha, "res_Voltimetro": res_Voltimetro},
+        "fijas": {"tipo_A": _sensibilidad(da_dV) * acum_V.u_A},
+    }
+
+
+def sensibilidad_experimento3():
+    """
+    c_s de la pendiente de Radiancia vs T⁴ (Experimento 3). El voltímetro y el
+    amperímetro mueven T⁴ a través de R = V/I y la calibración del tungsteno; el
+    sensor de radiación mueve la Radiancia.
+    """
+    from Experimento3 import Voltajes, Corrientes, Radiancia, R_ref, res_Voltaje, res_Corriente, res_Radiancia
+    from tungsteno import CalibracionTungsteno
+
+    T, dT_dR_rel = CalibracionTungsteno().evaluar(Voltajes / Corrientes / R_ref)
+    dT4_dR_rel = 4 * T**3 * dT_dR_rel
+    b, db_dx, db_dy = derivadas_pendiente(T**4, Radiancia)
+    return {
+        "resultado": "pendiente",
+        "valor": b,
+        "unidad": "mV/K^4",
+        "coeficientes": {
+            "res_Voltaje": _sensibilidad(db_dx * dT4_dR_rel / (Corrientes * R_ref)),
+            "res_Corriente": _sensibilidad(db_dx * dT4_dR_rel * Voltajes / (Corrientes**2 * R_ref)),
+            "res_Radiancia": _sensibilidad(db_dy),
+        },
+        "nominales": {"res_Voltaje": res_Voltaje, "res_Corriente": res_Corriente, "res_Radiancia": res_Radiancia},
+        "fijas": {},
+    }
+
+
+def sensibilidad_experimento4():
+    """c_s de u_c tal como la propaga el Experimento 4: u_c² = (u_dd/t̄)² + (d̄·u_dt/t̄²)²."""
+    from Experimento4 import fases, distancias, res_fase, res_huincha
+    from regresion import regresion_lineal
+
+    t_prom = np.mean(fases)
+    d_prom = np.mean(distancias)
+    return {
+        "resultado": "c",
+        "valor": regresion_lineal(fases, distancias)[0],
+        "unidad": "m/s",
+        "coeficientes": {"res_fase": d_prom / t_prom**2, "res_huincha": 1 / t_prom},
+        "nominales": {"res_fase": res_fase, "res_huincha": res_huincha},
+        "fijas": {},
+    }
+
+
+SENSIBILIDADES = {2: sensibilidad_experimento2, 3: sensibilidad_experimento3, 4: sensibilidad_experimento4}
+
+
+def barrido_experimento(experimento, n_puntos=32, factor=10.0, k=K_BARRIDO):
+    """Barrido de las resoluciones del experimento alrededor de sus valores nominales (ver barrido)."""
+    s = SENSIBILIDADES[experimento]()
+    t0 = time.perf_counter()
+    resultado = barrido(s["coeficientes"], grilla_resoluciones(s["nominales"], n_puntos, factor), k, s["fijas"])
+    resultado["t_barrido"] = time.perf_counter() - t0
+    resultado["nominal"] = barrido(s["coeficientes"], s["nominales"], 1.0, s["fijas"])
+    resultado.update({clave: s[clave] for clave in ("resultado", "valor", "unidad", "nominales", "coeficientes",
+                                                    "fijas")})
+    return resultado
+
+
+#------------------------------------------------------------------------------------------
+
+#Resumen
+
+def _imprimir(experimento, resultado):
+    nominal = resultado["nominal"]
+    n_combinaciones = int(np.prod(resultado["U"].shape))
+    print(f"\n--- Experimento {experimento}: u({resultado['resultado']}), "
+          f"{resultado['resultado']} = {resultado['valor']:.3e} {resultado['unidad']} ---")
+    print(f"{n_combinaciones} combinaciones en {resultado['t_barrido']*1e3:.1f} ms")
+    print(f"Con las resoluciones actuales: u = {nominal['u'].item():.2e} {resultado['unidad']}")
+    for fuente in nominal["fuentes"]:
+        print(f"  {fuente:<16} {nominal['fraccion'][fuente].item()*100:6.1f} % de la varianza")
+
+    dominante = resultado["dominante"]
+    print("Fuente dominante en la grilla:")
+    for i, fuente in enumerate(resultado["fuentes"]):
+        print(f"  {fuente:<16} {np.mean(dominante == i)*100:6.1f} % de las combinaciones")
+
+    # Ganancia al mejorar un solo instrumento a la menor resolución del barrido
+    print("Mejorando un solo instrumento al extremo del barrido (k = 1):")
+    for fuente, res in resultado["nominales"].items():
+        mejor = resultado["ejes"][fuente].min()
+        u = barrido(resultado["coeficientes"], dict(resultado["nominales"], **{fuente: mejor}), 1.0,
+                    resultado["fijas"])["u"].item()
+        print(f"  {fuente:<16} {res:.3g} → {mejor:.3g}: u = {u:.2e} {resultado['unidad']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de sensibilidad a las resoluciones de los instrumentos")
+    parser.add_argument("--experimento", type=int, nargs="+", default=sorted(SENSIBILIDADES),
+                        choices=sorted(SENSIBILIDADES), help="experimentos a barrer")
+    parser.add_argument("--puntos", type=int, default=None,
+                        help="valores por resolución (por defecto, los necesarios para ~10⁶ combinaciones)")
+    parser.add_argument("--factor", type=float, default=10.0, help="el barrido va de res/factor a res·factor")
+    parser.add_argument("--k", type=float, nargs="+", default=list(K_BARRIDO), help="factores de cobertura")
+    args = parser.parse_args(argv)
+
+    for experimento in args.experimento:
+        n_puntos = args.puntos
+        if n_puntos is None:
+            n_resoluciones = len(SENSIBILIDADES[experimento]()["nominales"])
+            n_puntos = int(np.ceil((10**6 / len(args.k))**(1 / n_resoluciones)))
+        _imprimir(experimento, barrido_experimento(experimento, n_puntos, args.factor, args.k))
+
+
+if __name__ == "__main__":
+    main()
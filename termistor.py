@@ -0,0 +1,582 @@
+"""
+Termistor - Calibración y conversión Resistencia → Temperatura
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo reúne la tabla de calibración del termistor usado en el
+Experimento 1, el modelo de Steinhart-Hart y el spline cúbico, y ofrece una
+conversión vectorizada de resistencias a temperatura para arrays completos o
+para registros largos entregados por bloques.
+"""
+
+import os
+import time
+
+import numpy as np
+from scipy.interpolate import interp1d, make_interp_spline
+
+# Datos tabla del fabricante
+R = np.array([2041.7, 2157.6, 2281.0, 2412.6, 2553.0, 2702.7, 2862.5, 3033.3, 3215.8, 3411.0,
+              3619.8, 3843.4, 4082.9, 4339.7, 4615.1, 4910.7, 5228.1, 5569.3, 5936.1, 6330.8,
+              6755.9, 7214.0, 7707.7, 8240.6, 8816.0, 9437.7, 10100, 10837, 11625, 12479,
+              13405, 14410, 15502, 16689, 17980, 19386, 20919, 22590, 24415, 26409, 28590,
+              30976, 33591, 36458, 39605, 43062, 46863, 51048, 55658, 60743, 66356, 72560, 79422])
+
+T_C = np.array([134 - 2*i for i in range(53)])  # °C
+T_K = T_C + 273.15  # Kelvin
+
+# --- Coeficientes dados Steinhart-Hart ---
+A = 8.467428050163e-4
+B = 2.058325204985e-4
+C = 9.050118014518e-8
+
+# Factores de conversión a Ohms
+UNIDADES = {"ohm": 1.0, "kohm": 1000.0}
+
+
+# --- Modelo Steinhart-Hart ---
+def steinhart(R):
+    lnR = np.log(R)
+    return 1.0 / (A + lnR*(B + C*lnR*lnR))  # forma de Horner: un solo log y sin potencias
+
+
+# --- Interpolación spline cúbico ---
+spline = interp1d(R, T_K, kind="cubic")
+derivada_spline = make_interp_spline(R, T_K, k=3).derivative()  # dT/dR [K/Ω] del mismo spline
+
+
+#------------------------------------------------------------------------------------------
+
+#Conversión vectorizada
+
+def redondear(T, resolucion):
+    """Redondea un array de temperaturas al múltiplo más cercano de `resolucion` (K)."""
+    if resolucion is None:
+        return T
+    decimales = max(0, -int(np.floor(np.log10(resolucion))))
+    return np.round(np.round(T / resolucion) * resolucion, decimales)
+
+
+def _evaluar_spline(R_ohm):
+    # Fuera del rango de la tabla el spline no está definido: se marca con NaN
+    T = np.full(R_ohm.shape, np.nan)
+    dentro = (R_ohm >= R[0]) & (R_ohm <= R[-1])
+    T[dentro] = spline(R_ohm[dentro])
+    return T
+
+
+def convertir_resistencias(resistencias, unidad="ohm", modelo="spline", resolucion=0.1):
+    """
+    Convierte un array de resistencias a temperatura [K] en una sola pasada.
+
+    resistencias: array de cualquier forma, en la unidad indicada ("ohm" o "kohm").
+    modelo: "spline", "steinhart" o "ambos" (retorna la tupla (T_spline, T_SH)).
+    resolucion: paso de redondeo en K aplicado a todo el array (None = sin redondeo).
+    Los valores fuera del rango de la tabla quedan como NaN en el spline.
+    """
+    if unidad not in UNIDADES:
+        raise ValueError(f"Unidad desconocida: {unidad!r} (use 'ohm' o 'kohm')")
+    R_ohm = np.asarray(resistencias, dtype=float) * UNIDADES[unidad]
+
+    if modelo == "spline":
+        return redondear(_evaluar_spline(R_ohm), resolucion)
+    if modelo == "steinhart":
+        return redondear(steinhart(R_ohm), resolucion)
+    if modelo == "ambos":
+        return redondear(_evaluar_spline(R_ohm), resolucion), redondear(steinhart(R_ohm), resolucion)
+    raise ValueError(f"Modelo desconocido: {modelo!r} (use 'spline', 'steinhart' o 'ambos')")
+
+
+def convertir_por_bloques(bloques, **opciones):
+    """Convierte un iterador de bloques de resistencias, entregando un bloque de temperaturas por cada uno."""
+    for bloque in bloques:
+        yield convertir_resistencias(bloque, **opciones)
+
+
+#------------------------------------------------------------------------------------------
+
+#Calibración compilada: tabla uniforme en ln(R) con polinomios de Hermite cúbicos
+
+def _ruta_npz(ruta):
+    # np.savez agrega ".npz" si falta: guardar y cargar usan la misma ruta final
+    ruta = os.fspath(ruta)
+    return ruta if ruta.endswith(".npz") else ruta + ".npz"
+
+
+class CalibracionCompilada:
+    """
+    Aproximación precalculada de T(R) sobre una grilla uniforme en ln(R).
+
+    Cada intervalo guarda un polinomio cúbico de Hermite construido con el valor y
+    la derivada exactos del modelo en sus extremos, de modo que evaluar cuesta un
+    log, un índice y un Horner por muestra, sin búsqueda binaria. `error_max` es
+    una cota garantizada del error frente al modelo exacto en todo el rango (resto
+    de Hermite más un margen de redondeo, ver compilar_calibracion).
+    Fuera del rango, o con R ≤ 0, la temperatura es NaN.
+    """
+
+    def __init__(self, lnR_min, paso, coeficientes, fuente, error_max):
+        self.lnR_min = float(lnR_min)
+        self.paso = float(paso)
+        self.coeficientes = np.ascontiguousarray(coeficientes)  # forma (4, n_intervalos)
+        self.fuente = str(fuente)
+        self.error_max = float(error_max)
+
+    @property
+    def n_intervalos(self):
+        return self.coeficientes.shape[1]
+
+    @property
+    def rango(self):
+        lnR_max = self.lnR_min + self.paso*self.n_intervalos
+        return np.exp(self.lnR_min), np.exp(lnR_max)
+
+    def __call__(self, R_ohm):
+        R_ohm = np.asarray(R_ohm, dtype=float)
+        escalar = R_ohm.ndim == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = np.log(np.atleast_1d(R_ohm))
+        u -= self.lnR_min
+        u /= self.paso
+        # Margen de 1e-9 intervalos para que los extremos de la tabla no queden fuera por
+        # redondeo del log; incluye R ≤ 0 (log -inf o NaN)
+        fuera = ~((u >= -1e-9) & (u <= self.n_intervalos + 1e-9))
+        u[fuera] = 0.0
+        i = np.minimum(u.astype(np.intp), self.n_intervalos - 1)
+        u -= i  # u pasa a ser la posición t ∈ [0, 1] dentro del intervalo
+        c0, c1, c2, c3 = self.coeficientes
+        T = c3.take(i)
+        T *= u
+        T += c2.take(i)
+        T *= u
+        T += c1.take(i)
+        T *= u
+        T += c0.take(i)
+        T[fuera] = np.nan
+        return T[0] if escalar else T
+
+    def guardar(self, ruta):
+        ruta = _ruta_npz(ruta)
+        np.savez(ruta, lnR_min=self.lnR_min, paso=self.paso, coeficientes=self.coeficientes,
+                 fuente=self.fuente, error_max=self.error_max)
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(_ruta_npz(ruta)) as datos:
+            return cls(datos["lnR_min"], datos["paso"], datos["coeficientes"],
+                       datos["fuente"], datos["error_max"])
+
+
+def _cota_error_spline(bspl, nodos):
+    # Cota del error del Hermite cúbico en cada intervalo [nodos[j], nodos[j+1]] (u = ln R) para
+    # el spline cúbico en R. Con R = e^u y g(R) cúbica por tramos, d⁴T/du⁴ = R·g' + 7R²·g'' + 6R³·g'''
+    # es otro polinomio cúbico en R (su máximo está en los extremos o donde se anula su derivada).
+    # En cada nudo del spline d³T/du³ salta en R³·Δg''', y el resto de Hermite suma h³/192 por salto
+    from numpy.polynomial import Polynomial
+    from scipy.interpolate import PPoly
+
+    tramos = PPoly.from_spline(bspl)
+    paso = nodos[1] - nodos[0]
+    R_nodos = np.exp(nodos)
+    R_nodos[0], R_nodos[-1] = tramos.x[0], tramos.x[-1]
+    d4_max = np.zeros(nodos.size - 1)
+    saltos = np.zeros(nodos.size - 1)
+    anterior = None
+    for k in range(tramos.x.size - 1):
+        x0, x1 = tramos.x[k], tramos.x[k + 1]
+        if x1 <= x0:
+            continue
+        j0 = max(np.searchsorted(R_nodos, x0, side="right") - 1, 0)
+        j1 = min(np.searchsorted(R_nodos, x1, side="left"), d4_max.size)
+        if anterior is not None:
+            saltos[j0] += x0**3 * abs(6*(tramos.c[0, k] - tramos.c[0, anterior]))
+        anterior = k
+
+        g = Polynomial(tramos.c[::-1, k])  # en s = R - x0
+        R_s = Polynomial([x0, 1.0])
+        d4 = R_s*g.deriv() + 7*R_s**2*g.deriv(2) + 6*R_s**3*g.deriv(3)
+        extremos = np.abs(d4(np.clip(R_nodos[j0:j1 + 1], x0, x1) - x0))
+        np.maximum.at(d4_max, np.arange(j0, j1), np.maximum(extremos[:-1], extremos[1:]))
+        for raiz in d4.deriv().roots():
+            if np.isreal(raiz) and 0 <= raiz.real <= x1 - x0:
+                j = np.clip(np.searchsorted(R_nodos, x0 + raiz.real, side="right") - 1, 0, d4_max.size - 1)
+                d4_max[j] = max(d4_max[j], abs(d4(raiz.real)))
+    return paso**4/384 * d4_max + paso**3/192 * saltos
+
+
+def _cota_error_steinhart(coeficientes, nodos):
+    # Cota del error del Hermite cúbico en cada intervalo, h⁴/384·max|d⁴T/du⁴|, para T = 1/P(u) con
+    # P = a + b·u + c·u³: d⁴T/du⁴ = (8P'P''' + 6P''²)/P³ - 36P'²P''/P⁴ + 24P'⁴/P⁵, acotando cada factor
+    a, b, c = coeficientes
+    u_a, u_b = nodos[:-1], nodos[1:]
+
+    def P(u):
+        return a + u*(b + c*u*u)
+
+    def dP(u):
+        return b + 3*c*u*u
+
+    candidatos = [u_a, u_b]
+    if c != 0 and -b / (3*c) > 0:  # extremos locales de P
+        raiz = np.sqrt(-b / (3*c))
+        candidatos += [np.clip(raiz, u_a, u_b), np.clip(-raiz, u_a, u_b)]
+    valores_P = np.array([P(u) for u in candidatos])
+    # Si P cambia de signo en el intervalo, T tiene un polo y no hay cota
+    mismo_signo = (valores_P > 0).all(axis=0) | (valores_P < 0).all(axis=0)
+    min_P = np.where(mismo_signo, np.abs(valores_P).min(axis=0), 0.0)
+    max_dP = np.max(np.abs([dP(u_a), dP(u_b), dP(np.clip(0.0, u_a, u_b))]), axis=0)
+    max_d2P = 6*abs(c)*np.maximum(np.abs(u_a), np.abs(u_b))
+    d3P = 6*abs(c)
+    with np.errstate(divide="ignore"):
+        d4_max = ((8*max_dP*d3P + 6*max_d2P**2) / min_P**3 + 36*max_dP**2*max_d2P / min_P**4
+                  + 24*max_dP**4 / min_P**5)
+    return (u_b - u_a)**4/384 * d4_max
+
+
+def _modelo_en_lnR(fuente, R_tabla=R, T_tabla=T_K, coeficientes=(A, B, C)):
+    # Retorna T(u) y dT/du con u = ln(R), la cota del error de Hermite por intervalo de una grilla y el rango de u
+    if fuente == "spline":
+        bspl = make_interp_spline(R_tabla, T_tabla, k=3)  # mismo spline que interp1d(kind="cubic")
+        dbspl = bspl.derivative()
+        R_min, R_max = R_tabla[0], R_tabla[-1]
+
+        def T(u):
+            return bspl(np.clip(np.exp(u), R_min, R_max))
+
+        def dT(u):
+            R_u = np.clip(np.exp(u), R_min, R_max)
+            return dbspl(R_u) * R_u
+
+        def cota(nodos):
+            return _cota_error_spline(bspl, nodos)
+        return T, dT, cota, np.log(R_min), np.log(R_max)
+
+    if fuente == "steinhart":
+        a, b, c = coeficientes
+
+        def T(u):
+            return 1.0 / (a + u*(b + c*u*u))
+
+        def dT(u):
+            P = a + u*(b + c*u*u)
+            return -(b + 3*c*u*u) / P**2
+
+        def cota(nodos):
+            return _cota_error_steinhart(coeficientes, nodos)
+        return T, dT, cota, np.log(R_tabla[0]), np.log(R_tabla[-1])
+
+    raise ValueError(f"Fuente desconocida: {fuente!r} (use 'spline' o 'steinhart')")
+
+
+def compilar_calibracion(fuente="spline", tolerancia=1e-3, n_inicial=64, n_maximo=2**20, **modelo):
+    """
+    Construye una CalibracionCompilada cuyo error frente al modelo exacto ("spline"
+    de la tabla o "steinhart" con coeficientes A, B, C) sea menor que `tolerancia`
+    [K] en todo el rango. En un intervalo de ancho h (en ln R) el error del
+    Hermite cúbico es a lo más h⁴/384·max|d⁴T/du⁴|, más h³/192·|salto de d³T/du³|
+    por cada nudo del spline dentro del intervalo; la derivada se acota en cada
+    intervalo con la forma conocida del modelo (tramos cúbicos del spline o el
+    polinomio de Steinhart-Hart), y se suma un margen para el redondeo al evaluar
+    (64 ε·max|T|, unos 4e-12 K). Duplica el número de intervalos hasta que la cota
+    cumpla la tolerancia; si con `n_maximo` intervalos no la cumple, lanza ValueError.
+    """
+    T, dT, cota_intervalos, lnR_min, lnR_max = _modelo_en_lnR(fuente, **modelo)
+    n = n_inicial
+    while True:
+        nodos = np.linspace(lnR_min, lnR_max, n + 1)
+        paso = nodos[1] - nodos[0]
+        y = T(nodos)
+        cota = float(np.max(cota_intervalos(nodos))) + 64*np.finfo(float).eps*np.max(np.abs(y))
+        if cota < tolerancia:
+            break
+        if n >= n_maximo:
+            raise ValueError(f"Con {n} intervalos la cota del error es {cota:.2e} K, mayor que la tolerancia "
+                             f"{tolerancia:.2e} K (aumente n_maximo)")
+        n *= 2
+
+    d = dT(nodos) * paso
+    coeficientes = np.array([
+        y[:-1],
+        d[:-1],
+        3*(y[1:] - y[:-1]) - 2*d[:-1] - d[1:],
+        2*(y[:-1] - y[1:]) + d[:-1] + d[1:],
+    ])
+    return CalibracionCompilada(lnR_min, paso, coeficientes, fuente, cota)
+
+
+#------------------------------------------------------------------------------------------
+
+#Ajuste de coeficientes Steinhart-Hart para muchos termistores a la vez
+
+def _splines_en_lotes(x, y):
+    """
+    Segundas derivadas M de los splines cúbicos "not-a-knot" (los mismos de
+    interp1d(kind="cubic")) para un lote de curvas: x, y de forma (n_curvas, n_puntos),
+    con x creciente en cada fila. Resuelve los sistemas tridiagonales con el
+    algoritmo de Thomas, vectorizado sobre las curvas.
+    """
+    h = np.diff(x, axis=1)
+    r = 6*np.diff(np.diff(y, axis=1) / h, axis=1)  # lado derecho, nodos interiores
+    n = r.shape[1]
+
+    # Sistema tridiagonal para M_1 ... M_{n-2}: sub, diag, sup
+    sub = h[:, :-1].copy()
+    diag = 2*(h[:, :-1] + h[:, 1:])
+    sup = h[:, 1:].copy()
+    # Condición not-a-knot: M_0 y M_{n-1} se eliminan de la primera y última ecuación
+    h0, h1 = h[:, 0], h[:, 1]
+    diag[:, 0] += h0*(h0 + h1)/h1
+    sup[:, 0] -= h0**2/h1
+    hn, hm = h[:, -1], h[:, -2]
+    diag[:, -1] += hn*(hm + hn)/hm
+    sub[:, -1] -= hn**2/hm
+
+    for i in range(1, n):
+        w = sub[:, i] / diag[:, i-1]
+        diag[:, i] -= w*sup[:, i-1]
+        r[:, i] -= w*r[:, i-1]
+    M_int = np.empty_like(r)
+    M_int[:, -1] = r[:, -1] / diag[:, -1]
+    for i in range(n - 2, -1, -1):
+        M_int[:, i] = (r[:, i] - sup[:, i]*M_int[:, i+1]) / diag[:, i]
+
+    M0 = ((h0 + h1)*M_int[:, 0] - h0*M_int[:, 1]) / h1
+    Mn = ((hm + hn)*M_int[:, -1] - hn*M_int[:, -2]) / hm
+    return np.column_stack([M0, M_int, Mn])
+
+
+def _evaluar_splines_en_intervalos(x, y, M, t):
+    """Evalúa los splines del lote en las posiciones relativas t ∈ [0, 1] de cada intervalo."""
+    h = np.diff(x, axis=1)[..., None]
+    a = (1 - t) * h  # x_{i+1} - x
+    b = t * h        # x - x_i
+    M_i, M_j = M[:, :-1, None], M[:, 1:, None]
+    y_i, y_j = y[:, :-1, None], y[:, 1:, None]
+    h2 = h*h
+    S = (a*(M_i*(a*a - h2) + 6*y_i) + b*(M_j*(b*b - h2) + 6*y_j)) / (6*h)
+    return x[:, :-1, None] + b, S
+
+
+def ajustar_steinhart_lotes(R_tablas, T_tablas, puntos_por_intervalo=8, tam_bloque=1000):
+    """
+    Ajusta A, B, C de Steinhart-Hart por mínimos cuadrados lineales en
+    (1, ln R, ln³R) para un lote de termistores en una sola resolución QR apilada.
+
+    R_tablas, T_tablas: arrays de forma (n_termistores, n_puntos) en Ohm y K.
+    Retorna un diccionario con los coeficientes (n_termistores, 3), los residuos
+    en K en cada punto de la tabla y, por termistor, la máxima desviación entre
+    Steinhart-Hart y el spline cúbico de su propia tabla, evaluada en
+    `puntos_por_intervalo` puntos interiores de cada intervalo.
+    """
+    R_tablas = np.atleast_2d(np.asarray(R_tablas, dtype=float))
+    T_tablas = np.atleast_2d(np.asarray(T_tablas, dtype=float))
+    if R_tablas.shape != T_tablas.shape:
+        raise ValueError("R_tablas y T_tablas deben tener la misma forma")
+
+    orden = np.argsort(R_tablas, axis=1)
+    R_tablas = np.take_along_axis(R_tablas, orden, axis=1)
+    T_tablas = np.take_along_axis(T_tablas, orden, axis=1)
+
+    lnR = np.log(R_tablas)
+    X = np.stack([np.ones_like(lnR), lnR, lnR*lnR*lnR], axis=-1)  # (n_termistores, n_puntos, 3)
+    Q, Rq = np.linalg.qr(X)
+    coeficientes = np.linalg.solve(Rq, np.einsum("dpk,dp->dk", Q, 1.0 / T_tablas)[..., None])[..., 0]
+
+    A_, B_, C_ = coeficientes.T
+    T_ajuste = 1.0 / (A_[:, None] + lnR*(B_[:, None] + C_[:, None]*lnR*lnR))
+    residuos = T_ajuste - T_tablas
+
+    t = np.arange(1, puntos_por_intervalo + 1) / (puntos_por_intervalo + 1)
+    max_desviacion = np.empty(len(R_tablas))
+    R_max_desviacion = np.empty(len(R_tablas))
+    for inicio in range(0, len(R_tablas), tam_bloque):
+        bloque = slice(inicio, inicio + tam_bloque)
+        x, y = R_tablas[bloque], T_tablas[bloque]
+        R_eval, T_spline = _evaluar_splines_en_intervalos(x, y, _splines_en_lotes(x, y), t)
+        R_eval = R_eval.reshape(len(x), -1)
+        c = coeficientes[bloque, :, None]
+        lnR_eval = np.log(R_eval)
+        T_SH = 1.0 / (c[:, 0] + lnR_eval*(c[:, 1] + c[:, 2]*lnR_eval*lnR_eval))
+        desviacion = np.abs(T_spline.reshape(len(x), -1) - T_SH)
+        indice = np.argmax(desviacion, axis=1)
+        max_desviacion[bloque] = desviacion[np.arange(len(x)), indice]
+        R_max_desviacion[bloque] = R_eval[np.arange(len(x)), indice]
+
+    return {
+        "coeficientes": coeficientes,
+        "residuos": residuos,
+        "rms_residuos": np.sqrt(np.mean(residuos**2, axis=1)),
+        "max_residuo": np.max(np.abs(residuos), axis=1),
+        "max_desviacion_spline": max_desviacion,
+        "R_max_desviacion": R_max_desviacion,
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Búsqueda de la máxima diferencia spline vs Steinhart-Hart en todo el rango calibrado
+
+def _desviacion_lnR(u):
+    # |spline - Steinhart-Hart| en función de u = ln(R), recortando al rango de la tabla
+    R_u = np.clip(np.exp(u), R[0], R[-1])
+    return np.abs(spline(R_u) - steinhart(R_u))
+
+
+def buscar_desviacion_maxima(n_puntos=10**6, tam_bloque=2**17, refinar=True):
+    """
+    Busca la máxima diferencia |spline - Steinhart-Hart| en todo el rango de la tabla.
+
+    1) Evalúa ambos modelos en `n_puntos` puntos equiespaciados en ln(R),
+       por bloques de `tam_bloque` para acotar la memoria.
+    2) Refina cada máximo local con un optimizador acotado entre sus vecinos.
+    3) Retorna la máxima desviación, su ubicación y los tiempos de cada etapa.
+    """
+    from scipy.optimize import minimize_scalar
+
+    lnR_min, lnR_max = np.log(R[0]), np.log(R[-1])
+    paso = (lnR_max - lnR_min) / (n_puntos - 1)
+
+    t0 = time.perf_counter()
+    candidatos = []  # índices de grilla de los máximos locales
+    for inicio in range(0, n_puntos, tam_bloque):
+        # Se agrega un punto a cada lado para detectar máximos en los bordes del bloque
+        k = np.arange(max(inicio - 1, 0), min(inicio + tam_bloque + 1, n_puntos))
+        d = _desviacion_lnR(lnR_min + k*paso)
+        izquierda = np.concatenate([[-np.inf], d[:-1]])
+        derecha = np.concatenate([d[1:], [-np.inf]])
+        es_maximo = (d >= izquierda) & (d > derecha)
+        es_maximo &= (k >= inicio) & (k < inicio + tam_bloque)
+        # En los extremos de un bloque intermedio el vecino faltante sí existe
+        if k[0] > 0:
+            es_maximo[0] = False
+        if k[-1] < n_puntos - 1:
+            es_maximo[-1] = False
+        candidatos.append(k[es_maximo])
+    candidatos = np.concatenate(candidatos)
+    t_grilla = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    u_max = lnR_min + candidatos*paso
+    d_max = _desviacion_lnR(u_max)
+    if refinar:
+        for j, kc in enumerate(candidatos):
+            cotas = (lnR_min + max(kc - 1, 0)*paso, lnR_min + min(kc + 1, n_puntos - 1)*paso)
+            opt = minimize_scalar(lambda u: -_desviacion_lnR(u), bounds=cotas, method="bounded",
+                                  options={"xatol": 1e-12})
+            if -opt.fun > d_max[j]:
+                u_max[j], d_max[j] = opt.x, -opt.fun
+    t_refinamiento = time.perf_counter() - t0
+
+    j = np.argmax(d_max)
+    R_peor = float(np.clip(np.exp(u_max[j]), R[0], R[-1]))
+    return {
+        "max_desviacion": float(d_max[j]),
+        "R_max": R_peor,
+        "T_spline": float(spline(R_peor)),
+        "T_SH": float(steinhart(R_peor)),
+        "R_maximos_locales": np.exp(u_max),
+        "desviacion_maximos_locales": d_max,
+        "n_puntos": n_puntos,
+        "t_grilla": t_grilla,
+        "t_refinamiento": t_refinamiento,
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def benchmark_conversion(n=10**6, n_bucle=10**4, semilla=0):
+    """
+    Compara el rendimiento del bucle elemento a elemento original con la
+    conversión vectorizada. El bucle se mide sobre `n_bucle` muestras y se
+    reporta en muestras por segundo para poder comparar con `n` muestras.
+    """
+    rng = np.random.default_rng(semilla)
+    R_muestras = np.exp(rng.uniform(np.log(R[0]), np.log(R[-1]), n))
+
+    t0 = time.perf_counter()
+    for R_val in R_muestras[:n_bucle]:
+        round(float(spline(R_val)), 1)
+    t_bucle = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    convertir_resistencias(R_muestras, modelo="spline")
+    t_vector = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    convertir_resistencias(R_muestras, modelo="ambos")
+    t_ambos = time.perf_counter() - t0
+
+    return {
+        "bucle_muestras_s": n_bucle / t_bucle,
+        "spline_muestras_s": n / t_vector,
+        "ambos_muestras_s": n / t_ambos,
+        "aceleracion": (n / t_vector) / (n_bucle / t_bucle),
+    }
+
+
+def benchmark_calibracion_compilada(n=10**6, repeticiones=10, semilla=0):
+    """Compara la evaluación de las calibraciones compiladas con `steinhart` y `spline`."""
+    rng = np.random.default_rng(semilla)
+    R_muestras = np.exp(rng.uniform(np.log(R[0]), np.log(R[-1]), n))
+
+    t0 = time.perf_counter()
+    compiladas = {fuente: compilar_calibracion(fuente) for fuente in ("spline", "steinhart")}
+    t_compilar = time.perf_counter() - t0
+
+    def medir(funcion):
+        funcion(R_muestras)
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion(R_muestras)
+        return (time.perf_counter() - t0) / repeticiones
+
+    return {
+        "t_compilar": t_compilar,
+        "t_spline": medir(spline),
+        "t_steinhart": medir(steinhart),
+        "t_compilada_spline": medir(compiladas["spline"]),
+        "t_compilada_steinhart": medir(compiladas["steinhart"]),
+        "error_spline": compiladas["spline"].error_max,
+        "error_steinhart": compiladas["steinhart"].error_max,
+    }
+
+
+def benchmark_ajuste_lotes(n_termistores=10**5, semilla=0):
+    """Ajusta un lote sintético de termistores derivados de la tabla del fabricante."""
+    rng = np.random.default_rng(semilla)
+    escala = rng.normal(1.0, 0.02, (n_termistores, 1))   # dispersión de R25 entre unidades
+    ruido = rng.normal(0.0, 1e-3, (n_termistores, len(R)))  # ruido relativo de medición
+    R_tablas = R * escala * (1 + ruido)
+    T_tablas = np.broadcast_to(T_K, R_tablas.shape)
+
+    t0 = time.perf_counter()
+    resultado = ajustar_steinhart_lotes(R_tablas, T_tablas)
+    t_ajuste = time.perf_counter() - t0
+    return {
+        "n_termistores": n_termistores,
+        "t_ajuste": t_ajuste,
+        "termistores_s": n_termistores / t_ajuste,
+        "max_desviacion_mediana": float(np.median(resultado["max_desviacion_spline"])),
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_conversion()
+    print(f"Bucle por elemento:       {resultado['bucle_muestras_s']:12.3e} muestras/s")
+    print(f"Vectorizado (spline):     {resultado['spline_muestras_s']:12.3e} muestras/s")
+    print(f"Vectorizado (ambos):      {resultado['ambos_muestras_s']:12.3e} muestras/s")
+    print(f"Aceleración:              {resultado['aceleracion']:12.1f} x")
+
+    resultado = benchmark_calibracion_compilada()
+    print(f"\nCompilación de ambas calibraciones: {resultado['t_compilar']*1e3:.1f} ms")
+    for nombre in ("spline", "steinhart", "compilada_spline", "compilada_steinhart"):
+        print(f"{nombre:22s} {resultado['t_' + nombre]*1e3:8.2f} ms por 1e6 muestras")
+    print(f"Cota del error compilada spline:    {resultado['error_spline']*1e3:.4f} mK")
+    print(f"Cota del error compilada steinhart: {resultado['error_steinhart']*1e3:.4f} mK")
+
+    resultado = benchmark_ajuste_lotes()
+    print(f"\nAjuste de {resultado['n_termistores']} termistores: {resultado['t_ajuste']:.2f} s "
+          f"({resultado['termistores_s']:.3e} termistores/s)")
+    print(f"Mediana de la máxima desviación spline vs SH: {resultado['max_desviacion_mediana']:.3f} K")
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+from collections import deque
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adquisicion import (PASO_ESPEJO, PASO_TUNGSTENO, BufferCircular, ConsumidorLuz, ConsumidorTungsteno,
+                         InstrumentoSimulado, adquirir_simulado, posicion_espejo)
+
+
+def test_buffer_circular_igual_a_una_cola():
+    # Referencia: una cola de largo máximo fijo con las lecturas aún no leídas
+    rng = np.random.default_rng(0)
+    buffer = BufferCircular(capacidad=50, n_columnas=1)
+    pendientes = deque(maxlen=50)
+    escritos = perdidos = 0
+    for _ in range(500):
+        if rng.random() < 0.6:
+            n = int(rng.integers(0, 80))
+            bloque = np.arange(escritos, escritos + n, dtype=float)
+            perdidos += max(0, len(pendientes) + n - 50)
+            pendientes.extend(bloque)
+            escritos += n
+            buffer.escribir(bloque)
+        else:
+            assert np.array_equal(buffer.leer()[:, 0], list(pendientes))
+            pendientes.clear()
+    buffer.leer()
+    assert buffer.perdidos == perdidos
+    assert len(buffer) == 50
+    assert np.array_equal(buffer.ultimos(7)[:, 0], np.arange(escritos - 7, escritos))
+    assert buffer.leer().shape == (0, 1)
+
+
+def test_protocolo_del_instrumento():
+    async def sesion():
+        instrumento = InstrumentoSimulado("osciloscopio", tasa=1000, semilla=0)
+        puerto = await instrumento.iniciar()
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        try:
+            escritor.write(b"*IDN?\n")
+            identificacion = await lector.readline()
+            escritor.write(b"OTRA?\n")
+            error = await lector.readline()
+            bloques = []
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                escritor.write(b"LEER?\n")
+                assert await lector.readexactly(2) == b"#8"
+                largo = int(await lector.readexactly(8))
+                bloques.append(np.frombuffer(await lector.readexactly(largo), dtype=float).reshape(-1, 2))
+        finally:
+            escritor.close()
+            await instrumento.cerrar()
+        return identificacion, error, np.concatenate(bloques)
+
+    identificacion, error, lecturas = asyncio.run(sesion())
+    assert identificacion == b"FISMOD,osciloscopio,SIM\n" and error == b"ERROR\n"
+    # Lecturas contiguas a la tasa del instrumento, sin repetir entre consultas
+    assert len(lecturas) >= 100
+    assert np.allclose(np.diff(lecturas[:, 0]), 1e-3)
+    assert np.all((lecturas[:, 1] > 200e-9) & (lecturas[:, 1] < 240e-9))
+
+
+def test_consumidor_luz_igual_a_linregress():
+    from scipy.stats import linregress
+
+    from Experimento4 import distancias
+
+    t = np.arange(0, 3.0, 0.01)
+    d = posicion_espejo(t, distancias)
+    assert np.array_equal(d[:20], np.repeat(distancias[:1], 20)) and np.isclose(PASO_ESPEJO, 0.2)
+    dt = (d + 28.6) / 2.19e8 + np.random.default_rng(1).normal(0, 0.3e-9, t.size)
+    consumidor = ConsumidorLuz()
+    for parte in np.array_split(np.arange(t.size), 7):
+        consumidor.procesar({"osciloscopio": np.column_stack([t[parte], dt[parte], t[parte]])})
+    referencia = linregress(dt, d)
+    assert consumidor.ajuste.n == t.size
+    assert np.isclose(consumidor.ajuste.pendiente, referencia.slope, rtol=1e-9)
+    assert np.isclose(consumidor.ajuste.u_pendiente, referencia.stderr, rtol=1e-7)
+
+
+def test_consumidor_tungsteno_empareja_las_lecturas():
+    from scipy.stats import linregress
+
+    from Experimento3 import Corrientes, R_ref, Radiancia, Voltajes
+    from tungsteno import CalibracionTungsteno
+
+    # Una lectura de cada instrumento por paso de la fuente, entregadas en lotes desfasados
+    t = (np.arange(Voltajes.size) + 0.5) * PASO_TUNGSTENO
+    columnas = {"voltimetro": Voltajes, "amperimetro": Corrientes, "termopila": Radiancia}
+    lecturas = {nombre: np.column_stack([t, valores, t]) for nombre, valores in columnas.items()}
+    consumidor = ConsumidorTungsteno()
+    cortes = {"voltimetro": 4, "amperimetro": 7, "termopila": 10}
+    consumidor.procesar({nombre: lote[:cortes[nombre]] for nombre, lote in lecturas.items()})
+    # Las radiancias posteriores a la última V (t > t_max) esperan al lote siguiente, aunque
+    # la I que les corresponde ya llegó en este
+    assert consumidor.ajuste.n == 4 and len(consumidor.pendientes) == 6
+    assert len(consumidor.V) == 1 and len(consumidor.I) == 3
+    consumidor.procesar({nombre: lote[cortes[nombre]:] for nombre, lote in lecturas.items()})
+    T = CalibracionTungsteno().temperatura(Voltajes / Corrientes / R_ref)
+    referencia = linregress(T**4, Radiancia)
+    assert consumidor.ajuste.n == Voltajes.size
+    assert np.isclose(consumidor.ajuste.pendiente, referencia.slope, rtol=1e-9)
+
+
+@pytest.mark.parametrize("simulador_aparte", [False, True])
+def test_adquisicion_simulada(simulador_aparte):
+    estadisticas, (tungsteno, termistor, luz) = asyncio.run(
+        adquirir_simulado(duracion=0.6, tasa=2000, simulador_aparte=simulador_aparte))
+    assert all(n == 0 for n in estadisticas["perdidos"].values())
+    for tasa in estadisticas["tasa_por_instrumento"].values():
+        assert 1000 < tasa < 2100
+    assert 0 < estadisticas["latencia_p50_s"] <= estadisticas["latencia_p99_s"] <= estadisticas["latencia_max_s"] < 0.5
+    assert luz.ajuste.n > 500 and np.isclose(luz.ajuste.pendiente, 2.19e8, rtol=0.05)
+    assert tungsteno.ajuste.n > 500 and termistor.temperaturas.n > 500
+    assert 280 < termistor.T_min <= termistor.T_actual <= termistor.T_max < 420
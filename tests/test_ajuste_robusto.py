@@ -0,0 +1,109 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ajuste_robusto import K_HUBER, ajustar_inverso_cuadrado, ajustar_potencia, apilar, barridos_sinteticos
+
+U_V = 0.1
+
+
+def _escala(resultado, r, V, modelo):
+    # Escala fija de Huber, deducida del punto con menor peso: peso = k / (|residuo|/(u_V·escala))
+    i = np.argmin(resultado["pesos"])
+    assert resultado["pesos"][i] < 1
+    return np.abs(V[i] - modelo(r[i])) / U_V * resultado["pesos"][i] / K_HUBER
+
+
+def test_inverso_cuadrado_sin_robustez_igual_a_curve_fit():
+    from scipy.optimize import curve_fit
+
+    r, V = barridos_sinteticos(5, semilla=1)
+    ajuste = ajustar_inverso_cuadrado(r, V, U_V, robusto=False)
+    for i in range(5):
+        assert np.allclose([ajuste["a"][i], ajuste["b"][i]], np.polyfit(1/r[i]**2, V[i], 1), rtol=1e-10)
+        p, covarianza = curve_fit(lambda r, a, b: a/r**2 + b, r[i], V[i], sigma=np.full(r.shape[1], U_V))
+        assert np.allclose([ajuste["u_a"][i], ajuste["u_b"][i]], np.sqrt(np.diag(covarianza)), rtol=1e-6)
+    assert ajuste["iteraciones"] == 0 and np.all(ajuste["pesos"] == 1)
+
+
+def test_potencia_sin_robustez_igual_a_curve_fit():
+    from scipy.optimize import curve_fit
+
+    r, V = barridos_sinteticos(5, semilla=2)
+    ajuste = ajustar_potencia(r, V, U_V, robusto=False)
+    for i in range(5):
+        p, covarianza = curve_fit(lambda r, a, n, b: a*r**-n + b, r[i], V[i], p0=(600, 2, 0),
+                                  sigma=np.full(r.shape[1], U_V), ftol=1e-15, xtol=1e-15, gtol=1e-15)
+        assert np.allclose([ajuste["a"][i], ajuste["n"][i], ajuste["b"][i]], p, rtol=1e-6)
+        assert np.allclose(ajuste["covarianza"][i], covarianza, rtol=1e-3)
+
+
+def test_huber_igual_a_least_squares():
+    # Con la escala ya fija, la reponderación y los pasos LM minimizan la misma pérdida
+    # de Huber que least_squares(loss="huber") con f_scale = k·escala
+    from scipy.optimize import least_squares
+
+    r, V = barridos_sinteticos(4, semilla=3)
+    inverso = ajustar_inverso_cuadrado(r, V, U_V)
+    potencia = ajustar_potencia(r, V, U_V)
+    for i in range(4):
+        escala = _escala({"pesos": inverso["pesos"][i]}, r[i], V[i],
+                         lambda x: inverso["a"][i]/x**2 + inverso["b"][i])
+        referencia = least_squares(lambda p: (V[i] - p[0]/r[i]**2 - p[1]) / U_V, (600, 0), loss="huber",
+                                   f_scale=K_HUBER*escala, xtol=1e-14, ftol=1e-14, gtol=1e-14)
+        assert np.allclose([inverso["a"][i], inverso["b"][i]], referencia.x, rtol=1e-6, atol=1e-6)
+
+        escala = _escala({"pesos": potencia["pesos"][i]}, r[i], V[i],
+                         lambda x: potencia["a"][i]*x**-potencia["n"][i] + potencia["b"][i])
+        referencia = least_squares(lambda p: (V[i] - p[0]*r[i]**-p[1] - p[2]) / U_V, (600, 2, 0), loss="huber",
+                                   f_scale=K_HUBER*escala, xtol=1e-14, ftol=1e-14, gtol=1e-14)
+        assert np.allclose([potencia["a"][i], potencia["n"][i], potencia["b"][i]], referencia.x, rtol=1e-5,
+                           atol=1e-5)
+
+
+def test_robusto_resiste_el_punto_de_campo_cercano():
+    r, V = barridos_sinteticos(500, semilla=4)
+    robusto = ajustar_inverso_cuadrado(r, V, U_V)
+    clasico = ajustar_inverso_cuadrado(r, V, U_V, robusto=False)
+    # El punto de 3 cm pierde casi todo su peso y a queda cerca del valor simulado
+    assert np.all(robusto["pesos"][:, 0] < 0.2)
+    assert np.abs(np.median(robusto["a"]) - 650) < np.abs(np.median(clasico["a"]) - 650) / 10
+    potencia = ajustar_potencia(r, V, U_V)
+    n_clasico = ajustar_potencia(r, V, U_V, robusto=False)["n"]
+    assert abs(np.median(potencia["n"]) - 2) < 0.05 < abs(np.median(n_clasico) - 2)
+    # El punto atípico no infla las incertidumbres: u(a) describe la dispersión de a entre barridos
+    assert 0.8 < np.std(robusto["a"]) / np.median(robusto["u_a"]) < 1.25
+
+
+@pytest.mark.parametrize("robusto", [True, False])
+def test_incertidumbres_iguales_a_la_dispersion(robusto):
+    r, V = barridos_sinteticos(2000, semilla=6)
+    r, V = r[:, 1:], V[:, 1:]  # sin el punto de campo cercano
+    inverso = ajustar_inverso_cuadrado(r, V, U_V, robusto)
+    potencia = ajustar_potencia(r, V, U_V, robusto)
+    for ajuste, clave in ((inverso, "a"), (inverso, "b"), (potencia, "a"), (potencia, "n"), (potencia, "b")):
+        assert 0.9 < np.std(ajuste[clave]) / np.median(ajuste[f"u_{clave}"]) < 1.15, clave
+
+
+def test_lote_igual_a_cada_barrido():
+    r, V = barridos_sinteticos(6, semilla=5)
+    barridos = [(r[i, :r.shape[1] - i], V[i, :r.shape[1] - i]) for i in range(6)]
+    r_lote, V_lote = apilar(barridos)
+    assert np.isnan(r_lote[5, -5:]).all()
+    for ajustar in (ajustar_inverso_cuadrado, ajustar_potencia):
+        lote = ajustar(r_lote, V_lote, U_V)
+        for i, (r_i, V_i) in enumerate(barridos):
+            solo = ajustar(r_i, V_i, U_V)
+            for clave in ("a", "b", "u_a"):
+                assert np.isclose(lote[clave][i], solo[clave][0], rtol=1e-6), (ajustar.__name__, clave, i)
+
+
+def test_barridos_cortos():
+    with pytest.raises(ValueError):
+        ajustar_inverso_cuadrado([[3.0, 5.0, np.nan]], [[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError):
+        ajustar_potencia([3.0, 5.0, 7.0], [1.0, 2.0, 3.0])
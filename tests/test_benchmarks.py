@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmarks
+from benchmarks import ETAPAS, comparar, ejecutar_benchmarks
+
+
+@pytest.fixture
+def rapido(monkeypatch):
+    monkeypatch.setattr(benchmarks, "T_MINIMO", 1e-9)
+    monkeypatch.setattr(benchmarks, "MAX_REPETICIONES", 2)
+    monkeypatch.setattr(benchmarks, "_commit", lambda: "prueba")
+
+
+@pytest.mark.parametrize("generador", [benchmarks.sintetico_termistor, benchmarks.sintetico_inverso_cuadrado,
+                                       benchmarks.sintetico_tungsteno, benchmarks.sintetico_luz])
+def test_sinteticos_de_n_puntos_y_reproducibles(generador):
+    datos = generador(1000, semilla=3)
+    for nombre, columna in datos.items():
+        assert columna.shape == (1000,) and np.all(np.isfinite(columna)), nombre
+        assert np.array_equal(columna, generador(1000, semilla=3)[nombre])
+        assert not np.array_equal(columna, generador(1000, semilla=4)[nombre])
+
+
+def test_sinteticos_en_el_rango_de_las_tablas():
+    from termistor import R
+    from tungsteno import R_rel_tabla
+
+    from Experimento3 import R_ref
+
+    R_termistor = benchmarks.sintetico_termistor(10**4)["R"]
+    assert R[0] <= R_termistor.min() and R_termistor.max() <= R[-1]
+    tungsteno = benchmarks.sintetico_tungsteno(10**4)
+    R_rel = tungsteno["Voltajes"] / tungsteno["Corrientes"] / R_ref
+    assert R_rel_tabla[0] - 1 < R_rel.min() and R_rel.max() < R_rel_tabla[-1] + 1
+    # c = 1/pendiente de fases vs distancias
+    luz = benchmarks.sintetico_luz(10**5)
+    assert np.isclose(np.polyfit(luz["fases"], luz["distancias"], 1)[0], 2.19e8, rtol=0.01)
+
+
+def test_cadena_tungsteno_igual_a_diferencias_finitas():
+    # u(T⁴) propagada con la derivada del spline frente a derivadas numéricas de T⁴(V, I)
+    from Experimento3 import R_ref, res_Corriente, res_Voltaje
+    from tungsteno import CalibracionTungsteno
+
+    datos = benchmarks.sintetico_tungsteno(200)
+    T_cuarta, u_T_cuarta = benchmarks._e3_cadena(datos)
+    V, I = datos["Voltajes"], datos["Corrientes"]
+
+    def T4(V, I):
+        return CalibracionTungsteno().temperatura(V / I / R_ref)**4
+
+    assert np.allclose(T_cuarta, T4(V, I), rtol=1e-13)
+    h_V, h_I = 1e-6*V, 1e-6*I
+    dV = (T4(V + h_V, I) - T4(V - h_V, I)) / (2*h_V)
+    dI = (T4(V, I + h_I) - T4(V, I - h_I)) / (2*h_I)
+    referencia = np.hypot(dV*res_Voltaje/np.sqrt(12), dI*res_Corriente/np.sqrt(12))
+    assert np.allclose(u_T_cuarta, referencia, rtol=1e-5)
+
+
+def test_ejecutar_benchmarks_todas_las_etapas(rapido, capsys):
+    informe = ejecutar_benchmarks([100, 200], semilla=0)
+    assert informe["commit"] == "prueba"
+    assert [(r["etapa"], r["n"]) for r in informe["resultados"]] == [(e, n) for e in ETAPAS for n in (100, 200)]
+    for r in informe["resultados"]:
+        assert 1 <= r["repeticiones"] <= 2
+        assert 0 < r["t_min_s"] <= r["t_mediana_s"]
+        assert r["pico_memoria_bytes"] >= 0
+        assert np.isclose(r["puntos_por_s"], r["n"] / r["t_mediana_s"])
+    assert len(capsys.readouterr().out.splitlines()) == 2*len(ETAPAS)
+    json.dumps(informe)
+
+
+def test_comparar_detecta_regresiones():
+    anterior = {"resultados": [{"etapa": "a", "n": 10, "t_mediana_s": 1.0, "pico_memoria_bytes": 100},
+                               {"etapa": "b", "n": 10, "t_mediana_s": 1.0, "pico_memoria_bytes": 100}]}
+    actual = {"resultados": [{"etapa": "a", "n": 10, "t_mediana_s": 1.1, "pico_memoria_bytes": 200},
+                             {"etapa": "b", "n": 10, "t_mediana_s": 1.5, "pico_memoria_bytes": 100},
+                             {"etapa": "c", "n": 10, "t_mediana_s": 9.0, "pico_memoria_bytes": 900}]}
+    assert comparar(anterior, actual) == [("a", 10, "pico_memoria_bytes", 100, 200),
+                                          ("b", 10, "t_mediana_s", 1.0, 1.5)]
+    assert comparar(anterior, actual, tolerancia=1.0) == []
+
+
+def test_main_guarda_y_compara(rapido, tmp_path, capsys):
+    anterior = tmp_path / "anterior.json"
+    benchmarks.main(["--puntos", "100", "--etapas", "e1_steinhart", "--salida", str(anterior)])
+    with open(anterior, encoding="utf-8") as f:
+        informe = json.load(f)
+    assert [r["etapa"] for r in informe["resultados"]] == ["e1_steinhart"]
+    benchmarks.main(["--puntos", "100", "--etapas", "e1_steinhart", "--salida", str(tmp_path / "actual.json"),
+                     "--comparar", str(anterior), "--tolerancia", "1000"])
+    assert "Comparación con prueba: 0 regresiones" in capsys.readouterr().out
@@ -0,0 +1,122 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache
+from cache import CacheResultados, memoizar
+
+
+class _Contador:
+    def __init__(self, resultado):
+        self.resultado = resultado
+        self.llamadas = 0
+
+    def __call__(self):
+        self.llamadas += 1
+        return dict(self.resultado)
+
+
+def test_clave_depende_solo_del_contenido(tmp_path):
+    c = CacheResultados(str(tmp_path))
+    x = np.linspace(0, 1, 100)
+    base = c.clave("ajuste", {"x": x, "k": 2, "opciones": {"a": 1, "b": (1, 2)}})
+    assert c.clave("ajuste", {"opciones": {"b": (1, 2), "a": 1}, "k": 2, "x": x.copy()}) == base
+    # Un memmap con los mismos datos da la misma clave que el array
+    np.save(tmp_path / "x.npy", x)
+    assert c.clave("ajuste", {"x": np.load(tmp_path / "x.npy", mmap_mode="r"), "k": 2,
+                              "opciones": {"a": 1, "b": (1, 2)}}) == base
+    distintas = [
+        c.clave("otro", {"x": x, "k": 2, "opciones": {"a": 1, "b": (1, 2)}}),
+        c.clave("ajuste", {"x": x.astype(np.float32), "k": 2, "opciones": {"a": 1, "b": (1, 2)}}),
+        c.clave("ajuste", {"x": x.reshape(10, 10), "k": 2, "opciones": {"a": 1, "b": (1, 2)}}),
+        c.clave("ajuste", {"x": x + 1e-15, "k": 2, "opciones": {"a": 1, "b": (1, 2)}}),
+        c.clave("ajuste", {"x": x, "k": 3, "opciones": {"a": 1, "b": (1, 2)}}),
+        c.clave("ajuste", {"x": x, "k": 2, "opciones": {"a": 1, "b": [1, 2]}}),
+    ]
+    assert base not in distintas and len(set(distintas)) == len(distintas)
+
+
+def test_clave_cambia_con_la_version(tmp_path, monkeypatch):
+    c = CacheResultados(str(tmp_path))
+    antes = c.clave("ajuste", {"k": 1})
+    monkeypatch.setattr(cache, "VERSION", cache.VERSION + 1)
+    assert c.clave("ajuste", {"k": 1}) != antes
+
+
+def test_aciertos_fallos_y_tiempos(tmp_path):
+    c = CacheResultados(str(tmp_path))
+    calcular = _Contador({"pendiente": np.arange(3.0), "t_total": 1.5, "t_ajuste": 0.5})
+    primero = c.obtener("ajuste", calcular, tiempos=("t_total",), x=np.arange(3))
+    segundo = c.obtener("ajuste", calcular, tiempos=("t_total",), x=np.arange(3))
+    assert calcular.llamadas == 1 and (c.aciertos, c.fallos) == (1, 1)
+    # Solo se descartan las claves indicadas en `tiempos`
+    for resultado in (primero, segundo):
+        assert sorted(resultado) == ["pendiente", "t_ajuste"]
+        assert np.array_equal(resultado["pendiente"], np.arange(3.0))
+    c.obtener("ajuste", calcular, tiempos=("t_total",), x=np.arange(4))
+    assert calcular.llamadas == 2 and (c.aciertos, c.fallos) == (1, 2)
+
+
+def test_archivo_dañado_se_recalcula(tmp_path):
+    c = CacheResultados(str(tmp_path))
+    calcular = _Contador({"valor": 1})
+    c.obtener("etapa", calcular, k=1)
+    with open(os.path.join(str(tmp_path), f"{c.clave('etapa', {'k': 1})}.pkl"), "wb") as f:
+        f.write(b"basura")
+    assert c.obtener("etapa", calcular, k=1) == {"valor": 1}
+    assert calcular.llamadas == 2
+
+
+def test_desalojo_lru(tmp_path):
+    bloque = np.zeros(1000)  # ~8 kB por entrada
+    c = CacheResultados(str(tmp_path), max_bytes=3 * 8500)
+    rutas = {}
+    for k, fecha in zip(range(3), (100, 200, 300)):
+        c.obtener("etapa", lambda: {"datos": bloque}, k=k)
+        rutas[k] = os.path.join(str(tmp_path), f"{c.clave('etapa', {'k': k})}.pkl")
+        os.utime(rutas[k], (fecha, fecha))
+    # Un acierto renueva la fecha de la entrada 0: la menos usada pasa a ser la 1
+    c.obtener("etapa", lambda: pytest.fail("debió ser un acierto"), k=0)
+    c.obtener("etapa", lambda: {"datos": bloque}, k=3)
+    assert os.path.exists(rutas[0]) and not os.path.exists(rutas[1]) and os.path.exists(rutas[2])
+    assert c.tamaño() <= c.max_bytes
+    c.limpiar()
+    assert c.tamaño() == 0
+
+
+def test_memoizar_con_y_sin_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_caches", {})
+    calcular = _Contador({"valor": 2.0, "t_total": 0.1})
+    monkeypatch.delenv("FISMOD_CACHE", raising=False)
+    assert memoizar("etapa", calcular, tiempos=("t_total",), k=1) == {"valor": 2.0}
+    assert memoizar("etapa", calcular, tiempos=("t_total",), k=1) == {"valor": 2.0}
+    assert calcular.llamadas == 2
+
+    monkeypatch.setenv("FISMOD_CACHE", str(tmp_path))
+    assert memoizar("etapa", calcular, tiempos=("t_total",), k=1) == {"valor": 2.0}
+    assert memoizar("etapa", calcular, tiempos=("t_total",), k=1) == {"valor": 2.0}
+    assert calcular.llamadas == 3
+    assert cache.cache_activo().resumen().endswith("1 aciertos, 1 fallos")
+
+
+def test_experimento3_con_cache_igual_que_sin_cache(tmp_path, monkeypatch, capsys):
+    import Experimento3
+
+    monkeypatch.setattr(cache, "_caches", {})
+    monkeypatch.delenv("FISMOD_CACHE", raising=False)
+    sin_cache = Experimento3.ejecutar(graficar=False)
+    monkeypatch.setenv("FISMOD_CACHE", str(tmp_path))
+    primero = Experimento3.ejecutar(graficar=False)
+    fallos = cache.cache_activo().fallos
+    segundo = Experimento3.ejecutar(graficar=False)
+    assert fallos > 0 and cache.cache_activo().fallos == fallos
+    assert cache.cache_activo().aciertos == fallos
+    for resultado in (primero, segundo):
+        assert sorted(resultado) == sorted(sin_cache)
+        for nombre, valor in sin_cache.items():
+            if not nombre.startswith("t_"):
+                assert np.array_equal(np.asarray(resultado[nombre]), np.asarray(valor), equal_nan=True), nombre
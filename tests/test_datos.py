@@ -0,0 +1,130 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datos
+from datos import (ALINEACION, ConjuntoDatos, cargar_columnar, cargar_datos, crear_columnar, csv_a_columnar,
+                   guardar_columnar)
+
+
+def _tabla(n=1000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return {"distancias": rng.uniform(0, 50, n), "voltaje": rng.normal(size=n), "indice": np.arange(n)}
+
+
+def _csv(ruta, columnas, encabezado=True, lineas_vacias=0):
+    tabla = np.column_stack(list(columnas.values()))
+    np.savetxt(ruta, tabla, delimiter=",", header=",".join(columnas) if encabezado else "", comments="",
+               fmt="%.17g")
+    with open(ruta, "a") as f:
+        f.write("\n" * lineas_vacias)
+    return np.loadtxt(ruta, delimiter=",", skiprows=1 if encabezado else 0, ndmin=2)
+
+
+def test_columnar_ida_y_vuelta(tmp_path):
+    columnas = _tabla()
+    columnas["cara"] = np.array(["negra", "blanca", "pulida", "opaca"] * 250)
+    ruta = guardar_columnar(str(tmp_path / "tabla.fmc"), columnas, tam_bloque=37)
+    cargado = cargar_datos(ruta)
+    assert cargado.nombres == list(columnas)
+    assert len(cargado) == 1000
+    for nombre, columna in columnas.items():
+        assert isinstance(cargado[nombre], np.memmap)
+        assert cargado[nombre].offset % ALINEACION == 0
+        assert np.array_equal(cargado[nombre], columna)
+    # Numéricas con un tipo común (al menos float64); el texto conserva el suyo
+    assert cargado["indice"].dtype == np.float64
+    assert cargado["cara"].dtype == columnas["cara"].dtype
+
+
+def test_bloques_recorren_todas_las_filas(tmp_path):
+    columnas = _tabla(n=1001)
+    cargado = cargar_columnar(guardar_columnar(str(tmp_path / "tabla.fmc"), columnas))
+    bloques = list(cargado.bloques(tam_bloque=100, columnas=["voltaje"]))
+    assert len(bloques) == 11 and list(bloques[0]) == ["voltaje"]
+    assert np.array_equal(np.concatenate([b["voltaje"] for b in bloques]), columnas["voltaje"])
+
+
+def test_crear_columnar_escribible(tmp_path):
+    ruta = str(tmp_path / "vacio.fmc")
+    destino = crear_columnar(ruta, ["x", "y"], 10)
+    destino["x"][:] = np.arange(10)
+    destino["y"][:] = -np.arange(10)
+    for columna in destino.values():
+        columna.flush()
+    cargado = cargar_columnar(ruta)
+    assert np.array_equal(cargado["x"], np.arange(10)) and np.array_equal(cargado["y"], -np.arange(10))
+
+
+def test_csv_a_columnar_igual_a_loadtxt(tmp_path):
+    ruta = str(tmp_path / "medidas.csv")
+    referencia = _csv(ruta, _tabla(), lineas_vacias=3)
+    cargado = cargar_columnar(csv_a_columnar(ruta, tam_bloque=64))
+    assert len(cargado) == len(referencia)
+    for j, nombre in enumerate(["distancias", "voltaje", "indice"]):
+        assert np.array_equal(cargado[nombre], referencia[:, j])
+
+
+def test_csv_grande_se_convierte_una_vez(tmp_path, monkeypatch):
+    ruta = str(tmp_path / "medidas.csv")
+    referencia = _csv(ruta, _tabla(), encabezado=False)
+    pequeño = cargar_datos(ruta, columnas=["d", "v", "i"])
+    monkeypatch.setattr(datos, "UMBRAL_CSV", 0)
+    grande = cargar_datos(ruta, columnas=["d", "v", "i"])
+    assert grande.ruta == ruta + ".fmc" and isinstance(grande["d"], np.memmap)
+    for j, nombre in enumerate(["d", "v", "i"]):
+        assert np.array_equal(grande[nombre], referencia[:, j])
+        assert np.array_equal(pequeño[nombre], referencia[:, j])
+    # Con el .fmc más nuevo que el CSV se reutiliza sin convertir de nuevo
+    monkeypatch.setattr(datos, "csv_a_columnar", lambda *args, **kwargs: pytest.fail("se volvió a convertir"))
+    assert np.array_equal(cargar_datos(ruta, columnas=["d", "v", "i"])["v"], referencia[:, 1])
+
+
+def test_npz_sin_comprimir_se_mapea(tmp_path):
+    columnas = _tabla()
+    ruta = str(tmp_path / "tabla.npz")
+    np.savez(ruta, **columnas, matriz=np.column_stack([columnas["distancias"], columnas["voltaje"]]))
+    cargado = cargar_datos(ruta)
+    assert isinstance(cargado["distancias"], np.memmap)
+    assert np.array_equal(cargado["voltaje"], columnas["voltaje"])
+    assert np.array_equal(cargado["c1"], columnas["voltaje"])
+    solo = cargar_datos(ruta, columnas=["indice"])
+    assert solo.nombres == ["indice"] and np.array_equal(solo["indice"], columnas["indice"])
+
+
+def test_npz_comprimido_igual_al_mapeado(tmp_path):
+    columnas = _tabla()
+    np.savez(tmp_path / "plano.npz", **columnas)
+    np.savez_compressed(tmp_path / "comprimido.npz", **columnas)
+    plano = cargar_datos(str(tmp_path / "plano.npz"))
+    comprimido = cargar_datos(str(tmp_path / "comprimido.npz"))
+    assert not isinstance(comprimido["voltaje"], np.memmap)
+    for nombre in columnas:
+        assert np.array_equal(plano[nombre], comprimido[nombre])
+
+
+def test_npy_2d_y_estructurado(tmp_path):
+    columnas = _tabla()
+    matriz = np.column_stack([columnas["distancias"], columnas["voltaje"]])
+    np.save(tmp_path / "matriz.npy", matriz)
+    cargado = cargar_datos(str(tmp_path / "matriz.npy"), columnas=["distancias", "voltaje"])
+    assert np.array_equal(cargado["voltaje"], columnas["voltaje"])
+
+    estructurado = np.zeros(5, dtype=[("fases", "f8"), ("distancias", "f8")])
+    estructurado["fases"] = np.arange(5)
+    np.save(tmp_path / "estructurado.npy", estructurado)
+    assert np.array_equal(cargar_datos(str(tmp_path / "estructurado.npy"))["fases"], np.arange(5))
+
+    with pytest.raises(ValueError):
+        cargar_datos(str(tmp_path / "matriz.npy"), columnas=["solo_una"])
+
+
+def test_errores():
+    with pytest.raises(ValueError):
+        ConjuntoDatos({"x": np.zeros(3), "y": np.zeros(4)})
+    with pytest.raises(ValueError):
+        cargar_datos("tabla.xlsx")
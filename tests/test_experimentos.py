@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def _python(codigo):
+    # Proceso nuevo, sin cache ni figuras: sys.modules refleja solo lo que importa el experimento
+    entorno = {clave: valor for clave, valor in os.environ.items() if not clave.startswith("FISMOD_")}
+    return subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=entorno, capture_output=True,
+                          text=True, timeout=300)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+def test_importar_no_ejecuta_nada(n):
+    proceso = _python(f"import sys, Experimento{n}; print(any(m.startswith('matplotlib') for m in sys.modules))")
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout == "False\n"
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 4])
+def test_no_plot_no_importa_matplotlib(n):
+    proceso = _python(f"import sys, Experimento{n}\n"
+                      f"Experimento{n}.main(['--no-plot'])\n"
+                      f"print('matplotlib' in sys.modules)")
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout.splitlines()[-1] == "False"
+    assert len(proceso.stdout.splitlines()) > 1
+
+
+def test_experimento4_igual_a_linregress(monkeypatch):
+    from scipy.stats import linregress
+
+    monkeypatch.delenv("FISMOD_CACHE", raising=False)
+    import Experimento4
+
+    resultado = Experimento4.ejecutar(graficar=False, n_remuestreos=0)
+    referencia = linregress(Experimento4.fases, Experimento4.distancias)
+    assert np.isclose(resultado["c"], referencia.slope, rtol=1e-12)
+    assert np.isclose(resultado["intercepto"], referencia.intercept, rtol=1e-10)
+    assert np.isclose(resultado["std_err"], referencia.stderr, rtol=1e-10)
+    assert np.isclose(resultado["r2"], referencia.rvalue**2, rtol=1e-12)
@@ -0,0 +1,139 @@
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import exportar
+from datos import cargar_datos
+from exportar import EscritorTabla, TablaResultados, guardar_resumen
+
+
+def _tabla(n=1000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    T = rng.uniform(1000, 2500, n)
+    u_T = rng.uniform(1, 5, n)
+    tabla = TablaResultados("Tungsteno")
+    tabla.agregar("cara", np.array(["negra", "blanca"] * (n // 2)))
+    tabla.agregar("T", T, u_T, "K")
+    tabla.agregar("T4", T**4, 4*T**3*u_T, "K⁴")
+    tabla.agregar("R", rng.uniform(1, 10, n), 0.05, "Ω")
+    return tabla
+
+
+def _leer_csv(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        filas = list(csv.reader(f))
+    return filas[0], filas[1:]
+
+
+def test_csv_igual_a_las_columnas(tmp_path, monkeypatch):
+    monkeypatch.setattr(exportar, "FILAS_BLOQUE_CSV", 7)  # varios bloques, el último incompleto
+    tabla = _tabla()
+    encabezado, filas = _leer_csv(tabla.guardar(str(tmp_path / "tabla.csv")))
+    assert encabezado == ["cara", "T", "u_T", "T4", "u_T4", "R", "u_R"]
+    assert len(filas) == 1000
+    columnas = list(zip(*filas))
+    assert list(columnas[0]) == tabla.columnas["cara"].tolist()
+    for j, nombre in enumerate(encabezado[1:], start=1):
+        assert np.allclose(np.array(columnas[j], dtype=float), tabla.columnas[nombre], rtol=1e-9, atol=0)
+
+
+@pytest.mark.parametrize("extension", [".npz", ".fmc"])
+def test_binarios_ida_y_vuelta(tmp_path, extension):
+    tabla = _tabla()
+    cargado = cargar_datos(tabla.guardar(str(tmp_path / f"tabla{extension}")))
+    assert cargado.nombres == list(tabla.columnas)
+    for nombre, columna in tabla.columnas.items():
+        assert np.array_equal(cargado[nombre], columna)
+
+
+def test_resumen_igual_a_numpy():
+    tabla = _tabla()
+    tabla.columnas["R"][:3] = np.nan
+    resumen = tabla.resumen()
+    assert list(resumen) == ["T", "T4", "R"]  # sin columnas de texto ni de incertidumbre
+    for nombre, fila in resumen.items():
+        valores = tabla.columnas[nombre][np.isfinite(tabla.columnas[nombre])]
+        assert fila["unidad"] == tabla.unidades[nombre] and fila["n"] == valores.size
+        assert np.isclose(fila["media"], valores.mean(), rtol=1e-12)
+        assert np.isclose(fila["desviacion"], valores.std(ddof=1), rtol=1e-10)
+        assert (fila["minimo"], fila["maximo"]) == (valores.min(), valores.max())
+        assert np.isclose(fila["u_media"], tabla.columnas[f"u_{nombre}"].mean(), rtol=1e-12)
+    assert resumen["R"]["n"] == 997
+
+
+@pytest.mark.parametrize("extension", [".csv", ".fmc"])
+def test_escritor_por_bloques_igual_a_la_tabla(tmp_path, extension):
+    tabla = _tabla()
+    del tabla.columnas["cara"]
+    ruta_completa = tabla.guardar(str(tmp_path / f"completa{extension}"))
+    nombres = list(tabla.columnas)
+    with EscritorTabla(str(tmp_path / f"bloques{extension}"), nombres, n_filas=tabla.n_filas,
+                       incertidumbres=tabla.incertidumbres, unidades=tabla.unidades) as escritor:
+        for inicio in range(0, tabla.n_filas, 300):
+            escritor.escribir({nombre: c[inicio:inicio + 300] for nombre, c in tabla.columnas.items()})
+    assert escritor.escritas == tabla.n_filas
+    if extension == ".csv":
+        with open(ruta_completa, "rb") as f, open(escritor.ruta, "rb") as g:
+            assert f.read() == g.read()
+    else:
+        cargado = cargar_datos(escritor.ruta)
+        for nombre in nombres:
+            assert np.array_equal(cargado[nombre], tabla.columnas[nombre])
+    completo, por_bloques = tabla.resumen(), escritor.resumen()
+    assert list(completo) == list(por_bloques)
+    for nombre in completo:
+        for clave, valor in completo[nombre].items():
+            if clave == "unidad":
+                assert por_bloques[nombre][clave] == valor
+            else:
+                assert np.isclose(por_bloques[nombre][clave], valor, rtol=1e-10), (nombre, clave)
+
+
+def test_resumen_markdown_y_latex(tmp_path):
+    tabla = _tabla()
+    with open(tabla.guardar_resumen(str(tmp_path / "resumen.md")), encoding="utf-8") as f:
+        markdown = f.read().splitlines()
+    assert markdown[0] == "### Tungsteno" and len(markdown) == 2 + 2 + 3
+    assert markdown[4].startswith("| T | K | 1000 | ")
+    with open(guardar_resumen(tabla.resumen(), str(tmp_path / "resumen.tex"), "u_T & 100%"),
+              encoding="utf-8") as f:
+        latex = f.read()
+    assert r"\caption{u\_T \& 100\%}" in latex
+    assert r"T4 & K$^4$ & 1000 &" in latex and r"R & $\Omega$ &" in latex
+    assert latex.count(r"\\") == 4  # encabezado y tres magnitudes
+
+
+def test_errores(tmp_path):
+    tabla = _tabla()
+    with pytest.raises(ValueError):
+        tabla.guardar(str(tmp_path / "tabla.xlsx"))
+    with pytest.raises(ValueError):
+        tabla.agregar("corta", np.zeros(3))
+    with pytest.raises(ValueError):
+        tabla.guardar_resumen(str(tmp_path / "resumen.txt"))
+    with pytest.raises(ValueError):
+        EscritorTabla(str(tmp_path / "bloques.fmc"), ["T"])
+    with pytest.raises(ValueError):
+        EscritorTabla(str(tmp_path / "bloques.npz"), ["T"], n_filas=10)
+
+
+def test_experimento3_exporta_su_tabla(tmp_path, monkeypatch):
+    import io
+    from contextlib import redirect_stdout
+
+    import Experimento3
+
+    monkeypatch.delenv("FISMOD_CACHE", raising=False)
+    ruta, ruta_resumen = str(tmp_path / "e3.csv"), str(tmp_path / "e3.md")
+    with redirect_stdout(io.StringIO()):
+        Experimento3.ejecutar(graficar=False, exportar=ruta, resumen=ruta_resumen)
+    tabla = cargar_datos(ruta)
+    assert len(tabla) == Experimento3.Voltajes.size
+    assert np.allclose(tabla["Radiancia"], Experimento3.Radiancia)
+    assert np.allclose(tabla["R"], Experimento3.Voltajes / Experimento3.Corrientes, rtol=1e-9)
+    assert os.path.getsize(ruta_resumen) > 0
@@ -0,0 +1,123 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graficos import MAX_PUNTOS, GraficoVivo, reducir_serie
+
+
+@pytest.fixture
+def sin_pantalla(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISMOD_FIGURAS", str(tmp_path))
+    return tmp_path
+
+
+def _grafico(**opciones):
+    return GraficoVivo("vivo", [{"xlabel": "x", "ylabel": "y", "xlim": (0, 10), "ylim": (0, 10)}],
+                       tasa=0, capacidad=8, figsize=(4, 3), dpi=50, **opciones)
+
+
+def _pixeles(grafico):
+    return np.asarray(grafico.figura.canvas.buffer_rgba()).copy()
+
+
+def test_agregar_amplia_la_capacidad(sin_pantalla):
+    grafico = _grafico()
+    serie = grafico.serie(0, "o")
+    x = np.linspace(1, 9, 100)
+    for parte in np.array_split(np.arange(100), 13):
+        grafico.agregar(serie, x[parte], 2*x[parte])
+    s = grafico.series[serie]
+    assert s["n"] == 100 and s["x"].size >= 100
+    assert np.array_equal(s["x"][:100], x) and np.array_equal(s["y"][:100], 2*x)
+    grafico.cerrar()
+
+
+def test_blitting_igual_a_dibujar_todo(sin_pantalla):
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(1, 9, (2, 300))
+    grafico = _grafico()
+    serie = grafico.serie(0, "o", markersize=3)
+    for parte in np.array_split(np.arange(300), 10):
+        grafico.agregar(serie, x[parte], y[parte])
+        assert grafico.refrescar()
+    # Solo el primer refresco dibuja la figura completa; los demás agregan los puntos nuevos
+    assert (grafico.redibujos, grafico.completos) == (10, 1)
+    assert grafico.series[serie]["dibujados"] == 300
+    incremental = _pixeles(grafico)
+    grafico._redibujar_todo(set())
+    completo = _pixeles(grafico)
+    assert np.mean(np.any(incremental != completo, axis=-1)) < 1e-3
+    grafico.cerrar()
+
+
+def test_punto_fuera_de_los_ejes_redibuja_y_amplia(sin_pantalla):
+    grafico = _grafico(margen=0.5)
+    serie = grafico.serie(0, "-")
+    grafico.agregar(serie, [1, 2], [1, 2])
+    grafico.refrescar()
+    grafico.agregar(serie, [3], [4])
+    grafico.refrescar()
+    assert grafico.completos == 1
+    grafico.agregar(serie, [20], [-5])
+    grafico.refrescar()
+    assert grafico.completos == 2
+    eje = grafico.ejes[0]
+    # Rango de los datos más la mitad de su ancho a cada lado
+    assert np.allclose(eje.get_xlim(), (1 - 9.5, 20 + 9.5)) and np.allclose(eje.get_ylim(), (-5 - 4.5, 4 + 4.5))
+    grafico.cerrar()
+
+
+def test_tasa_maxima_de_refresco(sin_pantalla):
+    grafico = GraficoVivo("vivo", [{}], tasa=1e-3)
+    serie = grafico.serie(0, "o")
+    grafico.agregar(serie, [1], [1])
+    assert grafico.refrescar()
+    grafico.agregar(serie, [2], [2])
+    assert not grafico.listo() and not grafico.refrescar()
+    assert grafico.refrescar(forzar=True) and grafico.redibujos == 2
+    grafico.cerrar()
+
+
+def test_cerrar_guarda_todas_las_series(sin_pantalla):
+    grafico = _grafico()
+    linea = grafico.serie(0, "-")
+    puntos = grafico.serie(0, "o")
+    curva = grafico.curva(0, "--")
+    n = 3*MAX_PUNTOS
+    x = np.linspace(0, 10, n)
+    y = 5 + np.sin(40*x)
+    grafico.agregar(linea, x, y)
+    grafico.agregar(puntos, x[:50], y[:50])
+    grafico.actualizar_curva(curva, [0, 10], [0, 10])
+    ruta = grafico.cerrar()
+    assert ruta == str(sin_pantalla / "vivo.png") and os.path.getsize(ruta) > 0
+    # Las líneas se guardan reducidas (con sus extremos) y los puntos completos
+    base_linea = grafico.series[linea]["base"].get_data()
+    assert all(np.array_equal(a, b) for a, b in zip(base_linea, reducir_serie(x, y)))
+    assert np.array_equal(grafico.series[puntos]["base"].get_data()[0], x[:50])
+    assert not grafico.curvas[curva].get_animated()
+
+
+def test_experimento2_en_vivo_igual_al_ajuste_por_lotes(sin_pantalla):
+    from scipy.stats import linregress
+
+    import Experimento2
+
+    lotes = list(Experimento2.barrido_simulado(2000, tam_lote=37))
+    r = np.concatenate([lote[0] for lote in lotes])
+    V = np.concatenate([lote[1] for lote in lotes])
+    with redirect_stdout(io.StringIO()):
+        resultado = Experimento2.ejecutar_vivo(iter(lotes), tasa_redibujo=0)
+    referencia = linregress(1/r**2, V)
+    assert resultado["n"] == 2000
+    assert np.isclose(resultado["pendiente_inverso_cuadrado"], referencia.slope, rtol=1e-10)
+    assert np.isclose(resultado["u_pendiente_inverso_cuadrado"], referencia.stderr, rtol=1e-8)
+    # Los ejes iniciales contienen todo el barrido: ningún refresco completo además del primero
+    assert resultado["refrescos"] == len(lotes) + 1 and resultado["completos"] == 1
+    assert os.path.exists(sin_pantalla / "exp2_barrido_vivo.png")
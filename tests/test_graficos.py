@@ -0,0 +1,85 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import graficos
+from graficos import Figura, mostrar, reducir_serie, renderizar_pendientes
+
+
+def test_reducir_serie_conserva_extremos_de_cada_tramo():
+    rng = np.random.default_rng(0)
+    n, max_puntos = 100_003, 1000
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    xr, yr = reducir_serie(x, y, max_puntos)
+    assert xr.size <= max_puntos + 4
+    assert np.all(np.diff(xr) > 0)
+    assert np.array_equal(yr, y[xr.astype(int)])
+    assert xr[0] == 0 and xr[-1] == n - 1
+    # Mínimo y máximo de cada tramo, por fuerza bruta
+    k = -(-n // (max_puntos // 2))
+    for inicio in range(0, n, k):
+        tramo = y[inicio:inicio + k]
+        assert tramo.min() in yr and tramo.max() in yr
+
+
+def test_reducir_serie_corta_sin_cambios():
+    x, y = np.arange(10.0), np.arange(10.0)**2
+    xr, yr = reducir_serie(x, y)
+    assert np.array_equal(xr, x) and np.array_equal(yr, y)
+
+
+def test_figura_registra_llamadas():
+    fig = Figura("prueba", figsize=(4, 3))
+    fig.plot([1, 2], [3, 4], "o", label="datos")
+    fig.xlabel("x")
+    assert fig.opciones_figura == {"figsize": (4, 3)}
+    assert fig.llamadas == [("plot", ([1, 2], [3, 4], "o"), {"label": "datos"}),
+                            ("xlabel", ("x",), {})]
+
+
+def _figuras(n):
+    figuras = []
+    for i in range(n):
+        fig = Figura(f"figura_{i}")
+        x = np.linspace(0, 1, 20_000)
+        fig.plot(x, np.sin(2*np.pi*(i + 1)*x), "-")
+        fig.title(f"Figura {i}")
+        figuras.append(fig)
+    return figuras
+
+
+def test_renderizar_pendientes_sin_pantalla(tmp_path, monkeypatch):
+    monkeypatch.setenv("FISMOD_FIGURAS", str(tmp_path))
+    monkeypatch.setattr(graficos, "_pendientes", [])
+    for fig in _figuras(3):
+        mostrar(fig)
+    assert len(graficos._pendientes) == 3
+    rutas = renderizar_pendientes(n_procesos=1)
+    assert rutas == [str(tmp_path / f"figura_{i}.png") for i in range(3)]
+    for ruta in rutas:
+        with open(ruta, "rb") as archivo:
+            assert archivo.read(8) == b"\x89PNG\r\n\x1a\n"
+    assert graficos._pendientes == []
+    assert renderizar_pendientes() == []
+
+
+def _leer(ruta):
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+
+def test_renderizar_pendientes_en_pool_igual_que_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(graficos, "_pendientes", [])
+    contenidos = []
+    for n_procesos, sub in ((1, "serial"), (2, "pool")):
+        monkeypatch.setenv("FISMOD_FIGURAS", str(tmp_path / sub))
+        for fig in _figuras(2):
+            mostrar(fig)
+        rutas = renderizar_pendientes(n_procesos=n_procesos)
+        assert [os.path.basename(r) for r in rutas] == ["figura_0.png", "figura_1.png"]
+        contenidos.append([_leer(r) for r in rutas])
+    assert contenidos[0] == contenidos[1]
@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from incertidumbre import AcumuladorTipoA
+
+
+def _lecturas(n=1000, semilla=0):
+    return np.random.default_rng(semilla).normal(12.5, 0.3, n)
+
+
+def test_acumulador_igual_a_numpy():
+    lecturas = _lecturas()
+    acumulador = AcumuladorTipoA(ddof=1, u_res=0.05).agregar_bloque(lecturas)
+    assert np.isclose(acumulador.media, lecturas.mean(), rtol=1e-14)
+    assert np.isclose(acumulador.desviacion, lecturas.std(ddof=1), rtol=1e-12)
+    assert np.isclose(acumulador.u_A, lecturas.std(ddof=1) / np.sqrt(lecturas.size), rtol=1e-12)
+    assert np.isclose(acumulador.u_combinada, np.hypot(0.05, acumulador.u_A))
+
+
+def test_lectura_a_lectura_igual_a_bloques_y_combinados():
+    lecturas = _lecturas()
+    una_a_una = AcumuladorTipoA(ddof=0)
+    for x in lecturas:
+        una_a_una.agregar(x)
+    bloques = [AcumuladorTipoA(ddof=0).agregar_bloque(b) for b in np.array_split(lecturas, 7)]
+    combinado = bloques[0]
+    for otro in bloques[1:]:
+        combinado.combinar(otro)
+    for acumulador in (una_a_una, combinado):
+        assert acumulador.n == lecturas.size
+        assert np.isclose(acumulador.media, lecturas.mean(), rtol=1e-13)
+        assert np.isclose(acumulador.varianza, lecturas.var(), rtol=1e-10)
+
+
+def test_acumulador_estable_con_gran_desplazamiento():
+    # Σx² - (Σx)²/n perdería toda la precisión; Welford no
+    lecturas = 1e9 + _lecturas()
+    acumulador = AcumuladorTipoA(ddof=1).agregar_bloque(lecturas[:500])
+    for x in lecturas[500:]:
+        acumulador.agregar(x)
+    assert np.isclose(acumulador.desviacion, lecturas.std(ddof=1), rtol=1e-6)
+
+
+def test_acumulador_vacio_y_una_lectura():
+    assert np.isnan(AcumuladorTipoA(ddof=1).varianza)
+    assert np.isnan(AcumuladorTipoA(ddof=1).agregar(3.0).varianza)
+    assert AcumuladorTipoA(ddof=0).agregar(3.0).varianza == 0.0
+
+
+def test_combinar_incompatibles():
+    with pytest.raises(ValueError):
+        AcumuladorTipoA(ddof=1).combinar(AcumuladorTipoA(ddof=0))
+    with pytest.raises(ValueError):
+        AcumuladorTipoA(ddof=1, u_res=0.01).combinar(AcumuladorTipoA(ddof=1, u_res=0.1))
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import instrumentacion
+from instrumentacion import Traza, etapa
+
+
+@pytest.fixture
+def traza():
+    ya_activo = tracemalloc.is_tracing()
+    traza = Traza(memoria=True)
+    yield traza
+    if not ya_activo:
+        tracemalloc.stop()
+
+
+def test_sin_traza_no_mide(monkeypatch):
+    monkeypatch.setattr(instrumentacion, "_traza", None)
+    with etapa("ajuste") as e:
+        pass
+    assert e is etapa("otra") is instrumentacion._INACTIVA
+
+
+def test_etapas_anidadas(traza):
+    with traza.etapa("analisis"):
+        time.sleep(0.02)
+        with traza.etapa("ajuste"):
+            grande = np.ones(2**20)  # 8 MB
+            time.sleep(0.05)
+            del grande
+        pequeño = np.ones(2**17)  # 1 MB
+        del pequeño
+    ajuste, analisis = traza.eventos
+    assert (ajuste["pila"], analisis["pila"]) == ("analisis;ajuste", "analisis")
+    assert ajuste["t_real_s"] >= 0.05 and analisis["t_real_s"] >= 0.07
+    assert ajuste["t_cpu_s"] < ajuste["t_real_s"]
+    assert analisis["inicio_s"] <= ajuste["inicio_s"]
+    # El pico de la etapa padre incluye el de la hija aunque la hija ya liberó su memoria
+    assert 8*2**20 <= ajuste["pico_memoria_bytes"] < 9*2**20
+    assert analisis["pico_memoria_bytes"] >= ajuste["pico_memoria_bytes"]
+
+    resumen = traza.resumen()
+    assert resumen["analisis;ajuste"]["n"] == 1 and resumen["analisis"]["t_real_s"] == analisis["t_real_s"]
+
+
+def test_pilas_colapsadas_con_tiempo_propio(traza):
+    for _ in range(2):
+        with traza.etapa("a"):
+            with traza.etapa("b"):
+                time.sleep(0.01)
+    lineas = dict(linea.split(" ") for linea in traza.a_pilas_colapsadas())
+    eventos = {pila: sum(e["t_real_s"] for e in traza.eventos if e["pila"] == pila) for pila in ("a", "a;b")}
+    assert int(lineas["a;b"]) == round(eventos["a;b"]*1e6)
+    assert int(lineas["a"]) == max(round((eventos["a"] - eventos["a;b"])*1e6), 0)
+    assert traza.resumen()["a;b"]["n"] == 2
+
+
+def test_error_en_la_etapa_se_registra(traza):
+    with pytest.raises(ZeroDivisionError):
+        with traza.etapa("falla"):
+            1 / 0
+    assert [e["nombre"] for e in traza.eventos] == ["falla"] and traza._pila == []
+
+
+def test_guardar_chrome_y_folded(tmp_path):
+    traza = Traza(memoria=False)
+    with traza.etapa("a"):
+        with traza.etapa("b"):
+            pass
+    with open(traza.guardar(str(tmp_path / "traza.json")), encoding="utf-8") as f:
+        chrome = json.load(f)
+    assert [(e["name"], e["ph"]) for e in chrome["traceEvents"]] == [("b", "X"), ("a", "X")]
+    assert chrome["traceEvents"][0]["args"]["pila"] == "a;b"
+    assert chrome["traceEvents"][0]["args"]["pico_memoria_bytes"] == 0
+    with open(traza.guardar(str(tmp_path / "traza.folded")), encoding="utf-8") as f:
+        assert [linea.split(" ")[0] for linea in f.read().splitlines()] == ["a;b", "a"]
+
+
+def test_variable_de_entorno_escribe_la_traza(tmp_path):
+    ruta = str(tmp_path / "traza.json")
+    entorno = {clave: valor for clave, valor in os.environ.items() if not clave.startswith("FISMOD_")}
+    entorno.update(FISMOD_TRAZA=ruta, FISMOD_TRAZA_MEMORIA="0")
+    proceso = subprocess.run([sys.executable, "Experimento4.py", "--no-plot"], cwd=RAIZ, env=entorno,
+                             capture_output=True, text=True, timeout=120)
+    assert proceso.returncode == 0, proceso.stderr
+    with open(ruta, encoding="utf-8") as f:
+        pilas = {e["args"]["pila"] for e in json.load(f)["traceEvents"]}
+    assert {"Experimento4", "Experimento4;ajuste", "Experimento4;bootstrap"} <= pilas
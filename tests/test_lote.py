@@ -0,0 +1,93 @@
+import csv
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from lote import COLUMNAS_RESUMEN, crear_lote_sintetico, descubrir, ejecutar_lote, guardar_resumen, tabla_resumen
+
+
+@pytest.fixture(scope="module")
+def lote(tmp_path_factory):
+    directorio = str(tmp_path_factory.mktemp("lote"))
+    crear_lote_sintetico(directorio, n_sesiones=2)
+    with open(os.path.join(directorio, "exp4_dañado.csv"), "w") as f:
+        f.write("fases,otra\n1,2\n3,4\n")
+    return directorio, descubrir(directorio)
+
+
+def _valores(resultados):
+    # repr: las incertidumbres NaN se comparan iguales
+    return [(r["experimento"], r["archivo"], r["estado"], repr(r["filas"])) for r in resultados]
+
+
+def test_descubrir(tmp_path):
+    for nombre in ["exp1_a.csv", "grupo2/Experimento3/sesion.npz", "exp_2.npy", "exp2_grande.csv.fmc",
+                   "exp4_notas.txt", "sin_experimento.csv", "EXP-4/datos.fmc"]:
+        ruta = tmp_path / nombre
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_bytes(b"")
+    encontrados = [(n, os.path.relpath(ruta, tmp_path)) for n, ruta in descubrir(str(tmp_path))]
+    # Primero los archivos de cada carpeta y luego sus subcarpetas, en orden alfabético
+    assert encontrados == [(1, "exp1_a.csv"), (2, "exp_2.npy"), (4, os.path.join("EXP-4", "datos.fmc")),
+                           (3, os.path.join("grupo2", "Experimento3", "sesion.npz"))]
+
+
+def test_lote_serial_igual_a_cada_experimento(lote):
+    from scipy.stats import linregress
+
+    from datos import cargar_datos
+
+    directorio, archivos = lote
+    assert [n for n, _ in archivos] == [1, 1, 2, 2, 3, 3, 4, 4, 4]
+    resultados, t_total = ejecutar_lote(archivos, n_procesos=1)
+    assert t_total > 0
+    assert [r["archivo"] for r in resultados] == [ruta for _, ruta in archivos]
+    for r in resultados:
+        if os.path.basename(r["archivo"]) == "exp4_dañado.csv":
+            assert r["estado"] == "error" and r["filas"] == [] and "KeyError" in r["detalle"]
+            continue
+        assert r["estado"] == "ok", r["detalle"]
+        if r["experimento"] == 4:
+            datos = cargar_datos(r["archivo"])
+            referencia = linregress(datos["fases"], datos["distancias"])
+            assert r["filas"][0][0] == "c" and np.isclose(r["filas"][0][1], referencia.slope, rtol=1e-12)
+
+
+def test_lote_en_pool_igual_que_serial(lote):
+    _, archivos = lote
+    serial, _ = ejecutar_lote(archivos, n_procesos=1, calentamiento=False)
+    paralelo, _ = ejecutar_lote(archivos, n_procesos=2)
+    assert _valores(paralelo) == _valores(serial)
+
+
+@pytest.mark.parametrize("metodo", ["spawn", "forkserver"])
+def test_calentamiento_con_otros_metodos_de_inicio(lote, metodo):
+    # Con spawn/forkserver los procesos del pool arrancan a medida que llegan tareas
+    _, archivos = lote
+    codigo = (f"import multiprocessing, lote\n"
+              f"if __name__ == '__main__':\n"
+              f"    multiprocessing.set_start_method({metodo!r})\n"
+              f"    archivos = [a for a in lote.descubrir({os.path.dirname(archivos[0][1])!r}) if a[0] == 4]\n"
+              f"    resultados, _ = lote.ejecutar_lote(archivos, n_procesos=3)\n"
+              f"    print(sum(r['estado'] == 'ok' for r in resultados), len(resultados))\n")
+    proceso = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, timeout=120)
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout.split() == ["2", "3"]
+
+
+def test_tabla_resumen(lote, tmp_path):
+    _, archivos = lote
+    resultados, _ = ejecutar_lote(archivos[-3:], n_procesos=1, calentamiento=False)
+    tabla = tabla_resumen(resultados)
+    # Una fila por magnitud y una fila de error sin magnitud
+    assert [(f["estado"], f["magnitud"]) for f in tabla] == [("error", ""), ("ok", "c"), ("ok", "c")]
+    with open(guardar_resumen(tabla, str(tmp_path / "resumen.csv")), encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert list(filas[0]) == COLUMNAS_RESUMEN and len(filas) == 3
+    assert float(filas[1]["valor"]) == tabla[1]["valor"]
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mediciones import MedicionesRadiacion, mediciones_sinteticas
+from termistor import spline
+
+
+def test_emisividad_y_V_vs_T_igual_al_bucle_por_diccionarios():
+    mediciones = mediciones_sinteticas(n_potencias=6, n_repeticiones=3, semilla=1)
+    emisividad = mediciones.emisividad_relativa()
+    T, V = mediciones.V_vs_T()
+    for i, potencia in enumerate(mediciones.potencias):
+        V_negra = np.mean(mediciones.V_mV[i, mediciones.indice_cara("negra")])
+        for j, cara in enumerate(mediciones.caras):
+            V_cara = np.mean(mediciones.V_mV[i, j])
+            T_cara = np.mean([round(float(spline(r*1000)), 1) for r in mediciones.R_kohm[i, j]])
+            assert np.isclose(emisividad[i, j], V_cara / V_negra)
+            assert np.isclose(V[i, j], V_cara)
+            assert np.isclose(T[i, j], T_cara)
+    assert mediciones.como_diccionario(emisividad)[mediciones.potencias[0]]["negra"] == 1.0
+
+
+def test_repeticiones_faltantes():
+    R_kohm = np.array([[[5.0, np.nan], [5.1, 5.2]]])
+    V_mV = np.array([[[2.0, np.nan], [1.0, 3.0]]])
+    mediciones = MedicionesRadiacion(["P1"], ["negra", "blanca"], R_kohm, V_mV)
+    T, V = mediciones.V_vs_T(resolucion=None)
+    assert np.array_equal(V, [[2.0, 2.0]])
+    assert np.isclose(T[0, 0], spline(5000.0))
+    assert np.array_equal(mediciones.emisividad_relativa(), [[1.0, 1.0]])
+
+
+def test_formas_invalidas():
+    with pytest.raises(ValueError):
+        MedicionesRadiacion(["P1", "P2"], ["negra"], np.ones((2, 1)), np.ones((2, 2)))
+    with pytest.raises(ValueError):
+        MedicionesRadiacion(["P1"], ["negra", "blanca"], np.ones((2, 2)), np.ones((2, 2)))
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from montecarlo import propagar_montecarlo
+
+# Datos del Experimento 3
+Voltajes = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0])
+Corrientes = np.array([1.18, 1.41, 1.58, 1.75, 1.91, 2.04, 2.17, 2.30, 2.44, 2.55, 2.68])
+Radiancia = np.array([1.8, 3.6, 5.9, 8.6, 11.6, 14.9, 16.8, 20.5, 25.5, 29.0, 32.5])
+
+
+def _propagar(**opciones):
+    return propagar_montecarlo(Voltajes, Corrientes, Radiancia, 0.5, 0.01, 0.1, R_ref=0.6,
+                               n_muestras=2*10**5, tam_bloque=5*10**4, semilla=0, **opciones)
+
+
+def test_resumen_igual_a_las_muestras():
+    resultado = _propagar(muestras=True)
+    pendientes = resultado["pendientes"]
+    assert pendientes.size == resultado["n_muestras"]
+    assert np.isclose(resultado["pendiente_media"], pendientes.mean(), rtol=1e-12)
+    assert np.isclose(resultado["u_pendiente"], pendientes.std(ddof=1), rtol=1e-9)
+    assert np.isclose(resultado["u_intercepto"], resultado["interceptos"].std(ddof=1), rtol=1e-9)
+    # El intervalo del histograma difiere de los percentiles exactos en menos de un intervalo del histograma
+    exacto = np.percentile(pendientes, [2.5, 97.5])
+    assert np.allclose(resultado["intervalo_95"], exacto, rtol=0, atol=1e-3*pendientes.std())
+
+
+def test_sin_muestras_por_defecto():
+    resultado = _propagar()
+    assert "pendientes" not in resultado and "interceptos" not in resultado
+
+
+def test_procesos_igual_a_un_proceso():
+    uno = _propagar()
+    dos = _propagar(n_procesos=2)
+    for clave in ("pendiente_media", "u_pendiente", "intervalo_95", "intercepto_medio"):
+        assert np.allclose(uno[clave], dos[clave], rtol=1e-12)
@@ -0,0 +1,129 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from regresion import ajustar_york, RegresionIncremental
+
+
+def _puntos_T4(n=40, semilla=0):
+    # Radiancia vs T^4 del filamento: x ~ 1e13, donde las sumas Σx, Σxx pierden precisión
+    rng = np.random.default_rng(semilla)
+    T4 = np.linspace(1200.0, 2600.0, n)**4
+    return T4, 7e-13*T4 + 1.5 + rng.normal(0.0, 0.3, n)
+
+
+def _comparar_con_linregress(ajuste, x, y):
+    from scipy.stats import linregress
+
+    referencia = linregress(x, y)
+    assert ajuste.n == len(x)
+    assert np.isclose(ajuste.pendiente, referencia.slope, rtol=1e-10)
+    assert np.isclose(ajuste.intercepto, referencia.intercept, rtol=1e-9)
+    assert np.isclose(ajuste.r2, referencia.rvalue**2, rtol=1e-10)
+    assert np.isclose(ajuste.u_pendiente, referencia.stderr, rtol=1e-8)
+    assert np.isclose(ajuste.u_intercepto, referencia.intercept_stderr, rtol=1e-8)
+
+
+def test_incremental_igual_a_linregress():
+    x, y = _puntos_T4()
+    ajuste = RegresionIncremental()
+    for xi, yi in zip(x, y):
+        ajuste.agregar(xi, yi)
+    _comparar_con_linregress(ajuste, x, y)
+
+
+def test_quitar_punto():
+    x, y = _puntos_T4(semilla=1)
+    ajuste = RegresionIncremental().agregar_bloque(x, y)
+    ajuste.quitar(x[7], y[7]).quitar(x[-1], y[-1])
+    _comparar_con_linregress(ajuste, np.delete(x, [7, -1]), np.delete(y, [7, -1]))
+
+
+def test_combinar_bloques():
+    x, y = _puntos_T4(semilla=2)
+    partes = [RegresionIncremental().agregar_bloque(xb, yb) for xb, yb in zip(np.array_split(x, 3), np.array_split(y, 3))]
+    ajuste = RegresionIncremental()
+    for parte in partes:
+        ajuste.combinar(parte)
+    _comparar_con_linregress(ajuste, x, y)
+
+
+def test_r2_sin_puntos():
+    assert np.isnan(RegresionIncremental().r2)
+
+
+def test_r2_un_punto():
+    assert np.isnan(RegresionIncremental().agregar(1.0, 2.0).r2)
+
+
+def test_r2_y_constante():
+    ajuste = RegresionIncremental().agregar_bloque([1.0, 2.0, 3.0], [5.0, 5.0, 5.0])
+    assert np.isnan(ajuste.r2)
+    assert ajuste.pendiente == 0.0
+
+
+def test_r2_recta_exacta():
+    ajuste = RegresionIncremental().agregar_bloque([1.0, 2.0, 3.0], [2.0, 4.0, 6.0])
+    assert np.isclose(ajuste.r2, 1.0)
+
+
+#------------------------------------------------------------------------------------------
+
+#Ajuste de York
+
+def _serie_york(semilla=0, n=12):
+    rng = np.random.default_rng(semilla)
+    x_verdadero = np.linspace(1.0, 10.0, n)
+    u_x = rng.uniform(0.05, 0.2, n)
+    u_y = rng.uniform(0.1, 0.4, n)
+    x = x_verdadero + rng.normal(0.0, u_x)
+    y = 2.0 + 0.7*x_verdadero + rng.normal(0.0, u_y)
+    return x, y, u_x, u_y
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")  # scipy.odr está obsoleto desde SciPy 1.17
+def test_york_igual_a_odr():
+    from scipy import odr
+
+    x, y, u_x, u_y = _serie_york()
+    york = ajustar_york(x, y, u_x, u_y)
+    referencia = odr.ODR(odr.RealData(x, y, sx=u_x, sy=u_y), odr.unilinear, beta0=[0.7, 2.0]).run()
+    assert np.isclose(york["pendiente"][0], referencia.beta[0], rtol=1e-6)
+    assert np.isclose(york["intercepto"][0], referencia.beta[1], rtol=1e-6)
+    assert york["convergido"][0]
+
+
+def test_york_sin_error_en_x_es_minimos_cuadrados_ponderados():
+    x, y, _, u_y = _serie_york(1)
+    york = ajustar_york(x, y, 0.0, u_y)
+    b, a = np.polyfit(x, y, 1, w=1/u_y)
+    assert np.isclose(york["pendiente"][0], b, rtol=1e-10)
+    assert np.isclose(york["intercepto"][0], a, rtol=1e-10)
+
+
+def test_york_lote_con_series_de_distinto_largo():
+    series = [_serie_york(semilla, n) for semilla, n in [(2, 12), (3, 8)]]
+    x, y, u_x, u_y = (np.full((2, 12), np.nan) for _ in range(4))
+    for i, serie in enumerate(series):
+        for apilado, valores in zip((x, y, u_x, u_y), serie):
+            apilado[i, :valores.size] = valores
+    lote = ajustar_york(x, y, np.nan_to_num(u_x), np.nan_to_num(u_y))
+    for i, serie in enumerate(series):
+        individual = ajustar_york(*serie)
+        assert np.isclose(lote["pendiente"][i], individual["pendiente"][0], rtol=1e-9)
+        assert np.isclose(lote["chi2_reducido"][i], individual["chi2_reducido"][0], rtol=1e-6)
+
+
+def test_york_sin_iteraciones():
+    york = ajustar_york(*_serie_york(), max_iteraciones=0)
+    assert york["iteraciones"] == 0
+    assert not york["convergido"].any()
+
+
+def test_york_pocos_puntos():
+    with pytest.raises(ValueError):
+        ajustar_york([1.0, 2.0], [1.0, 2.0], 0.1, 0.1)
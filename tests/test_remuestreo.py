@@ -0,0 +1,101 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from remuestreo import _pendientes_indices, bootstrap_pendiente, jackknife_pendiente
+
+
+def _datos(n=30, semilla=0):
+    rng = np.random.default_rng(semilla)
+    x = rng.uniform(16, 22, n)
+    # Errores asimétricos: la distribución bootstrap de la pendiente queda sesgada
+    y = 3.0 + 2.0*x + rng.exponential(1.0, n)
+    return x, y
+
+
+def test_pendientes_indices_igual_a_linregress():
+    from scipy.stats import linregress
+
+    x, y = _datos()
+    indices = np.random.default_rng(1).integers(0, x.size, (50, x.size))
+    pendientes = _pendientes_indices(x, y, indices)
+    assert np.allclose(pendientes, [linregress(x[i], y[i]).slope for i in indices], rtol=1e-10)
+    # Todos los x iguales: pendiente indefinida
+    assert np.isnan(_pendientes_indices(x, y, np.zeros((1, x.size), dtype=int)))[0]
+
+
+def test_jackknife_igual_a_dejar_uno_fuera():
+    from scipy.stats import linregress, t
+
+    x, y = _datos()
+    jack = jackknife_pendiente(x, y, confianza=0.9)
+    n = x.size
+    referencia = np.array([linregress(np.delete(x, i), np.delete(y, i)).slope for i in range(n)])
+    b = linregress(x, y).slope
+    assert np.isclose(jack["pendiente"], b, rtol=1e-12)
+    assert np.allclose(jack["pendientes"], referencia, rtol=1e-10)
+    sesgo = (n - 1)*(referencia.mean() - b)
+    u = np.sqrt((n - 1)/n*np.sum((referencia - referencia.mean())**2))
+    k = t.ppf(0.95, n - 1)
+    assert np.isclose(jack["sesgo"], sesgo, rtol=1e-8)
+    assert np.isclose(jack["u_pendiente"], u, rtol=1e-8)
+    assert np.allclose(jack["intervalo"], (b - sesgo - k*u, b - sesgo + k*u), rtol=1e-10)
+
+
+def test_bca_con_la_formula_de_efron():
+    # Mismos remuestreos: BCa de referencia con scipy.stats.norm y jackknife por fuerza bruta
+    from scipy.stats import linregress, norm
+
+    x, y = _datos()
+    boot = bootstrap_pendiente(x, y, 20_000, confianza=0.9, semilla=2)
+    pendientes = boot["pendientes"]
+    b = linregress(x, y).slope
+    z0 = norm.ppf(np.mean(pendientes < b))
+    jack = np.array([linregress(np.delete(x, i), np.delete(y, i)).slope for i in range(x.size)])
+    d = jack.mean() - jack
+    a = np.sum(d**3) / (6*np.sum(d**2)**1.5)
+    z = norm.ppf([0.05, 0.95])
+    niveles = norm.cdf(z0 + (z0 + z)/(1 - a*(z0 + z)))
+    assert np.allclose(boot["intervalo_bca"], np.quantile(pendientes, niveles), rtol=1e-12)
+    assert np.allclose(boot["intervalo_percentil"], np.quantile(pendientes, [0.05, 0.95]), rtol=1e-12)
+    assert np.isclose(boot["u_pendiente"], pendientes.std(ddof=1))
+    assert boot["n_remuestreos"] == 20_000 and boot["degenerados"] == 0 and pendientes.size == 20_000
+
+
+def test_bca_igual_a_scipy_bootstrap():
+    # Otros remuestreos: los intervalos coinciden dentro del error de Monte Carlo
+    from scipy.stats import bootstrap
+
+    x, y = _datos()
+    boot = bootstrap_pendiente(x, y, 10**5, semilla=3)
+
+    def pendiente(x, y, axis=-1):
+        xc = x - x.mean(axis=axis, keepdims=True)
+        return np.sum(xc*y, axis=axis) / np.sum(xc*xc, axis=axis)
+
+    referencia = bootstrap((x, y), pendiente, paired=True, vectorized=True, n_resamples=10**5, method="BCa",
+                           random_state=np.random.default_rng(4))
+    ancho = boot["intervalo_bca"][1] - boot["intervalo_bca"][0]
+    assert np.allclose(boot["intervalo_bca"], (referencia.confidence_interval.low,
+                                               referencia.confidence_interval.high), atol=0.02*ancho)
+    assert np.isclose(boot["u_pendiente"], referencia.standard_error, rtol=0.02)
+
+
+def test_bootstrap_no_depende_del_numero_de_procesos():
+    x, y = _datos()
+    serial = bootstrap_pendiente(x, y, 5000, tam_bloque=700, semilla=5)
+    paralelo = bootstrap_pendiente(x, y, 5000, tam_bloque=700, n_procesos=2, semilla=5)
+    assert np.array_equal(serial["pendientes"], paralelo["pendientes"])
+    assert serial["intervalo_bca"] == paralelo["intervalo_bca"]
+
+
+def test_bootstrap_descarta_remuestreos_degenerados():
+    x, y = np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.1, 2.9])
+    boot = bootstrap_pendiente(x, y, 9000, semilla=6)
+    # Con 3 puntos, 3 de los 27 remuestreos posibles repiten un solo x
+    assert np.isclose(boot["degenerados"] / 9000, 3/27, atol=0.01)
+    assert boot["pendientes"].size == 9000 - boot["degenerados"]
+    assert not np.isnan(boot["pendientes"]).any()
@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datos import ConjuntoDatos, cargar_datos
+from retardo import crear_capturas_sinteticas, estimar_retardos, retardos_bloque
+
+
+def _ruido_desplazado(retardos, n=1024, semilla=0):
+    # Ruido blanco y el mismo ruido retrasado un número entero de muestras (sin bordes circulares)
+    rng = np.random.default_rng(semilla)
+    margen = int(np.max(np.abs(retardos))) + 1
+    base = rng.normal(size=(len(retardos), n + 2*margen))
+    referencia = base[:, margen:margen + n]
+    senal = np.array([fila[margen - d:margen - d + n] for fila, d in zip(base, retardos)])
+    return referencia, senal
+
+
+def test_retardos_enteros():
+    retardos = np.array([0, 1, -1, 37, -200, 511])
+    referencia, senal = _ruido_desplazado(retardos)
+    estimados = retardos_bloque(referencia, senal)
+    # El máximo cae en la muestra exacta; la parábola por ruido blanco lo mueve muy poco
+    assert np.array_equal(np.round(estimados), retardos)
+    assert np.allclose(estimados, retardos, atol=0.01)
+
+
+def test_igual_a_la_correlacion_directa():
+    # Máximo de np.correlate (O(n²)) en la misma ventana de retardos
+    rng = np.random.default_rng(1)
+    n, m = 300, 40
+    referencia = rng.normal(size=(20, n))
+    senal = np.roll(referencia, 7, axis=1) + rng.normal(0, 2.0, (20, n))
+    estimados = retardos_bloque(referencia, senal, retardo_max=m)
+    for r, s, estimado in zip(referencia, senal, estimados):
+        completa = np.correlate(s - s.mean(), r - r.mean(), mode="full")  # retardo k en la posición n - 1 + k
+        ventana = completa[n - 1 - m:n + m]
+        assert int(np.argmax(ventana)) - m == int(np.round(estimado))
+        assert abs(estimado - (int(np.argmax(ventana)) - m)) <= 0.5
+
+
+def test_retardo_fraccionario_de_un_pulso():
+    n = 2048
+    t = np.arange(n)
+    retardos = np.array([0.0, 0.25, 10.5, -33.3, 101.75])
+    referencia = np.tile(np.exp(-0.5*((t - 1000) / 12.0)**2), (retardos.size, 1))
+    senal = 0.3*np.exp(-0.5*((t - 1000 - retardos[:, None]) / 12.0)**2)
+    assert np.allclose(retardos_bloque(referencia, senal), retardos, atol=0.02)
+
+
+def test_retardo_max_limita_la_busqueda():
+    referencia, senal = _ruido_desplazado(np.array([300]))
+    assert abs(retardos_bloque(referencia, senal, retardo_max=100)[0]) <= 100
+    assert np.isclose(retardos_bloque(referencia, senal, retardo_max=400)[0], 300, atol=1e-6)
+
+
+def _error_rms(datos, retardos, frecuencia, **opciones):
+    estimados = estimar_retardos(datos, 2**12, frecuencia, retardo_max=500e-9, **opciones)
+    return estimados, np.sqrt(np.mean((estimados - retardos)**2)) * frecuencia
+
+
+def test_capturas_sinteticas_por_bloques(tmp_path):
+    frecuencia = 2.5e9
+    rng = np.random.default_rng(2)
+    retardos = (rng.uniform(16, 22, 40) + 28.6) / 2.19e8
+
+    sin_ruido = cargar_datos(crear_capturas_sinteticas(str(tmp_path / "limpias.fmc"), retardos, 2**12, frecuencia,
+                                                       ruido=0.0))
+    assert len(sin_ruido) == 40 * 2**12 and sin_ruido["senal"].dtype == np.float32
+    assert _error_rms(sin_ruido, retardos, frecuencia)[1] < 0.005  # en muestras
+
+    # Con ruido, el error queda cerca del límite de Cramér-Rao (~0.16 muestras) solo con el pasa bajos
+    datos = cargar_datos(crear_capturas_sinteticas(str(tmp_path / "capturas.fmc"), retardos, 2**12, frecuencia,
+                                                   semilla=3))
+    estimados, error = _error_rms(datos, retardos, frecuencia, frecuencia_corte=200e6)
+    assert error < 0.3
+    assert _error_rms(datos, retardos, frecuencia)[1] > error
+    por_bloques, _ = _error_rms(datos, retardos, frecuencia, frecuencia_corte=200e6, tam_bloque=7)
+    assert np.allclose(por_bloques, estimados, rtol=0, atol=1e-15)
+
+
+def test_capturas_incompletas():
+    datos = ConjuntoDatos({"referencia": np.zeros(1000), "senal": np.zeros(1000)})
+    with pytest.raises(ValueError):
+        estimar_retardos(datos, 300, 1e9)
+
+
+def test_experimento4_con_capturas(tmp_path):
+    import Experimento4
+
+    frecuencia = 2.5e9
+    distancias = np.linspace(16.82, 21.82, 12)
+    retardos = (distancias + 28.6) / 2.19e8
+    capturas = cargar_datos(crear_capturas_sinteticas(str(tmp_path / "capturas.fmc"), retardos, 2**12, frecuencia,
+                                                      ruido=0.0))
+    with redirect_stdout(io.StringIO()):
+        resultado = Experimento4.ejecutar_capturas(capturas, distancias, 2**12, frecuencia, 200e6, graficar=False)
+    assert np.isclose(resultado["c"], 2.19e8, rtol=1e-4)
+    assert np.isclose(resultado["intercepto"], -28.6, atol=0.01)
+    with pytest.raises(ValueError):
+        Experimento4.ejecutar_capturas(capturas, distancias[:-1], 2**12, frecuencia, graficar=False)
@@ -0,0 +1,115 @@
+import io
+import itertools
+import os
+import sys
+from contextlib import redirect_stdout
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensibilidad import (barrido, derivadas_pendiente, grilla_resoluciones, sensibilidad_experimento2,
+                          sensibilidad_experimento3, sensibilidad_experimento4)
+
+
+def _derivadas_numericas(f, valores, h=1e-6):
+    # ∂f/∂valores_i por diferencias centradas
+    derivadas = np.empty(valores.size)
+    for i in range(valores.size):
+        paso = h * max(abs(valores[i]), 1.0)
+        arriba, abajo = valores.copy(), valores.copy()
+        arriba[i] += paso
+        abajo[i] -= paso
+        derivadas[i] = (f(arriba) - f(abajo)) / (2*paso)
+    return derivadas
+
+
+def test_derivadas_pendiente_igual_a_polyfit():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 12)
+    y = 1.5 + 0.7*x + rng.normal(0, 0.3, 12)
+    pesos = rng.uniform(0.2, 1.0, 12)
+    for w in (None, pesos):
+        raiz = None if w is None else np.sqrt(w)
+        b, db_dx, db_dy = derivadas_pendiente(x, y, w)
+        assert np.isclose(b, np.polyfit(x, y, 1, w=raiz)[0], rtol=1e-12)
+        assert np.allclose(db_dx, _derivadas_numericas(lambda x: np.polyfit(x, y, 1, w=raiz)[0], x), rtol=1e-6)
+        assert np.allclose(db_dy, _derivadas_numericas(lambda y: np.polyfit(x, y, 1, w=raiz)[0], y), rtol=1e-6)
+
+
+def test_barrido_igual_a_un_bucle():
+    coeficientes = {"a": 2.0, "b": 0.5, "c": 30.0}
+    resoluciones = {"a": np.geomspace(0.1, 10, 5), "b": np.linspace(1, 4, 3), "c": [0.01, 0.02]}
+    k = (1.0, 2.0)
+    r = barrido(coeficientes, resoluciones, k, fijas={"tipo_A": 0.3})
+    assert r["fuentes"] == ["a", "b", "c", "tipo_A"]
+    assert r["U"].shape == (5, 3, 2, 2) and r["u"].shape == r["dominante"].shape == (5, 3, 2, 1)
+    for (i, res_a), (j, res_b), (m, res_c) in itertools.product(*[enumerate(np.atleast_1d(v))
+                                                                  for v in resoluciones.values()]):
+        varianzas = [(2.0*res_a)**2/12, (0.5*res_b)**2/12, (30.0*res_c)**2/12, 0.09]
+        u = np.sqrt(sum(varianzas))
+        assert np.isclose(r["u"][i, j, m, 0], u, rtol=1e-13)
+        assert np.allclose(r["U"][i, j, m], np.array(k)*u, rtol=1e-13)
+        assert r["dominante"][i, j, m, 0] == np.argmax(varianzas)
+        for fuente, v in zip(r["fuentes"], varianzas):
+            assert np.isclose(r["fraccion"][fuente][i, j, m, 0], v / u**2, rtol=1e-12)
+
+
+def test_grilla_resoluciones():
+    grilla = grilla_resoluciones({"x": 0.5}, n_puntos=9, factor=4.0)["x"]
+    assert np.isclose(grilla[0], 0.125) and np.isclose(grilla[4], 0.5) and np.isclose(grilla[-1], 2.0)
+
+
+def test_experimento4_igual_a_su_propagacion(monkeypatch):
+    import Experimento4
+
+    monkeypatch.delenv("FISMOD_CACHE", raising=False)
+    s = sensibilidad_experimento4()
+    with redirect_stdout(io.StringIO()):
+        resultado = Experimento4.ejecutar(graficar=False, n_remuestreos=0)
+    u = barrido(s["coeficientes"], s["nominales"], 1.0)["u"].item()
+    assert np.isclose(u, resultado["u_c"], rtol=1e-12)
+    assert np.isclose(s["valor"], resultado["c"], rtol=1e-12)
+
+
+def test_experimento3_igual_a_derivadas_numericas():
+    # c_s² = Σ_i (∂b/∂m_i)² derivando la cadena completa V, I → T⁴ → pendiente
+    from Experimento3 import Corrientes, R_ref, Radiancia, Voltajes
+    from tungsteno import CalibracionTungsteno
+
+    calibracion = CalibracionTungsteno()
+
+    def pendiente(V, I, Rad):
+        return np.polyfit(calibracion.temperatura(V / I / R_ref)**4, Rad, 1)[0]
+
+    s = sensibilidad_experimento3()
+    derivadas = {
+        "res_Voltaje": _derivadas_numericas(lambda V: pendiente(V, Corrientes, Radiancia), Voltajes),
+        "res_Corriente": _derivadas_numericas(lambda I: pendiente(Voltajes, I, Radiancia), Corrientes),
+        "res_Radiancia": _derivadas_numericas(lambda Rad: pendiente(Voltajes, Corrientes, Rad), Radiancia),
+    }
+    assert np.isclose(s["valor"], pendiente(Voltajes, Corrientes, Radiancia), rtol=1e-10)
+    for fuente, d in derivadas.items():
+        assert np.isclose(s["coeficientes"][fuente], np.sqrt(np.sum(d**2)), rtol=1e-5), fuente
+
+
+def test_experimento2_con_pesos_fijos():
+    # Con los pesos de Huber fijos, a es la pendiente ponderada de V vs 1/r²: se deriva
+    # numéricamente respecto de cada r_i y V_i
+    from ajuste_robusto import ajustar_inverso_cuadrado
+    from Experimento2 import distancias, repetibilidad, res_Voltimetro, voltaje
+    from incertidumbre import DDOF_TIPO_A, AcumuladorTipoA
+
+    s = sensibilidad_experimento2()
+    u_V = AcumuladorTipoA(ddof=DDOF_TIPO_A, u_res=res_Voltimetro/np.sqrt(12)).agregar_bloque(repetibilidad)
+    raiz = np.sqrt(ajustar_inverso_cuadrado(distancias, voltaje, u_V.u_combinada)["pesos"][0])
+
+    def a(r, V):
+        return np.polyfit(1/r**2, V, 1, w=raiz)[0]
+
+    assert np.isclose(s["valor"], a(distancias, voltaje), rtol=1e-10)
+    d_r = _derivadas_numericas(lambda r: a(r, voltaje), distancias)
+    d_V = _derivadas_numericas(lambda V: a(distancias, V), voltaje)
+    assert np.isclose(s["coeficientes"]["res_huincha"], np.sqrt(np.sum(d_r**2)), rtol=1e-5)
+    assert np.isclose(s["coeficientes"]["res_Voltimetro"], np.sqrt(np.sum(d_V**2)), rtol=1e-5)
+    assert np.isclose(s["fijas"]["tipo_A"], s["coeficientes"]["res_Voltimetro"] * u_V.u_A, rtol=1e-12)
@@ -0,0 +1,155 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from termistor import (A, B, C, R, T_K, CalibracionCompilada, ajustar_steinhart_lotes, buscar_desviacion_maxima,
+                       compilar_calibracion, convertir_por_bloques, convertir_resistencias, spline, steinhart)
+
+
+#------------------------------------------------------------------------------------------
+
+#Conversión vectorizada
+
+def test_conversion_igual_al_bucle_por_lectura():
+    # Referencia: el bucle original de Experimento1, una lectura a la vez con round(T, 1)
+    rng = np.random.default_rng(0)
+    R_kOhm = np.round(rng.uniform(R[0], R[-1], (3, 7)) / 1000, 2)
+    T = convertir_resistencias(R_kOhm, unidad="kohm")
+    assert T.shape == R_kOhm.shape
+    for R_val, T_val in zip(R_kOhm.ravel(), T.ravel()):
+        assert T_val == round(float(spline(R_val*1000)), 1)
+
+
+def test_conversion_ambos_modelos_y_fuera_de_rango():
+    T_spline, T_SH = convertir_resistencias([1000.0, 5000.0, 90000.0], modelo="ambos", resolucion=None)
+    assert np.isnan(T_spline[[0, 2]]).all()
+    assert T_spline[1] == spline(5000.0)
+    assert np.allclose(T_SH, 1 / (A + B*np.log([1000.0, 5000.0, 90000.0]) + C*np.log([1000.0, 5000.0, 90000.0])**3))
+
+
+def test_conversion_por_bloques_igual_a_todo_junto():
+    R_ohm = np.linspace(R[0], R[-1], 1000)
+    por_bloques = np.concatenate(list(convertir_por_bloques(np.array_split(R_ohm, 7), modelo="steinhart")))
+    assert np.array_equal(por_bloques, convertir_resistencias(R_ohm, modelo="steinhart"))
+
+
+def test_conversion_argumentos_invalidos():
+    with pytest.raises(ValueError):
+        convertir_resistencias([5.0], unidad="mohm")
+    with pytest.raises(ValueError):
+        convertir_resistencias([5000.0], modelo="lineal")
+
+#------------------------------------------------------------------------------------------
+
+#Calibración compilada
+
+def _R_densas(n=10**6):
+    return np.clip(np.exp(np.linspace(np.log(R[0]), np.log(R[-1]), n)), R[0], R[-1])
+
+
+@pytest.mark.parametrize("fuente, modelo", [("spline", spline), ("steinhart", steinhart)])
+@pytest.mark.parametrize("tolerancia", [1e-3, 1e-6])
+def test_compilada_dentro_de_la_cota(fuente, modelo, tolerancia):
+    calibracion = compilar_calibracion(fuente, tolerancia=tolerancia)
+    R_densas = _R_densas()
+    error = np.max(np.abs(calibracion(R_densas) - modelo(R_densas)))
+    assert calibracion.error_max < tolerancia
+    assert error <= calibracion.error_max
+
+
+def test_compilada_fuera_de_rango():
+    calibracion = compilar_calibracion("steinhart")
+    T = calibracion(np.array([-1000.0, 0.0, R[0] / 2, R[-1] * 2, np.nan, 5000.0]))
+    assert np.isnan(T[:5]).all()
+    assert np.isclose(T[5], steinhart(5000.0), atol=1e-3)
+    assert np.isnan(calibracion(-1.0))
+    assert np.ndim(calibracion(5000.0)) == 0
+
+
+def test_compilada_tolerancia_inalcanzable():
+    with pytest.raises(ValueError):
+        compilar_calibracion("spline", tolerancia=1e-9, n_maximo=128)
+
+
+def test_compilada_guardar_y_cargar_sin_extension(tmp_path):
+    calibracion = compilar_calibracion("spline")
+    ruta = calibracion.guardar(tmp_path / "calibracion")
+    assert ruta.endswith(".npz")
+    cargada = CalibracionCompilada.cargar(tmp_path / "calibracion")
+    R_densas = _R_densas(1000)
+    assert np.array_equal(cargada(R_densas), calibracion(R_densas))
+    assert np.isfinite(cargada(R[[0, -1]])).all()
+    assert cargada.error_max == calibracion.error_max
+    assert cargada.fuente == "spline"
+
+
+#------------------------------------------------------------------------------------------
+
+#Ajuste de Steinhart-Hart en lotes
+
+def _lote_termistores(n=5, semilla=0):
+    rng = np.random.default_rng(semilla)
+    R_tablas = R * rng.normal(1.0, 0.02, (n, 1)) * (1 + rng.normal(0.0, 1e-3, (n, R.size)))
+    return R_tablas, np.broadcast_to(T_K, R_tablas.shape)
+
+
+def test_ajuste_en_lotes_igual_a_lstsq_por_termistor():
+    R_tablas, T_tablas = _lote_termistores()
+    ajuste = ajustar_steinhart_lotes(R_tablas, T_tablas, tam_bloque=2)
+    for i in range(len(R_tablas)):
+        lnR = np.log(R_tablas[i])
+        X = np.column_stack([np.ones_like(lnR), lnR, lnR**3])
+        referencia = np.linalg.lstsq(X, 1 / T_tablas[i], rcond=None)[0]
+        assert np.allclose(ajuste["coeficientes"][i], referencia, rtol=1e-8)
+
+
+def test_ajuste_en_lotes_recupera_coeficientes_exactos():
+    ajuste = ajustar_steinhart_lotes(R, steinhart(R))
+    assert np.allclose(ajuste["coeficientes"][0], [A, B, C], rtol=1e-7)
+    assert ajuste["max_residuo"][0] < 1e-8
+
+
+def test_desviacion_en_lotes_igual_a_interp1d():
+    from scipy.interpolate import interp1d
+
+    R_tablas, T_tablas = _lote_termistores(3, semilla=1)
+    ajuste = ajustar_steinhart_lotes(R_tablas, T_tablas, puntos_por_intervalo=4)
+    t = np.arange(1, 5) / 5
+    for i in range(len(R_tablas)):
+        x = R_tablas[i]
+        R_eval = (x[:-1, None] + (x[1:] - x[:-1])[:, None]*t).ravel()
+        lnR = np.log(R_eval)
+        a, b, c = ajuste["coeficientes"][i]
+        desviacion = np.abs(interp1d(x, T_tablas[i], kind="cubic")(R_eval) - 1 / (a + b*lnR + c*lnR**3))
+        assert np.isclose(ajuste["max_desviacion_spline"][i], desviacion.max(), rtol=1e-9)
+        assert np.isclose(ajuste["R_max_desviacion"][i], R_eval[np.argmax(desviacion)])
+
+
+def test_ajuste_en_lotes_formas_distintas():
+    with pytest.raises(ValueError):
+        ajustar_steinhart_lotes(R, T_K[:-1])
+
+
+#------------------------------------------------------------------------------------------
+
+#Búsqueda de la máxima desviación spline vs Steinhart-Hart
+
+def test_desviacion_maxima_igual_a_grilla_completa():
+    # Referencia: todos los puntos de una grilla más fina evaluados de una vez
+    R_densas = _R_densas(2*10**6)
+    referencia = np.abs(spline(R_densas) - steinhart(R_densas))
+    busqueda = buscar_desviacion_maxima(n_puntos=10**5)
+    assert referencia.max() <= busqueda["max_desviacion"] <= referencia.max() + 1e-9
+    assert np.isclose(busqueda["R_max"], R_densas[np.argmax(referencia)], rtol=1e-5)
+    assert busqueda["max_desviacion"] >= np.abs(spline(R) - steinhart(R)).max()
+
+
+def test_desviacion_maxima_no_depende_de_los_bloques():
+    completa = buscar_desviacion_maxima(n_puntos=20000, tam_bloque=20000, refinar=False)
+    por_bloques = buscar_desviacion_maxima(n_puntos=20000, tam_bloque=777, refinar=False)
+    assert np.array_equal(completa["R_maximos_locales"], por_bloques["R_maximos_locales"])
+    assert completa["max_desviacion"] == por_bloques["max_desviacion"]
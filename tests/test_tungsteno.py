@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tungsteno import CalibracionTungsteno, R_rel_tabla, Temp_tabla
+
+
+def _R_rel(n=5000, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return rng.uniform(R_rel_tabla[0] - 0.2, R_rel_tabla[-1] + 0.2, (n // 5, 5))
+
+
+def test_temperatura_igual_a_interp1d():
+    from scipy.interpolate import interp1d
+
+    referencia = interp1d(R_rel_tabla, Temp_tabla, kind="cubic", fill_value="extrapolate")
+    R_rel = _R_rel()
+    T = CalibracionTungsteno().temperatura(R_rel)
+    assert T.shape == R_rel.shape
+    assert np.allclose(T, referencia(R_rel), rtol=1e-12, atol=1e-9)
+    assert np.allclose(CalibracionTungsteno()(R_rel_tabla), Temp_tabla, rtol=1e-13)
+
+
+def test_derivada_del_mismo_spline():
+    from scipy.interpolate import make_interp_spline
+
+    referencia = make_interp_spline(R_rel_tabla, Temp_tabla, k=3).derivative()
+    R_rel = _R_rel(semilla=1).clip(R_rel_tabla[0], R_rel_tabla[-1])
+    calibracion = CalibracionTungsteno()
+    T, dT = calibracion.evaluar(R_rel)
+    assert np.allclose(calibracion.derivada(R_rel), referencia(R_rel), rtol=1e-10)
+    assert np.array_equal(dT, calibracion.derivada(R_rel))
+    assert np.array_equal(T, calibracion.temperatura(R_rel))
+
+
+def test_inversa():
+    calibracion = CalibracionTungsteno()
+    R_rel = _R_rel(semilla=2).clip(R_rel_tabla[0], R_rel_tabla[-1])
+    assert np.allclose(calibracion.resistencia_relativa(calibracion.temperatura(R_rel)), R_rel, rtol=1e-12)
+
+
+def test_arrays_ida_y_vuelta():
+    calibracion = CalibracionTungsteno(R_rel_tabla[::2], Temp_tabla[::2])
+    copia = CalibracionTungsteno.desde_arrays(**calibracion.como_arrays())
+    R_rel = _R_rel(semilla=3)
+    assert np.array_equal(copia.temperatura(R_rel), calibracion.temperatura(R_rel))
+    assert not np.allclose(copia.temperatura(R_rel), CalibracionTungsteno().temperatura(R_rel))
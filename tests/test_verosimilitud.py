@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from verosimilitud import ajustar_exponente, grilla
+
+
+def _mediciones(n=4.0, T_amb=295.0, semilla=0):
+    rng = np.random.default_rng(semilla)
+    T = np.linspace(1200.0, 2600.0, 12)
+    u_y = np.full(T.size, 0.5)
+    a = 40.0 / (T.max()**n - T_amb**n)
+    Radiancia = a*(T**n - T_amb**n) + 1.5 + rng.normal(0.0, u_y)
+    return T, Radiancia, u_y
+
+
+def test_grilla_con_b_libre():
+    exponentes, T_ambientes = grilla(10**6)
+    exponentes_libre, T_ambientes_libre = grilla(10**6, b_libre=True)
+    assert abs(exponentes.size * T_ambientes.size - 10**6) < exponentes.size
+    assert np.array_equal(exponentes_libre, exponentes)
+    assert T_ambientes_libre.size == 1
+
+
+def test_mejor_celda_igual_a_minimos_cuadrados_ponderados():
+    T, Radiancia, u_y = _mediciones()
+    ajuste = ajustar_exponente(T, Radiancia, 0.0, u_y, *grilla(20000), u_intercepto=None, escalar=False)
+    mejor = ajuste["mejor"]
+    x = T**mejor["exponente"] - mejor["T_amb"]**mejor["exponente"]
+    a, b = np.polyfit(x, Radiancia, 1, w=1/u_y)
+    assert np.isclose(mejor["a"], a, rtol=1e-6)
+    assert np.isclose(mejor["b"], b, rtol=1e-6, atol=1e-9)
+    assert np.isclose(mejor["chi2"], np.sum(((Radiancia - a*x - b)/u_y)**2), rtol=1e-6)
+
+
+def test_exponente_recuperado():
+    T, Radiancia, u_y = _mediciones()
+    n = ajustar_exponente(T, Radiancia, 0.0, u_y, *grilla(20000, b_libre=True))["exponente"]
+    assert n["intervalo_95"][0] < 4.0 < n["intervalo_95"][1]
+
+
+def test_b_libre_no_depende_de_T_amb():
+    # Con b libre todas las columnas de T_amb tienen la misma verosimilitud: basta una
+    T, Radiancia, u_y = _mediciones()
+    exponentes, T_ambientes = grilla(5000)
+    completa = ajustar_exponente(T, Radiancia, 1.0, u_y, exponentes, T_ambientes)
+    una = ajustar_exponente(T, Radiancia, 1.0, u_y, exponentes, T_ambientes[:1])
+    assert np.allclose(completa["exponente"]["densidad"], una["exponente"]["densidad"], rtol=1e-6)
+    assert una["celdas"] == exponentes.size
+
+
+def test_pocas_mediciones():
+    with pytest.raises(ValueError):
+        ajustar_exponente([1000.0, 1500.0, 2000.0], [1.0, 2.0, 3.0], 1.0, 0.1)
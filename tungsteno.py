@@ -0,0 +1,177 @@
+"""
+Tungsteno - Tabla de conversión del filamento
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo contiene la tabla del fabricante para el filamento de
+tungsteno del Experimento 3 (resistencia relativa R/R300K, temperatura y
+resistividad) y la calibración cúbica que convierte R/R300K en temperatura,
+con su derivada y su inversa calculadas a partir de los mismos coeficientes.
+"""
+
+import time
+
+import numpy as np
+
+# Tabla de conversión manual de usuario
+# Cada fila: [R/R300K, Temp_K, Resistivity_μΩcm]
+data = np.array([
+    [1.00,  300,  5.65],
+    [1.43,  400,  8.06],
+    [1.87,  500, 10.56],
+    [2.34,  600, 13.23],
+    [2.85,  700, 16.09],
+    [3.36,  800, 19.00],
+    [3.88,  900, 21.94],
+    [4.41, 1000, 24.93],
+    [4.95, 1100, 27.94],
+    [5.48, 1200, 30.98],
+    [6.03, 1300, 34.08],
+    [6.58, 1400, 37.19],
+    [7.14, 1500, 40.36],
+    [7.71, 1600, 43.55],
+    [8.28, 1700, 46.78],
+    [8.86, 1800, 50.05],
+    [9.44, 1900, 53.35],
+    [10.03, 2000, 56.67],
+    [10.63, 2100, 60.06],
+    [11.24, 2200, 63.48],
+    [11.84, 2300, 66.91],
+    [12.46, 2400, 70.39],
+    [13.08, 2500, 73.91],
+    [13.72, 2600, 77.49],
+    [14.34, 2700, 81.04],
+    [14.99, 2800, 84.70],
+    [15.63, 2900, 88.33],
+    [16.29, 3000, 92.04],
+    [16.95, 3100, 95.76],
+    [17.62, 3200, 99.54],
+    [18.28, 3300, 103.3],
+    [18.97, 3400, 107.2],
+    [19.66, 3500, 111.1]
+])
+
+R_rel_tabla = data[:, 0]
+Temp_tabla = data[:, 1]
+
+
+class CalibracionTungsteno:
+    """
+    Spline cúbico R/R300K → T (el mismo de interp1d(kind='cubic')) guardado como
+    coeficientes por tramo. Valor, derivada dT/dR_rel e inversa T → R/R300K se
+    evalúan con esos coeficientes, vectorizados sobre arrays de cualquier forma.
+    Fuera de la tabla se extrapola con el polinomio del tramo extremo.
+    """
+
+    def __init__(self, R_rel=R_rel_tabla, T=Temp_tabla):
+        from scipy.interpolate import make_interp_spline, PPoly
+
+        pp = PPoly.from_spline(make_interp_spline(R_rel, T, k=3))
+        # Se descartan los tramos de largo cero que agrega la representación B-spline
+        validos = np.diff(pp.x) > 0
+        self.nodos = np.unique(pp.x)
+        self.coeficientes = np.ascontiguousarray(pp.c[:, validos])  # (4, n_tramos), potencias decrecientes
+        self.T_nodos = np.append(self.coeficientes[3], T[-1])  # valor al inicio de cada tramo
+
+    def como_arrays(self):
+        """Arrays que definen la calibración, para guardarlos (por ejemplo en la caché) o enviarlos a otro proceso."""
+        return {"nodos": self.nodos, "coeficientes": self.coeficientes, "T_nodos": self.T_nodos}
+
+    @classmethod
+    def desde_arrays(cls, nodos, coeficientes, T_nodos):
+        """Reconstruye la calibración a partir de como_arrays(), sin SciPy."""
+        calibracion = cls.__new__(cls)
+        calibracion.nodos = np.asarray(nodos, dtype=float)
+        calibracion.coeficientes = np.ascontiguousarray(coeficientes, dtype=float)
+        calibracion.T_nodos = np.asarray(T_nodos, dtype=float)
+        return calibracion
+
+    @staticmethod
+    def _horner(c, i, dx):
+        return ((c[0].take(i)*dx + c[1].take(i))*dx + c[2].take(i))*dx + c[3].take(i)
+
+    @staticmethod
+    def _horner_derivada(c, i, dx):
+        return (3*c[0].take(i)*dx + 2*c[1].take(i))*dx + c[2].take(i)
+
+    def _tramo(self, R_rel):
+        i = np.searchsorted(self.nodos, R_rel, side="right") - 1
+        np.clip(i, 0, len(self.nodos) - 2, out=i)
+        return i, R_rel - self.nodos.take(i)
+
+    def temperatura(self, R_rel):
+        R_rel = np.asarray(R_rel, dtype=float)
+        i, dx = self._tramo(R_rel)
+        return self._horner(self.coeficientes, i, dx)
+
+    __call__ = temperatura
+
+    def derivada(self, R_rel):
+        """dT/dR_rel del mismo spline que `temperatura`."""
+        R_rel = np.asarray(R_rel, dtype=float)
+        i, dx = self._tramo(R_rel)
+        return self._horner_derivada(self.coeficientes, i, dx)
+
+    def evaluar(self, R_rel):
+        """Temperatura y derivada compartiendo la búsqueda del tramo."""
+        R_rel = np.asarray(R_rel, dtype=float)
+        i, dx = self._tramo(R_rel)
+        return self._horner(self.coeficientes, i, dx), self._horner_derivada(self.coeficientes, i, dx)
+
+    def resistencia_relativa(self, T, iteraciones=6):
+        """Inversa T → R/R300K por Newton sobre el polinomio del tramo (T(R_rel) es monótona)."""
+        T = np.asarray(T, dtype=float)
+        i = np.searchsorted(self.T_nodos, T, side="right") - 1
+        np.clip(i, 0, len(self.nodos) - 2, out=i)
+        # Estimación inicial: interpolación lineal dentro del tramo
+        x0, x1 = self.nodos.take(i), self.nodos.take(i + 1)
+        T0, T1 = self.T_nodos.take(i), self.T_nodos.take(i + 1)
+        dx = (T - T0) * (x1 - x0) / (T1 - T0)
+        for _ in range(iteraciones):
+            dx -= (self._horner(self.coeficientes, i, dx) - T) / self._horner_derivada(self.coeficientes, i, dx)
+        return x0 + dx
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def benchmark_calibracion(n=10**6, repeticiones=5, semilla=0):
+    """
+    Compara la calibración única (construida una vez, valor y derivada con los
+    mismos tramos) con el esquema anterior: interp1d para T más np.gradient y un
+    segundo interp1d para la derivada.
+    """
+    from scipy.interpolate import interp1d
+
+    rng = np.random.default_rng(semilla)
+    R_rel = rng.uniform(R_rel_tabla[0], R_rel_tabla[-1], n)
+
+    def construir_anterior():
+        interpolador_temp = interp1d(R_rel_tabla, Temp_tabla, kind='cubic', fill_value="extrapolate")
+        dT_dR_rel_tabla = np.gradient(Temp_tabla, R_rel_tabla)
+        interpolador_deriv = interp1d(R_rel_tabla, dT_dR_rel_tabla, kind='cubic', fill_value="extrapolate")
+        return interpolador_temp, interpolador_deriv
+
+    def medir(funcion):
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        return (time.perf_counter() - t0) / repeticiones
+
+    interpolador_temp, interpolador_deriv = construir_anterior()
+    calibracion = CalibracionTungsteno()
+    return {
+        "t_construir_anterior": medir(construir_anterior),
+        "t_construir_calibracion": medir(CalibracionTungsteno),
+        "t_evaluar_anterior": medir(lambda: (interpolador_temp(R_rel), interpolador_deriv(R_rel))),
+        "t_evaluar_calibracion": medir(lambda: calibracion.evaluar(R_rel)),
+        "n": n,
+    }
+
+
+if __name__ == "__main__":
+    resultado = benchmark_calibracion()
+    print(f"Construcción: anterior {resultado['t_construir_anterior']*1e3:.2f} ms, "
+          f"calibración única {resultado['t_construir_calibracion']*1e3:.2f} ms")
+    print(f"T y dT/dR_rel para {resultado['n']} puntos: anterior {resultado['t_evaluar_anterior']*1e3:.1f} ms, "
+          f"calibración única {resultado['t_evaluar_calibracion']*1e3:.1f} ms")
@@ -0,0 +1,252 @@
+"""
+Verosimilitud - Exponente de la ley de Stefan-Boltzmann en una grilla (n, T_amb)
+Curso: Física Moderna 2025
+Autor: Mauricio Santibañez
+Descripción: Este módulo ajusta Radiancia = a·(Tⁿ - T_ambⁿ) + b a las mediciones
+del filamento del Experimento 3 evaluando la verosimilitud en una grilla densa de
+exponentes n y temperaturas ambiente T_amb. En cada celda a y b se obtienen en
+forma cerrada por mínimos cuadrados ponderados, con la varianza efectiva
+u_y² + (a·∂x/∂T·u_T)² (una repetición con el a de la primera pasada), y la
+verosimilitud queda perfilada en a, b y, opcionalmente, en una escala global de
+las incertidumbres. La grilla se recorre por bloques de exponentes contra todas
+las T_amb con broadcasting, acumulando solo las marginales (log-suma-exp), sin
+guardar las 10⁷ celdas; los bloques se pueden repartir en un pool de procesos.
+
+Con b libre, el término -a·T_ambⁿ se confunde con b: T_amb no queda determinada y
+la verosimilitud es la misma en todas las columnas de T_amb, así que por defecto
+se evalúa una sola columna (la del centro de la grilla) con los mismos exponentes
+de la grilla completa: de ~celdas se evalúan solo ~√(2·celdas) (4472 de 10⁷), y
+el resultado informa las celdas evaluadas. Un prior gaussiano en b (u_intercepto,
+el cero del detector) vuelve medible T_amb y se recorre la grilla completa.
+Uso: python verosimilitud.py [--celdas N] [--procesos P]   (benchmark con los datos de clase)
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Elementos (celdas × mediciones) por bloque: ~2 MB por array intermedio, que caben en caché
+ELEMENTOS_BLOQUE = 2**18
+
+# Factores de varianza relativa (≥ 1) que se multiplican antes de un solo logaritmo
+GRUPO_PRODUCTO = 16
+
+# Grilla por defecto: exponentes alrededor de 4 y T_amb alrededor de la del laboratorio
+LIMITES_EXPONENTE = (2.0, 6.0)
+LIMITES_T_AMB = (250.0, 350.0)
+CELDAS = 10**7
+
+# Parámetros ajustados además de la escala: a, n y b o T_amb (con b libre T_amb no cuenta)
+N_PARAMETROS = 3
+
+
+def grilla(celdas=CELDAS, limites_exponente=LIMITES_EXPONENTE, limites_T_amb=LIMITES_T_AMB, b_libre=False):
+    """
+    Exponentes y T_amb [K] equiespaciados con ~`celdas` celdas en total (el doble de
+    exponentes que de T_amb). Con b_libre la verosimilitud no depende de T_amb: se
+    usan los mismos exponentes con una sola T_amb, el centro de limites_T_amb, y
+    quedan solo celdas // n_T ≈ √(2·celdas) celdas.
+    """
+    n_T = max(1, int(np.sqrt(celdas / 2)))
+    n_n = max(2, celdas // n_T)
+    if b_libre:
+        return np.linspace(*limites_exponente, n_n), np.array([np.mean(limites_T_amb)])
+    return np.linspace(*limites_exponente, n_n), np.linspace(*limites_T_amb, n_T)
+
+
+def _sumas(sumas, Q):
+    # Sumas ponderadas de x = P - Q a partir de las de [1, P, P², y, P·y, y²] (penúltimo eje)
+    s1, sP, sPP, sy, sPy, syy = np.moveaxis(sumas, -2, 0)
+    return s1, sP - Q*s1, sy, sPP - 2*Q*sP + Q*Q*s1, sPy - Q*sy, syy
+
+
+def _resolver(S, Sx, Sy, Sxx, Sxy, Syy, peso_b):
+    # a y b en forma cerrada y chi² mínimo; el prior de b es un punto (x=0, y=0) con peso peso_b
+    if np.isinf(peso_b):
+        a = Sxy / Sxx
+        return a, np.zeros_like(a), Syy - a*Sxy
+    S = S + peso_b
+    D = S*Sxx - Sx*Sx
+    a = (S*Sxy - Sx*Sy) / D
+    b = (Sxx*Sy - Sx*Sxy) / D
+    return a, b, Syy - a*Sxy - b*Sy
+
+
+def _bloque(exponentes, t, t_amb, y, u_T_rel, u_y, peso_b, escalar):
+    """
+    log L de las celdas (exponentes × t_amb). t = T/T_ref y t_amb = T_amb/T_ref, de
+    modo que x = tⁿ - t_ambⁿ está entre -1 y 1 para cualquier n; a queda en unidades
+    de T_refⁿ. u_T_rel = u_T/T.
+    """
+    P = np.exp(exponentes[:, None] * np.log(t))        # (n_exp, N)
+    Q = np.exp(exponentes[:, None] * np.log(t_amb))    # (n_exp, n_T)
+    # [1, P, P², y, P·y, y²] con los pesos de la radiancia incluidos
+    M = np.stack([np.ones_like(P), P, P*P, np.broadcast_to(y, P.shape), P*y, np.broadcast_to(y*y, P.shape)],
+                 axis=-1) / u_y[:, None]**2             # (n_exp, N, 6)
+    r = (exponentes[:, None] * P * u_T_rel / u_y)**2     # (u_T·∂x/∂T / u_y)²
+
+    # Primera pasada con los pesos de la radiancia, iguales en todas las celdas: sin arrays de 3 ejes
+    a, b, chi2 = _resolver(*_sumas(M.sum(axis=1)[:, :, None], Q), peso_b)
+
+    # Varianza efectiva relativa v = 1 + a²·r ≥ 1 con ese a (arrays de 3 ejes, operaciones en el lugar);
+    # las sumas ponderadas de todas las celdas del bloque son un solo producto con M
+    v = np.multiply((a*a)[..., None], r[:, None, :])   # (n_exp, n_T, N)
+    v += 1
+    log_v = sum(np.log(v[..., i:i + GRUPO_PRODUCTO].prod(axis=-1)) for i in range(0, v.shape[-1], GRUPO_PRODUCTO))
+    w = np.reciprocal(v, out=v)
+    a, b, chi2 = _resolver(*_sumas(M.transpose(0, 2, 1) @ w.transpose(0, 2, 1), Q), peso_b)
+
+    n = y.size
+    log_pesos = -0.5 * (log_v + 2*np.log(u_y).sum())
+    if escalar:
+        # Escala global de las incertidumbres perfilada: s² = chi²/n
+        log_L = log_pesos - 0.5*n*np.log(np.maximum(chi2, 1e-300) / n) - 0.5*n
+    else:
+        log_L = log_pesos - 0.5*chi2
+
+    # Solo se devuelven las marginales parciales y la mejor celda del bloque
+    maximo = log_L.max()
+    i, j = np.unravel_index(np.argmax(log_L), log_L.shape)
+    L = np.exp(log_L - maximo)
+    with np.errstate(divide="ignore"):  # filas o columnas sin peso: log 0 = -inf, neutro en log-suma-exp
+        con_n = np.log(L.sum(axis=1)) + maximo
+        con_T = np.log(L.sum(axis=0)) + maximo
+    return con_n, con_T, (log_L[i, j], i, j, a[i, j], b[i, j], chi2[i, j])
+
+
+def _resumen_marginal(valores, log_marginal):
+    """Densidad normalizada, media, desviación, moda e intervalos centrales 68 % y 95 % de una marginal."""
+    p = np.exp(log_marginal - log_marginal.max())
+    paso = valores[1] - valores[0] if valores.size > 1 else 1.0
+    p /= p.sum() * paso
+    media = np.sum(p * valores) * paso
+    desviacion = np.sqrt(np.sum(p * (valores - media)**2) * paso)
+    acumulada = np.cumsum(p) * paso
+    acumulada /= acumulada[-1]
+    intervalos = {nivel: tuple(float(v) for v in np.interp([(1 - nivel)/2, (1 + nivel)/2], acumulada, valores))
+                  for nivel in (0.68, 0.95)}
+    return {"valores": valores, "densidad": p, "media": float(media), "desviacion": float(desviacion),
+            "moda": float(valores[np.argmax(p)]), "intervalo_68": intervalos[0.68],
+            "intervalo_95": intervalos[0.95]}
+
+
+def ajustar_exponente(T, Radiancia, u_T, u_Radiancia, exponentes=None, T_ambientes=None, u_intercepto=None,
+                      escalar=True, tam_bloque=None, n_procesos=1):
+    """
+    Verosimilitud de Radiancia = a·(Tⁿ - T_ambⁿ) + b en la grilla exponentes × T_ambientes
+    (por defecto, grilla() con CELDAS celdas, con una sola T_amb si b es libre).
+    Se necesitan más mediciones que N_PARAMETROS; si no, lanza ValueError.
+
+    u_intercepto: None deja b libre; un valor > 0 es un prior gaussiano b ~ N(0, u_intercepto)
+    y 0 fija b = 0. escalar=True perfila una escala común de las incertidumbres
+    (como el chi² reducido de los ajustes de la carpeta); con False se toman tal cual.
+    tam_bloque: exponentes por bloque (por defecto ELEMENTOS_BLOQUE / (n_T · N)).
+
+    Retorna las marginales de n y T_amb (densidad, media, desviación, moda e
+    intervalos 68 % y 95 %) y la mejor celda con sus a y b.
+    """
+    T = np.asarray(T, dtype=float).ravel()
+    y = np.asarray(Radiancia, dtype=float).ravel()
+    if T.size <= N_PARAMETROS:
+        # Con tan pocos puntos el ajuste es exacto (chi² = 0) y la verosimilitud perfilada no tiene sentido
+        raise ValueError(f"Se necesitan al menos {N_PARAMETROS + 1} mediciones para ajustar a, b y n "
+                         f"(hay {T.size})")
+    if exponentes is None or T_ambientes is None:
+        exponentes_defecto, T_ambientes_defecto = grilla(b_libre=u_intercepto is None)
+        exponentes = exponentes_defecto if exponentes is None else exponentes
+        T_ambientes = T_ambientes_defecto if T_ambientes is None else T_ambientes
+    exponentes = np.asarray(exponentes, dtype=float)
+    T_ambientes = np.asarray(T_ambientes, dtype=float)
+    u_T_rel = np.broadcast_to(np.asarray(u_T, dtype=float), T.shape) / T
+    u_y = np.broadcast_to(np.asarray(u_Radiancia, dtype=float), y.shape)
+    T_ref = T.max()
+    t, t_amb = T / T_ref, T_ambientes / T_ref
+    if u_intercepto is None:
+        peso_b = 0.0
+    elif u_intercepto == 0:
+        peso_b = np.inf
+    else:
+        peso_b = 1.0 / u_intercepto**2
+
+    if tam_bloque is None:
+        tam_bloque = max(1, ELEMENTOS_BLOQUE // (T_ambientes.size * T.size))
+    bloques = [exponentes[inicio:inicio + tam_bloque] for inicio in range(0, exponentes.size, tam_bloque)]
+    argumentos = (t, t_amb, y, u_T_rel, u_y, peso_b, escalar)
+
+    t0 = time.perf_counter()
+    if n_procesos > 1:
+        with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+            resultados = list(pool.map(_bloque, bloques, *[[arg]*len(bloques) for arg in argumentos]))
+    else:
+        resultados = [_bloque(bloque, *argumentos) for bloque in bloques]
+    t_total = time.perf_counter() - t0
+
+    log_n = np.concatenate([r[0] for r in resultados])
+    log_T = np.logaddexp.reduce(np.stack([r[1] for r in resultados]), axis=0)
+    k = int(np.argmax([r[2][0] for r in resultados]))
+    log_L, i, j, a, b, chi2 = resultados[k][2]
+    return {
+        "exponente": _resumen_marginal(exponentes, log_n),
+        "T_amb": _resumen_marginal(T_ambientes, log_T),
+        "mejor": {"exponente": float(bloques[k][i]), "T_amb": float(T_ambientes[j]),
+                  "a": float(a / T_ref**bloques[k][i]), "b": float(b), "chi2": float(chi2),
+                  "chi2_reducido": float(chi2) / (T.size - N_PARAMETROS)},
+        "celdas": exponentes.size * T_ambientes.size,
+        "t_total": t_total,
+    }
+
+
+#------------------------------------------------------------------------------------------
+
+#Benchmark
+
+def benchmark_verosimilitud(celdas=CELDAS, n_procesos=1):
+    """Celdas por segundo con las mediciones de clase del Experimento 3 frente a un bucle de curve_fit por celda."""
+    from scipy.optimize import curve_fit
+    from Experimento3 import Voltajes, Corrientes, Radiancia, R_ref, res_Voltaje, res_Corriente, res_Radiancia
+    from tungsteno import CalibracionTungsteno
+
+    T, dT_dR_rel = CalibracionTungsteno().evaluar(Voltajes / Corrientes / R_ref)
+    u_R = np.sqrt((res_Voltaje/np.sqrt(12) / Corrientes)**2
+                  + (Voltajes / Corrientes**2 * res_Corriente/np.sqrt(12))**2)
+    u_T = dT_dR_rel * u_R / R_ref
+    u_Radiancia = res_Radiancia / np.sqrt(12)
+
+    # Referencia: a y b con curve_fit celda por celda (estimado con 200 celdas)
+    n_bucle = 200
+    t0 = time.perf_counter()
+    for n, T_amb in zip(np.linspace(3, 5, n_bucle), np.linspace(250, 350, n_bucle)):
+        x = (T**n - T_amb**n) / T.max()**n
+        curve_fit(lambda x, a, b: a*x + b, x, Radiancia, sigma=np.full(T.size, u_Radiancia))
+    t_curve_fit = (time.perf_counter() - t0) / n_bucle
+
+    # Grilla completa (n, T_amb): mide el rendimiento por celda aunque con b libre T_amb sea degenerada
+    resultado = ajustar_exponente(T, Radiancia, u_T, u_Radiancia, *grilla(celdas), n_procesos=n_procesos)
+    return {
+        "celdas": resultado["celdas"],
+        "celdas_s": resultado["celdas"] / resultado["t_total"],
+        "celdas_s_curve_fit": 1 / t_curve_fit,
+        "resultado": resultado,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del ajuste del exponente en grilla (n, T_amb)")
+    parser.add_argument("--celdas", type=int, default=CELDAS, help="celdas de la grilla")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos para repartir los bloques")
+    args = parser.parse_args(argv)
+
+    resultado = benchmark_verosimilitud(args.celdas, args.procesos)
+    r = resultado["resultado"]
+    print(f"{resultado['celdas']} celdas en {r['t_total']:.2f} s: {resultado['celdas_s']:.2e} celdas/s "
+          f"({resultado['celdas_s_curve_fit']:.2e} con curve_fit por celda)")
+    n = r["exponente"]
+    print(f"n = {n['media']:.3f} ± {n['desviacion']:.3f} (95 %: [{n['intervalo_95'][0]:.3f}, "
+          f"{n['intervalo_95'][1]:.3f}]), mejor celda n = {r['mejor']['exponente']:.3f}, "
+          f"T_amb = {r['mejor']['T_amb']:.1f} K, chi² reducido {r['mejor']['chi2_reducido']:.2f}")
+
+
+if __name__ == "__main__":
+    main()